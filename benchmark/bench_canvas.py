@@ -0,0 +1,79 @@
+"""
+Compares drawing a scatter plot and line series on a window canvas one shape
+per call from Python against the batched `nuklear.canvas` helpers, which take
+NumPy arrays and loop in the nuklearPy shim.
+
+Usage:
+    python benchmark/bench_canvas.py [--frames N] [--points N] [--series N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import nuklear as nk
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def per_shape(canvas, rects, series, colors):
+    for rect, color in zip(rects.tolist(), colors.tolist()):
+        nk.fill_rect(canvas, nk.Rect(*rect), 0, nk.Color(*color))
+    for line in series:
+        points = [(float(x), float(y)) for x, y in line]
+        nk.stroke_polyline(canvas, points, 1.0, nk.Color(255, 255, 255, 255))
+
+
+def batched(canvas, rects, series, colors):
+    nk.fill_rects(canvas, rects, colors)
+    nk.stroke_polylines(canvas, series, (255, 255, 255, 255), 1.0)
+
+
+def run(ctx, draw, frames, rects, series, colors) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        nk.clear(ctx)
+        if nk.begin(ctx, "Plot", nk.Rect(0, 0, 800, 600), 0):
+            draw(nk.window_get_canvas(ctx), rects, series, colors)
+        nk.end(ctx)
+    return (time.perf_counter() - start) / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--series", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.points
+    rects = np.column_stack(
+        [rng.uniform(0, 780, n), rng.uniform(0, 580, n), np.full((n, 2), 3)]
+    ).astype(np.float32)
+    colors = rng.integers(0, 256, (n, 4), dtype=np.uint8)
+    colors[:, 3] = 255
+    x = np.linspace(0, 800, n, dtype=np.float32)
+    series = np.stack(
+        [
+            np.column_stack([x, 300 + 100 * np.sin(x / 50 + k)])
+            for k in range(args.series)
+        ]
+    ).astype(np.float32)
+
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width))
+    slow = run(ctx, per_shape, args.frames, rects, series, colors)
+    fast = run(ctx, batched, args.frames, rects, series, colors)
+    nk.free(ctx)
+
+    print(f"{n} rects, {args.series} series of {n} points")
+    print(f"per shape {slow * 1e3:>9.2f} ms/frame")
+    print(f"batched   {fast * 1e3:>9.2f} ms/frame ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measures how frame building scales when independent contexts are driven from a
+thread pool with `nuklear.build_frames`. The font width callback is written in
+Python and has to re-acquire the GIL for every measured label, which bounds the
+achievable speedup.
+
+Usage:
+    python benchmark/bench_context_scaling.py [--frames N] [--windows N] [--rows N]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import nuklear as nk
+
+THREADS = (1, 2, 4, 8, 16)
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def make_build(windows: int, rows: int):
+    def build(ctx: nk.Context) -> None:
+        for w in range(windows):
+            bounds = nk.Rect(w * 20.0, w * 20.0, 300.0, 400.0)
+            if nk.begin(ctx, f"Window {w}", bounds, nk.WINDOW_BORDER):
+                nk.layout_row_dynamic(ctx, 18.0, 2)
+                for r in range(rows):
+                    nk.label(ctx, "Label", nk.TEXT_LEFT)
+                    nk.label(ctx, "Value", nk.TEXT_RIGHT)
+            nk.end(ctx)
+        nk.clear(ctx)
+
+    return build
+
+
+def run(threads: int, frames: int, build) -> float:
+    font = nk.UserFont(height=13.0, width=_width)
+    contexts = [nk.Context() for _ in range(threads)]
+    for ctx in contexts:
+        nk.init_default(ctx, font)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        nk.build_frames(contexts, build, executor)  # warm up
+        start = time.perf_counter()
+        for _ in range(frames):
+            nk.build_frames(contexts, build, executor)
+        elapsed = time.perf_counter() - start
+
+    for ctx in contexts:
+        nk.free(ctx)
+    return threads * frames / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--windows", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20)
+    args = parser.parse_args()
+
+    build = make_build(args.windows, args.rows)
+    baseline = None
+    print(f"{'threads':>8} {'frames/s':>12} {'speedup':>8}")
+    for threads in THREADS:
+        rate = run(threads, args.frames, build)
+        baseline = baseline or rate
+        print(f"{threads:>8} {rate:>12.1f} {rate / baseline:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares baking a font atlas with several sizes of the default font, one of
+them with the Chinese glyph ranges, serially with `font_atlas_bake` and in
+parallel with `nuklear.fontbake`, both with a new and with a running process
+pool. The speedup depends on the number of cores.
+
+Usage:
+    python benchmark/bench_fontbake.py [--repeat N] [--workers N]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import nuklear as nk
+from nuklear.fontbake import font_atlas_bake_parallel
+
+
+def atlas() -> nk.FontAtlas:
+    atlas = nk.FontAtlas()
+    nk.font_atlas_init_default(atlas)
+    nk.font_atlas_begin(atlas)
+    for height in (13.0, 16.0, 20.0, 28.0):
+        nk.font_atlas_add_default(atlas, height)
+    config = nk.FontConfig(range=nk.font_chinese_glyph_ranges())
+    nk.font_atlas_add_default(atlas, 16.0, config)
+    return atlas
+
+
+def run(bake, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        fonts = atlas()
+        start = time.perf_counter()
+        bake(fonts)
+        best = min(best, time.perf_counter() - start)
+        nk.font_atlas_clear(fonts)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    fmt = nk.FONT_ATLAS_RGBA32
+
+    serial = run(lambda a: nk.font_atlas_bake(a, fmt), args.repeat)
+    cold = run(lambda a: font_atlas_bake_parallel(a, fmt, args.workers), args.repeat)
+    with ProcessPoolExecutor(args.workers) as pool:
+        # Starts the workers.
+        font_atlas_bake_parallel(atlas(), fmt, args.workers, pool)
+        warm = run(
+            lambda a: font_atlas_bake_parallel(a, fmt, args.workers, pool),
+            args.repeat,
+        )
+
+    print(f"workers:         {args.workers}")
+    print(f"serial:          {serial * 1e3:8.2f} ms")
+    print(f"parallel, cold:  {cold * 1e3:8.2f} ms  ({serial / cold:.2f}x)")
+    print(f"parallel, warm:  {warm * 1e3:8.2f} ms  ({serial / warm:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
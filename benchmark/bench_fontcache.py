@@ -0,0 +1,81 @@
+"""
+Compares cold and warm font atlas startup with `nuklear.fontcache`: a cold start
+bakes the fonts and stores them in the cache, a warm start memory-maps the
+cached atlas instead. Measures both the bake itself and a fresh interpreter
+that imports nuklearPy and sets up the atlas.
+
+Usage:
+    python benchmark/bench_fontcache.py [--repeat N] [--chinese]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+import nuklear as nk
+from nuklear.fontcache import FontAtlasCache
+
+
+def load(cache: FontAtlasCache, chinese: bool) -> None:
+    atlas = nk.FontAtlas()
+    nk.font_atlas_init_default(atlas)
+    nk.font_atlas_begin(atlas)
+    nk.font_atlas_add_default(atlas, 13.0)
+    if chinese:
+        config = nk.FontConfig(range=nk.font_chinese_glyph_ranges())
+        nk.font_atlas_add_default(atlas, 16.0, config)
+    cache.bake(atlas, nk.FONT_ATLAS_RGBA32)
+    nk.font_atlas_end(atlas, nk.Handle(id=1))
+    nk.font_atlas_clear(atlas)
+
+
+def startup(directory: str, chinese: bool) -> float:
+    # Wall time of a fresh interpreter, including importing nuklearPy.
+    command = [sys.executable, __file__, "--child", directory]
+    if chinese:
+        command.append("--chinese")
+    start = time.perf_counter()
+    subprocess.run(command, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chinese", action="store_true", help="add CJK ranges")
+    parser.add_argument("--child", metavar="DIRECTORY", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        load(FontAtlasCache(args.child), args.chinese)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FontAtlasCache(directory)
+        cold = []
+        warm = []
+        for _ in range(args.repeat):
+            cache.clear()
+            start = time.perf_counter()
+            load(cache, args.chinese)
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            load(cache, args.chinese)
+            warm.append(time.perf_counter() - start)
+        print(f"bake    cold: {min(cold) * 1e3:8.2f} ms")
+        print(f"bake    warm: {min(warm) * 1e3:8.2f} ms")
+        print(f"speedup:      {min(cold) / min(warm):8.1f}x")
+
+        cold = []
+        warm = []
+        for _ in range(args.repeat):
+            cache.clear()
+            cold.append(startup(directory, args.chinese))
+            warm.append(startup(directory, args.chinese))
+        print(f"startup cold: {min(cold) * 1e3:8.2f} ms")
+        print(f"startup warm: {min(warm) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
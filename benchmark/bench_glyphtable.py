@@ -0,0 +1,56 @@
+"""
+Compares frames full of labels measured by a naive `UserFont` with a Python
+`width` callback against the same font tabulated with
+`nuklear.glyphtable.GlyphTableFont`, which measures text without calling back
+into Python.
+
+Usage:
+    python benchmark/bench_glyphtable.py [--frames N] [--labels N]
+"""
+
+import argparse
+import time
+
+import nuklear as nk
+from nuklear.glyphtable import GlyphTableFont
+
+
+def _width(handle, height, text):
+    return sum(height * (0.5 if c.isascii() else 0.8) for c in text)
+
+
+def run(font, frames: int, labels) -> float:
+    ctx = nk.Context()
+    nk.init_default(ctx, font)
+    start = time.perf_counter()
+    for _ in range(frames):
+        nk.clear(ctx)
+        if nk.begin(ctx, "Labels", nk.Rect(0, 0, 800, 600), nk.WINDOW_TITLE):
+            nk.layout_row_dynamic(ctx, 14, 4)
+            for label in labels:
+                nk.label(ctx, label, nk.TEXT_LEFT)
+        nk.end(ctx)
+    seconds = (time.perf_counter() - start) / frames
+    nk.free(ctx)
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--labels", type=int, default=400)
+    args = parser.parse_args()
+    labels = [f"Item {i}: value {i * 37 % 1000}" for i in range(args.labels)]
+
+    naive = nk.UserFont(height=13.0, width=_width)
+    table = GlyphTableFont.from_user_font(naive)
+    naive_time = run(naive, args.frames, labels)
+    table_time = run(table.handle, args.frames, labels)
+    print(f"labels per frame: {args.labels}")
+    print(f"naive callback:   {naive_time * 1e3:8.3f} ms/frame")
+    print(f"glyph table:      {table_time * 1e3:8.3f} ms/frame")
+    print(f"speedup:          {naive_time / table_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
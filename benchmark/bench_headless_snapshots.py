@@ -0,0 +1,88 @@
+"""
+Measures the throughput of `nuklear.headless.SnapshotService` in snapshots per
+second, overall and per worker process.
+
+`blank` only builds the frames and ships empty images, the baseline cost of the
+service. `software` also converts and rasterizes every frame with
+`nuklear.raster.SoftwareRenderer`, which is what a snapshot actually costs.
+
+Usage:
+    python benchmark/bench_headless_snapshots.py [--jobs N] [--raster-jobs N] [--size WxH] [--workers N ...]
+"""  # noqa: E501
+
+import argparse
+import os
+import time
+
+import nuklear as nk
+from nuklear import headless
+from nuklear.raster import SoftwareRenderer
+
+
+class BlankRenderer(headless.Renderer):
+    """Stands in for a rasterizer, so only build and transport are measured."""
+
+    def render(self, ctx, width, height):
+        return bytes(width * height * 4)
+
+
+def build(ctx, width, height):
+    bounds = nk.Rect(0, 0, width, height)
+    if nk.begin(ctx, "Report", bounds, nk.WINDOW_BORDER | nk.WINDOW_TITLE):
+        nk.layout_row_dynamic(ctx, 18.0, 3)
+        for row in range(40):
+            nk.label(ctx, f"Row {row}", nk.TEXT_LEFT)
+            nk.label(ctx, "Metric", nk.TEXT_CENTERED)
+            nk.label(ctx, f"{row * 3.14:.2f}", nk.TEXT_RIGHT)
+    nk.end(ctx)
+
+
+class NullSink(headless.Sink):
+    def write(self, snapshot):
+        pass
+
+
+def run(
+    renderer: headless.Renderer, workers: int, jobs: int, width: int, height: int
+) -> float:
+    with headless.SnapshotService(renderer, max_workers=workers) as service:
+        # Warm up every worker before timing.
+        service.render(
+            (
+                headless.SnapshotJob(f"w{i}", build, width, height)
+                for i in range(workers)
+            ),
+            NullSink(),
+        )
+        start = time.perf_counter()
+        service.render(
+            (headless.SnapshotJob(f"s{i}", build, width, height) for i in range(jobs)),
+            NullSink(),
+        )
+        return jobs / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--raster-jobs", type=int, default=100)
+    parser.add_argument("--size", default="320x240")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    renderers = (
+        ("blank", BlankRenderer(), args.jobs),
+        ("software", SoftwareRenderer(), args.raster_jobs),
+    )
+    print(f"{'renderer':>8} {'workers':>8} {'snapshots/s':>12} {'per core':>10}")
+    for name, renderer, jobs in renderers:
+        for workers in sorted(set(args.workers)):
+            rate = run(renderer, workers, jobs, width, height)
+            print(f"{name:>8} {workers:>8} {rate:>12.1f} {rate / workers:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compares baking the default font with the full Chinese glyph ranges up front
+against a `nuklear.lazyfont.LazyFont` that starts with the default ranges and
+grows while a window shows a few lines of Chinese text: time to the first frame,
+total bake time and atlas memory.
+
+Usage:
+    python benchmark/bench_lazyfont.py [--lines N]
+"""
+
+import argparse
+import random
+import time
+
+import nuklear as nk
+from nuklear.lazyfont import LazyFont
+
+
+def lines(count: int):
+    rng = random.Random(0)
+    common = range(0x4E00, 0x4E00 + 2000)
+    return ["".join(chr(rng.choice(common)) for _ in range(20)) for _ in range(count)]
+
+
+def frame(ctx, text) -> None:
+    nk.clear(ctx)
+    if nk.begin(ctx, "Text", nk.Rect(0, 0, 800, 600), 0):
+        nk.layout_row_dynamic(ctx, 16, 1)
+        for line in text:
+            nk.label(ctx, line, nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20)
+    args = parser.parse_args()
+    text = lines(args.lines)
+
+    def upload(texture, pixels, width, height):
+        pass
+
+    start = time.perf_counter()
+    atlas = nk.FontAtlas()
+    nk.font_atlas_init_default(atlas)
+    nk.font_atlas_begin(atlas)
+    config = nk.FontConfig(range=nk.font_chinese_glyph_ranges())
+    nk.font_atlas_add_default(atlas, 16.0, config)
+    pixels, width, height = nk.font_atlas_bake(atlas, nk.FONT_ATLAS_RGBA32)
+    nk.font_atlas_end(atlas, nk.Handle(id=1))
+    full = time.perf_counter() - start
+    print(f"full:  first frame after {full * 1e3:8.2f} ms, {len(pixels) >> 20} MB")
+    nk.font_atlas_clear(atlas)
+
+    start = time.perf_counter()
+    font = LazyFont(16.0, upload, nk.Handle(id=1))
+    first = time.perf_counter() - start
+    ctx = nk.Context()
+    nk.init_default(ctx, font.handle)
+    frames = 0
+    while True:
+        frame(ctx, text)
+        frames += 1
+        if not font.update() and not font.rebaking:
+            break
+        font.wait()
+    stats = font.stats
+    print(
+        f"lazy:  first frame after {first * 1e3:8.2f} ms, "
+        f"{stats.atlas_bytes / 2**20:.1f} MB after {frames} frames, "
+        f"{stats.bakes} bakes in {stats.bake_seconds * 1e3:.2f} ms"
+    )
+    nk.free(ctx)
+    font.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Pastes a large string into an active edit widget with `nuklear.input_paste`,
+in a single frame through the clipboard paste path, against typing it with
+one `nk_input_unicode` call per rune, of which Nuklear takes fewer than
+`INPUT_MAX` bytes per frame.
+
+Typing is measured on the first `--typed-kb` kilobytes only and scaled up
+linearly, which underestimates it: every frame lays out all text typed so far.
+
+Usage:
+    python benchmark/bench_paste.py [--kilobytes N] [--typed-kb N]
+"""
+
+import argparse
+import time
+
+import nuklear as nk
+from nuklear.glyphtable import GlyphTableFont
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+class Editor:
+    def __init__(self):
+        font = GlyphTableFont.from_user_font(nk.UserFont(height=13.0, width=_width))
+        self.font = font
+        self.ctx = nk.Context()
+        nk.init_default(self.ctx, font.handle)
+        self.edit = nk.TextEdit(undo_records=0, undo_chars=0)
+        nk.textedit_init_default(self.edit)
+        self.frame(lambda ctx: nk.input_button(ctx, nk.BUTTON_LEFT, 20, 20, True))
+        self.frame(lambda ctx: nk.input_button(ctx, nk.BUTTON_LEFT, 20, 20, False))
+        assert self.edit.active
+
+    def frame(self, events) -> None:
+        ctx = self.ctx
+        nk.input_begin(ctx)
+        nk.input_motion(ctx, 20, 20)
+        events(ctx)
+        nk.input_end(ctx)
+        if nk.begin(ctx, "Editor", nk.Rect(0, 0, 800, 600), 0):
+            nk.layout_row_dynamic(ctx, 560, 1)
+            nk.edit_buffer(ctx, nk.EDIT_BOX, self.edit)
+        nk.end(ctx)
+        nk.clear(ctx)
+
+    def close(self) -> None:
+        nk.textedit_free(self.edit)
+        nk.free(self.ctx)
+
+
+def paste(text: str) -> float:
+    editor = Editor()
+    start = time.perf_counter()
+    editor.frame(lambda ctx: nk.input_paste(ctx, text))
+    seconds = time.perf_counter() - start
+    assert len(editor.edit) == len(text)
+    editor.close()
+    return seconds
+
+
+def typed(text: str):
+    editor = Editor()
+    frames = 0
+    start = time.perf_counter()
+    runes = iter(text)
+    rune = next(runes, None)
+    while rune is not None:
+
+        def events(ctx):
+            nonlocal rune
+            size = 0
+            while rune is not None and size + len(rune.encode()) < nk.INPUT_MAX:
+                size += len(rune.encode())
+                nk.input_unicode(ctx, ord(rune))
+                rune = next(runes, None)
+
+        editor.frame(events)
+        frames += 1
+    seconds = time.perf_counter() - start
+    assert len(editor.edit) == len(text)
+    editor.close()
+    return seconds, frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kilobytes", type=int, default=1024)
+    parser.add_argument("--typed-kb", type=int, default=16)
+    args = parser.parse_args()
+    line = "Grüße aus Köln — 世界 — paste benchmark\n"
+    text = line * (args.kilobytes * 1024 // len(line.encode()))
+    sample = text[: len(text) * args.typed_kb // args.kilobytes]
+
+    pasted = paste(text)
+    typed_seconds, frames = typed(sample)
+    scale = len(text) / len(sample)
+    print(f"{len(text.encode()) >> 10} KB, {len(text)} runes")
+    print(f"input_paste:   {pasted * 1e3:10.1f} ms in 1 frame")
+    print(
+        f"input_unicode: >{typed_seconds * scale * 1e3:9.1f} ms in "
+        f"{int(frames * scale)} frames (scaled from {args.typed_kb} KB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the throughput of `nuklear.raster.Rasterizer` in megapixels per
+second on a text-heavy report screen, serially and with tile-parallel drawing.
+The frame is converted once, so only rasterization is timed.
+
+Usage:
+    python benchmark/bench_raster.py [--frames N] [--size WxH] [--threads N ...]
+                                     [--tile-size N]
+"""
+
+import argparse
+import os
+import time
+
+import nuklear as nk
+from nuklear.raster import Rasterizer
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def _query(handle, height, codepoint, next_codepoint):
+    return nk.UserFontGlyph(width=height * 0.5, height=height, xadvance=height * 0.5)
+
+
+def build(ctx, width, height):
+    bounds = nk.Rect(0, 0, width, height)
+    if nk.begin(ctx, "Report", bounds, nk.WINDOW_BORDER | nk.WINDOW_TITLE):
+        nk.layout_row_dynamic(ctx, 18.0, 3)
+        for row in range(60):
+            nk.label(ctx, f"Row {row}", nk.TEXT_LEFT)
+            nk.label(ctx, "Metric", nk.TEXT_CENTERED)
+            nk.label(ctx, f"{row * 3.14:.2f}", nk.TEXT_RIGHT)
+    nk.end(ctx)
+
+
+def run(ctx, frames: int, width: int, height: int, threads: int, tile: int) -> float:
+    with Rasterizer(width, height, threads, tile) as raster:
+        data = raster.converter.convert(ctx)
+        raster.draw(data)
+        start = time.perf_counter()
+        for _ in range(frames):
+            raster.draw(data)
+        seconds = time.perf_counter() - start
+    return frames * width * height / seconds / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--tile-size", type=int, default=64)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width, query=_query))
+    build(ctx, width, height)
+
+    print(f"{'threads':>8} {'Mpixels/s':>10} {'frames/s':>9}")
+    for threads in sorted(set(args.threads)):
+        rate = run(ctx, args.frames, width, height, threads, args.tile_size)
+        print(f"{threads:>8} {rate:>10.2f} {rate * 1e6 / (width * height):>9.1f}")
+    nk.free(ctx)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Replays a recorded input log against a layout-heavy screen and prints the
+frame time and allocation report. Without `--log`, a deterministic synthetic
+input stream (mouse sweeps, clicks and scrolling) is generated and, with
+`--record`, saved so later runs replay exactly the same input.
+
+Usage:
+    python benchmark/bench_replay.py [--log FILE] [--record FILE] [--frames N]
+                                     [--windows N] [--rows N] [--csv FILE]
+"""
+
+import argparse
+import random
+
+import nuklear as nk
+from nuklear import replay
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def make_build(windows: int, rows: int):
+    def build(ctx: nk.Context) -> None:
+        for w in range(windows):
+            bounds = nk.Rect(w * 20.0, w * 20.0, 300.0, 400.0)
+            if nk.begin(ctx, f"Window {w}", bounds, nk.WINDOW_BORDER):
+                nk.layout_row_dynamic(ctx, 18.0, 2)
+                for r in range(rows):
+                    nk.label(ctx, "Label", nk.TEXT_LEFT)
+                    nk.label(ctx, "Value", nk.TEXT_RIGHT)
+            nk.end(ctx)
+
+    return build
+
+
+def synthetic_frames(frames: int, seed: int = 0):
+    rng = random.Random(seed)
+    result = []
+    x, y = 0, 0
+    for i in range(frames):
+        queue = nk.InputQueue()
+        x = (x + rng.randint(0, 12)) % 600
+        y = (y + rng.randint(0, 8)) % 500
+        queue.motion(x, y)
+        if i % 30 == 0:
+            queue.button(nk.BUTTON_LEFT, x, y, True)
+        elif i % 30 == 2:
+            queue.button(nk.BUTTON_LEFT, x, y, False)
+        if i % 7 == 0:
+            queue.scroll(0.0, rng.choice((-1.0, 1.0)))
+        result.append(queue)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log", help="input log to replay")
+    parser.add_argument("--record", help="save the synthetic input to this log")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--windows", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--csv", help="write the per-frame report to this file")
+    args = parser.parse_args()
+
+    if args.log:
+        frames = replay.read_input_log(args.log)
+    else:
+        frames = synthetic_frames(args.frames)
+        if args.record:
+            with replay.InputRecorder(args.record) as recorder:
+                for queue in frames:
+                    recorder.record(queue)
+
+    ctx = nk.Context()
+    stats = nk.init_counting(ctx, nk.UserFont(height=13.0, width=_width))
+    report = replay.replay(
+        ctx,
+        frames,
+        make_build(args.windows, args.rows),
+        stats=stats,
+        warmup=args.warmup,
+    )
+    nk.free(ctx)
+
+    print(report.summary())
+    if args.csv:
+        report.write_csv(args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Types a large string through a text edit filter: a Python `PluginFilter`, a
+`nuklear.runefilter.RuneFilter` and Nuklear's `nk_filter_decimal`, which all
+accept the same runes.
+
+Usage:
+    python benchmark/bench_runefilter.py [--runes N]
+"""
+
+import argparse
+import random
+import string
+import time
+
+import nuklear as nk
+from nuklear.runefilter import RuneFilter
+
+
+def typed(filter, text: str) -> float:
+    edit = nk.TextEdit(undo_records=0, undo_chars=0)
+    nk.textedit_init_default(edit)
+    edit.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+    edit.struct.filter = filter
+    start = time.perf_counter()
+    nk.textedit_text(edit, text)
+    seconds = time.perf_counter() - start
+    nk.textedit_free(edit)
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runes", type=int, default=1_000_000)
+    args = parser.parse_args()
+    # Mostly rejected runes, so that inserting the others does not dominate.
+    rng = random.Random(0)
+    text = "".join(
+        rng.choice(string.digits if rng.random() < 0.002 else string.ascii_letters)
+        for _ in range(args.runes)
+    )
+
+    digits = set(map(ord, string.digits + "-"))
+    python = nk.PluginFilter(lambda edit, rune: rune in digits)
+    rune_filter = RuneFilter(chars=string.digits + "-")
+    results = [
+        ("Python PluginFilter", typed(python, text)),
+        (f"RuneFilter (native: {rune_filter.native})", typed(rune_filter.filter, text)),
+        ("nk_filter_decimal", typed(nk.filter_decimal, text)),
+    ]
+    rune_filter.close()
+    print(f"{args.runes} runes typed")
+    for name, seconds in results:
+        print(
+            f"{name:28} {seconds * 1e3:9.2f} ms, {seconds / args.runes * 1e9:7.1f} ns/rune"
+        )
+
+
+if __name__ == "__main__":
+    main()
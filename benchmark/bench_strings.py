@@ -0,0 +1,77 @@
+"""
+Measures frames of a window full of labels with the UTF-8 encodings of the
+window title and labels interned by `nuklear.library.string_cache` against
+encoding every string anew, and the cost of `to_char_p` alone.
+
+Usage:
+    python benchmark/bench_strings.py [--labels N] [--frames N]
+"""
+
+import argparse
+import time
+
+import nuklear as nk
+from nuklear import library
+
+
+def _width(handle, height, text):
+    return 0.0
+
+
+def run(labels, frames: int) -> float:
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width))
+    start = time.perf_counter()
+    for _ in range(frames):
+        nk.clear(ctx)
+        if nk.begin(ctx, "Settings — Général", nk.Rect(0, 0, 400, 4000), 0):
+            nk.layout_row_dynamic(ctx, 16, 1)
+            for label in labels:
+                nk.label(ctx, label, nk.TEXT_LEFT)
+        nk.end(ctx)
+    seconds = time.perf_counter() - start
+    nk.free(ctx)
+    return seconds / frames
+
+
+def encode(labels, frames: int, function=library.to_char_p) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        for label in labels:
+            function(label)
+    return (time.perf_counter() - start) / frames / len(labels)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--labels", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+    labels = [f"Option {i}: Einstellung für Größe" for i in range(args.labels)]
+
+    raw = encode(labels, args.frames, lambda s: s.encode("utf-8"))
+    print(f"str.encode:                {raw * 1e9:6.1f} ns per call")
+
+    cache = library.string_cache
+    max_entries = cache.max_entries
+    cache.max_entries = 0
+    cache.clear()
+    plain = run(labels, args.frames)
+    plain_encode = encode(labels, args.frames)
+
+    cache.max_entries = max_entries
+    interned = run(labels, args.frames)
+    interned_encode = encode(labels, args.frames)
+
+    print(
+        f"encoded:  {plain * 1e3:7.3f} ms/frame, "
+        f"{plain_encode * 1e9:6.1f} ns per to_char_p"
+    )
+    print(
+        f"interned: {interned * 1e3:7.3f} ms/frame, "
+        f"{interned_encode * 1e9:6.1f} ns per to_char_p, {len(cache)} strings"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Edits a large log in a `TextEdit` under `nuklear.edit_buffer` against a
+`nuklear.textdocument.TextDocument` under `document_edit`: the latency of an
+insertion in the middle of the text, and of a frame of the widget while it
+scrolls through the text.
+
+Usage:
+    python benchmark/bench_textdocument.py [--megabytes N] [--frames N]
+"""
+
+import argparse
+import time
+
+import nuklear as nk
+from nuklear.glyphtable import GlyphTableFont
+from nuklear.textdocument import TextDocument
+from nuklear.textdocument import document_edit
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def log(megabytes: float) -> bytes:
+    lines = []
+    size = 0
+    while size < megabytes * (1 << 20):
+        line = f"2024-05-01 12:{len(lines) % 60:02}:00 INFO request {len(lines)} ok\n"
+        lines.append(line)
+        size += len(line)
+    return "".join(lines).encode()
+
+
+def frames(ctx, draw, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        nk.input_begin(ctx)
+        nk.input_motion(ctx, 200, 200)
+        nk.input_scroll(ctx, nk.Vec2(0, -5))
+        nk.input_end(ctx)
+        nk.clear(ctx)
+        if nk.begin(ctx, "Log", nk.Rect(0, 0, 800, 600), 0):
+            nk.layout_row_dynamic(ctx, 560, 1)
+            draw(ctx)
+        nk.end(ctx)
+    return (time.perf_counter() - start) / count
+
+
+def inserts(insert, size: int, count: int = 20) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        insert(size // 2 + i, "x")
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=10)
+    parser.add_argument("--frames", type=int, default=5)
+    args = parser.parse_args()
+    text = log(args.megabytes)
+
+    ctx = nk.Context()
+    font = GlyphTableFont.from_user_font(nk.UserFont(height=13.0, width=_width))
+    nk.init_default(ctx, font.handle)
+
+    edit = nk.TextEdit(undo_records=0, undo_chars=0)
+    nk.textedit_init_default(edit)
+    nk.str_append_text_char(edit.struct.string, text)
+    edit.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+    edit.struct.single_line = 0
+
+    def insert_edit(pos, c):
+        edit.cursor = pos
+        nk.textedit_text(edit, c)
+
+    stock_insert = inserts(insert_edit, len(text))
+    stock_frame = frames(ctx, lambda ctx: nk.edit_buffer(ctx, nk.EDIT_BOX, edit), 2)
+    nk.textedit_free(edit)
+
+    doc = TextDocument(text)
+    document_insert = inserts(doc.insert, len(text))
+    document_frame = frames(ctx, lambda ctx: document_edit(ctx, doc), args.frames)
+    doc.close()
+    nk.free(ctx)
+
+    lines = text.count(b"\n") + 1
+    print(f"{len(text) >> 20} MB, {lines} lines")
+    print(
+        f"TextEdit:     {stock_insert * 1e6:9.1f} us/insert, "
+        f"{stock_frame * 1e3:9.2f} ms/frame"
+    )
+    print(
+        f"TextDocument: {document_insert * 1e6:9.1f} us/insert, "
+        f"{document_frame * 1e3:9.2f} ms/frame"
+    )
+
+
+if __name__ == "__main__":
+    main()
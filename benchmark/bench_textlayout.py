@@ -0,0 +1,68 @@
+"""
+Compares frames of wrapped paragraphs drawn with `nuklear.text_wrap`, which
+breaks every paragraph anew every frame, against
+`nuklear.textlayout.text_wrap` with a layout cache, both with a Python font.
+
+Usage:
+    python benchmark/bench_textlayout.py [--paragraphs N] [--frames N]
+"""
+
+import argparse
+import random
+import time
+
+import nuklear as nk
+from nuklear import textlayout
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do".split()
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def paragraphs(count: int):
+    rng = random.Random(0)
+    return [" ".join(rng.choice(WORDS) for _ in range(60)) for _ in range(count)]
+
+
+def run(draw, text, frames: int) -> float:
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width))
+    start = time.perf_counter()
+    for _ in range(frames):
+        nk.clear(ctx)
+        if nk.begin(ctx, "Text", nk.Rect(0, 0, 400, 4000), 0):
+            nk.layout_row_dynamic(ctx, 120, 1)
+            for paragraph in text:
+                draw(ctx, paragraph)
+        nk.end(ctx)
+    seconds = time.perf_counter() - start
+    nk.free(ctx)
+    return seconds / frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paragraphs", type=int, default=20)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+    text = paragraphs(args.paragraphs)
+
+    plain = run(nk.text_wrap, text, args.frames)
+    print(f"text_wrap:  {plain * 1e3:8.3f} ms/frame")
+
+    cache = textlayout.TextLayoutCache()
+    cached = run(
+        lambda ctx, paragraph: textlayout.text_wrap(ctx, paragraph, cache),
+        text,
+        args.frames,
+    )
+    print(
+        f"cached:     {cached * 1e3:8.3f} ms/frame, {plain / cached:.1f}x, "
+        f"hit rate {cache.hit_rate:.1%}, {cache.nbytes >> 10} KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures the cells of a large table one `width` call per string against
+`nuklear.glyphtable.text_widths`, serially and on a thread pool.
+
+Usage:
+    python benchmark/bench_textwidths.py [--cells N] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import time
+
+import nuklear as nk
+from nuklear.glyphtable import GlyphTableFont
+from nuklear.glyphtable import text_widths
+
+
+def _width(handle, height, text):
+    return sum(height * (0.5 if ord(c) < 0x80 else 0.75) for c in text)
+
+
+def cells(count: int):
+    rng = random.Random(0)
+    return [f"{rng.random() * 10 ** rng.randint(0, 8):,.2f} €" for _ in range(count)]
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cells", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    texts = cells(args.cells)
+
+    naive = nk.UserFont(height=13.0, width=_width)
+    font = GlyphTableFont.from_user_font(naive)
+    struct = naive.to_c()
+
+    def per_string():
+        for text in texts:
+            data = text.encode()
+            struct.width(struct.userdata, 13.0, data, len(data))
+
+    results = [
+        ("UserFont.width per string", timed(per_string)),
+        ("text_widths(UserFont)", timed(lambda: text_widths(naive, texts))),
+        (
+            "GlyphTableFont.width per string",
+            timed(lambda: list(map(font.width, texts))),
+        ),
+        ("text_widths(GlyphTableFont)", timed(lambda: font.widths(texts))),
+        (
+            f"text_widths, {args.workers} threads",
+            timed(lambda: font.widths(texts, workers=args.workers)),
+        ),
+    ]
+    for name, seconds in results:
+        print(f"{name:36} {seconds * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
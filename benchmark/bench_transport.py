@@ -0,0 +1,97 @@
+"""
+Measures the end-to-end latency of handing converted frames to a renderer
+process through `nuklear.transport`, from the moment a frame is converted
+until the renderer process has read it, and the frame rate both sides sustain.
+The renderer touches every vertex, element and command without copying them.
+
+Usage:
+    python benchmark/bench_transport.py [--frames N] [--rows N] [--slots N ...]
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import nuklear as nk
+from nuklear.transport import FrameConsumer
+from nuklear.transport import FrameProducer
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def _query(handle, height, codepoint, next_codepoint):
+    return nk.UserFontGlyph(width=height * 0.5, height=height, xadvance=height * 0.5)
+
+
+def build(ctx, rows: int, frame: int):
+    nk.clear(ctx)
+    bounds = nk.Rect(0, 0, 640, 480)
+    if nk.begin(ctx, "Report", bounds, nk.WINDOW_BORDER | nk.WINDOW_TITLE):
+        nk.layout_row_dynamic(ctx, 18.0, 3)
+        for row in range(rows):
+            nk.label(ctx, f"Row {row}", nk.TEXT_LEFT)
+            nk.label(ctx, "Metric", nk.TEXT_CENTERED)
+            nk.label(ctx, f"{(row + frame) * 3.14:.2f}", nk.TEXT_RIGHT)
+    nk.end(ctx)
+
+
+def render(handle, frames: int, results) -> None:
+    latencies = []
+    with FrameConsumer(handle) as consumer:
+        while True:
+            frame = consumer.acquire(timeout=5)
+            if frame is None:
+                break
+            data = frame.data
+            data.vertices["position"].sum()
+            data.elements.max(initial=0)
+            data.commands["elem_count"].sum()
+            latencies.append(time.monotonic_ns() - frame.timestamp_ns)
+            last = frame.frame
+            del frame, data
+            if last >= frames:
+                break
+    results.send(latencies)
+
+
+def run(ctx, frames: int, rows: int, slots: int):
+    with FrameProducer(slots) as producer:
+        receive, send = multiprocessing.Pipe(False)
+        process = multiprocessing.Process(
+            target=render, args=(producer.handle, frames, send)
+        )
+        process.start()
+        start = time.perf_counter()
+        for frame in range(frames):
+            build(ctx, rows, frame)
+            producer.publish(ctx)
+        seconds = time.perf_counter() - start
+        latencies = sorted(receive.recv())
+        process.join()
+    return seconds, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--slots", type=int, nargs="+", default=[2, 3])
+    args = parser.parse_args()
+
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width, query=_query))
+
+    print(f"{'slots':>6} {'frames/s':>9} {'read':>6} {'p50 us':>8} {'p95 us':>8}")
+    for slots in args.slots:
+        seconds, latencies = run(ctx, args.frames, args.rows, slots)
+        p50 = latencies[len(latencies) // 2] / 1e3
+        p95 = latencies[int(len(latencies) * 0.95)] / 1e3
+        fps = args.frames / seconds
+        print(f"{slots:>6} {fps:>9.1f} {len(latencies):>6} {p50:>8.1f} {p95:>8.1f}")
+    nk.free(ctx)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures the size of `nuklear.wire` messages and the encode and decode
+throughput, sending every frame over a local socket pair. Each frame of the
+report screen changes a few values, like a live dashboard.
+
+Usage:
+    python benchmark/bench_wire.py [--frames N] [--rows N] [--keyframe-interval N]
+"""
+
+import argparse
+import socket
+import time
+
+import nuklear as nk
+from nuklear import drawing
+from nuklear import wire
+
+
+def _width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def build(ctx, rows: int, frame: int):
+    nk.clear(ctx)
+    bounds = nk.Rect(0, 0, 640, 480)
+    if nk.begin(ctx, "Report", bounds, nk.WINDOW_BORDER | nk.WINDOW_TITLE):
+        nk.layout_row_dynamic(ctx, 18.0, 3)
+        for row in range(rows):
+            nk.label(ctx, f"Row {row}", nk.TEXT_LEFT)
+            nk.label(ctx, "Metric", nk.TEXT_CENTERED)
+            value = row * 3.14 + (frame if row % 10 == 0 else 0)
+            nk.label(ctx, f"{value:.2f}", nk.TEXT_RIGHT)
+    nk.end(ctx)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--keyframe-interval", type=int, default=60)
+    args = parser.parse_args()
+
+    ctx = nk.Context()
+    nk.init_default(ctx, nk.UserFont(height=13.0, width=_width))
+    encoder = wire.WireEncoder(args.keyframe_interval)
+    decoder = wire.WireDecoder()
+
+    raw = commands = 0
+    keyframe_bytes = delta_bytes = 0
+    encode_seconds = decode_seconds = 0.0
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        for frame in range(args.frames):
+            build(ctx, args.rows, frame)
+            for kind, address in drawing.walk_commands(ctx):
+                raw += drawing.command_size(kind, address)
+                commands += 1
+
+            start = time.perf_counter()
+            message = encoder.encode(ctx)
+            wire.send_message(sender, message)
+            encode_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            decoder.decode(wire.recv_message(receiver))
+            decode_seconds += time.perf_counter() - start
+
+            if message[0] & wire.FLAG_KEYFRAME:
+                keyframe_bytes += len(message)
+            else:
+                delta_bytes += len(message)
+    nk.free(ctx)
+
+    deltas = args.frames - encoder.keyframes
+    print(f"commands/frame  {commands / args.frames:>10.0f}")
+    print(f"raw bytes/frame {raw / args.frames:>10.0f}")
+    print(f"keyframe bytes  {keyframe_bytes / max(encoder.keyframes, 1):>10.0f}")
+    print(f"delta bytes     {delta_bytes / max(deltas, 1):>10.0f}")
+    print(f"average ratio   {raw / encoder.bytes_out:>10.1f}x")
+    print(f"encode frames/s {args.frames / encode_seconds:>10.1f}")
+    print(f"decode frames/s {args.frames / decode_seconds:>10.1f}")
+    print(f"encode MB/s     {raw / encode_seconds / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,9 @@ def setup_files() -> None:
     h_file: Path = build_dir / "nuklear.h"
     h_file.write_text(contents)
 
+    shim = project_dir / "shim" / "nuklear_py.c"
+    shutil.copy(shim, build_dir / "nuklear_py.c")
+
     contents = os.linesep.join(
         (
             "#define NK_API __declspec(dllexport)",
@@ -43,6 +46,7 @@ def setup_files() -> None:
             "#define NK_INCLUDE_DEFAULT_FONT",
             "#define NK_IMPLEMENTATION",
             '#include "nuklear.h"',
+            '#include "nuklear_py.c"',
         )
     )
     c_file: Path = build_dir / "nuklear.c"
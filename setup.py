@@ -8,6 +8,9 @@ setup(
         "vulkan": [
             "cffi",
         ],
+        "numpy": [
+            "numpy",
+        ],
     },
     tests_require=[
         "tox",
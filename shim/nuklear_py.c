@@ -0,0 +1,1518 @@
+/*
+ * Helpers compiled into the Nuklear shared library for nuklearPy.
+ *
+ * This file is included by the generated `nuklear.c` directly after the
+ * Nuklear implementation, so it shares the translation unit and can use the
+ * internal (`NK_INTERN`) helpers as well as the full struct definitions.
+ *
+ * Every function here is prefixed with `nk_py_` and is optional on the Python
+ * side: the bindings check for it with `hasattr` before using it.
+ */
+
+/* ==============================================================
+ *
+ *                          CONTEXT
+ *
+ * ============================================================== */
+
+NK_API nk_size
+nk_py_sizeof_context(void)
+{
+    return sizeof(struct nk_context);
+}
+
+NK_API void
+nk_py_set_delta_time(struct nk_context *ctx, float seconds)
+{
+    NK_ASSERT(ctx);
+    if (!ctx) return;
+    ctx->delta_time_seconds = seconds;
+}
+
+NK_API float
+nk_py_get_delta_time(const struct nk_context *ctx)
+{
+    NK_ASSERT(ctx);
+    if (!ctx) return 0;
+    return ctx->delta_time_seconds;
+}
+
+/* ==============================================================
+ *
+ *                          ALLOCATOR
+ *
+ * ============================================================== */
+
+struct nk_py_alloc_stats {
+    nk_size alloc_count;
+    nk_size free_count;
+    nk_size alloc_bytes;
+};
+
+NK_INTERN void*
+nk_py_counting_alloc(nk_handle handle, void *old, nk_size size)
+{
+    struct nk_py_alloc_stats *stats = (struct nk_py_alloc_stats*)handle.ptr;
+    stats->alloc_count++;
+    stats->alloc_bytes += size;
+    return nk_malloc(handle, old, size);
+}
+
+NK_INTERN void
+nk_py_counting_free(nk_handle handle, void *old)
+{
+    struct nk_py_alloc_stats *stats = (struct nk_py_alloc_stats*)handle.ptr;
+    stats->free_count++;
+    nk_mfree(handle, old);
+}
+
+/* Sets up `alloc` to use the standard library allocator while counting every
+ * allocation into `stats`, without calling back into Python. */
+NK_API void
+nk_py_counting_allocator(struct nk_allocator *alloc,
+    struct nk_py_alloc_stats *stats)
+{
+    NK_ASSERT(alloc);
+    NK_ASSERT(stats);
+    if (!alloc || !stats) return;
+    alloc->userdata.ptr = stats;
+    alloc->alloc = nk_py_counting_alloc;
+    alloc->free = nk_py_counting_free;
+}
+
+/* ==============================================================
+ *
+ *                          INPUT
+ *
+ * ============================================================== */
+
+enum nk_py_input_type {
+    NK_PY_INPUT_MOTION,
+    NK_PY_INPUT_KEY,
+    NK_PY_INPUT_BUTTON,
+    NK_PY_INPUT_SCROLL,
+    NK_PY_INPUT_UNICODE
+};
+
+struct nk_py_input_event {
+    int type;
+    int code;       /* key, button or unicode rune */
+    int down;
+    int x, y;       /* motion or button position */
+    float sx, sy;   /* scroll delta */
+};
+
+NK_API void
+nk_py_input_events(struct nk_context *ctx,
+    const struct nk_py_input_event *events, int count)
+{
+    int i;
+    nk_input_begin(ctx);
+    for (i = 0; i < count; ++i) {
+        const struct nk_py_input_event *e = &events[i];
+        switch (e->type) {
+        case NK_PY_INPUT_MOTION:
+            nk_input_motion(ctx, e->x, e->y);
+            break;
+        case NK_PY_INPUT_KEY:
+            nk_input_key(ctx, (enum nk_keys)e->code, e->down);
+            break;
+        case NK_PY_INPUT_BUTTON:
+            nk_input_button(ctx, (enum nk_buttons)e->code, e->x, e->y, e->down);
+            break;
+        case NK_PY_INPUT_SCROLL:
+            nk_input_scroll(ctx, nk_vec2(e->sx, e->sy));
+            break;
+        case NK_PY_INPUT_UNICODE:
+            nk_input_unicode(ctx, (nk_rune)e->code);
+            break;
+        default: break;
+        }
+    }
+    nk_input_end(ctx);
+}
+
+/* ==============================================================
+ *
+ *                          DRAWING
+ *
+ * ============================================================== */
+
+/* Returns the start of the command buffer memory of `ctx` and stores the
+ * number of bytes in use in `allocated`, so the commands can be walked
+ * without one call into the library per command. Only valid until the next
+ * call that changes the command buffer. */
+NK_API const void*
+nk_py_command_memory(const struct nk_context *ctx, nk_size *allocated)
+{
+    NK_ASSERT(ctx);
+    NK_ASSERT(allocated);
+    if (!ctx || !allocated) return 0;
+    *allocated = ctx->memory.allocated;
+    return ctx->memory.memory.ptr;
+}
+
+/* 64-bit FNV-1a hash of `size` bytes, continuing from `hash`. */
+NK_INTERN unsigned long long
+nk_py_hash_bytes(unsigned long long hash, const void *data, nk_size size)
+{
+    const nk_byte *p = (const nk_byte*)data;
+    nk_size i;
+    for (i = 0; i < size; ++i) {
+        hash ^= p[i];
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+/* Commands are pushed without clearing their memory, so the padding between
+ * and after their fields holds leftovers from earlier frames. Only the fields
+ * themselves are hashed, one at a time. */
+#define NK_PY_HASH_SIZE(field, size) \
+    (hash = nk_py_hash_bytes(hash, &(field), (size)), total += (size))
+#define NK_PY_HASH(field) NK_PY_HASH_SIZE(field, sizeof(field))
+#define NK_PY_HASH_RECT(c) \
+    (NK_PY_HASH((c)->x), NK_PY_HASH((c)->y), NK_PY_HASH((c)->w), NK_PY_HASH((c)->h))
+
+/* 64-bit FNV-1a hash over the fields of every draw command of the current
+ * frame, in drawing order. Two frames with the same hash draw the same thing,
+ * so backends can skip converting and drawing the second one. The number of
+ * hashed bytes is stored in `size` if it is not null. */
+NK_API unsigned long long
+nk_py_command_hash(struct nk_context *ctx, nk_size *size)
+{
+    const struct nk_command *cmd;
+    unsigned long long hash = 14695981039346656037ULL;
+    nk_size total = 0;
+    NK_ASSERT(ctx);
+    if (!ctx) return 0;
+    nk_foreach(cmd, ctx) {
+        /* `next` is an offset in the command buffer, which follows from the
+         * commands before it. */
+        NK_PY_HASH(cmd->type);
+#ifdef NK_INCLUDE_COMMAND_USERDATA
+        NK_PY_HASH(cmd->userdata.ptr);
+#endif
+        switch (cmd->type) {
+        case NK_COMMAND_SCISSOR: {
+            const struct nk_command_scissor *c = (const struct nk_command_scissor*)cmd;
+            NK_PY_HASH_RECT(c);
+        } break;
+        case NK_COMMAND_LINE: {
+            const struct nk_command_line *c = (const struct nk_command_line*)cmd;
+            NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH(c->begin); NK_PY_HASH(c->end);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_CURVE: {
+            const struct nk_command_curve *c = (const struct nk_command_curve*)cmd;
+            NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH(c->begin); NK_PY_HASH(c->end); NK_PY_HASH(c->ctrl);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_RECT: {
+            const struct nk_command_rect *c = (const struct nk_command_rect*)cmd;
+            NK_PY_HASH(c->rounding); NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_RECT_FILLED: {
+            const struct nk_command_rect_filled *c =
+                (const struct nk_command_rect_filled*)cmd;
+            NK_PY_HASH(c->rounding);
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_RECT_MULTI_COLOR: {
+            const struct nk_command_rect_multi_color *c =
+                (const struct nk_command_rect_multi_color*)cmd;
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->left); NK_PY_HASH(c->top);
+            NK_PY_HASH(c->bottom); NK_PY_HASH(c->right);
+        } break;
+        case NK_COMMAND_CIRCLE: {
+            const struct nk_command_circle *c = (const struct nk_command_circle*)cmd;
+            NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_CIRCLE_FILLED: {
+            const struct nk_command_circle_filled *c =
+                (const struct nk_command_circle_filled*)cmd;
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_ARC: {
+            const struct nk_command_arc *c = (const struct nk_command_arc*)cmd;
+            NK_PY_HASH(c->cx); NK_PY_HASH(c->cy); NK_PY_HASH(c->r);
+            NK_PY_HASH(c->line_thickness); NK_PY_HASH(c->a);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_ARC_FILLED: {
+            const struct nk_command_arc_filled *c =
+                (const struct nk_command_arc_filled*)cmd;
+            NK_PY_HASH(c->cx); NK_PY_HASH(c->cy); NK_PY_HASH(c->r);
+            NK_PY_HASH(c->a);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_TRIANGLE: {
+            const struct nk_command_triangle *c =
+                (const struct nk_command_triangle*)cmd;
+            NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH(c->a); NK_PY_HASH(c->b); NK_PY_HASH(c->c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_TRIANGLE_FILLED: {
+            const struct nk_command_triangle_filled *c =
+                (const struct nk_command_triangle_filled*)cmd;
+            NK_PY_HASH(c->a); NK_PY_HASH(c->b); NK_PY_HASH(c->c);
+            NK_PY_HASH(c->color);
+        } break;
+        case NK_COMMAND_POLYGON: {
+            const struct nk_command_polygon *c = (const struct nk_command_polygon*)cmd;
+            NK_PY_HASH(c->color); NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH(c->point_count);
+            NK_PY_HASH_SIZE(c->points, c->point_count * sizeof(struct nk_vec2i));
+        } break;
+        case NK_COMMAND_POLYGON_FILLED: {
+            const struct nk_command_polygon_filled *c =
+                (const struct nk_command_polygon_filled*)cmd;
+            NK_PY_HASH(c->color);
+            NK_PY_HASH(c->point_count);
+            NK_PY_HASH_SIZE(c->points, c->point_count * sizeof(struct nk_vec2i));
+        } break;
+        case NK_COMMAND_POLYLINE: {
+            const struct nk_command_polyline *c =
+                (const struct nk_command_polyline*)cmd;
+            NK_PY_HASH(c->color); NK_PY_HASH(c->line_thickness);
+            NK_PY_HASH(c->point_count);
+            NK_PY_HASH_SIZE(c->points, c->point_count * sizeof(struct nk_vec2i));
+        } break;
+        case NK_COMMAND_TEXT: {
+            const struct nk_command_text *c = (const struct nk_command_text*)cmd;
+            NK_PY_HASH(c->font);
+            NK_PY_HASH(c->background); NK_PY_HASH(c->foreground);
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->height); NK_PY_HASH(c->length);
+            NK_PY_HASH_SIZE(c->string, (nk_size)c->length);
+        } break;
+        case NK_COMMAND_IMAGE: {
+            const struct nk_command_image *c = (const struct nk_command_image*)cmd;
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->img.handle.ptr);
+            NK_PY_HASH(c->img.w); NK_PY_HASH(c->img.h); NK_PY_HASH(c->img.region);
+            NK_PY_HASH(c->col);
+        } break;
+        case NK_COMMAND_CUSTOM: {
+            const struct nk_command_custom *c = (const struct nk_command_custom*)cmd;
+            NK_PY_HASH_RECT(c);
+            NK_PY_HASH(c->callback_data.ptr);
+            NK_PY_HASH(c->callback);
+        } break;
+        default: break;
+        }
+    }
+    if (size) *size = total;
+    return hash;
+}
+
+#undef NK_PY_HASH_RECT
+#undef NK_PY_HASH
+#undef NK_PY_HASH_SIZE
+
+/* ==============================================================
+ *
+ *                          CANVAS
+ *
+ * ============================================================== */
+
+/* The batched canvas helpers below take flat arrays, so a whole plot is
+ * pushed with one call. `colors` holds either one color for every shape
+ * (`color_count` 1) or one per shape. */
+
+#define NK_PY_COLOR(colors, color_count, i) \
+    ((colors)[(color_count) > 1 ? (i) : 0])
+
+/* Fills `count` rects given as x, y, w, h floats. */
+NK_API void
+nk_py_fill_rects(struct nk_command_buffer *b, const float *rects, int count,
+    float rounding, const struct nk_color *colors, int color_count)
+{
+    int i;
+    NK_ASSERT(b);
+    if (!b || !rects || !colors || color_count < 1) return;
+    for (i = 0; i < count; ++i) {
+        const float *r = rects + 4 * i;
+        nk_fill_rect(b, nk_rect(r[0], r[1], r[2], r[3]), rounding,
+            NK_PY_COLOR(colors, color_count, i));
+    }
+}
+
+/* Fills `count` rects given as x, y, w, h floats with four colors each, in
+ * the order left, top, right, bottom. */
+NK_API void
+nk_py_fill_rects_multi_color(struct nk_command_buffer *b, const float *rects,
+    int count, const struct nk_color *colors)
+{
+    int i;
+    NK_ASSERT(b);
+    if (!b || !rects || !colors) return;
+    for (i = 0; i < count; ++i) {
+        const float *r = rects + 4 * i;
+        const struct nk_color *c = colors + 4 * i;
+        nk_fill_rect_multi_color(b, nk_rect(r[0], r[1], r[2], r[3]),
+            c[0], c[1], c[2], c[3]);
+    }
+}
+
+/* Strokes `count` polylines, or closed polygons if `closed` is set, whose
+ * x, y float points follow each other in `points`; polyline i has
+ * `point_counts[i]` points. */
+NK_API void
+nk_py_stroke_polylines(struct nk_command_buffer *b, const float *points,
+    const int *point_counts, int count, int closed, float line_thickness,
+    const struct nk_color *colors, int color_count)
+{
+    int i;
+    NK_ASSERT(b);
+    if (!b || !points || !point_counts || !colors || color_count < 1) return;
+    for (i = 0; i < count; ++i) {
+        float *p = (float*)points;
+        if (closed)
+            nk_stroke_polygon(b, p, point_counts[i], line_thickness,
+                NK_PY_COLOR(colors, color_count, i));
+        else
+            nk_stroke_polyline(b, p, point_counts[i], line_thickness,
+                NK_PY_COLOR(colors, color_count, i));
+        points += 2 * point_counts[i];
+    }
+}
+
+/* Fills `count` polygons laid out like the polylines of
+ * `nk_py_stroke_polylines`. */
+NK_API void
+nk_py_fill_polygons(struct nk_command_buffer *b, const float *points,
+    const int *point_counts, int count, const struct nk_color *colors,
+    int color_count)
+{
+    int i;
+    NK_ASSERT(b);
+    if (!b || !points || !point_counts || !colors || color_count < 1) return;
+    for (i = 0; i < count; ++i) {
+        nk_fill_polygon(b, (float*)points, point_counts[i],
+            NK_PY_COLOR(colors, color_count, i));
+        points += 2 * point_counts[i];
+    }
+}
+
+/* ==============================================================
+ *
+ *                          FONT
+ *
+ * ============================================================== */
+
+/* Places the cursors in the custom rect of `atlas`, as `nk_font_atlas_bake`
+ * does at the end. */
+NK_INTERN void
+nk_py_font_atlas_init_cursors(struct nk_font_atlas *atlas, int width, int height)
+{
+    NK_STORAGE const struct nk_vec2 cursor_data[NK_CURSOR_COUNT][3] = {
+        /* Pos      Size        Offset, as in nk_font_atlas_bake */
+        {{ 0, 3},   {12,19},    { 0, 0}},
+        {{13, 0},   { 7,16},    { 4, 8}},
+        {{31, 0},   {23,23},    {11,11}},
+        {{21, 0},   { 9, 23},   { 5,11}},
+        {{55,18},   {23, 9},    {11, 5}},
+        {{73, 0},   {17,17},    { 9, 9}},
+        {{55, 0},   {17,17},    { 9, 9}}
+    };
+    int i;
+    for (i = 0; i < NK_CURSOR_COUNT; ++i) {
+        struct nk_cursor *cursor = &atlas->cursors[i];
+        cursor->img.w = (unsigned short)width;
+        cursor->img.h = (unsigned short)height;
+        cursor->img.region[0] = (unsigned short)(atlas->custom.x + cursor_data[i][0].x);
+        cursor->img.region[1] = (unsigned short)(atlas->custom.y + cursor_data[i][0].y);
+        cursor->img.region[2] = (unsigned short)cursor_data[i][1].x;
+        cursor->img.region[3] = (unsigned short)cursor_data[i][1].y;
+        cursor->size = cursor_data[i][1];
+        cursor->offset = cursor_data[i][2];
+    }
+}
+
+/* Restores what `nk_font_atlas_bake` leaves in `atlas` from the results of an
+ * earlier bake of the same fonts, without rasterizing anything: the glyph
+ * table is copied into the atlas, every font is initialized from its baked
+ * info and the cursors are placed in the custom rect. The atlas image itself
+ * stays with the caller, so `atlas->pixel` is left empty. Returns 0 if the
+ * glyph or font counts do not match the fonts added to `atlas`. */
+NK_API int
+nk_py_font_atlas_load(struct nk_font_atlas *atlas, int width, int height,
+    const struct nk_recti *custom, const struct nk_font_glyph *glyphs,
+    int glyph_count, const struct nk_baked_font *fonts, int font_count)
+{
+    struct nk_font *font;
+    nk_size tmp_size;
+    int expected = 0;
+    int i;
+
+    NK_ASSERT(atlas);
+    if (!atlas || !custom || !glyphs || !fonts || !atlas->permanent.alloc ||
+        atlas->glyphs || atlas->font_num != font_count)
+        return 0;
+    nk_font_baker_memory(&tmp_size, &expected, atlas->config, atlas->font_num);
+    if (expected != glyph_count) return 0;
+
+    atlas->glyphs = (struct nk_font_glyph*)atlas->permanent.alloc(
+        atlas->permanent.userdata, 0,
+        sizeof(struct nk_font_glyph) * (nk_size)glyph_count);
+    if (!atlas->glyphs) return 0;
+    NK_MEMCPY(atlas->glyphs, glyphs,
+        sizeof(struct nk_font_glyph) * (nk_size)glyph_count);
+    atlas->glyph_count = glyph_count;
+    atlas->custom = *custom;
+    atlas->tex_width = width;
+    atlas->tex_height = height;
+    atlas->pixel = 0;
+
+    for (font = atlas->fonts, i = 0; font; font = font->next, ++i) {
+        struct nk_font_config *config = font->config;
+        struct nk_baked_font baked = fonts[i];
+        baked.ranges = config->range;
+        nk_font_init(font, config->size, config->fallback_glyph, atlas->glyphs,
+            &baked, nk_handle_ptr(0));
+    }
+    nk_py_font_atlas_init_cursors(atlas, width, height);
+    return 1;
+}
+
+/* Splitting `nk_font_atlas_bake` so the glyphs can be rasterized in several
+ * processes: every process packs the same fonts into the same layout, which is
+ * deterministic, and rasterizes a slice of the glyphs into a shared image. The
+ * glyph rects are disjoint, so the slices never overlap, and
+ * `nk_py_font_atlas_bake_finish` completes the bake from the shared image and
+ * the packed glyph data exactly as `nk_font_atlas_bake` would have. Glyphs are
+ * numbered in baking order: by font config, merged configs included, then by
+ * glyph range. */
+
+/* Packs the fonts of `atlas` like `nk_font_atlas_bake`. The returned baker
+ * lives in `*tmp` and must be released with `nk_py_font_atlas_unpack`. */
+NK_INTERN struct nk_font_baker*
+nk_py_font_atlas_pack(struct nk_font_atlas *atlas, void **tmp,
+    int *width, int *height, int *glyph_count)
+{
+    struct nk_font_baker *baker;
+    nk_size tmp_size, img_size;
+
+    *tmp = 0;
+    if (!atlas || !atlas->font_num || !atlas->temporary.alloc ||
+        !atlas->temporary.free)
+        return 0;
+    nk_font_baker_memory(&tmp_size, glyph_count, atlas->config, atlas->font_num);
+    *tmp = atlas->temporary.alloc(atlas->temporary.userdata, 0, tmp_size);
+    if (!*tmp) return 0;
+    baker = nk_font_baker(*tmp, *glyph_count, atlas->font_num, &atlas->temporary);
+
+    atlas->custom.w = (NK_CURSOR_DATA_W*2)+1;
+    atlas->custom.h = NK_CURSOR_DATA_H + 1;
+    if (!nk_font_bake_pack(baker, &img_size, width, height, &atlas->custom,
+        atlas->config, atlas->font_num, &atlas->temporary)) {
+        atlas->temporary.free(atlas->temporary.userdata, *tmp);
+        *tmp = 0;
+        return 0;
+    }
+    return baker;
+}
+
+NK_INTERN void
+nk_py_font_atlas_unpack(struct nk_font_atlas *atlas, struct nk_font_baker *baker,
+    void *tmp)
+{
+    nk_tt_PackEnd(&baker->spc, &baker->alloc);
+    atlas->temporary.free(atlas->temporary.userdata, tmp);
+}
+
+/* Returns the size of the alpha8 image and the number of glyphs of baking the
+ * fonts of `atlas`, and the size of the packed glyph data the other functions
+ * exchange. */
+NK_API int
+nk_py_font_atlas_measure(struct nk_font_atlas *atlas, int *width, int *height,
+    int *glyph_count, nk_size *packed_size)
+{
+    struct nk_font_baker *baker;
+    void *tmp;
+
+    NK_ASSERT(atlas);
+    if (!width || !height || !glyph_count || !packed_size) return 0;
+    baker = nk_py_font_atlas_pack(atlas, &tmp, width, height, glyph_count);
+    if (!baker) return 0;
+    nk_py_font_atlas_unpack(atlas, baker, tmp);
+    *packed_size = (nk_size)*glyph_count * sizeof(struct nk_tt_packedchar);
+    return 1;
+}
+
+/* Rasterizes the glyphs `first` to `first + count - 1` into `image`, which
+ * must be zeroed by the caller, and stores their packed data in `packed`.
+ * Nothing outside of the rects of these glyphs is written. */
+NK_API int
+nk_py_font_atlas_render(struct nk_font_atlas *atlas, int first, int count,
+    void *image, int width, int height, void *packed)
+{
+    struct nk_font_baker *baker;
+    const struct nk_font_config *config_iter, *it;
+    void *tmp;
+    int packed_width, packed_height, glyph_count;
+    int input_i = 0;
+    int char_n = 0;
+    int last = first + count;
+
+    NK_ASSERT(atlas);
+    if (!image || !packed || first < 0 || count < 0) return 0;
+    baker = nk_py_font_atlas_pack(atlas, &tmp, &packed_width, &packed_height,
+        &glyph_count);
+    if (!baker) return 0;
+    if (packed_width != width || packed_height != height || last > glyph_count) {
+        nk_py_font_atlas_unpack(atlas, baker, tmp);
+        return 0;
+    }
+
+    baker->spc.pixels = (unsigned char*)image;
+    baker->spc.height = height;
+    for (config_iter = atlas->config; config_iter; config_iter = config_iter->next) {
+        it = config_iter;
+        do {struct nk_font_bake_data *data = &baker->build[input_i++];
+            int rect_n = 0;
+            nk_rune i;
+            for (i = 0; i < data->range_count; ++i) {
+                struct nk_tt_pack_range range = data->ranges[i];
+                int begin = NK_MAX(first, char_n);
+                int end = NK_MIN(last, char_n + range.num_chars);
+                if (begin < end) {
+                    int skip = begin - char_n;
+                    range.first_unicode_codepoint_in_range += skip;
+                    range.num_chars = end - begin;
+                    range.chardata_for_range = (struct nk_tt_packedchar*)packed + begin;
+                    nk_tt_PackFontRangesRenderIntoRects(&baker->spc, &data->info,
+                        &range, 1, data->rects + rect_n + skip, &baker->alloc);
+                }
+                rect_n += data->ranges[i].num_chars;
+                char_n += data->ranges[i].num_chars;
+            }
+        } while ((it = it->n) != config_iter);
+    }
+    nk_py_font_atlas_unpack(atlas, baker, tmp);
+    return 1;
+}
+
+/* The third pass of `nk_font_bake`: fills the baked fonts and the glyph table
+ * from the packed glyph data. */
+NK_INTERN void
+nk_py_font_bake_glyphs(struct nk_font_baker *baker, int width, int height,
+    struct nk_font_glyph *glyphs, const struct nk_font_config *config_list)
+{
+    int input_i = 0;
+    nk_rune glyph_n = 0;
+    const struct nk_font_config *config_iter;
+    const struct nk_font_config *it;
+
+    for (config_iter = config_list; config_iter; config_iter = config_iter->next) {
+        it = config_iter;
+        do {nk_size i = 0;
+            int char_idx = 0;
+            nk_rune glyph_count = 0;
+            const struct nk_font_config *cfg = it;
+            struct nk_font_bake_data *tmp = &baker->build[input_i++];
+            struct nk_baked_font *dst_font = cfg->font;
+
+            float font_scale = nk_tt_ScaleForPixelHeight(&tmp->info, cfg->size);
+            int unscaled_ascent, unscaled_descent, unscaled_line_gap;
+            nk_tt_GetFontVMetrics(&tmp->info, &unscaled_ascent, &unscaled_descent,
+                                    &unscaled_line_gap);
+
+            if (!cfg->merge_mode) {
+                dst_font->ranges = cfg->range;
+                dst_font->height = cfg->size;
+                dst_font->ascent = ((float)unscaled_ascent * font_scale);
+                dst_font->descent = ((float)unscaled_descent * font_scale);
+                dst_font->glyph_offset = glyph_n;
+            }
+
+            for (i = 0; i < tmp->range_count; ++i) {
+                struct nk_tt_pack_range *range = &tmp->ranges[i];
+                for (char_idx = 0; char_idx < range->num_chars; char_idx++) {
+                    nk_rune codepoint = 0;
+                    float dummy_x = 0, dummy_y = 0;
+                    struct nk_tt_aligned_quad q;
+                    struct nk_font_glyph *glyph;
+
+                    const struct nk_tt_packedchar *pc = &range->chardata_for_range[char_idx];
+                    if (!pc->x0 && !pc->x1 && !pc->y0 && !pc->y1) continue;
+                    codepoint = (nk_rune)(range->first_unicode_codepoint_in_range + char_idx);
+                    nk_tt_GetPackedQuad(range->chardata_for_range, (int)width,
+                        (int)height, char_idx, &dummy_x, &dummy_y, &q, 0);
+
+                    glyph = &glyphs[dst_font->glyph_offset + dst_font->glyph_count + (unsigned int)glyph_count];
+                    glyph->codepoint = codepoint;
+                    glyph->x0 = q.x0; glyph->y0 = q.y0;
+                    glyph->x1 = q.x1; glyph->y1 = q.y1;
+                    glyph->y0 += (dst_font->ascent + 0.5f);
+                    glyph->y1 += (dst_font->ascent + 0.5f);
+                    glyph->w = glyph->x1 - glyph->x0 + 0.5f;
+                    glyph->h = glyph->y1 - glyph->y0;
+
+                    if (cfg->coord_type == NK_COORD_PIXEL) {
+                        glyph->u0 = q.s0 * (float)width;
+                        glyph->v0 = q.t0 * (float)height;
+                        glyph->u1 = q.s1 * (float)width;
+                        glyph->v1 = q.t1 * (float)height;
+                    } else {
+                        glyph->u0 = q.s0;
+                        glyph->v0 = q.t0;
+                        glyph->u1 = q.s1;
+                        glyph->v1 = q.t1;
+                    }
+                    glyph->xadvance = (pc->xadvance + cfg->spacing.x);
+                    if (cfg->pixel_snap)
+                        glyph->xadvance = (float)(int)(glyph->xadvance + 0.5f);
+                    glyph_count++;
+                }
+            }
+            dst_font->glyph_count += glyph_count;
+            glyph_n += glyph_count;
+        } while ((it = it->n) != config_iter);
+    }
+}
+
+/* Completes `nk_font_atlas_bake` from an alpha8 `image` and the `packed` glyph
+ * data of all glyphs, as written by `nk_py_font_atlas_render`, and returns the
+ * atlas image in `fmt` like `nk_font_atlas_bake`. */
+NK_API const void*
+nk_py_font_atlas_bake_finish(struct nk_font_atlas *atlas, int *width,
+    int *height, enum nk_font_atlas_format fmt, const void *image,
+    const void *packed)
+{
+    struct nk_font_baker *baker;
+    struct nk_font *font_iter;
+    void *tmp;
+    nk_size img_size;
+
+    NK_ASSERT(atlas);
+    if (!atlas || !width || !height || !image || !packed ||
+        !atlas->permanent.alloc || !atlas->permanent.free || atlas->glyphs)
+        return 0;
+    baker = nk_py_font_atlas_pack(atlas, &tmp, width, height, &atlas->glyph_count);
+    if (!baker) return 0;
+    img_size = (nk_size)*width * (nk_size)*height;
+
+    atlas->glyphs = (struct nk_font_glyph*)atlas->permanent.alloc(
+        atlas->permanent.userdata, 0,
+        sizeof(struct nk_font_glyph) * (nk_size)atlas->glyph_count);
+    atlas->pixel = atlas->temporary.alloc(atlas->temporary.userdata, 0, img_size);
+    if (!atlas->glyphs || !atlas->pixel) goto failed;
+    NK_MEMCPY(atlas->pixel, image, img_size);
+    NK_MEMCPY(baker->packed_chars, packed,
+        (nk_size)atlas->glyph_count * sizeof(struct nk_tt_packedchar));
+
+    nk_py_font_bake_glyphs(baker, *width, *height, atlas->glyphs, atlas->config);
+    nk_font_bake_custom_data(atlas->pixel, *width, *height, atlas->custom,
+            nk_custom_cursor_data, NK_CURSOR_DATA_W, NK_CURSOR_DATA_H, '.', 'X');
+
+    if (fmt == NK_FONT_ATLAS_RGBA32) {
+        void *img_rgba = atlas->temporary.alloc(atlas->temporary.userdata, 0,
+                            (nk_size)(*width * *height * 4));
+        if (!img_rgba) goto failed;
+        nk_font_bake_convert(img_rgba, *width, *height, atlas->pixel);
+        atlas->temporary.free(atlas->temporary.userdata, atlas->pixel);
+        atlas->pixel = img_rgba;
+    }
+    atlas->tex_width = *width;
+    atlas->tex_height = *height;
+
+    for (font_iter = atlas->fonts; font_iter; font_iter = font_iter->next) {
+        struct nk_font *font = font_iter;
+        struct nk_font_config *config = font->config;
+        nk_font_init(font, config->size, config->fallback_glyph, atlas->glyphs,
+            config->font, nk_handle_ptr(0));
+    }
+    nk_py_font_atlas_init_cursors(atlas, *width, *height);
+    nk_py_font_atlas_unpack(atlas, baker, tmp);
+    return atlas->pixel;
+
+failed:
+    nk_py_font_atlas_unpack(atlas, baker, tmp);
+    if (atlas->glyphs) {
+        atlas->permanent.free(atlas->permanent.userdata, atlas->glyphs);
+        atlas->glyphs = 0;
+    }
+    if (atlas->pixel) {
+        atlas->temporary.free(atlas->temporary.userdata, atlas->pixel);
+        atlas->pixel = 0;
+    }
+    return 0;
+}
+
+/* Ordered loads and stores for the caches below, which the fonts fill while
+ * several threads may be building frames with them. A value stored before
+ * `nk_py_store_release` is visible to a thread that sees the stored word
+ * through `nk_py_load_acquire`. */
+#if defined(_MSC_VER) && !defined(__clang__)
+#include <intrin.h>
+
+NK_INTERN nk_uint
+nk_py_load_acquire(nk_uint *word)
+{
+    return (nk_uint)_InterlockedOr((volatile long*)word, 0);
+}
+
+NK_INTERN void
+nk_py_store_release(nk_uint *word, nk_uint value)
+{
+    _InterlockedExchange((volatile long*)word, (long)value);
+}
+
+/* Replaces `*word` with `desired` if it is `expected`, returns whether it did. */
+NK_INTERN int
+nk_py_compare_exchange(nk_uint *word, nk_uint expected, nk_uint desired)
+{
+    return (nk_uint)_InterlockedCompareExchange((volatile long*)word,
+        (long)desired, (long)expected) == expected;
+}
+#else
+NK_INTERN nk_uint
+nk_py_load_acquire(nk_uint *word)
+{
+    return __atomic_load_n(word, __ATOMIC_ACQUIRE);
+}
+
+NK_INTERN void
+nk_py_store_release(nk_uint *word, nk_uint value)
+{
+    __atomic_store_n(word, value, __ATOMIC_RELEASE);
+}
+
+/* Replaces `*word` with `desired` if it is `expected`, returns whether it did. */
+NK_INTERN int
+nk_py_compare_exchange(nk_uint *word, nk_uint expected, nk_uint desired)
+{
+    return __atomic_compare_exchange_n(word, &expected, desired, 0,
+        __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE);
+}
+#endif
+
+/* Generations of the fonts below, unique in the process, so a layout measured
+ * with a font is never taken for one of a later font at the same address. */
+static nk_uint nk_py_font_generations;
+
+NK_INTERN nk_uint
+nk_py_next_font_generation(void)
+{
+    nk_uint generation;
+    do generation = nk_py_load_acquire(&nk_py_font_generations);
+    while (!nk_py_compare_exchange(&nk_py_font_generations, generation,
+        generation + 1));
+    return generation + 1;
+}
+
+/* A user font over an `nk_font` that records the runes the font has no glyph
+ * for while Nuklear measures and draws text, so the atlas can be rebaked with
+ * them. `handle` comes first, so the struct can be passed to Nuklear as the
+ * font itself, and `nk_py_lazy_font_set` swaps the font in between frames
+ * without Nuklear noticing. */
+#define NK_PY_LAZY_FONT_MISSING 256
+
+struct nk_py_lazy_font {
+    struct nk_user_font handle;
+    struct nk_font *font;
+    nk_uint generation;
+    nk_uint missing_count;
+    int overflow;
+    nk_rune missing[NK_PY_LAZY_FONT_MISSING];
+};
+
+/* Threads measuring text at the same time may lose a record to each other,
+ * which only delays the rune to a later frame, but never write past the end
+ * of `missing`. */
+NK_INTERN void
+nk_py_lazy_font_record(struct nk_py_lazy_font *lazy, nk_rune unicode)
+{
+    nk_uint count = nk_py_load_acquire(&lazy->missing_count);
+    nk_uint i;
+    for (i = 0; i < count; ++i)
+        if (lazy->missing[i] == unicode) return;
+    if (count < NK_PY_LAZY_FONT_MISSING) {
+        lazy->missing[count] = unicode;
+        nk_py_compare_exchange(&lazy->missing_count, count, count + 1);
+    } else lazy->overflow = 1;
+}
+
+NK_INTERN const struct nk_font_glyph*
+nk_py_lazy_font_glyph(struct nk_py_lazy_font *lazy, nk_rune unicode)
+{
+    struct nk_font *font = lazy->font;
+    const struct nk_font_glyph *g = nk_font_find_glyph(font, unicode);
+    if (g == font->fallback && unicode != font->fallback_codepoint)
+        nk_py_lazy_font_record(lazy, unicode);
+    return g;
+}
+
+/* `nk_font_text_width` with recording. */
+NK_INTERN float
+nk_py_lazy_font_width(nk_handle handle, float height, const char *text, int len)
+{
+    struct nk_py_lazy_font *lazy = (struct nk_py_lazy_font*)handle.ptr;
+    nk_rune unicode;
+    int text_len = 0;
+    float text_width = 0;
+    int glyph_len = 0;
+    float scale = 0;
+
+    NK_ASSERT(lazy);
+    if (!lazy || !lazy->font || !text || !len) return 0;
+
+    scale = height/lazy->font->info.height;
+    glyph_len = text_len = nk_utf_decode(text, &unicode, (int)len);
+    if (!glyph_len) return 0;
+    while (text_len <= (int)len && glyph_len) {
+        if (unicode == NK_UTF_INVALID) break;
+        text_width += nk_py_lazy_font_glyph(lazy, unicode)->xadvance * scale;
+        glyph_len = nk_utf_decode(text + text_len, &unicode, (int)len - text_len);
+        text_len += glyph_len;
+    }
+    return text_width;
+}
+
+/* `nk_font_query_font_glyph` with recording. */
+NK_INTERN void
+nk_py_lazy_font_query(nk_handle handle, float height,
+    struct nk_user_font_glyph *glyph, nk_rune codepoint, nk_rune next_codepoint)
+{
+    struct nk_py_lazy_font *lazy = (struct nk_py_lazy_font*)handle.ptr;
+    const struct nk_font_glyph *g;
+    float scale;
+
+    NK_ASSERT(lazy);
+    NK_ASSERT(glyph);
+    NK_UNUSED(next_codepoint);
+    if (!lazy || !lazy->font || !glyph) return;
+
+    scale = height/lazy->font->info.height;
+    g = nk_py_lazy_font_glyph(lazy, codepoint);
+    glyph->width = (g->x1 - g->x0) * scale;
+    glyph->height = (g->y1 - g->y0) * scale;
+    glyph->offset = nk_vec2(g->x0 * scale, g->y0 * scale);
+    glyph->xadvance = (g->xadvance * scale);
+    glyph->uv[0] = nk_vec2(g->u0, g->v0);
+    glyph->uv[1] = nk_vec2(g->u1, g->v1);
+}
+
+NK_API nk_size
+nk_py_sizeof_lazy_font(void)
+{
+    return sizeof(struct nk_py_lazy_font);
+}
+
+/* Makes `lazy` measure and draw with the baked `font` from the atlas image in
+ * `texture`. */
+NK_API void
+nk_py_lazy_font_set(struct nk_py_lazy_font *lazy, struct nk_font *font,
+    nk_handle texture)
+{
+    NK_ASSERT(lazy);
+    NK_ASSERT(font);
+    if (!lazy || !font) return;
+    lazy->font = font;
+    lazy->generation = nk_py_next_font_generation();
+    lazy->handle.userdata = nk_handle_ptr(lazy);
+    lazy->handle.height = font->handle.height;
+    lazy->handle.width = nk_py_lazy_font_width;
+    lazy->handle.query = nk_py_lazy_font_query;
+    lazy->handle.texture = texture;
+}
+
+/* Moves up to `capacity` recorded runes into `runes` and returns how many. */
+NK_API int
+nk_py_lazy_font_drain(struct nk_py_lazy_font *lazy, nk_rune *runes, int capacity,
+    int *overflow)
+{
+    int count, left, i;
+    NK_ASSERT(lazy);
+    if (!lazy || !runes) return 0;
+    left = (int)lazy->missing_count;
+    count = NK_MAX(0, NK_MIN(capacity, left));
+    NK_MEMCPY(runes, lazy->missing, (nk_size)count * sizeof(nk_rune));
+    left -= count;
+    for (i = 0; i < left; ++i)
+        lazy->missing[i] = lazy->missing[i + count];
+    lazy->missing_count = (nk_uint)left;
+    if (overflow) *overflow = lazy->overflow;
+    lazy->overflow = 0;
+    return count;
+}
+
+/* A user font whose text widths are sums of glyph advances, scaled to the
+ * requested height. Advances of the runes below `count` come from a dense
+ * table, any other rune is measured once through `advance` and kept in a small
+ * open addressing cache, so measuring text normally never leaves C. `handle`
+ * comes first, so the struct can be passed to Nuklear as the font itself. */
+#define NK_PY_GLYPH_TABLE_SLOTS 1024
+/* Key of a slot whose advance is being stored, never a rune + 1. */
+#define NK_PY_GLYPH_TABLE_BUSY 0xFFFFFFFFu
+
+typedef float(*nk_py_advance_f)(nk_handle, nk_rune);
+
+struct nk_py_glyph_table {
+    struct nk_user_font handle;
+    nk_handle userdata;
+    nk_py_advance_f advance;
+    nk_query_font_glyph_f query;
+    float height;
+    const float *advances;
+    int count;
+    nk_uint generation;
+    nk_rune keys[NK_PY_GLYPH_TABLE_SLOTS];
+    float values[NK_PY_GLYPH_TABLE_SLOTS];
+};
+
+NK_INTERN float
+nk_py_glyph_table_advance(struct nk_py_glyph_table *table, nk_rune unicode)
+{
+    nk_rune key = unicode + 1;
+    nk_rune slot = (unicode * 2654435761u) & (NK_PY_GLYPH_TABLE_SLOTS - 1);
+    int i;
+    float advance;
+
+    if (unicode < (nk_rune)table->count) return table->advances[unicode];
+    for (i = 0; i < NK_PY_GLYPH_TABLE_SLOTS; ++i) {
+        nk_rune index = (slot + (nk_rune)i) & (NK_PY_GLYPH_TABLE_SLOTS - 1);
+        nk_rune found = nk_py_load_acquire(&table->keys[index]);
+        if (found == key) return table->values[index];
+        if (!found || found == NK_PY_GLYPH_TABLE_BUSY) {
+            if (!table->advance) return 0;
+            advance = table->advance(table->userdata, unicode);
+            /* Another thread may be building with this font as well: claim
+             * the slot, store the advance and only then publish the key. If
+             * the slot is taken meanwhile, the advance is just not cached. */
+            if (!found && nk_py_compare_exchange(&table->keys[index], 0,
+                    NK_PY_GLYPH_TABLE_BUSY)) {
+                table->values[index] = advance;
+                nk_py_store_release(&table->keys[index], key);
+            }
+            return advance;
+        }
+    }
+    /* the cache is full */
+    return table->advance ? table->advance(table->userdata, unicode) : 0;
+}
+
+NK_INTERN float
+nk_py_glyph_table_width(nk_handle handle, float height, const char *text, int len)
+{
+    struct nk_py_glyph_table *table = (struct nk_py_glyph_table*)handle.ptr;
+    nk_rune unicode;
+    int text_len = 0;
+    int glyph_len = 0;
+    float text_width = 0;
+
+    NK_ASSERT(table);
+    if (!table || !text || !len) return 0;
+    glyph_len = text_len = nk_utf_decode(text, &unicode, len);
+    while (text_len <= len && glyph_len) {
+        if (unicode == NK_UTF_INVALID) break;
+        text_width += nk_py_glyph_table_advance(table, unicode);
+        glyph_len = nk_utf_decode(text + text_len, &unicode, len - text_len);
+        text_len += glyph_len;
+    }
+    return text_width * (height / table->height);
+}
+
+NK_INTERN void
+nk_py_glyph_table_query(nk_handle handle, float height,
+    struct nk_user_font_glyph *glyph, nk_rune codepoint, nk_rune next_codepoint)
+{
+    struct nk_py_glyph_table *table = (struct nk_py_glyph_table*)handle.ptr;
+    NK_ASSERT(table);
+    if (!table || !table->query) return;
+    table->query(table->userdata, height, glyph, codepoint, next_codepoint);
+}
+
+NK_API nk_size
+nk_py_sizeof_glyph_table(void)
+{
+    return sizeof(struct nk_py_glyph_table);
+}
+
+/* Sets up `table` for a font of `height` with the given advances, which must
+ * outlive it. `advance`, `query` and `texture` may be empty, `advance` and
+ * `query` are called with `userdata`. */
+NK_API void
+nk_py_glyph_table_init(struct nk_py_glyph_table *table, float height,
+    const float *advances, int count, nk_py_advance_f advance,
+    nk_query_font_glyph_f query, nk_handle userdata, nk_handle texture)
+{
+    NK_ASSERT(table);
+    NK_ASSERT(height > 0);
+    if (!table || height <= 0) return;
+    nk_zero(table, sizeof(*table));
+    table->userdata = userdata;
+    table->advance = advance;
+    table->query = query;
+    table->height = height;
+    table->advances = advances;
+    table->count = advances ? NK_MAX(count, 0) : 0;
+    table->generation = nk_py_next_font_generation();
+
+    table->handle.userdata = nk_handle_ptr(table);
+    table->handle.height = height;
+    table->handle.width = nk_py_glyph_table_width;
+    table->handle.query = query ? nk_py_glyph_table_query : 0;
+    table->handle.texture = texture;
+}
+
+/* Returns the generation of a lazy font or glyph table, which changes whenever
+ * a lazy font swaps in a new atlas, or 0 for any other font. */
+NK_API nk_uint
+nk_py_font_generation(const struct nk_user_font *font)
+{
+    NK_ASSERT(font);
+    if (!font) return 0;
+    if (font->width == nk_py_lazy_font_width)
+        return ((const struct nk_py_lazy_font*)font->userdata.ptr)->generation;
+    if (font->width == nk_py_glyph_table_width)
+        return ((const struct nk_py_glyph_table*)font->userdata.ptr)->generation;
+    return 0;
+}
+
+/* ==============================================================
+ *
+ *                          TEXT
+ *
+ * ============================================================== */
+
+/* Measures `count` texts stored back to back in `text`, the i-th one of
+ * `lengths[i]` bytes, at `height` with the font `f`, into `widths`. */
+NK_API void
+nk_py_text_widths(const struct nk_user_font *f, float height, const char *text,
+    const int *lengths, int count, float *widths)
+{
+    int i;
+
+    NK_ASSERT(f);
+    NK_ASSERT(f->width);
+    if (!f || !f->width || !widths) return;
+    for (i = 0; i < count; ++i) {
+        widths[i] = lengths[i] > 0 ? f->width(f->userdata, height, text, lengths[i]) : 0;
+        text += NK_MAX(lengths[i], 0);
+    }
+}
+
+/* Returns the width `nk_text_wrap` would break the next text in the current
+ * window at, and the font it would measure with. */
+NK_API float
+nk_py_text_wrap_width(struct nk_context *ctx, const struct nk_user_font **font)
+{
+    struct nk_rect bounds;
+    struct nk_vec2 padding;
+
+    NK_ASSERT(ctx);
+    NK_ASSERT(font);
+    if (!ctx || !font || !ctx->current || !ctx->current->layout) return 0;
+    nk_layout_peek(&bounds, ctx);
+    padding = ctx->style.text.padding;
+    *font = ctx->style.font;
+    return NK_MAX(bounds.w, 2 * padding.x) - 2 * padding.x;
+}
+
+/* Breaks `text` into the lines `nk_text_wrap` draws for the line width
+ * `width`, without the limit of the widget height, and stores the length and
+ * width of up to `capacity` lines. Returns the number of lines. */
+NK_API int
+nk_py_text_wrap_layout(const struct nk_user_font *f, const char *text, int len,
+    float width, int *lengths, float *widths, int capacity)
+{
+    NK_INTERN nk_rune seperator[] = {' '};
+    float fitting_width;
+    int glyphs = 0;
+    int fitting = 0;
+    int done = 0;
+    int count = 0;
+
+    NK_ASSERT(f);
+    if (!f || !text || len <= 0) return 0;
+    fitting = nk_text_clamp(f, text, len, width, &glyphs, &fitting_width,
+        seperator, NK_LEN(seperator));
+    while (done < len && fitting) {
+        if (count < capacity) {
+            lengths[count] = fitting;
+            widths[count] = f->width(f->userdata, f->height, &text[done], fitting);
+        }
+        count++;
+        done += fitting;
+        fitting = nk_text_clamp(f, &text[done], len - done, width, &glyphs,
+            &fitting_width, seperator, NK_LEN(seperator));
+    }
+    return count;
+}
+
+/* `nk_widget_text` of one left aligned line of known width, followed by
+ * `nk_draw_text`, without measuring the text again. */
+NK_INTERN void
+nk_py_text_line(struct nk_command_buffer *o, struct nk_rect b,
+    const char *string, int len, float width, const struct nk_text *t,
+    const struct nk_user_font *f)
+{
+    struct nk_command_text *cmd;
+    struct nk_rect label;
+
+    b.h = NK_MAX(b.h, 0);
+    label.x = b.x;
+    label.w = NK_MAX(0, b.w);
+    /* NK_TEXT_LEFT is middle aligned */
+    label.y = b.y + b.h/2.0f - (float)f->height/2.0f;
+    label.h = NK_MAX(b.h/2.0f, b.h - (b.h/2.0f + f->height/2.0f));
+    if (width > label.w) {
+        nk_draw_text(o, label, string, len, f, t->background, t->text);
+        return;
+    }
+
+    if (!string || !len || (t->background.a == 0 && t->text.a == 0)) return;
+    if (o->use_clipping) {
+        const struct nk_rect *c = &o->clip;
+        if (c->w == 0 || c->h == 0 ||
+            !NK_INTERSECT(label.x, label.y, label.w, label.h, c->x, c->y, c->w, c->h))
+            return;
+    }
+    cmd = (struct nk_command_text*)
+        nk_command_buffer_push(o, NK_COMMAND_TEXT, sizeof(*cmd) + (nk_size)(len + 1));
+    if (!cmd) return;
+    cmd->x = (short)label.x;
+    cmd->y = (short)label.y;
+    cmd->w = (unsigned short)label.w;
+    cmd->h = (unsigned short)label.h;
+    cmd->background = t->background;
+    cmd->foreground = t->text;
+    cmd->font = f;
+    cmd->length = len;
+    cmd->height = f->height;
+    NK_MEMCPY(cmd->string, string, (nk_size)len);
+    cmd->string[len] = '\0';
+}
+
+/* `nk_text_wrap_colored` with the lines from `nk_py_text_wrap_layout` for the
+ * line width `width`. Falls back to `nk_text_wrap_colored` if the widget turns
+ * out to be of another width. `color` may be null for the style's text color. */
+NK_API void
+nk_py_text_wrap_lines(struct nk_context *ctx, const char *text, int len,
+    float width, const int *lengths, const float *widths, int count,
+    const struct nk_color *color)
+{
+    struct nk_window *win;
+    const struct nk_style *style;
+    const struct nk_user_font *f;
+    struct nk_rect bounds, b, line;
+    struct nk_text t;
+    int done = 0;
+    int i;
+
+    NK_ASSERT(ctx);
+    NK_ASSERT(ctx->current);
+    NK_ASSERT(ctx->current->layout);
+    if (!ctx || !ctx->current || !ctx->current->layout) return;
+
+    win = ctx->current;
+    style = &ctx->style;
+    f = style->font;
+    nk_panel_alloc_space(&bounds, ctx);
+    t.padding = style->text.padding;
+    t.background = style->window.background;
+    t.text = color ? *color : style->text.color;
+
+    b = bounds;
+    b.w = NK_MAX(b.w, 2 * t.padding.x);
+    b.h = NK_MAX(b.h, 2 * t.padding.y);
+    b.h = b.h - 2 * t.padding.y;
+    line.x = b.x + t.padding.x;
+    line.y = b.y + t.padding.y;
+    line.w = b.w - 2 * t.padding.x;
+    line.h = 2 * t.padding.y + f->height;
+    if (line.w != width) {
+        nk_widget_text_wrap(&win->buffer, bounds, text, len, &t, f);
+        return;
+    }
+
+    t.padding = nk_vec2(0, 0);
+    for (i = 0; i < count && done < len; ++i) {
+        if (line.y + line.h >= (b.y + b.h)) break;
+        nk_py_text_line(&win->buffer, line, &text[done], lengths[i], widths[i], &t, f);
+        done += lengths[i];
+        line.y += f->height + 2 * style->text.padding.y;
+    }
+}
+
+/* ==============================================================
+ *
+ *                          TEXT EDIT
+ *
+ * ============================================================== */
+
+NK_API nk_size
+nk_py_sizeof_text_edit(void)
+{
+    return sizeof(struct nk_text_edit);
+}
+
+/* Returns the height of a text row in a multiline edit widget with the current
+ * style, the vertical space the widget needs around its rows and the spacing
+ * between widget rows. */
+NK_API float
+nk_py_edit_row_height(const struct nk_context *ctx, float *frame, float *spacing)
+{
+    const struct nk_style_edit *style;
+
+    NK_ASSERT(ctx);
+    if (!ctx || !ctx->style.font) return 0;
+    style = &ctx->style.edit;
+    if (frame) *frame = 2.0f * (style->padding.y + style->border);
+    if (spacing) *spacing = ctx->style.window.spacing.y;
+    return ctx->style.font->height + style->row_padding;
+}
+
+/* `nk_edit_buffer` with the text of `edit` scrolled down by `scroll` pixels
+ * and without its scrollbar, for edits over a window of a larger text. Sets
+ * bit 0 and 1 of `keys` if the undo and redo keys were pressed for an active
+ * edit, which the caller handles for the whole text. */
+NK_API nk_flags
+nk_py_edit_window(struct nk_context *ctx, nk_flags flags, struct nk_text_edit *edit,
+    nk_plugin_filter filter, float scroll, int *keys)
+{
+    struct nk_vec2 scrollbar_size;
+    nk_flags result;
+
+    NK_ASSERT(ctx);
+    NK_ASSERT(edit);
+    if (!ctx || !edit) return 0;
+    if (keys) {
+        *keys = 0;
+        if (edit->active && !(flags & NK_EDIT_READ_ONLY)) {
+            if (nk_input_is_key_pressed(&ctx->input, NK_KEY_TEXT_UNDO)) *keys |= 1;
+            if (nk_input_is_key_pressed(&ctx->input, NK_KEY_TEXT_REDO)) *keys |= 2;
+        }
+    }
+    scrollbar_size = ctx->style.edit.scrollbar_size;
+    ctx->style.edit.scrollbar_size.x = 0;
+    edit->scrollbar = nk_vec2(0, scroll);
+    result = nk_edit_buffer(ctx, flags, edit, filter);
+    ctx->style.edit.scrollbar_size = scrollbar_size;
+    return result;
+}
+
+/* Inserts `len` bytes of `text`, `glyphs` runes, at the cursor and moves the
+ * cursor past them. */
+NK_INTERN int
+nk_py_textedit_insert(struct nk_text_edit *state, const char *text, int len,
+    int glyphs)
+{
+    int inserted;
+    if (state->cursor >= state->string.len)
+        inserted = nk_str_append_text_char(&state->string, text, len) == len;
+    else inserted = nk_str_insert_at_rune(&state->string, state->cursor, text, len);
+    if (!inserted) return 0;
+    state->cursor += glyphs;
+    return 1;
+}
+
+/* `nk_py_textedit_paste`, leaving out the runes the filter of `state` rejects
+ * if `filtered` is set. */
+NK_INTERN int
+nk_py_textedit_paste_text(struct nk_text_edit *state, const char *text, int len,
+    int filtered)
+{
+    nk_rune unicode;
+    int where, glyphs = 0, run = 0;
+    int start = 0, text_len = 0, glyph_len;
+
+    NK_ASSERT(state);
+    NK_ASSERT(text);
+    if (!state || !text || len <= 0 || state->mode == NK_TEXT_EDIT_MODE_VIEW)
+        return 0;
+
+    nk_textedit_clamp(state);
+    nk_textedit_delete_selection(state);
+    where = state->cursor;
+    if (!filtered || !state->filter) {
+        glyphs = nk_utf_len(text, len);
+        if (!nk_py_textedit_insert(state, text, len, glyphs)) return 0;
+    } else {
+        /* Every run of accepted runes is inserted in one piece. */
+        for (;;) {
+            glyph_len = text_len < len ?
+                nk_utf_decode(text + text_len, &unicode, len - text_len) : 0;
+            if (glyph_len && state->filter(state, unicode)) {
+                text_len += glyph_len;
+                ++run;
+                continue;
+            }
+            if (run) {
+                if (!nk_py_textedit_insert(state, text + start, text_len - start, run))
+                    break;
+                glyphs += run;
+                run = 0;
+            }
+            if (!glyph_len) break;
+            text_len += glyph_len;
+            start = text_len;
+        }
+        if (!glyphs) return 0;
+    }
+    nk_textedit_makeundo_insert(state, where, glyphs);
+    state->has_preferred_x = 0;
+    return 1;
+}
+
+/* `nk_textedit_paste` with `len` in bytes throughout: the one in nuklear.h
+ * inserts `len` runes but moves the cursor and records the undo by bytes, which
+ * breaks on any multi-byte rune. Runes the filter of `state` rejects are left
+ * out, as they are from typed text. */
+NK_API int
+nk_py_textedit_paste(struct nk_text_edit *state, const char *text, int len)
+{
+    return nk_py_textedit_paste_text(state, text, len, nk_true);
+}
+
+/* ==============================================================
+ *
+ *                          RUNE FILTERS
+ *
+ * ============================================================== */
+
+/* Text edit filters accepting the runes set in a bitmap, bit `rune & 7` of
+ * byte `rune >> 3`. Nuklear decodes UTF-8 sequences of up to three bytes, so
+ * the bitmap covers the basic multilingual plane. */
+NK_INTERN int
+nk_py_rune_set_contains(const unsigned char *set, nk_rune unicode)
+{
+    if (!set) return nk_true;
+    if (unicode >= 0x10000) return nk_false;
+    return (set[unicode >> 3] >> (unicode & 7)) & 1;
+}
+
+/* `nk_plugin_filter` has no user data, so every rune set gets one of a fixed
+ * number of filter functions, each reading the set of its slot. */
+#define NK_PY_RUNE_FILTERS 32
+static const unsigned char *nk_py_rune_sets[NK_PY_RUNE_FILTERS];
+
+#define NK_PY_RUNE_FILTER(i) \
+    NK_INTERN int \
+    nk_py_rune_filter_##i(const struct nk_text_edit *box, nk_rune unicode) \
+    { \
+        NK_UNUSED(box); \
+        return nk_py_rune_set_contains(nk_py_rune_sets[i], unicode); \
+    }
+
+NK_PY_RUNE_FILTER(0)  NK_PY_RUNE_FILTER(1)  NK_PY_RUNE_FILTER(2)  NK_PY_RUNE_FILTER(3)
+NK_PY_RUNE_FILTER(4)  NK_PY_RUNE_FILTER(5)  NK_PY_RUNE_FILTER(6)  NK_PY_RUNE_FILTER(7)
+NK_PY_RUNE_FILTER(8)  NK_PY_RUNE_FILTER(9)  NK_PY_RUNE_FILTER(10) NK_PY_RUNE_FILTER(11)
+NK_PY_RUNE_FILTER(12) NK_PY_RUNE_FILTER(13) NK_PY_RUNE_FILTER(14) NK_PY_RUNE_FILTER(15)
+NK_PY_RUNE_FILTER(16) NK_PY_RUNE_FILTER(17) NK_PY_RUNE_FILTER(18) NK_PY_RUNE_FILTER(19)
+NK_PY_RUNE_FILTER(20) NK_PY_RUNE_FILTER(21) NK_PY_RUNE_FILTER(22) NK_PY_RUNE_FILTER(23)
+NK_PY_RUNE_FILTER(24) NK_PY_RUNE_FILTER(25) NK_PY_RUNE_FILTER(26) NK_PY_RUNE_FILTER(27)
+NK_PY_RUNE_FILTER(28) NK_PY_RUNE_FILTER(29) NK_PY_RUNE_FILTER(30) NK_PY_RUNE_FILTER(31)
+
+static const nk_plugin_filter nk_py_rune_filters[NK_PY_RUNE_FILTERS] = {
+    nk_py_rune_filter_0,  nk_py_rune_filter_1,  nk_py_rune_filter_2,
+    nk_py_rune_filter_3,  nk_py_rune_filter_4,  nk_py_rune_filter_5,
+    nk_py_rune_filter_6,  nk_py_rune_filter_7,  nk_py_rune_filter_8,
+    nk_py_rune_filter_9,  nk_py_rune_filter_10, nk_py_rune_filter_11,
+    nk_py_rune_filter_12, nk_py_rune_filter_13, nk_py_rune_filter_14,
+    nk_py_rune_filter_15, nk_py_rune_filter_16, nk_py_rune_filter_17,
+    nk_py_rune_filter_18, nk_py_rune_filter_19, nk_py_rune_filter_20,
+    nk_py_rune_filter_21, nk_py_rune_filter_22, nk_py_rune_filter_23,
+    nk_py_rune_filter_24, nk_py_rune_filter_25, nk_py_rune_filter_26,
+    nk_py_rune_filter_27, nk_py_rune_filter_28, nk_py_rune_filter_29,
+    nk_py_rune_filter_30, nk_py_rune_filter_31
+};
+
+NK_API int
+nk_py_rune_filter_count(void)
+{
+    return NK_PY_RUNE_FILTERS;
+}
+
+/* Points filter `slot` at the bitmap `set` of 0x2000 bytes, which has to stay
+ * alive for as long as the filter is in use, or at no bitmap to accept every
+ * rune. Returns the filter. */
+NK_API nk_plugin_filter
+nk_py_rune_filter(int slot, const unsigned char *set)
+{
+    NK_ASSERT(slot >= 0 && slot < NK_PY_RUNE_FILTERS);
+    if (slot < 0 || slot >= NK_PY_RUNE_FILTERS) return 0;
+    nk_py_rune_sets[slot] = set;
+    return nk_py_rune_filters[slot];
+}
+
+/* ==============================================================
+ *
+ *                          PASTE
+ *
+ * ============================================================== */
+
+/* Text for the next paste into an edit widget, installed as the clipboard of
+ * the context by `nk_py_input_paste`. The text is only pasted during frame
+ * `seq` of `ctx`, the frame it was submitted for. `clip` is the clipboard it
+ * replaced, which copying and later pastes go to. */
+struct nk_py_paste {
+    const char *text;
+    int len;
+    unsigned int seq;
+    int unfiltered;
+    const struct nk_context *ctx;
+    struct nk_clipboard clip;
+};
+
+NK_INTERN void
+nk_py_paste_text(nk_handle userdata, struct nk_text_edit *edit)
+{
+    struct nk_py_paste *paste = (struct nk_py_paste*)userdata.ptr;
+    /* Text no widget took in its own frame is dropped, so it does not take
+     * the place of a later paste from the clipboard. */
+    if (paste->text && paste->ctx->seq != paste->seq)
+        paste->text = 0;
+    if (paste->text) {
+        nk_py_textedit_paste_text(edit, paste->text, paste->len,
+            !paste->unfiltered);
+        paste->text = 0;
+    } else if (paste->clip.paste) {
+        paste->clip.paste(paste->clip.userdata, edit);
+    }
+}
+
+NK_INTERN void
+nk_py_paste_copy(nk_handle userdata, const char *text, int len)
+{
+    struct nk_py_paste *paste = (struct nk_py_paste*)userdata.ptr;
+    if (paste->clip.copy)
+        paste->clip.copy(paste->clip.userdata, text, len);
+}
+
+/* Pastes `paste->text` into the active edit widget of the frame, between
+ * `nk_input_begin` and `nk_input_end`: installs `paste` as the clipboard of
+ * `ctx` and presses the paste key. `paste` has to stay alive until the next
+ * call or until the context is freed. */
+NK_API void
+nk_py_input_paste(struct nk_context *ctx, struct nk_py_paste *paste)
+{
+    NK_ASSERT(ctx);
+    NK_ASSERT(paste);
+    if (!ctx || !paste) return;
+
+    if (ctx->clip.paste == nk_py_paste_text)
+        paste->clip = ((struct nk_py_paste*)ctx->clip.userdata.ptr)->clip;
+    else paste->clip = ctx->clip;
+    paste->seq = ctx->seq;
+    paste->ctx = ctx;
+    ctx->clip.userdata = nk_handle_ptr(paste);
+    ctx->clip.paste = nk_py_paste_text;
+    ctx->clip.copy = nk_py_paste_copy;
+
+    nk_input_key(ctx, NK_KEY_PASTE, nk_true);
+    nk_input_key(ctx, NK_KEY_PASTE, nk_false);
+}
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+from nuklear import buffer
+from nuklear import canvas
 from nuklear import color
+from nuklear import context
+from nuklear import drawing
+from nuklear import font
+from nuklear import input
+from nuklear import layout
 from nuklear import metadata
+from nuklear import textedit
+from nuklear import texts
 from nuklear import types
+from nuklear import window
 
 __metadata_version__ = metadata.__metadata_version__
 __title__ = metadata.__title__
@@ -112,6 +122,7 @@ PluginAlloc = types.PluginAlloc
 PluginFree = types.PluginFree
 
 Allocator = types.Allocator
+AllocationStats = types.AllocationStats
 
 SymbolType = types.SymbolType
 (
@@ -138,62 +149,19 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
-# @c_func(_nk.nk_init_default, (ctypes.POINTER(Context), ctypes.POINTER(UserFont)), Bool)
-# def init_default(ctx: Context, font: UserFont) -> bool:
-#     """
-#     Initializes a `Context` struct with a default standard library allocator.
-#     Should be used if you don't want to be bothered with memory management in nuklear.
-#     Wrapper for:
-#         nk_bool nk_init_default(struct nk_context*, const struct nk_user_font*);
-#     """
-#     return _nk.nk_init_default(ctx, font)
-#
-#
-# @c_func(
-#     _nk.nk_init_fixed,
-#     (
-#             ctypes.POINTER(Context),
-#             ctypes.c_void_p,
-#             Size,
-#             ctypes.POINTER(UserFont),
-#     ),
-#     Bool
-# )
-# def init_fixed(ctx: Context, memory: int, size: int, font: UserFont) -> bool:
-#     """
-#     Initializes a `Context` struct from single fixed size memory block
-#     Should be used if you want complete control over nuklear's memory management.
-#     Especially recommended for system with little memory or systems with virtual memory.
-#     For the later case you can just allocate for example 16MB of virtual memory
-#     and only the required amount of memory will actually be committed.
-#     Wrapper for:
-#         nk_bool nk_init_fixed(struct nk_context*, void#   memory, nk_size size, const struct nk_user_font*);
-#     """
-#     memory_ptr = ctypes.c_void_p(memory)
-#     size_value = ctypes.c_int(size)
-#     return _nk.nk_init_fixed(ctx, memory_ptr, size_value, font)
-#
-#
-# @c_func(
-#     _nk.nk_init,
-#     (
-#             ctypes.POINTER(Context),
-#             ctypes.POINTER(Allocator),
-#             ctypes.POINTER(UserFont),
-#     ),
-#     Bool
-# )
-# def init(ctx: Context, alloc: Allocator, font: UserFont) -> bool:
-#     """
-#     Initializes a `Context` struct with memory allocation callbacks for nuklear to allocate
-#     memory from. Used internally for `init_default` and provides a kitchen sink allocation
-#     interface to nuklear. Can be useful for cases like monitoring memory consumption.
-#     Wrapper for:
-#         nk_bool nk_init(struct nk_context*, struct nk_allocator*, const struct nk_user_font*);
-#     """
-#     return _nk.nk_init(ctx, alloc, font)
-#
-#
+Context = context.Context
+
+init_default = context.init_default
+init_fixed = context.init_fixed
+init = context.init
+clear = context.clear
+free = context.free
+init_counting = context.init_counting
+set_delta_time_seconds = context.set_delta_time_seconds
+get_delta_time_seconds = context.get_delta_time_seconds
+
+build_frames = context.build_frames
+
 # @c_func(
 #     _nk.nk_init_custom,
 #     (
@@ -215,29 +183,6 @@ SymbolType = types.SymbolType
 #     return _nk.nk_init_custom(ctx, cmds, pool, font)
 #
 #
-# @c_func(_nk.nk_clear, (ctypes.POINTER(Context),), None)
-# def clear(ctx: Context) -> None:
-#     """
-#     Resets the context state at the end of the frame. This includes mostly
-#     garbage collector tasks like removing windows or table not called and therefore
-#     used anymore.
-#     Wrapper for:
-#         void nk_clear(struct nk_context*);
-#     """
-#     _nk.nk_clear(ctx)
-#
-#
-# @c_func(_nk.nk_free, (ctypes.POINTER(Context),), None)
-# def free(ctx: Context) -> None:
-#     """
-#     Frees all memory allocated by nuklear. Not needed if context was
-#     initialized with `init_fixed`.
-#     Wrapper for:
-#         void nk_free(struct nk_context*);
-#     """
-#     _nk.nk_free(ctx)
-#
-#
 # if hasattr(_nk, "nk_set_user_data"):
 #     @c_func(_nk.nk_set_user_data, (ctypes.POINTER(Context), Handle), None)
 #     def set_user_data(ctx: Context, handle: Handle) -> None:
@@ -260,6 +205,63 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+Keys = types.Keys
+(
+    KEY_NONE,
+    KEY_SHIFT,
+    KEY_CTRL,
+    KEY_DEL,
+    KEY_ENTER,
+    KEY_TAB,
+    KEY_BACKSPACE,
+    KEY_COPY,
+    KEY_CUT,
+    KEY_PASTE,
+    KEY_UP,
+    KEY_DOWN,
+    KEY_LEFT,
+    KEY_RIGHT,
+    KEY_TEXT_INSERT_MODE,
+    KEY_TEXT_REPLACE_MODE,
+    KEY_TEXT_RESET_MODE,
+    KEY_TEXT_LINE_START,
+    KEY_TEXT_LINE_END,
+    KEY_TEXT_START,
+    KEY_TEXT_END,
+    KEY_TEXT_UNDO,
+    KEY_TEXT_REDO,
+    KEY_TEXT_SELECT_ALL,
+    KEY_TEXT_WORD_LEFT,
+    KEY_TEXT_WORD_RIGHT,
+    KEY_SCROLL_START,
+    KEY_SCROLL_END,
+    KEY_SCROLL_DOWN,
+    KEY_SCROLL_UP,
+    KEY_MAX,
+) = Keys
+
+Buttons = types.Buttons
+BUTTON_LEFT, BUTTON_MIDDLE, BUTTON_RIGHT, BUTTON_DOUBLE, BUTTON_MAX = Buttons
+
+input_begin = input.input_begin
+input_motion = input.input_motion
+input_key = input.input_key
+input_button = input.input_button
+input_scroll = input.input_scroll
+input_char = input.input_char
+input_glyph = input.input_glyph
+input_unicode = input.input_unicode
+input_end = input.input_end
+input_paste = input.input_paste
+
+InputType = types.InputType
+INPUT_MOTION, INPUT_KEY, INPUT_BUTTON, INPUT_SCROLL, INPUT_UNICODE = InputType
+
+InputEvent = types.InputEvent
+InputQueue = input.InputQueue
+input_events = input.input_events
+InputCoalescer = input.InputCoalescer
+
 
 # ==============================================================================
 #
@@ -267,6 +269,82 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+CommandType = types.CommandType
+(
+    COMMAND_NOP,
+    COMMAND_SCISSOR,
+    COMMAND_LINE,
+    COMMAND_CURVE,
+    COMMAND_RECT,
+    COMMAND_RECT_FILLED,
+    COMMAND_RECT_MULTI_COLOR,
+    COMMAND_CIRCLE,
+    COMMAND_CIRCLE_FILLED,
+    COMMAND_ARC,
+    COMMAND_ARC_FILLED,
+    COMMAND_TRIANGLE,
+    COMMAND_TRIANGLE_FILLED,
+    COMMAND_POLYGON,
+    COMMAND_POLYGON_FILLED,
+    COMMAND_POLYLINE,
+    COMMAND_TEXT,
+    COMMAND_IMAGE,
+    COMMAND_CUSTOM,
+) = CommandType
+
+Command = types.Command
+CommandScissor = types.CommandScissor
+CommandLine = types.CommandLine
+CommandCurve = types.CommandCurve
+CommandRect = types.CommandRect
+CommandRectFilled = types.CommandRectFilled
+CommandRectMultiColor = types.CommandRectMultiColor
+CommandCircle = types.CommandCircle
+CommandCircleFilled = types.CommandCircleFilled
+CommandArc = types.CommandArc
+CommandArcFilled = types.CommandArcFilled
+CommandTriangle = types.CommandTriangle
+CommandTriangleFilled = types.CommandTriangleFilled
+CommandPolygon = types.CommandPolygon
+CommandPolygonFilled = types.CommandPolygonFilled
+CommandPolyline = types.CommandPolyline
+CommandText = types.CommandText
+CommandImage = types.CommandImage
+CommandCustomCallback = types.CommandCustomCallback
+CommandCustom = types.CommandCustom
+CommandBuffer = types.CommandBuffer
+
+COMMAND_VIEWS = drawing.COMMAND_VIEWS
+walk_commands = drawing.walk_commands
+commands = drawing.commands
+command_size = drawing.command_size
+command_bytes = drawing.command_bytes
+dispatch_commands = drawing.dispatch_commands
+
+DrawIndex = drawing.DrawIndex
+VertexLayout = drawing.VertexLayout
+convert = drawing.convert
+draw_commands = drawing.draw_commands
+DRAW_COMMAND_DTYPE = drawing.DRAW_COMMAND_DTYPE
+DrawData = drawing.DrawData
+DrawBatcher = drawing.DrawBatcher
+Converter = drawing.Converter
+command_signature = drawing.command_signature
+FrameCache = drawing.FrameCache
+
+stroke_line = canvas.stroke_line
+stroke_rect = canvas.stroke_rect
+stroke_polyline = canvas.stroke_polyline
+stroke_polygon = canvas.stroke_polygon
+fill_rect = canvas.fill_rect
+fill_rect_multi_color = canvas.fill_rect_multi_color
+fill_polygon = canvas.fill_polygon
+push_scissor = canvas.push_scissor
+fill_rects = canvas.fill_rects
+fill_rects_multi_color = canvas.fill_rects_multi_color
+stroke_polylines = canvas.stroke_polylines
+fill_polygons = canvas.fill_polygons
+
 
 # ==============================================================================
 #
@@ -274,6 +352,28 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+PanelFlags = types.PanelFlags
+(
+    WINDOW_BORDER,
+    WINDOW_MOVABLE,
+    WINDOW_SCALABLE,
+    WINDOW_CLOSABLE,
+    WINDOW_MINIMIZABLE,
+    WINDOW_NO_SCROLLBAR,
+    WINDOW_TITLE,
+    WINDOW_SCROLL_AUTO_HIDE,
+    WINDOW_BACKGROUND,
+    WINDOW_SCALE_LEFT,
+    WINDOW_NO_INPUT,
+) = PanelFlags
+
+begin = window.begin
+begin_titled = window.begin_titled
+end = window.end
+window_is_hovered = window.window_is_hovered
+window_is_any_hovered = window.window_is_any_hovered
+window_get_canvas = window.window_get_canvas
+
 
 # ==============================================================================
 #
@@ -281,6 +381,9 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+layout_row_dynamic = layout.layout_row_dynamic
+layout_row_static = layout.layout_row_static
+
 
 # ==============================================================================
 #
@@ -302,6 +405,10 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+ListView = layout.ListView
+list_view_begin = layout.list_view_begin
+list_view_end = layout.list_view_end
+
 
 # ==============================================================================
 #
@@ -316,6 +423,25 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+TextAlign = types.TextAlign
+(
+    TEXT_ALIGN_LEFT,
+    TEXT_ALIGN_CENTERED,
+    TEXT_ALIGN_RIGHT,
+    TEXT_ALIGN_TOP,
+    TEXT_ALIGN_MIDDLE,
+    TEXT_ALIGN_BOTTOM,
+) = TextAlign
+
+TextAlignment = types.TextAlignment
+TEXT_LEFT, TEXT_CENTERED, TEXT_RIGHT = TextAlignment
+
+text = texts.text
+label = texts.label
+text_wrap = texts.text_wrap
+text_wrap_colored = texts.text_wrap_colored
+label_wrap = texts.label_wrap
+
 
 # ==============================================================================
 #
@@ -379,6 +505,37 @@ SymbolType = types.SymbolType
 #
 # ==============================================================================
 
+EditFlags = types.EditFlags
+(
+    EDIT_DEFAULT,
+    EDIT_READ_ONLY,
+    EDIT_AUTO_SELECT,
+    EDIT_SIG_ENTER,
+    EDIT_ALLOW_TAB,
+    EDIT_NO_CURSOR,
+    EDIT_SELECTABLE,
+    EDIT_CLIPBOARD,
+    EDIT_CTRL_ENTER_NEWLINE,
+    EDIT_NO_HORIZONTAL_SCROLL,
+    EDIT_ALWAYS_INSERT_MODE,
+    EDIT_MULTILINE,
+    EDIT_GOTO_END_ON_ACTIVATE,
+) = EditFlags
+
+EditTypes = types.EditTypes
+EDIT_SIMPLE, EDIT_FIELD, EDIT_BOX, EDIT_EDITOR = EditTypes
+
+EditEvents = types.EditEvents
+(
+    EDIT_ACTIVE,
+    EDIT_INACTIVE,
+    EDIT_ACTIVATED,
+    EDIT_DEACTIVATED,
+    EDIT_COMMITED,
+) = EditEvents
+
+edit_buffer = textedit.edit_buffer
+
 
 # ==============================================================================
 #
@@ -528,6 +685,14 @@ colorf_hsva_fv = color.colorf_hsva_fv
 #
 # ==============================================================================
 
+Str = textedit.Str
+str_clear = textedit.str_clear
+str_append_text_char = textedit.str_append_text_char
+str_insert_at_char = textedit.str_insert_at_char
+str_delete_chars = textedit.str_delete_chars
+str_len = textedit.str_len
+str_len_char = textedit.str_len_char
+
 
 # ==============================================================================
 #
@@ -542,6 +707,38 @@ colorf_hsva_fv = color.colorf_hsva_fv
 #
 # ==============================================================================
 
+UserFontGlyph = types.UserFontGlyph
+TextWidthF = types.TextWidthF
+QueryFontGlyphF = types.QueryFontGlyphF
+UserFont = types.UserFont
+
+FontCoordType = types.FontCoordType
+COORD_UV, COORD_PIXEL = FontCoordType
+
+FontAtlasFormat = types.FontAtlasFormat
+FONT_ATLAS_ALPHA8, FONT_ATLAS_RGBA32 = FontAtlasFormat
+
+BakedFont = types.BakedFont
+FontGlyph = types.FontGlyph
+FontConfig = types.FontConfig
+Font = font.Font
+FontAtlas = font.FontAtlas
+
+font_default_glyph_ranges = font.font_default_glyph_ranges
+font_chinese_glyph_ranges = font.font_chinese_glyph_ranges
+font_cyrillic_glyph_ranges = font.font_cyrillic_glyph_ranges
+font_korean_glyph_ranges = font.font_korean_glyph_ranges
+
+font_atlas_init_default = font.font_atlas_init_default
+font_atlas_begin = font.font_atlas_begin
+font_atlas_add_default = font.font_atlas_add_default
+font_atlas_add_from_memory = font.font_atlas_add_from_memory
+font_atlas_add_from_file = font.font_atlas_add_from_file
+font_atlas_bake = font.font_atlas_bake
+font_atlas_end = font.font_atlas_end
+font_atlas_cleanup = font.font_atlas_cleanup
+font_atlas_clear = font.font_atlas_clear
+
 
 # ==============================================================================
 #
@@ -549,6 +746,18 @@ colorf_hsva_fv = color.colorf_hsva_fv
 #
 # ==============================================================================
 
+BUFFER_MAX = buffer.BUFFER_MAX
+
+AllocationType = buffer.AllocationType
+BUFFER_FIXED, BUFFER_DYNAMIC = AllocationType
+
+Buffer = buffer.Buffer
+buffer_init_default = buffer.buffer_init_default
+buffer_init_fixed = buffer.buffer_init_fixed
+buffer_clear = buffer.buffer_clear
+buffer_free = buffer.buffer_free
+buffer_total = buffer.buffer_total
+
 
 # ==============================================================================
 #
@@ -563,6 +772,42 @@ colorf_hsva_fv = color.colorf_hsva_fv
 #
 # ==============================================================================
 
+TEXTEDIT_UNDOSTATECOUNT = types.TEXTEDIT_UNDOSTATECOUNT
+TEXTEDIT_UNDOCHARCOUNT = types.TEXTEDIT_UNDOCHARCOUNT
+
+TextEditType = types.TextEditType
+TEXT_EDIT_SINGLE_LINE, TEXT_EDIT_MULTI_LINE = TextEditType
+
+TextEditMode = types.TextEditMode
+TEXT_EDIT_MODE_VIEW, TEXT_EDIT_MODE_INSERT, TEXT_EDIT_MODE_REPLACE = TextEditMode
+
+PluginFilter = types.PluginFilter
+PluginPaste = types.PluginPaste
+PluginCopy = types.PluginCopy
+
+Clipboard = textedit.Clipboard
+TextUndoRecord = textedit.TextUndoRecord
+TextUndoState = textedit.TextUndoState
+TextEdit = textedit.TextEdit
+textedit_init_default = textedit.textedit_init_default
+textedit_init_fixed = textedit.textedit_init_fixed
+textedit_free = textedit.textedit_free
+textedit_text = textedit.textedit_text
+textedit_delete = textedit.textedit_delete
+textedit_delete_selection = textedit.textedit_delete_selection
+textedit_select_all = textedit.textedit_select_all
+textedit_cut = textedit.textedit_cut
+textedit_paste = textedit.textedit_paste
+textedit_undo = textedit.textedit_undo
+textedit_redo = textedit.textedit_redo
+filter_default = textedit.filter_default
+filter_ascii = textedit.filter_ascii
+filter_float = textedit.filter_float
+filter_decimal = textedit.filter_decimal
+filter_hex = textedit.filter_hex
+filter_oct = textedit.filter_oct
+filter_binary = textedit.filter_binary
+
 
 # ==============================================================================
 #
@@ -584,6 +829,56 @@ colorf_hsva_fv = color.colorf_hsva_fv
 #
 # ==============================================================================
 
+DrawNullTexture = types.DrawNullTexture
+
+AntiAliasing = types.AntiAliasing
+ANTI_ALIASING_OFF, ANTI_ALIASING_ON = AntiAliasing
+
+ConvertResult = types.ConvertResult
+(
+    CONVERT_SUCCESS,
+    CONVERT_INVALID_PARAM,
+    CONVERT_COMMAND_BUFFER_FULL,
+    CONVERT_VERTEX_BUFFER_FULL,
+    CONVERT_ELEMENT_BUFFER_FULL,
+) = ConvertResult
+
+DrawVertexLayoutAttribute = types.DrawVertexLayoutAttribute
+(
+    VERTEX_POSITION,
+    VERTEX_COLOR,
+    VERTEX_TEXCOORD,
+    VERTEX_ATTRIBUTE_COUNT,
+) = DrawVertexLayoutAttribute
+
+DrawVertexLayoutFormat = types.DrawVertexLayoutFormat
+(
+    FORMAT_SCHAR,
+    FORMAT_SSHORT,
+    FORMAT_SINT,
+    FORMAT_UCHAR,
+    FORMAT_USHORT,
+    FORMAT_UINT,
+    FORMAT_FLOAT,
+    FORMAT_DOUBLE,
+    FORMAT_R8G8B8,
+    FORMAT_R16G15B16,
+    FORMAT_R32G32B32,
+    FORMAT_R8G8B8A8,
+    FORMAT_B8G8R8A8,
+    FORMAT_R16G15B16A16,
+    FORMAT_R32G32B32A32,
+    FORMAT_R32G32B32A32_FLOAT,
+    FORMAT_R32G32B32A32_DOUBLE,
+    FORMAT_RGB32,
+    FORMAT_RGBA32,
+    FORMAT_COUNT,
+) = DrawVertexLayoutFormat
+
+DrawVertexLayoutElement = types.DrawVertexLayoutElement
+ConvertConfig = types.ConvertConfig
+DrawCommand = types.DrawCommand
+
 
 # ==============================================================================
 #
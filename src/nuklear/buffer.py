@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import ctypes
+from typing import Optional
+
+from nuklear.library import nuklear as nk
+from nuklear.types import Allocator
+from nuklear.types import Bool
+from nuklear.types import CEnum
+from nuklear.types import Size
+
+# ==============================================================================
+#
+#                                  MEMORY BUFFER
+#
+# ==============================================================================
+
+BUFFER_MAX = 2
+
+
+class AllocationType(CEnum):
+    BUFFER_FIXED = 0
+    BUFFER_DYNAMIC = 1
+
+
+class Buffer:
+    """
+    Owns a `struct nk_buffer`, and for fixed buffers the memory it uses.
+
+    Wrapper for:
+        struct nk_buffer {
+            struct nk_buffer_marker marker[NK_BUFFER_MAX];
+            struct nk_allocator pool;
+            enum nk_allocation_type type;
+            struct nk_memory memory;
+            float grow_factor;
+            nk_size allocated;
+            nk_size needed;
+            nk_size calls;
+            nk_size size;
+        };
+    """
+
+    class Marker(ctypes.Structure):
+        """
+        Wrapper for:
+            struct nk_buffer_marker {nk_bool active; nk_size offset;};
+        """
+
+        _fields_ = (
+            ("active", Bool),
+            ("offset", Size),
+        )
+
+    class Memory(ctypes.Structure):
+        """
+        Wrapper for:
+            struct nk_memory {void *ptr; nk_size size;};
+        """
+
+        _fields_ = (
+            ("ptr", ctypes.c_void_p),
+            ("size", Size),
+        )
+
+    class Struct(ctypes.Structure):
+        pass
+
+    def __init__(self):
+        self.struct = Buffer.Struct()
+        self._as_parameter_ = ctypes.pointer(self.struct)
+
+        self._memory: Optional[ctypes.Array] = None
+
+    @property
+    def address(self) -> int:
+        """Address of the buffer memory, which moves when a dynamic buffer grows."""
+        return self.struct.memory.ptr or 0
+
+    @property
+    def capacity(self) -> int:
+        return self.struct.memory.size
+
+    @property
+    def allocated(self) -> int:
+        """Number of bytes in use."""
+        return self.struct.allocated
+
+    @property
+    def needed(self) -> int:
+        """Number of bytes that were requested, including failed allocations."""
+        return self.struct.needed
+
+    def view(self, offset: int = 0, size: Optional[int] = None) -> ctypes.Array:
+        """
+        Returns a `c_ubyte` array over the buffer memory without copying, by
+        default covering the bytes in use. Only valid while the memory does not
+        move. Views over fixed memory keep that memory alive.
+        """
+        if size is None:
+            size = self.allocated - offset
+        if self._memory is not None:
+            return (ctypes.c_ubyte * size).from_buffer(self._memory, offset)
+        return (ctypes.c_ubyte * size).from_address(self.address + offset)
+
+
+Buffer.Struct._fields_ = (
+    ("marker", Buffer.Marker * BUFFER_MAX),
+    ("pool", Allocator.Struct),
+    ("type", AllocationType),
+    ("memory", Buffer.Memory),
+    ("grow_factor", ctypes.c_float),
+    ("allocated", Size),
+    ("needed", Size),
+    ("calls", Size),
+    ("size", Size),
+)
+
+
+nk.nk_buffer_init_default.argtypes = (ctypes.POINTER(Buffer.Struct),)
+nk.nk_buffer_init_default.restype = None
+
+
+def buffer_init_default(buffer: Buffer) -> None:
+    """
+    Initializes a growing buffer using the standard library allocator.
+    Wrapper for:
+        void nk_buffer_init_default(struct nk_buffer*);
+    """
+    nk.nk_buffer_init_default(buffer)
+
+
+nk.nk_buffer_init_fixed.argtypes = (
+    ctypes.POINTER(Buffer.Struct),
+    ctypes.c_void_p,
+    Size,
+)
+nk.nk_buffer_init_fixed.restype = None
+
+
+def buffer_init_fixed(buffer: Buffer, memory: ctypes.Array) -> None:
+    """
+    Initializes a buffer over a fixed block of memory, which is kept alive by
+    the buffer.
+    Wrapper for:
+        void nk_buffer_init_fixed(struct nk_buffer*, void *memory, nk_size size);
+    """
+    buffer._memory = memory
+    nk.nk_buffer_init_fixed(buffer, ctypes.addressof(memory), ctypes.sizeof(memory))
+
+
+nk.nk_buffer_clear.argtypes = (ctypes.POINTER(Buffer.Struct),)
+nk.nk_buffer_clear.restype = None
+
+
+def buffer_clear(buffer: Buffer) -> None:
+    """
+    Resets the buffer while keeping its memory.
+    Wrapper for:
+        void nk_buffer_clear(struct nk_buffer*);
+    """
+    nk.nk_buffer_clear(buffer)
+
+
+nk.nk_buffer_free.argtypes = (ctypes.POINTER(Buffer.Struct),)
+nk.nk_buffer_free.restype = None
+
+
+def buffer_free(buffer: Buffer) -> None:
+    """
+    Frees the memory of a dynamic buffer.
+    Wrapper for:
+        void nk_buffer_free(struct nk_buffer*);
+    """
+    nk.nk_buffer_free(buffer)
+    buffer._memory = None
+
+
+nk.nk_buffer_total.argtypes = (ctypes.POINTER(Buffer.Struct),)
+nk.nk_buffer_total.restype = Size
+
+
+def buffer_total(buffer: Buffer) -> int:
+    """
+    Wrapper for:
+        nk_size nk_buffer_total(struct nk_buffer*);
+    """
+    return nk.nk_buffer_total(buffer)
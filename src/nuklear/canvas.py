@@ -0,0 +1,475 @@
+"""
+Drawing on the canvas of a window.
+
+The per-shape functions wrap the Nuklear drawing API (`nk_fill_rect`,
+`nk_stroke_polyline`, ...). Points are passed as a `float*` straight from a
+float32 NumPy array of shape (n, 2), so no point is converted in Python.
+
+The batched functions (`fill_rects`, `stroke_polylines`, ...) push a whole set
+of shapes with one call: their arguments are flat arrays of rects, points and
+RGBA8 colors, which the nuklearPy shim loops over in C. Colors are either one
+color for every shape or one per shape. Without the shim the shapes are pushed
+one call each, still without converting any point.
+
+A `canvas` is the `CommandBuffer` returned by `window_get_canvas`. Without
+NumPy, points, rects and colors can be given as nested sequences and are copied
+into ctypes arrays.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from typing import Any, List, Optional, Sequence, Tuple
+
+from nuklear.library import nuklear as nk
+from nuklear.types import Color
+from nuklear.types import CommandBuffer
+from nuklear.types import Rect
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    np = None
+
+# Nuklear stores the point count of a polygon command as an unsigned short.
+MAX_POINTS = 0xFFFF
+
+_Canvas = ctypes.POINTER(CommandBuffer)
+
+
+def _floats(values: Any, width: int) -> Tuple[Any, int]:
+    # Returns values as contiguous float32 memory and the number of items of
+    # `width` floats, without copying float32 arrays.
+    if np is not None:
+        array = np.ascontiguousarray(values, np.float32)
+        if array.size % width:
+            raise ValueError(f"Expected items of {width} floats")
+        return array, array.size // width
+    flat = [float(v) for item in values for v in item]
+    return (ctypes.c_float * len(flat))(*flat), len(flat) // width
+
+
+def _color_values(colors: Any) -> List[int]:
+    if isinstance(colors, Color):
+        return [colors.r, colors.g, colors.b, colors.a]
+    if isinstance(colors, int):
+        return [colors]
+    return [v for color in colors for v in _color_values(color)]
+
+
+def _colors(colors: Any, width: int = 1) -> Tuple[Any, int]:
+    # Returns RGBA8 colors as contiguous memory and the number of groups of
+    # `width` colors. A single color may be a `Color` or a tuple of 4 ints.
+    if np is not None and isinstance(colors, np.ndarray):
+        memory = np.ascontiguousarray(colors, np.uint8)
+        size = memory.size
+    else:
+        values = _color_values(colors)
+        size = len(values)
+        if np is not None:
+            memory = np.array(values, np.uint8)
+        else:
+            memory = (ctypes.c_ubyte * size)(*values)
+    if size % (4 * width):
+        raise ValueError("Expected RGBA8 colors")
+    return memory, size // (4 * width)
+
+
+def _address(memory: Any) -> int:
+    if np is not None and isinstance(memory, np.ndarray):
+        return memory.ctypes.data
+    return ctypes.addressof(memory)
+
+
+def _counts(points: Any, counts: Optional[Sequence[int]]) -> Tuple[Any, Any, int]:
+    # Returns the concatenated points, the point count of every shape as int32
+    # memory and the number of shapes.
+    if counts is None:
+        if np is not None and isinstance(points, np.ndarray) and points.ndim == 3:
+            counts = [points.shape[1]] * points.shape[0]
+        else:
+            parts = list(points)
+            counts = [len(part) for part in parts]
+            if np is None:
+                points = [point for part in parts for point in part]
+            elif parts:
+                points = np.concatenate(
+                    [np.asarray(part, np.float32).reshape(-1, 2) for part in parts]
+                )
+            else:
+                points = np.zeros((0, 2), np.float32)
+    memory, total = _floats(points, 2)
+    counts = [int(c) for c in counts]
+    if sum(counts) != total:
+        raise ValueError("The point counts do not add up to the number of points")
+    if any(c > MAX_POINTS for c in counts):
+        raise ValueError(f"Shapes are limited to {MAX_POINTS} points")
+    return memory, (ctypes.c_int * len(counts))(*counts), len(counts)
+
+
+# ==============================================================================
+#
+#                                  SHAPES
+#
+# ==============================================================================
+
+nk.nk_stroke_line.argtypes = (
+    _Canvas,
+    ctypes.c_float,
+    ctypes.c_float,
+    ctypes.c_float,
+    ctypes.c_float,
+    ctypes.c_float,
+    Color.Struct,
+)
+nk.nk_stroke_line.restype = None
+
+
+def stroke_line(
+    canvas: CommandBuffer,
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+    line_thickness: float,
+    color: Color,
+) -> None:
+    """
+    Strokes the line from x0, y0 to x1, y1.
+    Wrapper for:
+        void nk_stroke_line(struct nk_command_buffer *b, float x0, float y0, float x1, float y1, float line_thickness, struct nk_color);
+    """  # noqa: E501
+    nk.nk_stroke_line(canvas, x0, y0, x1, y1, line_thickness, color.to_c())
+
+
+nk.nk_stroke_rect.argtypes = (
+    _Canvas,
+    Rect.Struct,
+    ctypes.c_float,
+    ctypes.c_float,
+    Color.Struct,
+)
+nk.nk_stroke_rect.restype = None
+
+
+def stroke_rect(
+    canvas: CommandBuffer,
+    rect: Rect,
+    rounding: float,
+    line_thickness: float,
+    color: Color,
+) -> None:
+    """
+    Strokes the outline of `rect`, with corners rounded by `rounding`.
+    Wrapper for:
+        void nk_stroke_rect(struct nk_command_buffer*, struct nk_rect, float rounding, float line_thickness, struct nk_color);
+    """  # noqa: E501
+    nk.nk_stroke_rect(canvas, rect.to_c(), rounding, line_thickness, color.to_c())
+
+
+nk.nk_stroke_polyline.argtypes = (
+    _Canvas,
+    ctypes.c_void_p,
+    ctypes.c_int,
+    ctypes.c_float,
+    Color.Struct,
+)
+nk.nk_stroke_polyline.restype = None
+
+
+def stroke_polyline(
+    canvas: CommandBuffer, points: Any, line_thickness: float, color: Color
+) -> None:
+    """
+    Strokes the line through `points`, an (n, 2) array of x, y.
+    Wrapper for:
+        void nk_stroke_polyline(struct nk_command_buffer*, float *points, int point_count, float line_thickness, struct nk_color col);
+    """  # noqa: E501
+    memory, count = _floats(points, 2)
+    if count > MAX_POINTS:
+        raise ValueError(f"Shapes are limited to {MAX_POINTS} points")
+    nk.nk_stroke_polyline(canvas, _address(memory), count, line_thickness, color.to_c())
+
+
+nk.nk_stroke_polygon.argtypes = nk.nk_stroke_polyline.argtypes
+nk.nk_stroke_polygon.restype = None
+
+
+def stroke_polygon(
+    canvas: CommandBuffer, points: Any, line_thickness: float, color: Color
+) -> None:
+    """
+    Strokes the closed outline through `points`, an (n, 2) array of x, y.
+    Wrapper for:
+        void nk_stroke_polygon(struct nk_command_buffer*, float*, int point_count, float line_thickness, struct nk_color);
+    """  # noqa: E501
+    memory, count = _floats(points, 2)
+    if count > MAX_POINTS:
+        raise ValueError(f"Shapes are limited to {MAX_POINTS} points")
+    nk.nk_stroke_polygon(canvas, _address(memory), count, line_thickness, color.to_c())
+
+
+nk.nk_fill_rect.argtypes = (_Canvas, Rect.Struct, ctypes.c_float, Color.Struct)
+nk.nk_fill_rect.restype = None
+
+
+def fill_rect(canvas: CommandBuffer, rect: Rect, rounding: float, color: Color) -> None:
+    """
+    Fills `rect`, with corners rounded by `rounding`.
+    Wrapper for:
+        void nk_fill_rect(struct nk_command_buffer*, struct nk_rect, float rounding, struct nk_color);
+    """  # noqa: E501
+    nk.nk_fill_rect(canvas, rect.to_c(), rounding, color.to_c())
+
+
+nk.nk_fill_rect_multi_color.argtypes = (
+    _Canvas,
+    Rect.Struct,
+    Color.Struct,
+    Color.Struct,
+    Color.Struct,
+    Color.Struct,
+)
+nk.nk_fill_rect_multi_color.restype = None
+
+
+def fill_rect_multi_color(
+    canvas: CommandBuffer,
+    rect: Rect,
+    left: Color,
+    top: Color,
+    right: Color,
+    bottom: Color,
+) -> None:
+    """
+    Fills `rect` with a gradient between the colors of its four sides.
+    Wrapper for:
+        void nk_fill_rect_multi_color(struct nk_command_buffer*, struct nk_rect, struct nk_color left, struct nk_color top, struct nk_color right, struct nk_color bottom);
+    """  # noqa: E501
+    nk.nk_fill_rect_multi_color(
+        canvas, rect.to_c(), left.to_c(), top.to_c(), right.to_c(), bottom.to_c()
+    )
+
+
+nk.nk_fill_polygon.argtypes = (_Canvas, ctypes.c_void_p, ctypes.c_int, Color.Struct)
+nk.nk_fill_polygon.restype = None
+
+
+def fill_polygon(canvas: CommandBuffer, points: Any, color: Color) -> None:
+    """
+    Fills the convex polygon through `points`, an (n, 2) array of x, y.
+    Wrapper for:
+        void nk_fill_polygon(struct nk_command_buffer*, float*, int point_count, struct nk_color);
+    """  # noqa: E501
+    memory, count = _floats(points, 2)
+    if count > MAX_POINTS:
+        raise ValueError(f"Shapes are limited to {MAX_POINTS} points")
+    nk.nk_fill_polygon(canvas, _address(memory), count, color.to_c())
+
+
+nk.nk_push_scissor.argtypes = (_Canvas, Rect.Struct)
+nk.nk_push_scissor.restype = None
+
+
+def push_scissor(canvas: CommandBuffer, rect: Rect) -> None:
+    """
+    Clips the shapes drawn after it to `rect`.
+    Wrapper for:
+        void nk_push_scissor(struct nk_command_buffer*, struct nk_rect);
+    """
+    nk.nk_push_scissor(canvas, rect.to_c())
+
+
+# ==============================================================================
+#
+#                                  BATCHES
+#
+# ==============================================================================
+
+if hasattr(nk, "nk_py_fill_rects"):
+    nk.nk_py_fill_rects.argtypes = (
+        _Canvas,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_float,
+        ctypes.c_void_p,
+        ctypes.c_int,
+    )
+    nk.nk_py_fill_rects.restype = None
+
+    nk.nk_py_fill_rects_multi_color.argtypes = (
+        _Canvas,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    )
+    nk.nk_py_fill_rects_multi_color.restype = None
+
+    nk.nk_py_stroke_polylines.argtypes = (
+        _Canvas,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_float,
+        ctypes.c_void_p,
+        ctypes.c_int,
+    )
+    nk.nk_py_stroke_polylines.restype = None
+
+    nk.nk_py_fill_polygons.argtypes = (
+        _Canvas,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_int,
+    )
+    nk.nk_py_fill_polygons.restype = None
+
+    _fill_rects = nk.nk_py_fill_rects
+    _fill_rects_multi_color = nk.nk_py_fill_rects_multi_color
+    _stroke_polylines = nk.nk_py_stroke_polylines
+    _fill_polygons = nk.nk_py_fill_polygons
+
+else:
+    # Without the nuklearPy shim every shape costs one call, but the points are
+    # still read straight from the arrays.
+
+    def _color_at(colors: int, color_count: int, i: int) -> Color.Struct:
+        return Color.Struct.from_address(colors + 4 * (i if color_count > 1 else 0))
+
+    def _fill_rects(canvas, rects, count, rounding, colors, color_count):
+        for i in range(count):
+            x, y, w, h = (ctypes.c_float * 4).from_address(rects + 16 * i)
+            nk.nk_fill_rect(
+                canvas,
+                Rect(x, y, w, h).to_c(),
+                rounding,
+                _color_at(colors, color_count, i),
+            )
+
+    def _fill_rects_multi_color(canvas, rects, count, colors):
+        for i in range(count):
+            x, y, w, h = (ctypes.c_float * 4).from_address(rects + 16 * i)
+            nk.nk_fill_rect_multi_color(
+                canvas,
+                Rect(x, y, w, h).to_c(),
+                *(Color.Struct * 4).from_address(colors + 16 * i),
+            )
+
+    def _stroke_polylines(
+        canvas, points, counts, count, closed, thickness, colors, color_count
+    ):
+        stroke = nk.nk_stroke_polygon if closed else nk.nk_stroke_polyline
+        point_counts = (ctypes.c_int * count).from_address(counts)
+        for i, n in enumerate(point_counts):
+            stroke(canvas, points, n, thickness, _color_at(colors, color_count, i))
+            points += 8 * n
+
+    def _fill_polygons(canvas, points, counts, count, colors, color_count):
+        point_counts = (ctypes.c_int * count).from_address(counts)
+        for i, n in enumerate(point_counts):
+            nk.nk_fill_polygon(canvas, points, n, _color_at(colors, color_count, i))
+            points += 8 * n
+
+
+def _check_colors(color_count: int, count: int) -> None:
+    if color_count not in (1, count):
+        raise ValueError("Expected one color, or one color per shape")
+
+
+def fill_rects(
+    canvas: CommandBuffer, rects: Any, colors: Any, rounding: float = 0.0
+) -> None:
+    """
+    Fills every rect of `rects`, an (n, 4) array of x, y, w, h, with one color
+    or with `colors`, an (n, 4) array of RGBA8 colors.
+    """
+    rect_memory, count = _floats(rects, 4)
+    color_memory, color_count = _colors(colors)
+    if not count:
+        return
+    _check_colors(color_count, count)
+    _fill_rects(
+        canvas,
+        _address(rect_memory),
+        count,
+        rounding,
+        _address(color_memory),
+        color_count,
+    )
+
+
+def fill_rects_multi_color(canvas: CommandBuffer, rects: Any, colors: Any) -> None:
+    """
+    Fills every rect of `rects`, an (n, 4) array of x, y, w, h, with a
+    gradient between four colors given as an (n, 4, 4) RGBA8 array in the order
+    left, top, right, bottom.
+    """
+    rect_memory, count = _floats(rects, 4)
+    color_memory, color_count = _colors(colors, 4)
+    if not count:
+        return
+    if color_count != count:
+        raise ValueError("Expected four colors per rect")
+    _fill_rects_multi_color(
+        canvas, _address(rect_memory), count, _address(color_memory)
+    )
+
+
+def stroke_polylines(
+    canvas: CommandBuffer,
+    points: Any,
+    colors: Any,
+    line_thickness: float = 1.0,
+    counts: Optional[Sequence[int]] = None,
+    closed: bool = False,
+) -> None:
+    """
+    Strokes several polylines, or closed polygons if `closed` is set, in one
+    call. `points` is either an (m, n, 2) array of m lines with n points each,
+    an (n, 2) array with the lines one after the other and `counts` giving the
+    number of points of each, or a sequence of (n, 2) arrays, which are joined
+    first.
+    """
+    memory, count_memory, count = _counts(points, counts)
+    color_memory, color_count = _colors(colors)
+    if not count:
+        return
+    _check_colors(color_count, count)
+    _stroke_polylines(
+        canvas,
+        _address(memory),
+        ctypes.addressof(count_memory),
+        count,
+        int(closed),
+        line_thickness,
+        _address(color_memory),
+        color_count,
+    )
+
+
+def fill_polygons(
+    canvas: CommandBuffer,
+    points: Any,
+    colors: Any,
+    counts: Optional[Sequence[int]] = None,
+) -> None:
+    """
+    Fills several convex polygons in one call, with `points` and `counts`
+    laid out as for `stroke_polylines`.
+    """
+    memory, count_memory, count = _counts(points, counts)
+    color_memory, color_count = _colors(colors)
+    if not count:
+        return
+    _check_colors(color_count, count)
+    _fill_polygons(
+        canvas,
+        _address(memory),
+        ctypes.addressof(count_memory),
+        count,
+        _address(color_memory),
+        color_count,
+    )
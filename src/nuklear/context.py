@@ -0,0 +1,283 @@
+"""
+Context lifetime and multi-context support.
+
+Nuklear keeps all of its state inside a `struct nk_context`, and the library is
+loaded through `ctypes.CDLL`, which releases the GIL for the duration of every
+foreign call. Independent contexts can therefore be driven from different
+threads at the same time, as long as each context is only used by one thread
+at a time. `Context.lock` guards a context for that purpose and `build_frames`
+builds the frames of several contexts concurrently on a thread pool.
+
+Nothing in `nuklear` keeps module-level mutable state that is shared between
+contexts: scratch buffers and the callbacks Nuklear holds pointers to (fonts,
+allocators, ...) are owned by the `Context` they belong to.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import threading
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+from nuklear.library import nuklear as nk
+from nuklear.types import AllocationStats
+from nuklear.types import Allocator
+from nuklear.types import Bool
+from nuklear.types import Size
+from nuklear.types import UserFont
+
+T = TypeVar("T")
+
+# ==============================================================================
+#
+#                                    CONTEXT
+#
+# ==============================================================================
+
+if hasattr(nk, "nk_py_sizeof_context"):
+    nk.nk_py_sizeof_context.argtypes = ()
+    nk.nk_py_sizeof_context.restype = Size
+
+
+class Context:
+    """
+    Owns the memory of a `struct nk_context` and everything Nuklear keeps a
+    pointer to while the context is alive.
+
+    Instances can be passed directly to the wrapped Nuklear functions. A context
+    must only be used by one thread at a time; hold `lock` (or use the context
+    as a context manager) while building a frame on it.
+    """
+
+    class Struct(ctypes.Structure):
+        """
+        Opaque declaration for:
+            struct nk_context;
+        """
+
+    def __init__(self):
+        if not hasattr(nk, "nk_py_sizeof_context"):
+            raise RuntimeError(
+                "Nuklear library was built without the nuklearPy shim, "
+                "rebuild it with build_library.py"
+            )
+        self._memory = (ctypes.c_ubyte * nk.nk_py_sizeof_context())()
+        self._as_parameter_ = ctypes.cast(self._memory, ctypes.POINTER(Context.Struct))
+
+        self.lock = threading.RLock()
+
+        self._objects: Dict[str, Any] = {}
+        self._scratch = (ctypes.c_ubyte * 0)()
+
+    def __enter__(self) -> Context:
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.lock.release()
+
+    def keep_alive(self, key: str, obj: T) -> T:
+        """
+        Stores `obj` under `key` for as long as the context lives, replacing the
+        previous object stored under the same key. Used for C structs and
+        callbacks that Nuklear only keeps a pointer to.
+        """
+        self._objects[key] = obj
+        return obj
+
+    def scratch(self, size: int) -> ctypes.Array:
+        """
+        Returns a scratch buffer of at least `size` bytes owned by this context.
+
+        The buffer is reused between calls, so its contents are only valid until
+        the next call to `scratch`.
+        """
+        if len(self._scratch) < size:
+            capacity = max(size, 2 * len(self._scratch), 256)
+            self._scratch = (ctypes.c_ubyte * capacity)()
+        return self._scratch
+
+
+def _user_font_p(ctx: Context, font: Optional[Union[UserFont, UserFont.Struct]]):
+    if font is None:
+        return None
+    if isinstance(font, UserFont):
+        font = font.to_c()
+    return ctypes.pointer(ctx.keep_alive("font", font))
+
+
+nk.nk_init_default.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(UserFont.Struct),
+)
+nk.nk_init_default.restype = Bool
+
+
+def init_default(
+    ctx: Context, font: Optional[Union[UserFont, UserFont.Struct]] = None
+) -> bool:
+    """
+    Initializes a `Context` with the default standard library allocator.
+    Wrapper for:
+        nk_bool nk_init_default(struct nk_context*, const struct nk_user_font*);
+    """
+    return nk.nk_init_default(ctx, _user_font_p(ctx, font))
+
+
+nk.nk_init_fixed.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_void_p,
+    Size,
+    ctypes.POINTER(UserFont.Struct),
+)
+nk.nk_init_fixed.restype = Bool
+
+
+def init_fixed(
+    ctx: Context,
+    memory: ctypes.Array,
+    font: Optional[Union[UserFont, UserFont.Struct]] = None,
+) -> bool:
+    """
+    Initializes a `Context` from a single fixed size memory block, which is kept
+    alive by the context.
+    Wrapper for:
+        nk_bool nk_init_fixed(struct nk_context*, void *memory, nk_size size, const struct nk_user_font*);
+    """  # noqa: E501
+    ctx.keep_alive("memory", memory)
+    return nk.nk_init_fixed(
+        ctx,
+        ctypes.addressof(memory),
+        ctypes.sizeof(memory),
+        _user_font_p(ctx, font),
+    )
+
+
+nk.nk_init.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(Allocator.Struct),
+    ctypes.POINTER(UserFont.Struct),
+)
+nk.nk_init.restype = Bool
+
+
+def init(
+    ctx: Context,
+    alloc: Union[Allocator, Allocator.Struct],
+    font: Optional[Union[UserFont, UserFont.Struct]] = None,
+) -> bool:
+    """
+    Initializes a `Context` with memory allocation callbacks for Nuklear to
+    allocate memory from. The allocator is kept alive by the context.
+    Wrapper for:
+        nk_bool nk_init(struct nk_context*, struct nk_allocator*, const struct nk_user_font*);
+    """  # noqa: E501
+    if isinstance(alloc, Allocator):
+        alloc = alloc.to_c()
+    alloc_c = ctx.keep_alive("allocator", alloc)
+    return nk.nk_init(ctx, ctypes.pointer(alloc_c), _user_font_p(ctx, font))
+
+
+if hasattr(nk, "nk_py_counting_allocator"):
+    nk.nk_py_counting_allocator.argtypes = (
+        ctypes.POINTER(Allocator.Struct),
+        ctypes.POINTER(AllocationStats.Struct),
+    )
+    nk.nk_py_counting_allocator.restype = None
+
+
+def init_counting(
+    ctx: Context, font: Optional[Union[UserFont, UserFont.Struct]] = None
+) -> AllocationStats.Struct:
+    """
+    Initializes a `Context` with the standard library allocator wrapped in
+    counters, and returns the live counters, which are updated in place by every
+    allocation Nuklear makes. Counting happens in C, so it adds no Python
+    overhead to the frame.
+    """
+    if not hasattr(nk, "nk_py_counting_allocator"):
+        raise RuntimeError(
+            "Nuklear library was built without the nuklearPy shim, "
+            "rebuild it with build_library.py"
+        )
+    stats = ctx.keep_alive("allocation_stats", AllocationStats.Struct())
+    alloc = Allocator.Struct()
+    nk.nk_py_counting_allocator(ctypes.pointer(alloc), ctypes.pointer(stats))
+    if not init(ctx, alloc, font):
+        raise RuntimeError("Failed to initialize the Nuklear context")
+    return stats
+
+
+nk.nk_clear.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_clear.restype = None
+
+
+def clear(ctx: Context) -> None:
+    """
+    Resets the context state at the end of the frame.
+    Wrapper for:
+        void nk_clear(struct nk_context*);
+    """
+    nk.nk_clear(ctx)
+
+
+nk.nk_free.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_free.restype = None
+
+
+def free(ctx: Context) -> None:
+    """
+    Frees all memory allocated by Nuklear and releases everything the context
+    kept alive.
+    Wrapper for:
+        void nk_free(struct nk_context*);
+    """
+    nk.nk_free(ctx)
+    ctx._objects.clear()
+
+
+if hasattr(nk, "nk_py_set_delta_time"):
+    nk.nk_py_set_delta_time.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_float)
+    nk.nk_py_set_delta_time.restype = None
+
+    nk.nk_py_get_delta_time.argtypes = (ctypes.POINTER(Context.Struct),)
+    nk.nk_py_get_delta_time.restype = ctypes.c_float
+
+
+def set_delta_time_seconds(ctx: Context, seconds: float) -> None:
+    """
+    Sets `delta_time_seconds` of the context, which drives time based behavior
+    such as key repeat and tooltips. Set it before every frame.
+    """
+    nk.nk_py_set_delta_time(ctx, seconds)
+
+
+def get_delta_time_seconds(ctx: Context) -> float:
+    return nk.nk_py_get_delta_time(ctx)
+
+
+def build_frames(
+    contexts: Sequence[Context],
+    build: Callable[[Context], T],
+    executor: Optional[Executor] = None,
+) -> List[T]:
+    """
+    Calls `build` once for every context, concurrently, while holding that
+    context's lock, and returns the results in the order of `contexts`.
+
+    `build` is expected to feed input and declare the widgets of one frame; the
+    resulting draw commands stay in the context until it is cleared. Pass a
+    long-lived `executor` when building frames repeatedly, otherwise a thread
+    pool with one worker per context is created for the call.
+    """
+
+    def _build(ctx: Context) -> T:
+        with ctx:
+            return build(ctx)
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max(len(contexts), 1)) as executor:
+            return list(executor.map(_build, contexts))
+    return list(executor.map(_build, contexts))
@@ -0,0 +1,209 @@
+"""
+Dirty-rectangle tracking between consecutive frames.
+
+`DamageTracker` compares the draw commands of a frame with those of the
+previous frame. Every command that was added, removed, changed, moved, or
+drawn in a different order contributes its bounding box, clipped to the active
+scissor rect. Those boxes are merged into a small set of `Rect`s, so backends
+only rasterize and transfer the parts of the surface that changed.
+"""
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import List, Optional, Sequence, Tuple
+
+from nuklear.context import Context
+from nuklear.drawing import COMMAND_VIEWS
+from nuklear.drawing import command_bytes
+from nuklear.drawing import walk_commands
+from nuklear.types import CommandType
+from nuklear.types import Rect
+
+# An axis aligned box as (x0, y0, x1, y1) with exclusive maximum.
+Box = Tuple[int, int, int, int]
+
+
+def _union(a: Box, b: Box) -> Box:
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _intersect(a: Box, b: Box) -> Optional[Box]:
+    box = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None
+    return box
+
+
+def _area(box: Box) -> int:
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _points_box(points, pad: int) -> Box:
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1
+
+
+def _rect_box(x: int, y: int, w: int, h: int, pad: int) -> Box:
+    return x - pad, y - pad, x + w + pad + 1, y + h + pad + 1
+
+
+def command_box(command, margin: int = 1) -> Optional[Box]:
+    """
+    Returns the box covered by a command view, grown by its line thickness
+    and `margin` pixels of anti-aliasing, or `None` for commands that do not
+    draw anything.
+    """
+    kind = command.header.type
+    if kind in (CommandType.COMMAND_NOP, CommandType.COMMAND_SCISSOR):
+        return None
+    pad = getattr(command, "line_thickness", 0) + margin
+    if kind == CommandType.COMMAND_LINE:
+        return _points_box((command.begin, command.end), pad)
+    if kind == CommandType.COMMAND_CURVE:
+        points = (command.begin, command.end, command.ctrl[0], command.ctrl[1])
+        return _points_box(points, pad)
+    if kind in (CommandType.COMMAND_TRIANGLE, CommandType.COMMAND_TRIANGLE_FILLED):
+        return _points_box((command.a, command.b, command.c), pad)
+    if kind in (CommandType.COMMAND_ARC, CommandType.COMMAND_ARC_FILLED):
+        r = command.r
+        return _rect_box(command.cx - r, command.cy - r, 2 * r, 2 * r, pad)
+    if kind in (
+        CommandType.COMMAND_POLYGON,
+        CommandType.COMMAND_POLYGON_FILLED,
+        CommandType.COMMAND_POLYLINE,
+    ):
+        if not command.point_count:
+            return None
+        return _points_box(command.vertices(), pad)
+    return _rect_box(command.x, command.y, command.w, command.h, pad)
+
+
+def merge_boxes(boxes: Sequence[Box], max_boxes: Optional[int] = None) -> List[Box]:
+    """
+    Merges overlapping boxes, and boxes whose union is no larger than the two
+    of them together, until no such pair is left. If more than `max_boxes`
+    remain, the pairs whose union adds the least area are merged until the
+    limit is met.
+    """
+    result = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        i = 0
+        while i < len(result):
+            j = i + 1
+            while j < len(result):
+                a, b = result[i], result[j]
+                union = _union(a, b)
+                if _intersect(a, b) or _area(union) <= _area(a) + _area(b):
+                    result[i] = union
+                    del result[j]
+                    merged = True
+                else:
+                    j += 1
+            i += 1
+
+    while max_boxes is not None and len(result) > max(max_boxes, 1):
+        best = None
+        for i in range(len(result)):
+            for j in range(i + 1, len(result)):
+                union = _union(result[i], result[j])
+                cost = _area(union) - _area(result[i]) - _area(result[j])
+                if best is None or cost < best[0]:
+                    best = cost, i, j, union
+        _, i, j, union = best
+        result[i] = union
+        del result[j]
+    return result
+
+
+# A drawn command: what it draws (its type, the bytes of its fields, and the clip
+# rect it is drawn with) and the box it covers.
+_Item = Tuple[Tuple[int, bytes, Optional[Box]], Optional[Box]]
+
+
+def _frame_items(ctx: Context, margin: int) -> List[_Item]:
+    items = []
+    clip: Optional[Box] = None
+    views = COMMAND_VIEWS
+    for kind, address in walk_commands(ctx):
+        if not 0 < kind < len(views):
+            continue
+        command = views[kind].from_address(address)
+        if kind == CommandType.COMMAND_SCISSOR:
+            clip = (
+                command.x,
+                command.y,
+                command.x + command.w,
+                command.y + command.h,
+            )
+            continue
+        data = command_bytes(kind, address)
+        box = command_box(command, margin)
+        if box is not None and clip is not None:
+            box = _intersect(box, clip)
+        items.append(((kind, data, clip), box))
+    return items
+
+
+class DamageTracker:
+    """
+    Computes the regions that changed between consecutive frames of one
+    context.
+
+    Call `update` once per frame, after the frame is built and before the
+    context is cleared. The first frame, and the first after `reset`, is
+    damaged wherever something is drawn. `max_rects` bounds the number of
+    returned rects; `margin` grows every command box to cover anti-aliasing.
+    """
+
+    def __init__(self, max_rects: Optional[int] = 16, margin: int = 1):
+        self.max_rects = max_rects
+        self.margin = margin
+
+        self._items: Optional[List[_Item]] = None
+
+        self.frames = 0
+        self.dirty_area = 0
+
+    def reset(self) -> None:
+        """Forgets the previous frame, so the next one is damaged everywhere."""
+        self._items = None
+
+    def update(self, ctx: Context, bounds: Optional[Rect] = None) -> List[Rect]:
+        """
+        Returns the merged dirty rects of the current frame of `ctx`, clipped to
+        `bounds` if given, and remembers the frame for the next comparison.
+        """
+        items = _frame_items(ctx, self.margin)
+        previous = self._items or []
+        self._items = items
+
+        boxes = []
+        if not previous:
+            boxes = [box for _, box in items if box is not None]
+        else:
+            matcher = SequenceMatcher(
+                None, [key for key, _ in previous], [key for key, _ in items], False
+            )
+            for tag, i0, i1, j0, j1 in matcher.get_opcodes():
+                if tag == "equal":
+                    continue
+                boxes.extend(box for _, box in previous[i0:i1] if box is not None)
+                boxes.extend(box for _, box in items[j0:j1] if box is not None)
+
+        if bounds is not None:
+            limit = (
+                int(bounds.x),
+                int(bounds.y),
+                int(bounds.x + bounds.w),
+                int(bounds.y + bounds.h),
+            )
+            boxes = [b for b in (_intersect(box, limit) for box in boxes) if b]
+
+        merged = merge_boxes(boxes, self.max_rects)
+        self.frames += 1
+        self.dirty_area += sum(_area(box) for box in merged)
+        return [Rect(x0, y0, x1 - x0, y1 - y0) for x0, y0, x1, y1 in merged]
@@ -0,0 +1,841 @@
+"""
+Access to the draw output of a frame.
+
+`commands` yields every `nk_command` of the current frame as a typed ctypes
+view (`CommandRect`, `CommandText`, ...) created directly over the command
+buffer of the context, so no command is ever copied. The view type is looked up
+in `COMMAND_VIEWS`, which is indexed by `CommandType`. Views are only valid
+until the context is cleared.
+
+`Converter` runs `nk_convert` into persistent buffers laid out by a
+`VertexLayout` and exposes the vertices, elements and draw commands as NumPy
+arrays (or memoryviews when NumPy is not installed) over those buffers.
+"""
+
+from __future__ import annotations
+
+import copy
+import ctypes
+import struct
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from nuklear.buffer import Buffer
+from nuklear.buffer import buffer_clear
+from nuklear.buffer import buffer_init_fixed
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.types import Command
+from nuklear.types import CommandArc
+from nuklear.types import CommandArcFilled
+from nuklear.types import CommandCircle
+from nuklear.types import CommandCircleFilled
+from nuklear.types import CommandCurve
+from nuklear.types import CommandCustom
+from nuklear.types import CommandImage
+from nuklear.types import CommandLine
+from nuklear.types import CommandPolygon
+from nuklear.types import CommandPolygonFilled
+from nuklear.types import CommandPolyline
+from nuklear.types import CommandRect
+from nuklear.types import CommandRectFilled
+from nuklear.types import CommandRectMultiColor
+from nuklear.types import CommandScissor
+from nuklear.types import CommandText
+from nuklear.types import CommandTriangle
+from nuklear.types import CommandTriangleFilled
+from nuklear.types import ConvertConfig
+from nuklear.types import ConvertResult
+from nuklear.types import DrawCommand
+from nuklear.types import DrawVertexLayoutAttribute
+from nuklear.types import DrawVertexLayoutElement
+from nuklear.types import DrawVertexLayoutFormat
+from nuklear.types import Flags
+from nuklear.types import Size
+from nuklear.types import Vec2i
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    np = None
+
+# ==============================================================================
+#
+#                                    DRAWING
+#
+# ==============================================================================
+
+COMMAND_VIEWS: Tuple[Type[ctypes.Structure], ...] = (
+    Command,  # COMMAND_NOP
+    CommandScissor,
+    CommandLine,
+    CommandCurve,
+    CommandRect,
+    CommandRectFilled,
+    CommandRectMultiColor,
+    CommandCircle,
+    CommandCircleFilled,
+    CommandArc,
+    CommandArcFilled,
+    CommandTriangle,
+    CommandTriangleFilled,
+    CommandPolygon,
+    CommandPolygonFilled,
+    CommandPolyline,
+    CommandText,
+    CommandImage,
+    CommandCustom,
+)
+
+# Layout of `Command` for reading command headers without creating ctypes objects.
+_HEADER = struct.Struct("@iN")
+assert _HEADER.size == ctypes.sizeof(Command)
+
+nk.nk__begin.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk__begin.restype = ctypes.c_void_p
+
+nk.nk__next.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_void_p)
+nk.nk__next.restype = ctypes.c_void_p
+
+
+if hasattr(nk, "nk_py_command_memory"):
+    nk.nk_py_command_memory.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(Size),
+    )
+    nk.nk_py_command_memory.restype = ctypes.c_void_p
+
+    def walk_commands(ctx: Context) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the type and address of every draw command of the current frame,
+        in drawing order, without creating any ctypes objects.
+        """
+        # Only the first command is requested from the library, the rest of
+        # the buffer is walked through the `next` offsets of the headers.
+        address = nk.nk__begin(ctx)
+        if not address:
+            return
+        allocated = Size(0)
+        base = nk.nk_py_command_memory(ctx, ctypes.byref(allocated))
+        allocated = allocated.value
+        memory = (ctypes.c_ubyte * allocated).from_address(base)
+        unpack = _HEADER.unpack_from
+
+        offset = address - base
+        while True:
+            kind, offset_next = unpack(memory, offset)
+            yield kind, base + offset
+            if offset_next >= allocated:
+                return
+            offset = offset_next
+
+else:
+
+    def walk_commands(ctx: Context) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the type and address of every draw command of the current frame,
+        in drawing order.
+        """
+        # Without the nuklearPy shim every command costs one `nk__next` call.
+        address = nk.nk__begin(ctx)
+        while address:
+            yield Command.from_address(address).type, address
+            address = nk.nk__next(ctx, address)
+
+
+def commands(ctx: Context) -> Iterator[ctypes.Structure]:
+    """
+    Yields a typed view over every draw command of the current frame, in
+    drawing order. Unknown command types are yielded as plain `Command`s.
+    """
+    views = COMMAND_VIEWS
+    count = len(views)
+    for kind, address in walk_commands(ctx):
+        if 0 <= kind < count:
+            yield views[kind].from_address(address)
+        else:
+            yield Command.from_address(address)
+
+
+def dispatch_commands(
+    ctx: Context, handlers: Mapping[int, Callable[[Any], None]]
+) -> int:
+    """
+    Calls `handlers[command_type](view)` for every draw command of the current
+    frame and returns the number of commands. Views are only created for
+    commands that have a handler.
+    """
+    table = [
+        (COMMAND_VIEWS[kind], handlers[kind]) if kind in handlers else None
+        for kind in range(len(COMMAND_VIEWS))
+    ]
+    count = len(table)
+    total = 0
+    for kind, address in walk_commands(ctx):
+        total += 1
+        entry = table[kind] if 0 <= kind < count else None
+        if entry is not None:
+            view, handler = entry
+            handler(view.from_address(address))
+    return total
+
+
+_POINTS = (CommandPolygon, CommandPolygonFilled, CommandPolyline)
+
+
+def command_size(kind: int, address: int) -> int:
+    """
+    Returns the number of bytes of the command of type `kind` at `address` up to
+    its last field, including the points of polygons and the string of text
+    commands.
+    """
+    view = COMMAND_VIEWS[kind] if 0 <= kind < len(COMMAND_VIEWS) else Command
+    if view in _POINTS:
+        count = view.from_address(address).point_count
+        return view.points.offset + count * ctypes.sizeof(Vec2i.Struct)
+    if view is CommandText:
+        return CommandText.string.offset + CommandText.from_address(address).length
+    return ctypes.sizeof(view)
+
+
+def _field_spans(view: Type[ctypes.Structure], base: int = 0):
+    # (offset, size) of every field of `view`, leaving out the padding between
+    # them, which holds leftovers from earlier frames. The header's `next`
+    # offset follows from the commands before it, and the size of the trailing
+    # points or string depends on the command (None).
+    for name, kind in view._fields_:
+        field = getattr(view, name)
+        if view is Command and name == "next":
+            continue
+        if name in ("points", "string"):
+            yield base + field.offset, None
+        elif isinstance(kind, type) and issubclass(kind, ctypes.Structure):
+            yield from _field_spans(kind, base + field.offset)
+        else:
+            yield base + field.offset, field.size
+
+
+_FIELD_SPANS = [tuple(_field_spans(view)) for view in COMMAND_VIEWS]
+
+
+def command_bytes(kind: int, address: int) -> bytes:
+    """
+    Returns the fields of the command of type `kind` at `address` as bytes,
+    including its points or string but not the padding between the fields or
+    the `next` offset of its header. Two commands draw the same exactly when
+    their bytes are equal.
+    """
+    spans = _FIELD_SPANS[kind if 0 <= kind < len(_FIELD_SPANS) else 0]
+    parts = []
+    for offset, size in spans:
+        if size is None:
+            size = command_size(kind, address) - offset
+        parts.append(ctypes.string_at(address + offset, size))
+    return b"".join(parts)
+
+
+if hasattr(nk, "nk_py_command_hash"):
+    nk.nk_py_command_hash.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(Size),
+    )
+    nk.nk_py_command_hash.restype = ctypes.c_ulonglong
+
+    def command_signature(ctx: Context) -> Hashable:
+        """
+        Returns a value that is equal for two frames exactly when they draw the
+        same commands, computed as a 64-bit hash over the fields of every
+        command.
+        """
+        size = Size(0)
+        return nk.nk_py_command_hash(ctx, ctypes.byref(size)), size.value
+
+else:
+
+    def command_signature(ctx: Context) -> Hashable:
+        """
+        Returns a value that is equal for two frames exactly when they draw the
+        same commands. The library was built without the nuklearPy shim, so
+        this is a copy of the fields of every command.
+        """
+        return b"".join(
+            command_bytes(kind, address) for kind, address in walk_commands(ctx)
+        )
+
+
+# Component type (as a NumPy type string) and count of every vertex format.
+# Position and texture coordinates always have two components.
+_SCALAR_FORMATS: Dict[int, str] = {
+    DrawVertexLayoutFormat.FORMAT_SCHAR: "i1",
+    DrawVertexLayoutFormat.FORMAT_SSHORT: "i2",
+    DrawVertexLayoutFormat.FORMAT_SINT: "i4",
+    DrawVertexLayoutFormat.FORMAT_UCHAR: "u1",
+    DrawVertexLayoutFormat.FORMAT_USHORT: "u2",
+    DrawVertexLayoutFormat.FORMAT_UINT: "u4",
+    DrawVertexLayoutFormat.FORMAT_FLOAT: "f4",
+    DrawVertexLayoutFormat.FORMAT_DOUBLE: "f8",
+}
+_COLOR_FORMATS: Dict[int, Tuple[str, int]] = {
+    DrawVertexLayoutFormat.FORMAT_R8G8B8: ("u1", 3),
+    DrawVertexLayoutFormat.FORMAT_R16G15B16: ("u2", 3),
+    DrawVertexLayoutFormat.FORMAT_R32G32B32: ("u4", 3),
+    DrawVertexLayoutFormat.FORMAT_R8G8B8A8: ("u1", 4),
+    DrawVertexLayoutFormat.FORMAT_B8G8R8A8: ("u1", 4),
+    DrawVertexLayoutFormat.FORMAT_R16G15B16A16: ("u2", 4),
+    DrawVertexLayoutFormat.FORMAT_R32G32B32A32: ("u4", 4),
+    DrawVertexLayoutFormat.FORMAT_R32G32B32A32_FLOAT: ("f4", 4),
+    DrawVertexLayoutFormat.FORMAT_R32G32B32A32_DOUBLE: ("f8", 4),
+    DrawVertexLayoutFormat.FORMAT_RGB32: ("u4", 1),
+    DrawVertexLayoutFormat.FORMAT_RGBA32: ("u4", 1),
+}
+_ATTRIBUTE_NAMES: Dict[int, str] = {
+    DrawVertexLayoutAttribute.VERTEX_POSITION: "position",
+    DrawVertexLayoutAttribute.VERTEX_COLOR: "color",
+    DrawVertexLayoutAttribute.VERTEX_TEXCOORD: "uv",
+}
+
+# Type of `nk_draw_index`, as NK_UINT_DRAW_INDEX is not defined.
+DrawIndex = ctypes.c_ushort
+
+
+def _component(attribute: int, fmt: int) -> Tuple[str, int]:
+    if attribute == DrawVertexLayoutAttribute.VERTEX_COLOR:
+        if fmt not in _COLOR_FORMATS:
+            raise ValueError(f"Format {fmt} is not a color format")
+        return _COLOR_FORMATS[fmt]
+    if attribute not in _ATTRIBUTE_NAMES:
+        raise ValueError(f"Unknown vertex attribute: {attribute}")
+    if fmt not in _SCALAR_FORMATS:
+        raise ValueError(f"Format {fmt} is not a scalar format")
+    return _SCALAR_FORMATS[fmt], 2
+
+
+class VertexLayout:
+    """
+    Declarative layout of the vertices written by `nk_convert`.
+
+    `attributes` lists `(attribute, format)` pairs in the order they appear in
+    a vertex. Offsets, the vertex size and its alignment are derived from the
+    formats with natural alignment, as a C compiler would lay out the matching
+    struct. Attributes that are left out are not written by Nuklear.
+    """
+
+    def __init__(self, attributes: Sequence[Tuple[int, int]]):
+        self.elements = []
+        names, formats, offsets = [], [], []
+        offset = 0
+        alignment = 1
+        for attribute, fmt in attributes:
+            kind, count = _component(attribute, fmt)
+            size = int(kind[1:])
+            offset = (offset + size - 1) // size * size
+            alignment = max(alignment, size)
+            self.elements.append(DrawVertexLayoutElement(attribute, fmt, offset))
+            names.append(_ATTRIBUTE_NAMES[attribute])
+            formats.append((kind, count) if count > 1 else kind)
+            offsets.append(offset)
+            offset += size * count
+        if len(set(names)) != len(names):
+            raise ValueError("Every vertex attribute may only appear once")
+
+        self.size = (offset + alignment - 1) // alignment * alignment
+        self.alignment = alignment
+
+        array = (DrawVertexLayoutElement.Struct * (len(self.elements) + 1))()
+        for i, element in enumerate(self.elements):
+            array[i] = element.to_c()
+        array[-1] = DrawVertexLayoutElement().to_c()  # NK_VERTEX_LAYOUT_END
+        self._array = array
+
+        self.dtype = None
+        if np is not None:
+            self.dtype = np.dtype(
+                {
+                    "names": names,
+                    "formats": formats,
+                    "offsets": offsets,
+                    "itemsize": self.size,
+                }
+            )
+
+    @classmethod
+    def default(cls) -> VertexLayout:
+        """Float position and texture coordinates with an RGBA8 color."""
+        return cls(
+            (
+                (
+                    DrawVertexLayoutAttribute.VERTEX_POSITION,
+                    DrawVertexLayoutFormat.FORMAT_FLOAT,
+                ),
+                (
+                    DrawVertexLayoutAttribute.VERTEX_TEXCOORD,
+                    DrawVertexLayoutFormat.FORMAT_FLOAT,
+                ),
+                (
+                    DrawVertexLayoutAttribute.VERTEX_COLOR,
+                    DrawVertexLayoutFormat.FORMAT_R8G8B8A8,
+                ),
+            )
+        )
+
+    def apply(self, config: ConvertConfig.Struct) -> ConvertConfig.Struct:
+        """Points `config` at this layout, which must outlive the conversion."""
+        config.vertex_layout = ctypes.cast(
+            self._array, ctypes.POINTER(DrawVertexLayoutElement.Struct)
+        )
+        config.vertex_size = self.size
+        config.vertex_alignment = self.alignment
+        return config
+
+
+nk.nk_convert.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(Buffer.Struct),
+    ctypes.POINTER(Buffer.Struct),
+    ctypes.POINTER(Buffer.Struct),
+    ctypes.POINTER(ConvertConfig.Struct),
+)
+nk.nk_convert.restype = Flags
+
+
+def convert(
+    ctx: Context,
+    cmds: Buffer,
+    vertices: Buffer,
+    elements: Buffer,
+    config: ConvertConfig,
+    layout: VertexLayout,
+) -> int:
+    """
+    Converts the draw commands of the current frame into vertices, elements and
+    draw commands, returning a combination of `ConvertResult` flags.
+    Wrapper for:
+        nk_flags nk_convert(struct nk_context*, struct nk_buffer *cmds, struct nk_buffer *vertices, struct nk_buffer *elements, const struct nk_convert_config*);
+    """  # noqa: E501
+    config_c = layout.apply(config.to_c())
+    return nk.nk_convert(ctx, cmds, vertices, elements, ctypes.pointer(config_c))
+
+
+nk.nk__draw_begin.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(Buffer.Struct),
+)
+nk.nk__draw_begin.restype = ctypes.c_void_p
+
+nk.nk__draw_end.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(Buffer.Struct),
+)
+nk.nk__draw_end.restype = ctypes.c_void_p
+
+
+def draw_commands(ctx: Context, cmds: Buffer) -> Sequence[Any]:
+    """
+    Returns the draw commands produced by the last `convert` into `cmds`, in
+    drawing order, without copying them.
+
+    Nuklear stores the commands contiguously from the back of the buffer, so
+    the result is a reversed NumPy view with the fields of `DrawCommand`, or a
+    list of `DrawCommand.Struct` views when NumPy is not installed.
+    """
+    first = nk.nk__draw_begin(ctx, cmds)
+    if not first:
+        return [] if np is None else np.empty(0, DRAW_COMMAND_DTYPE)
+    last = nk.nk__draw_end(ctx, cmds)
+    count = (first - last) // ctypes.sizeof(DrawCommand.Struct) + 1
+    size = count * ctypes.sizeof(DrawCommand.Struct)
+    array = (DrawCommand.Struct * count).from_buffer(
+        cmds.view(last - cmds.address, size)
+    )
+    if np is None:
+        return list(reversed(array))
+    return np.frombuffer(array, DRAW_COMMAND_DTYPE)[::-1]
+
+
+# NumPy dtype of the draw commands returned by `draw_commands`, or None when
+# NumPy is not installed.
+DRAW_COMMAND_DTYPE: Optional[Any] = None
+if np is not None:
+    DRAW_COMMAND_DTYPE = np.dtype(
+        {
+            "names": ["elem_count", "clip_rect", "texture"],
+            "formats": ["u4", ("f4", 4), np.uintp],
+            "offsets": [
+                DrawCommand.Struct.elem_count.offset,
+                DrawCommand.Struct.clip_rect.offset,
+                DrawCommand.Struct.texture.offset,
+            ],
+            "itemsize": ctypes.sizeof(DrawCommand.Struct),
+        }
+    )
+
+
+@dataclass
+class DrawData:
+    """
+    Output of `Converter.convert`. The arrays are views over the buffers of the
+    converter and are overwritten by the next conversion.
+
+    With NumPy, `vertices` is a structured array with one field per layout
+    attribute (`position`, `uv`, `color`), `elements` an array of indices and
+    `commands` a structured array with the fields of `DrawCommand`. Without
+    NumPy they are memoryviews of the raw vertex bytes and of the indices, and
+    a list of `DrawCommand.Struct` views.
+    """
+
+    vertices: Any
+    elements: Any
+    commands: Sequence[Any]
+    vertex_count: int
+    element_count: int
+
+
+def _command_key(command) -> Tuple:
+    if np is None:
+        rect = command.clip_rect
+        return rect.x, rect.y, rect.w, rect.h, command.texture.ptr or 0
+    return (*command["clip_rect"].tolist(), int(command["texture"]))
+
+
+def _overlaps(a: Optional[Tuple], b: Optional[Tuple]) -> bool:
+    if a is None or b is None:
+        return False
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a: Optional[Tuple], b: Tuple) -> Tuple:
+    if a is None:
+        return b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+class _Batch:
+    __slots__ = ("key", "first", "box", "ranges")
+
+    def __init__(self, key: Tuple, first: int, box: Optional[Tuple]):
+        self.key = key
+        self.first = first
+        self.box = box
+        self.ranges = []
+
+
+class DrawBatcher:
+    """
+    Reduces the number of draw calls of a converted frame.
+
+    `nk_convert` starts a new draw command whenever the texture or the clip rect
+    changes, so interleaved text and shapes produce many short commands. `batch`
+    merges adjacent commands with the same texture and clip rect and, with
+    `reorder`, also moves a command back into an earlier compatible batch when
+    nothing drawn in between overlaps it, so the image stays the same. At most
+    `window` batches are searched for every command. Reordering needs NumPy;
+    without it only adjacent commands are merged.
+
+    `commands_in` and `commands_out` count the draw commands before and after
+    batching over all frames.
+    """
+
+    def __init__(self, reorder: bool = True, window: int = 16):
+        self.reorder = reorder
+        self.window = window
+        self._elements = None
+
+        self.commands_in = 0
+        self.commands_out = 0
+
+    @property
+    def calls_saved(self) -> int:
+        return self.commands_in - self.commands_out
+
+    def reset_stats(self) -> None:
+        self.commands_in = 0
+        self.commands_out = 0
+
+    def _bounds(self, data: DrawData, starts, counts) -> list:
+        # Bounding box of the vertices of every command, clipped to its scissor.
+        boxes: list = [None] * len(counts)
+        drawn = np.nonzero(counts)[0]
+        if not len(drawn):
+            return boxes
+        total = int(starts[-1] + counts[-1])
+        points = data.vertices["position"][data.elements[:total]]
+        low = np.minimum.reduceat(points, starts[drawn])
+        high = np.maximum.reduceat(points, starts[drawn])
+        clips = data.commands["clip_rect"][drawn]
+        low = np.maximum(low, clips[:, :2])
+        high = np.minimum(high, clips[:, :2] + clips[:, 2:])
+        for i, lo, hi in zip(drawn.tolist(), low.tolist(), high.tolist()):
+            if lo[0] < hi[0] and lo[1] < hi[1]:
+                boxes[i] = (*lo, *hi)
+        return boxes
+
+    def batch(self, data: DrawData) -> DrawData:
+        """Returns `data` with its draw commands batched."""
+        commands = data.commands
+        count = len(commands)
+        self.commands_in += count
+        reorder = self.reorder and np is not None
+        if np is None:
+            counts = [command.elem_count for command in commands]
+        else:
+            counts = commands["elem_count"].astype(np.intp)
+        starts = [0] * count
+        for i in range(1, count):
+            starts[i] = starts[i - 1] + int(counts[i - 1])
+        if reorder:
+            starts = np.array(starts, np.intp)
+            boxes = self._bounds(data, starts, counts)
+
+        batches = []
+        for i in range(count):
+            if not counts[i]:
+                continue
+            key = _command_key(commands[i])
+            box = boxes[i] if reorder else None
+            target = None
+            for batch in reversed(batches[-self.window :]):
+                if batch.key == key:
+                    target = batch
+                    break
+                if not reorder or _overlaps(batch.box, box):
+                    break
+            if target is None:
+                target = _Batch(key, i, box)
+                batches.append(target)
+            elif box is not None:
+                target.box = _union(target.box, box)
+            target.ranges.append((int(starts[i]), int(counts[i])))
+
+        self.commands_out += len(batches)
+        if len(batches) == count:
+            return data
+
+        ranges = [r for batch in batches for r in batch.ranges]
+        elements = data.elements
+        if ranges != sorted(ranges):
+            if self._elements is None or len(self._elements) < data.element_count:
+                self._elements = np.empty(data.element_count, elements.dtype)
+            reordered = self._elements
+            offset = 0
+            for start, length in ranges:
+                reordered[offset : offset + length] = elements[start : start + length]
+                offset += length
+            elements = reordered[:offset]
+
+        if np is None:
+            merged = []
+            for batch in batches:
+                command = DrawCommand.Struct.from_buffer_copy(commands[batch.first])
+                command.elem_count = sum(length for _, length in batch.ranges)
+                merged.append(command)
+        else:
+            merged = commands[[batch.first for batch in batches]]
+            merged["elem_count"] = [
+                sum(length for _, length in batch.ranges) for batch in batches
+            ]
+        return DrawData(
+            data.vertices, elements, merged, data.vertex_count, data.element_count
+        )
+
+
+_FULL = (
+    ConvertResult.CONVERT_COMMAND_BUFFER_FULL,
+    ConvertResult.CONVERT_VERTEX_BUFFER_FULL,
+    ConvertResult.CONVERT_ELEMENT_BUFFER_FULL,
+)
+
+
+class Converter:
+    """
+    Runs `nk_convert` into three persistent fixed-size buffers that are reused
+    from frame to frame. A buffer that turns out to be too small is doubled and
+    the conversion repeated, so after the first few frames no memory is
+    allocated at all.
+
+    `config` can be changed between conversions; its anti-aliasing and segment
+    counts trade tessellation cost against quality. If a `batcher` is given,
+    every conversion is passed through it.
+    """
+
+    def __init__(
+        self,
+        layout: Optional[VertexLayout] = None,
+        config: Optional[ConvertConfig] = None,
+        command_capacity: int = 16 * 1024,
+        vertex_capacity: int = 256 * 1024,
+        element_capacity: int = 64 * 1024,
+        batcher: Optional[DrawBatcher] = None,
+    ):
+        self.layout = layout or VertexLayout.default()
+        self.config = config or ConvertConfig()
+        self.batcher = batcher
+
+        self.cmds = Buffer()
+        self.vertices = Buffer()
+        self.elements = Buffer()
+        self._buffers = (self.cmds, self.vertices, self.elements)
+        for index, capacity in enumerate(
+            (command_capacity, vertex_capacity, element_capacity)
+        ):
+            buffer_init_fixed(self._buffers[index], self._allocate(index, capacity))
+
+    def _allocate(self, index: int, capacity: int) -> ctypes.Array:
+        # Memory for the command (0), vertex (1) or element (2) buffer.
+        return (ctypes.c_ubyte * capacity)()
+
+    def _grow(self, buffer: Buffer) -> None:
+        capacity = max(2 * buffer.capacity, buffer.needed)
+        index = self._buffers.index(buffer)
+        buffer_init_fixed(buffer, self._allocate(index, capacity))
+
+    def convert(self, ctx: Context) -> DrawData:
+        """Converts the current frame of `ctx`."""
+        config_c = self.layout.apply(self.config.to_c())
+        config_p = ctypes.pointer(config_c)
+        while True:
+            for buffer in self._buffers:
+                buffer_clear(buffer)
+            result = nk.nk_convert(
+                ctx, self.cmds, self.vertices, self.elements, config_p
+            )
+            if result & ConvertResult.CONVERT_INVALID_PARAM:
+                raise ValueError("nk_convert rejected the conversion parameters")
+            full = [b for flag, b in zip(_FULL, self._buffers) if result & flag]
+            if not full:
+                break
+            for buffer in full:
+                self._grow(buffer)
+        data = self._draw_data(ctx)
+        if self.batcher is not None:
+            data = self.batcher.batch(data)
+        return data
+
+    def _draw_data(self, ctx: Context) -> DrawData:
+        vertex_bytes = self.vertices.view()
+        element_bytes = self.elements.view()
+        vertex_count = len(vertex_bytes) // self.layout.size
+        element_count = len(element_bytes) // ctypes.sizeof(DrawIndex)
+        if np is not None:
+            vertices = np.frombuffer(vertex_bytes, self.layout.dtype, vertex_count)
+            elements = np.frombuffer(element_bytes, np.uint16, element_count)
+        else:
+            vertices = memoryview(vertex_bytes).cast("B")
+            elements = memoryview(element_bytes).cast("B").cast("H")
+        commands = draw_commands(ctx, self.cmds)
+        return DrawData(vertices, elements, commands, vertex_count, element_count)
+
+
+class FrameCache:
+    """
+    Skips converting and drawing frames that are identical to the previous one.
+
+    `render` compares the command buffer of the frame with the last one that
+    was drawn (see `command_signature`). Only when it changed, or when the
+    converter's configuration changed, is the frame converted and passed to
+    `draw`; otherwise the backend can keep presenting what it drew before and
+    `data` still holds the previous conversion.
+
+    `time_saved` estimates the time skipped frames would have cost from the
+    average cost of the frames that were drawn, while `check_seconds` is the
+    total spent on change detection.
+
+    Text commands are compared by their font pointer, not by the glyphs behind
+    it, so call `invalidate` after changing a font in place, e.g. when a
+    `nuklear.lazyfont.LazyFont` swaps in a rebaked atlas under the same user
+    font.
+    """
+
+    def __init__(self, converter: Optional[Converter] = None):
+        self.converter = converter or Converter()
+        self.data: Optional[DrawData] = None
+
+        self._signature: Optional[Hashable] = None
+        self._config: Optional[ConvertConfig] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.check_seconds = 0.0
+        self.draw_seconds = 0.0
+
+    @property
+    def frames(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.frames if self.frames else 0.0
+
+    @property
+    def time_saved(self) -> float:
+        if not self.misses:
+            return 0.0
+        return self.hits * self.draw_seconds / self.misses - self.check_seconds
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.check_seconds = 0.0
+        self.draw_seconds = 0.0
+
+    def invalidate(self) -> None:
+        """
+        Forces the next frame to be converted and drawn, required after a font
+        changed in place.
+        """
+        self._signature = None
+
+    def _check(self, ctx: Context) -> Optional[Hashable]:
+        # Returns the signature of the current frame if it has to be drawn.
+        start = time.perf_counter()
+        signature = command_signature(ctx)
+        changed = (
+            signature != self._signature
+            or self.converter.config != self._config
+            or self.data is None
+        )
+        self.check_seconds += time.perf_counter() - start
+        return signature if changed else None
+
+    def changed(self, ctx: Context) -> bool:
+        """
+        Returns whether the current frame of `ctx` differs from the last frame
+        that `render` drew.
+        """
+        return self._check(ctx) is not None
+
+    def render(
+        self, ctx: Context, draw: Optional[Callable[[DrawData], None]] = None
+    ) -> bool:
+        """
+        Converts the current frame of `ctx` and calls `draw` with the result
+        unless the frame is unchanged. Returns whether the frame was drawn.
+        """
+        signature = self._check(ctx)
+        if signature is None:
+            self.hits += 1
+            return False
+        start = time.perf_counter()
+        config = copy.deepcopy(self.converter.config)
+        data = self.converter.convert(ctx)
+        if draw is not None:
+            draw(data)
+        # The frame only counts as drawn once `draw` returned, so a frame whose
+        # conversion or drawing failed is drawn again.
+        self.data = data
+        self._signature = signature
+        self._config = config
+        self.draw_seconds += time.perf_counter() - start
+        self.misses += 1
+        return True
@@ -0,0 +1,287 @@
+"""
+Recording of rendered frames to disk without blocking the frame loop.
+
+`FrameExporter` takes RGBA8 frames, such as the `pixels` of a
+`nuklear.raster.Rasterizer`, copies them into a bounded queue and leaves
+encoding and writing to worker threads. When the queue is full the `drop`
+policy decides between waiting for the workers (backpressure), discarding the
+new frame or discarding the oldest queued one. PNG compression runs in `zlib`,
+which releases the GIL, so several workers encode concurrently.
+
+`MappedFrameWriter` is the raw alternative: frames are written straight into a
+memory-mapped file, which the renderer can also draw into directly.
+
+Raw file format, all values little-endian:
+
+    b"NKPYRAW1"
+    uint32 width, uint32 height, uint32 frame count
+    frame count frames of height rows of width RGBA8 pixels
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+FORMATS = ("ppm", "pam", "png", "rgba")
+
+DROP_BLOCK = "block"
+DROP_NEWEST = "newest"
+DROP_OLDEST = "oldest"
+
+RAW_MAGIC = b"NKPYRAW1"
+_RAW_HEADER = struct.Struct("<8sIII")
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def encode_png(pixels: np.ndarray, level: int = 6) -> bytes:
+    """Encodes a `height` x `width` x 4 RGBA8 array as a PNG image."""
+    height, width = pixels.shape[:2]
+    # Every row is prefixed with filter type 0 (none).
+    rows = np.zeros((height, width * 4 + 1), np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * 4)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def encode(pixels: np.ndarray, fmt: str, level: int = 6) -> bytes:
+    """Encodes a `height` x `width` x 4 RGBA8 array in one of `FORMATS`."""
+    height, width = pixels.shape[:2]
+    if fmt == "png":
+        return encode_png(pixels, level)
+    if fmt == "ppm":
+        header = f"P6\n{width} {height}\n255\n".encode("ascii")
+        return header + np.ascontiguousarray(pixels[..., :3]).tobytes()
+    if fmt == "pam":
+        header = (
+            f"P7\nWIDTH {width}\nHEIGHT {height}\n"
+            "DEPTH 4\nMAXVAL 255\nTUPLTYPE RGB_ALPHA\nENDHDR\n"
+        ).encode("ascii")
+        return header + pixels.tobytes()
+    if fmt == "rgba":
+        return pixels.tobytes()
+    raise ValueError(f"Unknown frame format: {fmt}")
+
+
+class FrameExporter:
+    """
+    Writes submitted frames to `<directory>/<prefix><index>.<fmt>` on
+    `workers` background threads.
+
+    At most `max_queue` frames wait for a worker. `drop` is `DROP_BLOCK` to make
+    `submit` wait for room, `DROP_NEWEST` to discard the submitted frame or
+    `DROP_OLDEST` to discard the oldest waiting frame instead. Frames keep the
+    index they were submitted with, so dropped frames show up as gaps. The first
+    error raised by a worker is raised again by `submit` or `close`.
+    """
+
+    def __init__(
+        self,
+        directory: Union[os.PathLike, str],
+        fmt: str = "png",
+        workers: int = 2,
+        max_queue: int = 8,
+        drop: str = DROP_BLOCK,
+        prefix: str = "frame",
+        level: int = 6,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown frame format: {fmt}")
+        if drop not in (DROP_BLOCK, DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown drop policy: {drop}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.drop = drop
+        self.prefix = prefix
+        self.level = level
+
+        self._queue: queue.Queue = queue.Queue(max(1, max_queue))
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None
+        self._threads: List[threading.Thread] = []
+        for i in range(max(1, workers)):
+            thread = threading.Thread(
+                target=self._work, name=f"nuklear-export-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+
+    def __enter__(self) -> FrameExporter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def path(self, index: int) -> Path:
+        return self.directory / f"{self.prefix}{index:06d}.{self.fmt}"
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            index, pixels = item
+            try:
+                data = encode(pixels, self.fmt, self.level)
+                with open(self.path(index), "wb") as file:
+                    file.write(data)
+                with self._lock:
+                    self.written += 1
+            except Exception as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, pixels: np.ndarray) -> bool:
+        """
+        Queues a copy of a `height` x `width` x 4 RGBA8 frame and returns whether
+        it was accepted. Only `DROP_NEWEST` ever rejects a frame.
+        """
+        self._raise()
+        item = self.submitted, np.array(pixels, np.uint8, copy=True)
+        self.submitted += 1
+        if self.drop == DROP_BLOCK:
+            self._queue.put(item)
+            return True
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                if self.drop == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            self._queue.task_done()
+            self.dropped += 1
+
+    @property
+    def pending(self) -> int:
+        """Number of frames waiting for a worker."""
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Waits until every accepted frame has been written."""
+        self._queue.join()
+        self._raise()
+
+    def close(self) -> None:
+        """Writes the remaining frames and stops the workers."""
+        if not self._threads:
+            return
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._raise()
+
+
+class MappedFrameWriter:
+    """
+    Captures raw RGBA8 frames into a memory-mapped file with room for
+    `capacity` frames.
+
+    `next_frame` returns a writable `height` x `width` x 4 view of the next slot,
+    so a renderer can write its pixels straight into the file (see
+    `Rasterizer.read_pixels`); `write` copies a finished frame instead. The
+    operating system writes the pages back in the background. Views may outlive
+    `close`, the file is then unmapped once the last of them is collected.
+    """
+
+    def __init__(
+        self, path: Union[os.PathLike, str], width: int, height: int, capacity: int
+    ):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.frame_size = width * height * 4
+        size = _RAW_HEADER.size + capacity * self.frame_size
+        with open(path, "wb+") as file:
+            file.truncate(size)
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(file.fileno(), size)
+        self._mmap[: _RAW_HEADER.size] = _RAW_HEADER.pack(RAW_MAGIC, width, height, 0)
+        self._frames = np.frombuffer(
+            self._mmap, np.uint8, capacity * self.frame_size, _RAW_HEADER.size
+        ).reshape(capacity, height, width, 4)
+        self.count = 0
+
+    def __enter__(self) -> MappedFrameWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def next_frame(self) -> np.ndarray:
+        """Claims the next frame slot and returns a view of it."""
+        if self._mmap is None:
+            raise ValueError("The mapped frame file is closed")
+        if self.count >= self.capacity:
+            raise IndexError("The mapped frame file is full")
+        frame = self._frames[self.count]
+        self.count += 1
+        struct.pack_into("<I", self._mmap, _RAW_HEADER.size - 4, self.count)
+        return frame
+
+    def write(self, pixels: np.ndarray) -> None:
+        self.next_frame()[...] = pixels
+
+    def close(self) -> None:
+        if self._mmap is None:
+            return
+        del self._frames
+        mapping, self._mmap = self._mmap, None
+        mapping.flush()
+        try:
+            mapping.close()
+        except BufferError:
+            # Frames returned by `next_frame` are still alive, the mapping is
+            # closed along with the last of them.
+            pass
+
+
+def read_raw_frames(path: Union[os.PathLike, str]) -> Tuple[np.ndarray, int, int]:
+    """
+    Maps a file written by `MappedFrameWriter` read-only and returns its frames
+    as a `count` x `height` x `width` x 4 array, with the width and height.
+    """
+    with open(path, "rb") as file:
+        magic, width, height, count = _RAW_HEADER.unpack(file.read(_RAW_HEADER.size))
+    if magic != RAW_MAGIC:
+        raise ValueError("Not a nuklearPy raw frame file")
+    frames = np.memmap(path, np.uint8, "r", _RAW_HEADER.size, (count, height, width, 4))
+    return frames, width, height
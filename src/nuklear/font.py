@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import ctypes
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.types import Allocator
+from nuklear.types import BakedFont
+from nuklear.types import Cursor
+from nuklear.types import DrawNullTexture
+from nuklear.types import FontAtlasFormat
+from nuklear.types import FontConfig
+from nuklear.types import FontGlyph
+from nuklear.types import Handle
+from nuklear.types import Recti
+from nuklear.types import Rune
+from nuklear.types import Size
+from nuklear.types import UserFont
+
+# ==============================================================================
+#
+#                                      FONT
+#
+# ==============================================================================
+
+CURSOR_COUNT = 7
+
+
+class Font:
+    """
+    Reference to a `struct nk_font` owned by a `FontAtlas`.
+
+    Wrapper for:
+        struct nk_font {
+            struct nk_font *next;
+            struct nk_user_font handle;
+            struct nk_baked_font info;
+            float scale;
+            struct nk_font_glyph *glyphs;
+            const struct nk_font_glyph *fallback;
+            nk_rune fallback_codepoint;
+            nk_handle texture;
+            struct nk_font_config *config;
+        };
+    """
+
+    class Struct(ctypes.Structure):
+        pass
+
+    def __init__(self, atlas: FontAtlas, pointer):
+        self.atlas = atlas
+        self._as_parameter_ = pointer
+
+    @property
+    def handle(self) -> UserFont.Struct:
+        """The `nk_user_font` to pass to a `Context`, pointing into the atlas."""
+        return self._as_parameter_.contents.handle
+
+    @property
+    def info(self) -> BakedFont:
+        return BakedFont.from_c(self._as_parameter_.contents.info)
+
+    @property
+    def scale(self) -> float:
+        return self._as_parameter_.contents.scale
+
+    def glyphs(self) -> List[FontGlyph]:
+        """Copies the glyph table of the font, only valid after baking."""
+        struct = self._as_parameter_.contents
+        return [
+            FontGlyph.from_c(struct.glyphs[i]) for i in range(struct.info.glyph_count)
+        ]
+
+
+Font.Struct._fields_ = (
+    ("next", ctypes.POINTER(Font.Struct)),
+    ("handle", UserFont.Struct),
+    ("info", BakedFont.Struct),
+    ("scale", ctypes.c_float),
+    ("glyphs", ctypes.POINTER(FontGlyph.Struct)),
+    ("fallback", ctypes.POINTER(FontGlyph.Struct)),
+    ("fallback_codepoint", Rune),
+    ("texture", Handle.Struct),
+    ("config", ctypes.POINTER(FontConfig.Struct)),
+)
+
+
+class FontAtlas:
+    """
+    Owns a `struct nk_font_atlas` together with the font data and glyph ranges
+    it points to.
+
+    Wrapper for:
+        struct nk_font_atlas {
+            void *pixel;
+            int tex_width;
+            int tex_height;
+            struct nk_allocator permanent;
+            struct nk_allocator temporary;
+            struct nk_recti custom;
+            struct nk_cursor cursors[NK_CURSOR_COUNT];
+            int glyph_count;
+            struct nk_font_glyph *glyphs;
+            struct nk_font *default_font;
+            struct nk_font *fonts;
+            struct nk_font_config *config;
+            int font_num;
+        };
+    """
+
+    class Struct(ctypes.Structure):
+        _fields_ = (
+            ("pixel", ctypes.c_void_p),
+            ("tex_width", ctypes.c_int),
+            ("tex_height", ctypes.c_int),
+            ("permanent", Allocator.Struct),
+            ("temporary", Allocator.Struct),
+            ("custom", Recti.Struct),
+            ("cursors", Cursor.Struct * CURSOR_COUNT),
+            ("glyph_count", ctypes.c_int),
+            ("glyphs", ctypes.POINTER(FontGlyph.Struct)),
+            ("default_font", ctypes.POINTER(Font.Struct)),
+            ("fonts", ctypes.POINTER(Font.Struct)),
+            ("config", ctypes.POINTER(FontConfig.Struct)),
+            ("font_num", ctypes.c_int),
+        )
+
+    def __init__(self):
+        self.struct = FontAtlas.Struct()
+        self._as_parameter_ = ctypes.pointer(self.struct)
+
+        self._objects: List[Any] = []
+
+    def keep_alive(self, obj: Any) -> Any:
+        """Keeps `obj` alive for as long as the atlas lives."""
+        self._objects.append(obj)
+        return obj
+
+    @property
+    def fonts(self) -> List[Font]:
+        fonts = []
+        pointer = self.struct.fonts
+        while pointer:
+            fonts.append(Font(self, pointer))
+            pointer = pointer.contents.next
+        return fonts
+
+    @property
+    def default_font(self) -> Optional[Font]:
+        if not self.struct.default_font:
+            return None
+        return Font(self, self.struct.default_font)
+
+
+def _configs(atlas: FontAtlas):
+    # Every config of the atlas in baking order, merged configs included.
+    pointer = atlas.struct.config
+    while pointer:
+        config = pointer.contents
+        yield config
+        merged = config.n
+        while merged and ctypes.addressof(merged.contents) != ctypes.addressof(config):
+            yield merged.contents
+            merged = merged.contents.n
+        pointer = config.next
+
+
+def _font_config_p(atlas: FontAtlas, height: float, config: Optional[FontConfig]):
+    if config is None:
+        return None
+    struct = config.to_c()
+    if not config.size:
+        struct.size = height
+    if config.range is None:
+        struct.range = nk.nk_font_default_glyph_ranges()
+    return ctypes.pointer(atlas.keep_alive(struct))
+
+
+def _font(atlas: FontAtlas, pointer) -> Optional[Font]:
+    if not pointer:
+        return None
+    return Font(atlas, pointer)
+
+
+nk.nk_font_default_glyph_ranges.argtypes = ()
+nk.nk_font_default_glyph_ranges.restype = ctypes.POINTER(Rune)
+
+
+def _ranges(pointer) -> List[int]:
+    ranges = []
+    i = 0
+    while pointer[i]:
+        ranges.append(pointer[i])
+        i += 1
+    return ranges
+
+
+def font_default_glyph_ranges() -> List[int]:
+    return _ranges(nk.nk_font_default_glyph_ranges())
+
+
+nk.nk_font_chinese_glyph_ranges.argtypes = ()
+nk.nk_font_chinese_glyph_ranges.restype = ctypes.POINTER(Rune)
+
+
+def font_chinese_glyph_ranges() -> List[int]:
+    return _ranges(nk.nk_font_chinese_glyph_ranges())
+
+
+nk.nk_font_cyrillic_glyph_ranges.argtypes = ()
+nk.nk_font_cyrillic_glyph_ranges.restype = ctypes.POINTER(Rune)
+
+
+def font_cyrillic_glyph_ranges() -> List[int]:
+    return _ranges(nk.nk_font_cyrillic_glyph_ranges())
+
+
+nk.nk_font_korean_glyph_ranges.argtypes = ()
+nk.nk_font_korean_glyph_ranges.restype = ctypes.POINTER(Rune)
+
+
+def font_korean_glyph_ranges() -> List[int]:
+    return _ranges(nk.nk_font_korean_glyph_ranges())
+
+
+nk.nk_font_atlas_init_default.argtypes = (ctypes.POINTER(FontAtlas.Struct),)
+nk.nk_font_atlas_init_default.restype = None
+
+
+def font_atlas_init_default(atlas: FontAtlas) -> None:
+    nk.nk_font_atlas_init_default(atlas)
+
+
+nk.nk_font_atlas_begin.argtypes = (ctypes.POINTER(FontAtlas.Struct),)
+nk.nk_font_atlas_begin.restype = None
+
+
+def font_atlas_begin(atlas: FontAtlas) -> None:
+    nk.nk_font_atlas_begin(atlas)
+
+
+nk.nk_font_atlas_add_default.argtypes = (
+    ctypes.POINTER(FontAtlas.Struct),
+    ctypes.c_float,
+    ctypes.POINTER(FontConfig.Struct),
+)
+nk.nk_font_atlas_add_default.restype = ctypes.POINTER(Font.Struct)
+
+
+def font_atlas_add_default(
+    atlas: FontAtlas, height: float, config: Optional[FontConfig] = None
+) -> Optional[Font]:
+    config_p = _font_config_p(atlas, height, config)
+    return _font(atlas, nk.nk_font_atlas_add_default(atlas, height, config_p))
+
+
+nk.nk_font_atlas_add_from_memory.argtypes = (
+    ctypes.POINTER(FontAtlas.Struct),
+    ctypes.c_void_p,
+    Size,
+    ctypes.c_float,
+    ctypes.POINTER(FontConfig.Struct),
+)
+nk.nk_font_atlas_add_from_memory.restype = ctypes.POINTER(Font.Struct)
+
+
+def font_atlas_add_from_memory(
+    atlas: FontAtlas,
+    memory: bytes,
+    height: float,
+    config: Optional[FontConfig] = None,
+) -> Optional[Font]:
+    buffer = atlas.keep_alive(ctypes.create_string_buffer(memory, len(memory)))
+    config_p = _font_config_p(atlas, height, config)
+    return _font(
+        atlas,
+        nk.nk_font_atlas_add_from_memory(
+            atlas, ctypes.addressof(buffer), len(memory), height, config_p
+        ),
+    )
+
+
+nk.nk_font_atlas_add_from_file.argtypes = (
+    ctypes.POINTER(FontAtlas.Struct),
+    ctypes.c_char_p,
+    ctypes.c_float,
+    ctypes.POINTER(FontConfig.Struct),
+)
+nk.nk_font_atlas_add_from_file.restype = ctypes.POINTER(Font.Struct)
+
+
+def font_atlas_add_from_file(
+    atlas: FontAtlas,
+    file_path: os.PathLike,
+    height: float,
+    config: Optional[FontConfig] = None,
+) -> Optional[Font]:
+    config_p = _font_config_p(atlas, height, config)
+    path = to_char_p(os.fspath(file_path))
+    return _font(atlas, nk.nk_font_atlas_add_from_file(atlas, path, height, config_p))
+
+
+nk.nk_font_atlas_bake.argtypes = (
+    ctypes.POINTER(FontAtlas.Struct),
+    ctypes.POINTER(ctypes.c_int),
+    ctypes.POINTER(ctypes.c_int),
+    FontAtlasFormat,
+)
+nk.nk_font_atlas_bake.restype = ctypes.c_void_p
+
+_BYTES_PER_PIXEL: Dict[int, int] = {
+    FontAtlasFormat.FONT_ATLAS_ALPHA8: 1,
+    FontAtlasFormat.FONT_ATLAS_RGBA32: 4,
+}
+
+
+def font_atlas_bake(atlas: FontAtlas, fmt: int) -> Tuple[bytes, int, int]:
+    """
+    Bakes all added fonts and returns a copy of the atlas image together with
+    its width and height, since Nuklear frees the image in `font_atlas_end`.
+    """
+    width = ctypes.c_int(0)
+    height = ctypes.c_int(0)
+
+    pixels = nk.nk_font_atlas_bake(
+        atlas, ctypes.pointer(width), ctypes.pointer(height), fmt
+    )
+    if not pixels:
+        return b"", 0, 0
+    size = width.value * height.value * _BYTES_PER_PIXEL[getattr(fmt, "value", fmt)]
+    return ctypes.string_at(pixels, size), width.value, height.value
+
+
+nk.nk_font_atlas_end.argtypes = (
+    ctypes.POINTER(FontAtlas.Struct),
+    Handle.Struct,
+    ctypes.POINTER(DrawNullTexture.Struct),
+)
+nk.nk_font_atlas_end.restype = None
+
+
+def font_atlas_end(atlas: FontAtlas, texture: Handle) -> DrawNullTexture:
+    null = DrawNullTexture.Struct()
+    nk.nk_font_atlas_end(atlas, texture.to_c(), ctypes.pointer(null))
+    return DrawNullTexture.from_c(null)
+
+
+nk.nk_font_atlas_cleanup.argtypes = (ctypes.POINTER(FontAtlas.Struct),)
+nk.nk_font_atlas_cleanup.restype = None
+
+
+def font_atlas_cleanup(atlas: FontAtlas) -> None:
+    nk.nk_font_atlas_cleanup(atlas)
+
+
+nk.nk_font_atlas_clear.argtypes = (ctypes.POINTER(FontAtlas.Struct),)
+nk.nk_font_atlas_clear.restype = None
+
+
+def font_atlas_clear(atlas: FontAtlas) -> None:
+    nk.nk_font_atlas_clear(atlas)
+    atlas._objects.clear()
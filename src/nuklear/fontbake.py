@@ -0,0 +1,242 @@
+"""
+Parallel font atlas baking across a process pool.
+
+`font_atlas_bake_parallel` is a drop-in for `font_atlas_bake` that rasterizes
+the glyphs in worker processes. Every worker rebuilds the fonts of the atlas,
+packs them into the same layout, which is deterministic, and rasterizes a slice
+of the glyphs straight into an image in shared memory. Glyph rects never
+overlap, so the slices need no merging, and the bake is completed in this
+process from the shared image. The result is identical to a serial bake.
+
+Slices are cut across fonts and glyph ranges alike, so a single large font,
+such as one with the Chinese glyph ranges, is spread over all workers too.
+`font_atlas_bake_all` bakes several independent atlases over the same pool.
+
+Without the nuklearPy shim the atlases are baked serially.
+
+Shared block layout:
+
+    the alpha8 atlas image
+    the packed data of every glyph, as used by `stb_truetype`
+    the font data of every font config
+"""
+
+from __future__ import annotations
+
+import ctypes
+import math
+import os
+import sys
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+from nuklear.font import _BYTES_PER_PIXEL
+from nuklear.font import FontAtlas
+from nuklear.font import _configs
+from nuklear.font import font_atlas_add_from_memory
+from nuklear.font import font_atlas_bake
+from nuklear.font import font_atlas_begin
+from nuklear.font import font_atlas_clear
+from nuklear.font import font_atlas_init_default
+from nuklear.library import nuklear as nk
+from nuklear.types import FontAtlasFormat
+from nuklear.types import FontConfig
+from nuklear.types import Size
+
+# (offset in the shared block, size, config) of every font config to add.
+_Fonts = List[Tuple[int, int, FontConfig]]
+
+if hasattr(nk, "nk_py_font_atlas_render"):
+    nk.nk_py_font_atlas_measure.argtypes = (
+        ctypes.POINTER(FontAtlas.Struct),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(Size),
+    )
+    nk.nk_py_font_atlas_measure.restype = ctypes.c_int
+
+    nk.nk_py_font_atlas_render.argtypes = (
+        ctypes.POINTER(FontAtlas.Struct),
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    )
+    nk.nk_py_font_atlas_render.restype = ctypes.c_int
+
+    nk.nk_py_font_atlas_bake_finish.argtypes = (
+        ctypes.POINTER(FontAtlas.Struct),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        FontAtlasFormat,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+    )
+    nk.nk_py_font_atlas_bake_finish.restype = ctypes.c_void_p
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # Pool workers share the resource tracker of the process that created the
+    # block, where it is already registered.
+    return shared_memory.SharedMemory(name)
+
+
+def _address(buf: memoryview) -> int:
+    return ctypes.addressof(ctypes.c_char.from_buffer(buf))
+
+
+def _render(
+    name: str, fonts: _Fonts, first: int, count: int, width: int, height: int
+) -> bool:
+    # Runs in a worker process.
+    shm = _attach(name)
+    try:
+        atlas = FontAtlas()
+        font_atlas_init_default(atlas)
+        font_atlas_begin(atlas)
+        for offset, size, config in fonts:
+            memory = bytes(shm.buf[offset : offset + size])
+            font_atlas_add_from_memory(atlas, memory, config.size, config)
+        base = _address(shm.buf)
+        try:
+            return bool(
+                nk.nk_py_font_atlas_render(
+                    atlas, first, count, base, width, height, base + width * height
+                )
+            )
+        finally:
+            font_atlas_clear(atlas)
+    finally:
+        shm.close()
+
+
+class _Bake:
+    # The shared block and the slices of one atlas.
+
+    def __init__(self, atlas: FontAtlas):
+        self.atlas = atlas
+        self.shm: Optional[shared_memory.SharedMemory] = None
+
+        width = ctypes.c_int(0)
+        height = ctypes.c_int(0)
+        glyphs = ctypes.c_int(0)
+        packed = Size(0)
+        if not atlas.struct.font_num or not nk.nk_py_font_atlas_measure(
+            atlas, width, height, glyphs, packed
+        ):
+            return
+        self.width = width.value
+        self.height = height.value
+        self.glyph_count = glyphs.value
+
+        configs = list(_configs(atlas))
+        offset = self.width * self.height + packed.value
+        size = offset + sum(config.ttf_size for config in configs)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.fonts: _Fonts = []
+        for config in configs:
+            end = offset + config.ttf_size
+            self.shm.buf[offset:end] = ctypes.string_at(
+                config.ttf_blob, config.ttf_size
+            )
+            self.fonts.append((offset, config.ttf_size, FontConfig.from_c(config)))
+            offset = end
+
+    def finish(self, fmt: int) -> Tuple[bytes, int, int]:
+        width = ctypes.c_int(0)
+        height = ctypes.c_int(0)
+        base = _address(self.shm.buf)
+        pixels = nk.nk_py_font_atlas_bake_finish(
+            self.atlas, width, height, fmt, base, base + self.width * self.height
+        )
+        if not pixels:
+            return b"", 0, 0
+        fmt = getattr(fmt, "value", fmt)
+        size = width.value * height.value * _BYTES_PER_PIXEL[fmt]
+        return ctypes.string_at(pixels, size), width.value, height.value
+
+    def close(self) -> None:
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+def font_atlas_bake_all(
+    atlases: Sequence[FontAtlas],
+    fmt: int,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[Tuple[bytes, int, int]]:
+    """
+    Bakes all added fonts of every atlas like `font_atlas_bake`, rasterizing the
+    glyphs of all atlases in `workers` slices on `executor`, a new process pool
+    by default. Passing a long-lived pool saves starting the processes.
+    """
+    if not hasattr(nk, "nk_py_font_atlas_render"):
+        return [font_atlas_bake(atlas, fmt) for atlas in atlases]
+    workers = workers or os.cpu_count() or 1
+
+    bakes = []
+    try:
+        for atlas in atlases:
+            bakes.append(_Bake(atlas))
+        total = sum(bake.glyph_count for bake in bakes if bake.shm is not None)
+        step = max(1, math.ceil(total / workers))
+
+        if total:
+            pool = executor or ProcessPoolExecutor(workers)
+            try:
+                futures = [
+                    pool.submit(
+                        _render,
+                        bake.shm.name,
+                        bake.fonts,
+                        first,
+                        min(step, bake.glyph_count - first),
+                        bake.width,
+                        bake.height,
+                    )
+                    for bake in bakes
+                    if bake.shm is not None
+                    for first in range(0, bake.glyph_count, step)
+                ]
+                if not all(future.result() for future in futures):
+                    raise RuntimeError("Rasterizing font glyphs in a worker failed")
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+        # Atlases without fonts or with fonts Nuklear cannot pack are baked
+        # serially, which also covers adding the default font.
+        return [
+            (
+                bake.finish(fmt)
+                if bake.shm is not None
+                else font_atlas_bake(bake.atlas, fmt)
+            )
+            for bake in bakes
+        ]
+    finally:
+        for bake in bakes:
+            bake.close()
+
+
+def font_atlas_bake_parallel(
+    atlas: FontAtlas,
+    fmt: int,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Tuple[bytes, int, int]:
+    """
+    Bakes all added fonts like `font_atlas_bake`, rasterizing the glyphs in
+    `workers` slices on `executor`, a new process pool by default.
+    """
+    return font_atlas_bake_all([atlas], fmt, workers, executor)[0]
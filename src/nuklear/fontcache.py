@@ -0,0 +1,265 @@
+"""
+Persistent on-disk cache of baked font atlases.
+
+Baking rasterizes every glyph of every added font, which takes milliseconds for
+the default ranges and hundreds of milliseconds for CJK ranges. `FontAtlasCache`
+stores the result of a bake, the atlas image together with the glyph tables,
+in a file keyed by a hash of everything that affects it: the font data, pixel
+height, glyph ranges, oversampling and the other config values of every font,
+and the image format. On a hit, the file is memory-mapped and the atlas is
+restored by the nuklearPy shim without rasterizing anything, and the returned
+image is a view of the mapped file.
+
+Cache files are specific to the machine architecture and the nuklearPy
+version, both of which are part of the key.
+
+File format, native byte order:
+
+    b"NKPYFNT1"
+    uint32 format, width, height, glyph count, font count
+    int16 custom rect x, y, w, h
+    font count x struct nk_baked_font (with a null `ranges` pointer)
+    glyph count x struct nk_font_glyph
+    the atlas image, 16 byte aligned
+"""
+
+from __future__ import annotations
+
+import ctypes
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from nuklear.font import _BYTES_PER_PIXEL
+from nuklear.font import FontAtlas
+from nuklear.font import _configs
+from nuklear.font import font_atlas_bake
+from nuklear.library import nuklear as nk
+from nuklear.metadata import __version__
+from nuklear.types import BakedFont
+from nuklear.types import FontConfig
+from nuklear.types import FontGlyph
+from nuklear.types import Recti
+
+MAGIC = b"NKPYFNT1"
+SUFFIX = ".nkfont"
+
+_HEADER = struct.Struct("=8s5I4h")
+_ALIGN = 16
+_BAKED_SIZE = ctypes.sizeof(BakedFont.Struct)
+_GLYPH_SIZE = ctypes.sizeof(FontGlyph.Struct)
+
+if hasattr(nk, "nk_py_font_atlas_load"):
+    nk.nk_py_font_atlas_load.argtypes = (
+        ctypes.POINTER(FontAtlas.Struct),
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.POINTER(Recti.Struct),
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_int,
+    )
+    nk.nk_py_font_atlas_load.restype = ctypes.c_int
+
+
+def _value(value) -> int:
+    return getattr(value, "value", value)
+
+
+def atlas_key(atlas: FontAtlas, fmt: int) -> str:
+    """
+    Returns the cache key of baking the fonts added to `atlas` so far into an
+    image of format `fmt`.
+    """
+    fmt = _value(fmt)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(
+        f"{__version__}:{sys.byteorder}:{_BAKED_SIZE}:{_GLYPH_SIZE}:{fmt}".encode()
+    )
+    for config in _configs(atlas):
+        if config.ttf_blob:
+            blob = (ctypes.c_char * config.ttf_size).from_address(config.ttf_blob)
+            digest.update(hashlib.blake2b(blob, digest_size=20).digest())
+        settings = FontConfig.from_c(config)
+        digest.update(
+            repr(
+                (
+                    settings.size,
+                    settings.merge_mode,
+                    settings.pixel_snap,
+                    settings.oversample_v,
+                    settings.oversample_h,
+                    _value(settings.coord_type),
+                    settings.spacing.x,
+                    settings.spacing.y,
+                    settings.range,
+                    settings.fallback_glyph,
+                )
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class FontAtlasCache:
+    """
+    Caches baked font atlases in `directory`.
+
+    `bake` replaces `font_atlas_bake`: call it between `font_atlas_begin` and
+    `font_atlas_end` after adding the fonts. Without the nuklearPy shim every
+    call bakes, and the result is still stored for processes that have it.
+    """
+
+    def __init__(self, directory: Union[os.PathLike, str]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def bake(self, atlas: FontAtlas, fmt: int) -> Tuple[memoryview, int, int]:
+        """
+        Bakes the fonts of `atlas` or loads them from the cache, and returns the
+        atlas image as a read-only buffer together with its width and height.
+        """
+        start = time.perf_counter()
+        try:
+            if not atlas.struct.font_num:
+                # Nuklear adds the default font to an empty atlas while baking.
+                pixels, width, height = font_atlas_bake(atlas, fmt)
+                return memoryview(pixels), width, height
+
+            path = self.path(atlas_key(atlas, fmt))
+            loaded = self._load(atlas, fmt, path)
+            if loaded is not None:
+                self.hits += 1
+                return loaded
+
+            pixels, width, height = font_atlas_bake(atlas, fmt)
+            self.misses += 1
+            if pixels:
+                self._store(atlas, fmt, path, pixels, width, height)
+            return memoryview(pixels), width, height
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def clear(self) -> None:
+        """Removes every cached atlas."""
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            path.unlink()
+
+    def _store(
+        self,
+        atlas: FontAtlas,
+        fmt: int,
+        path: Path,
+        pixels: bytes,
+        width: int,
+        height: int,
+    ) -> None:
+        fonts = atlas.fonts
+        custom = atlas.struct.custom
+        header = _HEADER.pack(
+            MAGIC,
+            _value(fmt),
+            width,
+            height,
+            atlas.struct.glyph_count,
+            len(fonts),
+            custom.x,
+            custom.y,
+            custom.w,
+            custom.h,
+        )
+        chunks = [header]
+        for font in fonts:
+            info = BakedFont.Struct.from_buffer_copy(font._as_parameter_.contents.info)
+            info.ranges = None
+            chunks.append(bytes(info))
+        chunks.append(
+            ctypes.string_at(
+                atlas.struct.glyphs, atlas.struct.glyph_count * _GLYPH_SIZE
+            )
+        )
+        size = sum(len(chunk) for chunk in chunks)
+        chunks.append(bytes(_align(size) - size))
+        chunks.append(pixels)
+
+        # Written next to the final file and renamed, so concurrent processes
+        # never see a partial file.
+        fd, temporary = tempfile.mkstemp(SUFFIX, dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.writelines(chunks)
+            os.replace(temporary, path)
+        except OSError:
+            os.unlink(temporary)
+            raise
+
+    def _load(
+        self, atlas: FontAtlas, fmt: int, path: Path
+    ) -> Optional[Tuple[memoryview, int, int]]:
+        if not hasattr(nk, "nk_py_font_atlas_load"):
+            return None
+        fmt = _value(fmt)
+        try:
+            with open(path, "rb") as file:
+                # A private mapping is writable for ctypes, but never copied
+                # unless written to.
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if len(mapped) < _HEADER.size:
+            return None
+        (
+            magic,
+            file_fmt,
+            width,
+            height,
+            glyph_count,
+            font_count,
+            *custom,
+        ) = _HEADER.unpack_from(mapped)
+        fonts_offset = _HEADER.size
+        glyphs_offset = fonts_offset + font_count * _BAKED_SIZE
+        pixels_offset = _align(glyphs_offset + glyph_count * _GLYPH_SIZE)
+        pixels_size = width * height * _BYTES_PER_PIXEL[fmt]
+        if (
+            magic != MAGIC
+            or file_fmt != fmt
+            or len(mapped) != pixels_offset + pixels_size
+        ):
+            return None
+
+        rect = Recti.Struct()
+        rect.x, rect.y, rect.w, rect.h = custom
+        base = ctypes.addressof(ctypes.c_char.from_buffer(mapped))
+        if not nk.nk_py_font_atlas_load(
+            atlas,
+            width,
+            height,
+            ctypes.byref(rect),
+            base + glyphs_offset,
+            glyph_count,
+            base + fonts_offset,
+            font_count,
+        ):
+            return None
+        atlas.keep_alive(mapped)
+        pixels = memoryview(mapped)[pixels_offset:].toreadonly()
+        return pixels, width, height
@@ -0,0 +1,227 @@
+"""
+User fonts with cached glyph advance tables.
+
+A `UserFont` with a Python `width` callback costs an interpreter round trip for
+every text Nuklear measures, which is every label of every frame.
+`GlyphTableFont` asks its `advance` callback once per rune instead and measures
+text in the nuklearPy shim by summing the advances: the runes below `runes` are
+tabulated up front, any other rune is measured the first time it shows up and
+cached in C. Text widths are exact for fonts without kerning.
+
+`text_widths` measures a whole list of strings, such as the cells of a table
+column, in a single call into the shim, optionally in slices on a thread pool.
+
+Without the nuklearPy shim, widths of whole strings are cached in an LRU cache
+instead, which saves the round trips for repeated strings only.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import functools
+import math
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Union
+
+from nuklear.library import nuklear as nk
+from nuklear.types import Handle
+from nuklear.types import QueryFontGlyphF
+from nuklear.types import Rune
+from nuklear.types import UserFont
+
+# Returns the advance of a rune at the pixel height of the font.
+Advance = Callable[[int], float]
+
+AdvanceF = ctypes.CFUNCTYPE(ctypes.c_float, Handle.Struct, Rune)
+
+if hasattr(nk, "nk_py_glyph_table_init"):
+    nk.nk_py_sizeof_glyph_table.argtypes = ()
+    nk.nk_py_sizeof_glyph_table.restype = ctypes.c_size_t
+
+    nk.nk_py_glyph_table_init.argtypes = (
+        ctypes.c_void_p,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int,
+        AdvanceF,
+        QueryFontGlyphF,
+        Handle.Struct,
+        Handle.Struct,
+    )
+    nk.nk_py_glyph_table_init.restype = None
+
+if hasattr(nk, "nk_py_text_widths"):
+    nk.nk_py_text_widths.argtypes = (
+        ctypes.POINTER(UserFont.Struct),
+        ctypes.c_float,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    )
+    nk.nk_py_text_widths.restype = None
+
+# Inputs with fewer strings per worker are measured on the calling thread.
+_PARALLEL_MIN = 4096
+
+
+class GlyphTableFont:
+    """
+    A user font of pixel height `height` measured by `advance`, which is called
+    once per rune. `query` and `texture` are passed on to Nuklear like those of
+    `UserFont`. Pass `handle` to `init_default` or `style_set_font`.
+    """
+
+    def __init__(
+        self,
+        height: float,
+        advance: Advance,
+        runes: int = 0x100,
+        query: Optional[QueryFontGlyphF.QueryFontGlyphF] = None,
+        texture: Optional[Handle] = None,
+        cache_size: int = 4096,
+    ):
+        self.height = height
+        self.advance = advance
+        texture = texture or Handle()
+        # Builds the `query` callback and keeps it alive.
+        self._user_font = UserFont(height=height, query=query, texture=texture)
+        self._memory = None
+
+        if not hasattr(nk, "nk_py_glyph_table_init"):
+
+            @functools.lru_cache(cache_size)
+            def _width(text: str) -> float:
+                return sum(advance(ord(c)) for c in text)
+
+            self._user_font.width = lambda handle, h, text: _width(text) * h / height
+            self._struct = self._user_font.to_c()
+            return
+
+        self.advances = (ctypes.c_float * runes)(*(advance(r) for r in range(runes)))
+        self._advance = AdvanceF(lambda handle, rune: advance(rune))
+        self._struct = self._user_font.to_c()
+        self._memory = (ctypes.c_ubyte * nk.nk_py_sizeof_glyph_table())()
+        nk.nk_py_glyph_table_init(
+            self._memory,
+            height,
+            self.advances,
+            runes,
+            self._advance,
+            self._struct.query,
+            Handle().to_c(),
+            texture.to_c(),
+        )
+
+    @classmethod
+    def from_user_font(cls, font: UserFont, runes: int = 0x100) -> GlyphTableFont:
+        """
+        Tabulates a `UserFont` with a Python `width` callback, which has to
+        measure single runes correctly.
+        """
+        userdata = font.userdata
+
+        def advance(rune: int) -> float:
+            return font.width(userdata, font.height, chr(rune))
+
+        return cls(font.height, advance, runes, font.query, font.texture)
+
+    @property
+    def handle(self) -> UserFont.Struct:
+        """The user font to pass to Nuklear, which keeps this object alive."""
+        if self._memory is None:
+            return self._struct
+        struct = UserFont.Struct.from_buffer(self._memory)
+        # Nuklear calls back into `_advance` and `query` through this struct.
+        struct._font = self
+        return struct
+
+    def width(self, text: str) -> float:
+        """Measures `text` at the height of the font, like Nuklear does."""
+        handle = self.handle
+        data = text.encode("utf-8")
+        return handle.width(handle.userdata, self.height, data, len(data))
+
+    def widths(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[float]:
+        """Measures all `texts` like `width`, see `text_widths`."""
+        return text_widths(self, texts, workers=workers, executor=executor)
+
+
+def text_widths(
+    font: Union[GlyphTableFont, UserFont, UserFont.Struct],
+    texts: Iterable[str],
+    height: Optional[float] = None,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[float]:
+    """
+    Measures every string of `texts`, a list or array of strings, with `font`
+    at `height`, the font's height by default, like Nuklear does.
+
+    The strings are measured in one call into the nuklearPy shim, which never
+    leaves C for a `GlyphTableFont`. Such a font also measures inputs of many
+    thousand strings in `workers` slices on `executor`, a new thread pool by
+    default, since calls into Nuklear release the GIL.
+    """
+    if isinstance(font, GlyphTableFont):
+        struct = font.handle
+    elif isinstance(font, UserFont):
+        struct = font.to_c()
+    else:
+        struct = font
+    if height is None:
+        height = struct.height
+
+    encoded = list(map(str.encode, texts))
+    if not hasattr(nk, "nk_py_text_widths"):
+        return [
+            struct.width(struct.userdata, height, data, len(data)) if data else 0.0
+            for data in encoded
+        ]
+
+    count = len(encoded)
+    data = b"".join(encoded)
+    lengths = (ctypes.c_int * count)(*map(len, encoded))
+    widths = (ctypes.c_float * count)()
+    workers = workers or 1
+    if workers < 2 or count < workers * _PARALLEL_MIN:
+        nk.nk_py_text_widths(struct, height, data, lengths, count, widths)
+        return widths[:]
+    if not isinstance(font, GlyphTableFont):
+        raise ValueError("Only a GlyphTableFont can be measured on several threads")
+
+    # Caches the advances of all runes first, so the threads only read the
+    # glyph table.
+    font.width("".join(set(data.decode("utf-8"))))
+    text = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+    step = math.ceil(count / workers)
+    slices = []
+    offset = 0
+    for first in range(0, count, step):
+        size = min(step, count - first)
+        slices.append((text + offset, first, size))
+        offset += sum(lengths[first : first + size])
+
+    def measure(part):
+        start, first, size = part
+        nk.nk_py_text_widths(
+            struct,
+            height,
+            start,
+            ctypes.addressof(lengths) + first * ctypes.sizeof(ctypes.c_int),
+            size,
+            ctypes.addressof(widths) + first * ctypes.sizeof(ctypes.c_float),
+        )
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(measure, slices))
+    else:
+        list(executor.map(measure, slices))
+    return widths[:]
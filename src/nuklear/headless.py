@@ -0,0 +1,220 @@
+"""
+Headless rendering of UI snapshots on a process pool.
+
+Every worker process keeps a warm `Context` and a baked `FontAtlas` for its
+whole lifetime, so a job only pays for building its frame, converting it and
+rasterizing it. The rasterization step is pluggable through `Renderer`, and the
+finished images are streamed to a `Sink` in the parent process as soon as they
+complete.
+"""
+
+from __future__ import annotations
+
+import os
+from abc import ABC
+from abc import abstractmethod
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Set
+
+from nuklear.context import Context
+from nuklear.context import clear
+from nuklear.context import init_default
+from nuklear.font import FontAtlas
+from nuklear.font import font_atlas_add_default
+from nuklear.font import font_atlas_bake
+from nuklear.font import font_atlas_begin
+from nuklear.font import font_atlas_cleanup
+from nuklear.font import font_atlas_end
+from nuklear.font import font_atlas_init_default
+from nuklear.types import FontAtlasFormat
+from nuklear.types import Handle
+
+ATLAS_TEXTURE_ID = 1
+
+
+@dataclass
+class Snapshot:
+    """A rendered frame as tightly packed RGBA8 rows."""
+
+    key: str
+    width: int
+    height: int
+    pixels: bytes
+
+
+@dataclass
+class SnapshotJob:
+    """
+    Describes one snapshot. `build` declares the widgets of the frame and must be
+    picklable, i.e. a module-level function.
+    """
+
+    key: str
+    build: Callable[[Context, int, int], None]
+    width: int = 256
+    height: int = 256
+
+
+class Renderer(ABC):
+    """
+    Turns the frame built on a context into pixels. One instance is pickled into
+    every worker, where `setup` is called once before the first job.
+    """
+
+    def setup(self, atlas: FontAtlas, pixels: bytes, width: int, height: int) -> None:
+        """Receives the worker's baked RGBA32 font atlas image."""
+
+    @abstractmethod
+    def render(self, ctx: Context, width: int, height: int) -> bytes:
+        """Returns the frame currently held by `ctx` as RGBA8 rows."""
+
+
+class Sink(ABC):
+    """Receives finished snapshots in the parent process."""
+
+    @abstractmethod
+    def write(self, snapshot: Snapshot) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class CallbackSink(Sink):
+    def __init__(self, callback: Callable[[Snapshot], None]):
+        self.callback = callback
+
+    def write(self, snapshot: Snapshot) -> None:
+        self.callback(snapshot)
+
+
+class DirectorySink(Sink):
+    """
+    Writes every snapshot to `<directory>/<key>.<ext>`, either as a PAM image
+    (`fmt="pam"`, readable by most image tools and keeping alpha) or as raw
+    RGBA8 rows (`fmt="rgba"`).
+    """
+
+    def __init__(self, directory: os.PathLike, fmt: str = "pam"):
+        if fmt not in ("pam", "rgba"):
+            raise ValueError(f"Unknown snapshot format: {fmt}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+
+    def write(self, snapshot: Snapshot) -> None:
+        path = self.directory / f"{snapshot.key}.{self.fmt}"
+        with open(path, "wb") as file:
+            if self.fmt == "pam":
+                file.write(
+                    (
+                        f"P7\nWIDTH {snapshot.width}\nHEIGHT {snapshot.height}\n"
+                        "DEPTH 4\nMAXVAL 255\nTUPLTYPE RGB_ALPHA\nENDHDR\n"
+                    ).encode("ascii")
+                )
+            file.write(snapshot.pixels)
+
+
+class _Worker:
+    def __init__(self, renderer: Renderer, font_height: float):
+        self.atlas = FontAtlas()
+        font_atlas_init_default(self.atlas)
+        font_atlas_begin(self.atlas)
+        font = font_atlas_add_default(self.atlas, font_height)
+        pixels, width, height = font_atlas_bake(
+            self.atlas, FontAtlasFormat.FONT_ATLAS_RGBA32
+        )
+        font_atlas_end(self.atlas, Handle(id=ATLAS_TEXTURE_ID))
+        font_atlas_cleanup(self.atlas)
+
+        self.ctx = Context()
+        init_default(self.ctx, font.handle)
+
+        self.renderer = renderer
+        self.renderer.setup(self.atlas, pixels, width, height)
+
+    def run(self, job: SnapshotJob) -> Snapshot:
+        try:
+            job.build(self.ctx, job.width, job.height)
+            pixels = self.renderer.render(self.ctx, job.width, job.height)
+        finally:
+            # The second clear runs on an empty frame, which drops every window
+            # so no state leaks from one snapshot into the next, even a failed one.
+            clear(self.ctx)
+            clear(self.ctx)
+        return Snapshot(job.key, job.width, job.height, pixels)
+
+
+# Per-process worker state, only ever set inside pool worker processes.
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(renderer: Renderer, font_height: float) -> None:
+    global _worker
+    _worker = _Worker(renderer, font_height)
+
+
+def _run_job(job: SnapshotJob) -> Snapshot:
+    return _worker.run(job)
+
+
+class SnapshotService:
+    """
+    Renders `SnapshotJob`s on a pool of worker processes.
+
+    At most `max_pending` jobs are in flight at once, so arbitrarily long job
+    iterables are consumed lazily and completed snapshots are handed out in
+    completion order.
+    """
+
+    def __init__(
+        self,
+        renderer: Renderer,
+        max_workers: Optional[int] = None,
+        font_height: float = 13.0,
+        max_pending: Optional[int] = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(renderer, font_height),
+        )
+
+    def __enter__(self) -> SnapshotService:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def snapshots(self, jobs: Iterable[SnapshotJob]) -> Iterator[Snapshot]:
+        pending: Set[Future] = set()
+        for job in jobs:
+            if len(pending) >= self.max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(self._executor.submit(_run_job, job))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def render(self, jobs: Iterable[SnapshotJob], sink: Sink) -> int:
+        """Streams every snapshot into `sink` and returns how many were written."""
+        count = 0
+        try:
+            for snapshot in self.snapshots(jobs):
+                sink.write(snapshot)
+                count += 1
+        finally:
+            sink.close()
+        return count
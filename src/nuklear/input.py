@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import ctypes
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.textedit import Clipboard
+from nuklear.types import UTF_SIZE
+from nuklear.types import Bool
+from nuklear.types import Buttons
+from nuklear.types import InputEvent
+from nuklear.types import InputType
+from nuklear.types import Keys
+from nuklear.types import Rune
+from nuklear.types import Vec2
+
+# ==============================================================================
+#
+#                                     INPUT
+#
+# ==============================================================================
+
+nk.nk_input_begin.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_input_begin.restype = None
+
+
+def input_begin(ctx: Context) -> None:
+    nk.nk_input_begin(ctx)
+
+
+nk.nk_input_motion.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_int,
+    ctypes.c_int,
+)
+nk.nk_input_motion.restype = None
+
+
+def input_motion(ctx: Context, x: int, y: int) -> None:
+    nk.nk_input_motion(ctx, x, y)
+
+
+nk.nk_input_key.argtypes = (ctypes.POINTER(Context.Struct), Keys, Bool)
+nk.nk_input_key.restype = None
+
+
+def input_key(ctx: Context, key: int, down: bool) -> None:
+    nk.nk_input_key(ctx, key, down)
+
+
+nk.nk_input_button.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    Buttons,
+    ctypes.c_int,
+    ctypes.c_int,
+    Bool,
+)
+nk.nk_input_button.restype = None
+
+
+def input_button(ctx: Context, button: int, x: int, y: int, down: bool) -> None:
+    nk.nk_input_button(ctx, button, x, y, down)
+
+
+nk.nk_input_scroll.argtypes = (ctypes.POINTER(Context.Struct), Vec2.Struct)
+nk.nk_input_scroll.restype = None
+
+
+def input_scroll(ctx: Context, val: Vec2) -> None:
+    nk.nk_input_scroll(ctx, val.to_c())
+
+
+nk.nk_input_char.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_char)
+nk.nk_input_char.restype = None
+
+
+def input_char(ctx: Context, c: str) -> None:
+    if len(c) != 1:
+        raise ValueError(f"Expected a single character, got {c!r}")
+    if ord(c) < 0x80:
+        nk.nk_input_char(ctx, c.encode("ascii"))
+    else:
+        # nk_input_char only takes a single byte, so encode anything else here.
+        nk.nk_input_unicode(ctx, ord(c))
+
+
+nk.nk_input_glyph.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_char * UTF_SIZE)
+nk.nk_input_glyph.restype = None
+
+
+def input_glyph(ctx: Context, glyph: str) -> None:
+    encoded = glyph.encode("utf-8")
+    if len(encoded) > UTF_SIZE:
+        raise ValueError(f"Glyph {glyph!r} is longer than {UTF_SIZE} bytes")
+    nk.nk_input_glyph(ctx, (ctypes.c_char * UTF_SIZE)(*encoded))
+
+
+nk.nk_input_unicode.argtypes = (ctypes.POINTER(Context.Struct), Rune)
+nk.nk_input_unicode.restype = None
+
+
+def input_unicode(ctx: Context, rune: int) -> None:
+    nk.nk_input_unicode(ctx, rune)
+
+
+nk.nk_input_end.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_input_end.restype = None
+
+
+def input_end(ctx: Context) -> None:
+    nk.nk_input_end(ctx)
+
+
+class Paste(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_py_paste {
+            const char *text;
+            int len;
+            unsigned int seq;
+            int unfiltered;
+            const struct nk_context *ctx;
+            struct nk_clipboard clip;
+        };
+    """
+
+    _fields_ = (
+        ("text", ctypes.c_char_p),
+        ("len", ctypes.c_int),
+        ("seq", ctypes.c_uint),
+        ("unfiltered", ctypes.c_int),
+        ("ctx", ctypes.c_void_p),
+        ("clip", Clipboard),
+    )
+
+
+if hasattr(nk, "nk_py_input_paste"):
+    nk.nk_py_input_paste.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(Paste),
+    )
+    nk.nk_py_input_paste.restype = None
+
+
+def input_paste(
+    ctx: Context, text: Union[str, bytes], unfiltered: bool = False
+) -> None:
+    """
+    Pastes `text` into the active edit widget of the frame, between
+    `nk_input_begin` and `nk_input_end`. Text that no widget takes in that
+    frame is dropped.
+
+    The text takes the clipboard paste path of edit widgets with
+    `EDIT_CLIPBOARD`: it is inserted in C in a few allocations and as one
+    undo record, without the `INPUT_MAX` limit of typed text. Runes the filter
+    of the widget rejects are left out, unless `unfiltered` is set.
+    """
+    if not hasattr(nk, "nk_py_input_paste"):
+        raise RuntimeError(
+            "Nuklear library was built without the nuklearPy shim, "
+            "rebuild it with build_library.py"
+        )
+    data = text if isinstance(text, bytes) else text.encode("utf-8")
+    paste = Paste(data, len(data), unfiltered=unfiltered)
+    ctx.keep_alive("paste", (paste, data))
+    nk.nk_py_input_paste(ctx, ctypes.byref(paste))
+
+
+# Layout of `InputEvent` for packing events without creating ctypes objects.
+_EVENT = struct.Struct("=iiiiiff")
+assert _EVENT.size == ctypes.sizeof(InputEvent)
+
+_MOTION = InputType.INPUT_MOTION
+_KEY = InputType.INPUT_KEY
+_BUTTON = InputType.INPUT_BUTTON
+_SCROLL = InputType.INPUT_SCROLL
+_UNICODE = InputType.INPUT_UNICODE
+
+EventTuple = Tuple[int, int, int, int, int, float, float]
+
+
+class InputQueue:
+    """
+    Packed array of the input events of one frame.
+
+    Events are appended with the same arguments as the `input_*` functions and
+    are applied to a context all at once by `input_events`, between
+    `nk_input_begin` and `nk_input_end`.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._buffer) // _EVENT.size
+
+    def __iter__(self) -> Iterator[EventTuple]:
+        """Yields `(type, code, down, x, y, sx, sy)` for every queued event."""
+        return _EVENT.iter_unpack(self._buffer)
+
+    def clear(self) -> None:
+        del self._buffer[:]
+
+    def append(self, event: EventTuple) -> None:
+        self._buffer += _EVENT.pack(*event)
+
+    def extend(self, events: Iterable[EventTuple]) -> None:
+        pack = _EVENT.pack
+        self._buffer += b"".join(pack(*event) for event in events)
+
+    def motion(self, x: int, y: int) -> None:
+        self._buffer += _EVENT.pack(_MOTION, 0, 0, x, y, 0.0, 0.0)
+
+    def key(self, key: int, down: bool) -> None:
+        self._buffer += _EVENT.pack(_KEY, key, down, 0, 0, 0.0, 0.0)
+
+    def button(self, button: int, x: int, y: int, down: bool) -> None:
+        self._buffer += _EVENT.pack(_BUTTON, button, down, x, y, 0.0, 0.0)
+
+    def scroll(self, x: float, y: float) -> None:
+        self._buffer += _EVENT.pack(_SCROLL, 0, 0, 0, 0, x, y)
+
+    def unicode(self, rune: int) -> None:
+        self._buffer += _EVENT.pack(_UNICODE, rune, 0, 0, 0, 0.0, 0.0)
+
+    def text(self, string: str) -> None:
+        """Queues one unicode event per character of `string`."""
+        pack = _EVENT.pack
+        self._buffer += b"".join(
+            pack(_UNICODE, ord(c), 0, 0, 0, 0.0, 0.0) for c in string
+        )
+
+
+def _apply_events(ctx: Context, events: InputQueue) -> None:
+    nk.nk_input_begin(ctx)
+    for kind, code, down, x, y, sx, sy in events:
+        if kind == _MOTION:
+            nk.nk_input_motion(ctx, x, y)
+        elif kind == _KEY:
+            nk.nk_input_key(ctx, code, down)
+        elif kind == _BUTTON:
+            nk.nk_input_button(ctx, code, x, y, down)
+        elif kind == _SCROLL:
+            nk.nk_input_scroll(ctx, Vec2(sx, sy).to_c())
+        elif kind == _UNICODE:
+            nk.nk_input_unicode(ctx, code)
+    nk.nk_input_end(ctx)
+
+
+if hasattr(nk, "nk_py_input_events"):
+    nk.nk_py_input_events.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(InputEvent),
+        ctypes.c_int,
+    )
+    nk.nk_py_input_events.restype = None
+
+    def input_events(ctx: Context, events: InputQueue) -> None:
+        """
+        Applies every event of `events` to `ctx` between `nk_input_begin` and
+        `nk_input_end` in a single call into the library.
+        """
+        count = len(events)
+        if not count:
+            nk.nk_py_input_events(ctx, None, 0)
+            return
+        array = (InputEvent * count).from_buffer(events._buffer)
+        nk.nk_py_input_events(ctx, array, count)
+        # Release the export of the bytearray so the queue can grow again.
+        del array
+
+else:
+
+    def input_events(ctx: Context, events: InputQueue) -> None:
+        """
+        Applies every event of `events` to `ctx` between `nk_input_begin` and
+        `nk_input_end`. The library was built without the nuklearPy shim, so
+        this falls back to one call per event.
+        """
+        _apply_events(ctx, events)
+
+
+def _add_f32(a: float, b: float) -> float:
+    # Rounds like the float accumulation in nk_input_scroll.
+    return ctypes.c_float(a + b).value
+
+
+class InputCoalescer:
+    """
+    Removes the input events of a frame that cannot change what Nuklear sees
+    once the frame's input has been applied:
+
+    * Only the last mouse motion is kept, in its original position relative to
+      the other events, so the final position and delta are unchanged.
+    * Scroll deltas are summed into a single scroll event.
+    * Button and key events that do not change the button or key state are
+      dropped; Nuklear ignores them as well. Every real transition, including
+      `BUTTON_DOUBLE` and a key tapped within one frame, is kept in order, so
+      clicks, double clicks and key presses behave exactly the same.
+
+    Unicode events are always kept. The button and key states are tracked
+    across frames, so use one coalescer per context and route all of its input
+    through it.
+    """
+
+    def __init__(self):
+        self._buttons: List[bool] = [False] * Buttons.BUTTON_MAX
+        self._keys: List[bool] = [False] * Keys.KEY_MAX
+
+        self.events_in = 0
+        self.events_out = 0
+
+    @property
+    def calls_saved(self) -> int:
+        """Number of `nk_input_*` calls avoided so far."""
+        return self.events_in - self.events_out
+
+    def reset_stats(self) -> None:
+        self.events_in = 0
+        self.events_out = 0
+
+    def coalesce(self, events: InputQueue) -> InputQueue:
+        items = list(events)
+        keep: List[Optional[EventTuple]] = [None] * len(items)
+
+        last_motion = -1
+        last_scroll = -1
+        scroll_x = scroll_y = 0.0
+
+        for i, event in enumerate(items):
+            kind, code, down = event[0], event[1], bool(event[2])
+            if kind == _MOTION:
+                last_motion = i
+            elif kind == _SCROLL:
+                last_scroll = i
+                scroll_x = _add_f32(scroll_x, event[5])
+                scroll_y = _add_f32(scroll_y, event[6])
+            elif kind == _KEY and 0 <= code < len(self._keys):
+                if self._keys[code] != down:
+                    self._keys[code] = down
+                    keep[i] = event
+            elif kind == _BUTTON and 0 <= code < len(self._buttons):
+                if self._buttons[code] != down:
+                    self._buttons[code] = down
+                    keep[i] = event
+            else:
+                keep[i] = event
+
+        if last_motion >= 0:
+            keep[last_motion] = items[last_motion]
+        if last_scroll >= 0:
+            keep[last_scroll] = (_SCROLL, 0, 0, 0, 0, scroll_x, scroll_y)
+
+        result = InputQueue()
+        for event in keep:
+            if event is not None:
+                result.append(event)
+
+        self.events_in += len(items)
+        self.events_out += len(result)
+        return result
+
+    def input_events(self, ctx: Context, events: InputQueue) -> None:
+        """Coalesces `events` and applies the result with `input_events`."""
+        input_events(ctx, self.coalesce(events))
@@ -0,0 +1,103 @@
+import ctypes
+
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.types import Bool
+from nuklear.types import Flags
+
+# ==============================================================================
+#
+#                                    LAYOUT
+#
+# ==============================================================================
+
+nk.nk_layout_row_dynamic.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_float,
+    ctypes.c_int,
+)
+nk.nk_layout_row_dynamic.restype = None
+
+
+def layout_row_dynamic(ctx: Context, height: float, cols: int) -> None:
+    nk.nk_layout_row_dynamic(ctx, height, cols)
+
+
+nk.nk_layout_row_static.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_float,
+    ctypes.c_int,
+    ctypes.c_int,
+)
+nk.nk_layout_row_static.restype = None
+
+
+def layout_row_static(ctx: Context, height: float, item_width: int, cols: int) -> None:
+    nk.nk_layout_row_static(ctx, height, item_width, cols)
+
+
+# ==============================================================================
+#
+#                                   LIST VIEW
+#
+# ==============================================================================
+
+
+class ListView(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_list_view {
+            int begin, end, count;
+            int total_height;
+            struct nk_context *ctx;
+            nk_uint *scroll_pointer;
+            nk_uint scroll_value;
+        };
+    """
+
+    _fields_ = (
+        ("begin", ctypes.c_int),
+        ("end", ctypes.c_int),
+        ("count", ctypes.c_int),
+        ("total_height", ctypes.c_int),
+        ("ctx", ctypes.POINTER(Context.Struct)),
+        ("scroll_pointer", ctypes.POINTER(ctypes.c_uint)),
+        ("scroll_value", ctypes.c_uint),
+    )
+
+
+nk.nk_list_view_begin.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.POINTER(ListView),
+    ctypes.c_char_p,
+    Flags,
+    ctypes.c_int,
+    ctypes.c_int,
+)
+nk.nk_list_view_begin.restype = Bool
+
+
+def list_view_begin(
+    ctx: Context,
+    view: ListView,
+    title: str,
+    flags: int,
+    row_height: int,
+    row_count: int,
+) -> bool:
+    """
+    Begins a group of `row_count` rows of which only the visible ones, from
+    `view.begin` to `view.end`, need to be laid out.
+    """
+    return nk.nk_list_view_begin(
+        ctx, ctypes.byref(view), to_char_p(title), flags, row_height, row_count
+    )
+
+
+nk.nk_list_view_end.argtypes = (ctypes.POINTER(ListView),)
+nk.nk_list_view_end.restype = None
+
+
+def list_view_end(view: ListView) -> None:
+    nk.nk_list_view_end(ctypes.byref(view))
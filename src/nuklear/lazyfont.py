@@ -0,0 +1,292 @@
+"""
+Fonts that bake their glyph ranges lazily.
+
+Baking the full Chinese glyph ranges takes hundreds of milliseconds and an
+atlas of 32 MB, most of which a given UI never shows. A `LazyFont` starts with
+a small range, the default glyph ranges unless configured otherwise, and hands
+Nuklear a user font from the nuklearPy shim that records every rune it has no
+glyph for while text widgets measure and draw text. `LazyFont.update`, called
+in between frames, rebakes the atlas with the recorded runes in a background
+thread and swaps the new atlas in once it is done. Nuklear keeps the same user
+font throughout, so contexts need no update, and the new image is uploaded into
+the same texture.
+
+Runes are added in blocks of `block` consecutive runes, so text in a script
+rarely needs more than a few rebakes. Runes the font file has no glyph for are
+baked once and then left alone.
+
+Without the nuklearPy shim nothing is recorded and the font stays as baked.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set, Tuple
+
+from nuklear.font import _BYTES_PER_PIXEL
+from nuklear.font import Font
+from nuklear.font import FontAtlas
+from nuklear.font import font_atlas_add_default
+from nuklear.font import font_atlas_add_from_memory
+from nuklear.font import font_atlas_bake
+from nuklear.font import font_atlas_begin
+from nuklear.font import font_atlas_clear
+from nuklear.font import font_atlas_end
+from nuklear.font import font_atlas_init_default
+from nuklear.font import font_default_glyph_ranges
+from nuklear.library import nuklear as nk
+from nuklear.types import FontAtlasFormat
+from nuklear.types import FontConfig
+from nuklear.types import FontGlyph
+from nuklear.types import Handle
+from nuklear.types import Rune
+from nuklear.types import UserFont
+
+# Receives the texture handle and the new atlas image with its width and height.
+Upload = Callable[[Handle, bytes, int, int], None]
+
+_MISSING = 256
+
+if hasattr(nk, "nk_py_sizeof_lazy_font"):
+    nk.nk_py_sizeof_lazy_font.argtypes = ()
+    nk.nk_py_sizeof_lazy_font.restype = ctypes.c_size_t
+
+    nk.nk_py_lazy_font_set.argtypes = (
+        ctypes.c_void_p,
+        ctypes.POINTER(Font.Struct),
+        Handle.Struct,
+    )
+    nk.nk_py_lazy_font_set.restype = None
+
+    nk.nk_py_lazy_font_drain.argtypes = (
+        ctypes.c_void_p,
+        ctypes.POINTER(Rune),
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int),
+    )
+    nk.nk_py_lazy_font_drain.restype = ctypes.c_int
+
+
+@dataclass
+class LazyFontStats:
+    """
+    Counters of a `LazyFont`. The sizes are those of the current atlas, image
+    and glyph table, and the bakes include the first one.
+    """
+
+    atlas_bytes: int = 0
+    glyph_count: int = 0
+    bakes: int = 0
+    bake_seconds: float = 0.0
+    last_bake_seconds: float = 0.0
+    recorded: int = 0
+    overflows: int = 0
+    failures: int = 0
+
+
+def add_runes(ranges: List[int], runes, block: int = 1) -> List[int]:
+    """
+    Returns the flat glyph ranges `ranges` extended by the blocks of `block`
+    runes that contain `runes`, with overlapping and adjacent ranges merged.
+    """
+    spans = [(ranges[i], ranges[i + 1]) for i in range(0, len(ranges), 2)]
+    for rune in runes:
+        first = rune - rune % block
+        spans.append((max(first, 1), first + block - 1))
+    spans.sort()
+
+    merged: List[Tuple[int, int]] = []
+    for first, last in spans:
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return [rune for span in merged for rune in span]
+
+
+class LazyFont:
+    """
+    A font of pixel height `height` from the TrueType data `memory`, or the
+    default font, whose atlas grows by the runes Nuklear asks it for.
+
+    `upload` is called with `texture` and every baked atlas image, the first
+    time from the constructor. Pass `handle` to `init_default` or
+    `style_set_font` and call `update` once per frame, outside of any frame.
+    With `background` disabled, `update` rebakes right away. A failed rebake
+    raises its error from `update`, which retries the runes on its next call.
+    """
+
+    def __init__(
+        self,
+        height: float,
+        upload: Upload,
+        texture: Handle,
+        memory: Optional[bytes] = None,
+        config: Optional[FontConfig] = None,
+        fmt: int = FontAtlasFormat.FONT_ATLAS_RGBA32,
+        block: int = 16,
+        background: bool = True,
+    ):
+        self.height = height
+        self.upload = upload
+        self.texture = texture
+        self.memory = memory
+        self.config = config or FontConfig()
+        self.fmt = fmt
+        self.block = block
+        self.background = background
+        self.stats = LazyFontStats()
+
+        self.ranges = self.config.range or font_default_glyph_ranges()
+        self._requested: Set[int] = set()
+        self._pending: Set[int] = set()
+        self._baking: List[int] = []
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[Exception] = None
+        self._baked: Optional[Tuple[FontAtlas, Font, bytes, int, int]] = None
+        self._atlas: Optional[FontAtlas] = None
+        self._font: Optional[Font] = None
+
+        self._lazy = None
+        if hasattr(nk, "nk_py_sizeof_lazy_font"):
+            self._lazy = (ctypes.c_ubyte * nk.nk_py_sizeof_lazy_font())()
+        self._bake(self.ranges)
+        self._swap()
+
+    @property
+    def handle(self) -> UserFont.Struct:
+        """The user font to pass to Nuklear, the same for the font's lifetime."""
+        if self._lazy is None:
+            return self._font.handle
+        return UserFont.Struct.from_buffer(self._lazy)
+
+    @property
+    def rebaking(self) -> bool:
+        return self._thread is not None
+
+    def update(self) -> bool:
+        """
+        Starts a rebake if Nuklear asked for new runes and swaps in a finished
+        one. Returns whether the atlas was swapped, after which a
+        `nuklear.drawing.FrameCache` has to be invalidated.
+        """
+        swapped = False
+        if self._thread is not None and not self._thread.is_alive():
+            self._thread.join()
+            self._thread = None
+            error, self._error = self._error, None
+            if error is not None:
+                self._failed()
+                raise error
+            self._swap()
+            swapped = True
+
+        self._pending.update(self._drain())
+        if self._pending and self._thread is None:
+            self._baking = sorted(self._pending)
+            self._pending.clear()
+            self._requested.update(self._baking)
+            ranges = add_runes(self.ranges, self._baking, self.block)
+            if self.background:
+                self._thread = threading.Thread(
+                    target=self._bake_background, args=(ranges,), daemon=True
+                )
+                self._thread.start()
+            else:
+                try:
+                    self._bake(ranges)
+                except Exception:
+                    self._failed()
+                    raise
+                self._swap()
+                swapped = True
+        return swapped
+
+    def wait(self) -> None:
+        """Waits for a running rebake to finish, which `update` then swaps in."""
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self) -> None:
+        self.wait()
+        if self._baked is not None:
+            font_atlas_clear(self._baked[0])
+            self._baked = None
+        if self._atlas is not None:
+            font_atlas_clear(self._atlas)
+            self._atlas = None
+
+    def _drain(self) -> List[int]:
+        if self._lazy is None:
+            return []
+        runes = (Rune * _MISSING)()
+        overflow = ctypes.c_int(0)
+        count = nk.nk_py_lazy_font_drain(self._lazy, runes, _MISSING, overflow)
+        self.stats.overflows += overflow.value
+        # Runes the font has no glyph for stay missing after a rebake.
+        new = [rune for rune in runes[:count] if rune not in self._requested]
+        new = [rune for rune in new if rune not in self._pending]
+        self.stats.recorded += len(new)
+        return new
+
+    def _failed(self) -> None:
+        # Records the runes of the failed rebake again, so the next `update`
+        # retries them.
+        self.stats.failures += 1
+        self._requested.difference_update(self._baking)
+        self._pending.update(self._baking)
+        self._baking = []
+
+    def _bake_background(self, ranges: List[int]) -> None:
+        # Errors are raised from `update` on the calling thread instead.
+        try:
+            self._bake(ranges)
+        except Exception as error:
+            self._error = error
+
+    def _bake(self, ranges: List[int]) -> None:
+        start = time.perf_counter()
+        atlas = FontAtlas()
+        font_atlas_init_default(atlas)
+        try:
+            font_atlas_begin(atlas)
+            config = dataclasses.replace(self.config, range=ranges)
+            if self.memory is None:
+                font = font_atlas_add_default(atlas, self.height, config)
+            else:
+                font = font_atlas_add_from_memory(
+                    atlas, self.memory, self.height, config
+                )
+            pixels, width, height = font_atlas_bake(atlas, self.fmt)
+        except Exception:
+            font_atlas_clear(atlas)
+            raise
+        self._baked = (atlas, font, pixels, width, height)
+        self.ranges = ranges
+
+        seconds = time.perf_counter() - start
+        self.stats.bakes += 1
+        self.stats.bake_seconds += seconds
+        self.stats.last_bake_seconds = seconds
+
+    def _swap(self) -> None:
+        atlas, font, pixels, width, height = self._baked
+        self._baked = None
+        self.upload(self.texture, pixels, width, height)
+        font_atlas_end(atlas, self.texture)
+        if self._lazy is not None:
+            nk.nk_py_lazy_font_set(self._lazy, font._as_parameter_, self.texture.to_c())
+        if self._atlas is not None:
+            font_atlas_clear(self._atlas)
+        self._atlas = atlas
+        self._font = font
+
+        fmt = getattr(self.fmt, "value", self.fmt)
+        self.stats.glyph_count = atlas.struct.glyph_count
+        self.stats.atlas_bytes = width * height * _BYTES_PER_PIXEL[
+            fmt
+        ] + atlas.struct.glyph_count * ctypes.sizeof(FontGlyph.Struct)
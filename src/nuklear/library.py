@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import ctypes
 import glob
+import itertools
 import os
 import subprocess
 import sys
@@ -13,7 +14,7 @@ from abc import abstractmethod
 from dataclasses import astuple
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, TypeVar
+from typing import Dict, Optional, TypeVar
 
 from nuklear import metadata
 
@@ -222,6 +223,66 @@ class StructWrapper(ABC):
         ...
 
 
+class StringCache:
+    """
+    Interns the UTF-8 encoding of strings passed to Nuklear, so that the labels
+    and window titles of an immediate mode UI are not encoded anew every frame.
+    ctypes passes the buffer of a `bytes` object to `c_char_p` arguments
+    without copying, so the interned `bytes` serve as persistent buffers.
+
+    A string is interned the second time it is encoded; strings that show up
+    once, such as formatted numbers, only pass through a nursery of the same
+    size that is dropped whenever it fills up. Once `max_entries` strings are
+    interned, the oldest quarter of them is dropped. Strings longer than
+    `max_length` characters are never cached.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_length: int = 256):
+        self.max_entries = max_entries
+        self.max_length = max_length
+        self.interned: Dict[str, bytes] = {}
+        self._nursery: Dict[str, bytes] = {}
+
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.interned)
+
+    def encode(self, s: str) -> bytes:
+        encoded = self.interned.get(s)
+        if encoded is None:
+            encoded = self._miss(s)
+        return encoded
+
+    def clear(self) -> None:
+        self.interned.clear()
+        self._nursery.clear()
+
+    def _miss(self, s: str) -> bytes:
+        encoded = self._nursery.pop(s, None)
+        if encoded is not None:
+            if len(self.interned) >= self.max_entries:
+                stale = list(itertools.islice(self.interned, self.max_entries // 4 + 1))
+                for key in stale:
+                    self.interned.pop(key, None)
+                self.evictions += len(stale)
+            self.interned[s] = encoded
+            return encoded
+
+        self.misses += 1
+        encoded = s.encode("utf-8")
+        if len(s) <= self.max_length and self.max_entries > 0:
+            if len(self._nursery) >= self.max_entries:
+                self._nursery.clear()
+            self._nursery[s] = encoded
+        return encoded
+
+
+# Used by `to_char_p`; set its `max_entries` to 0 to encode every string anew.
+string_cache = StringCache()
+
+
 # Python 3 compatibility:
 # try:
 #     _getcwd = os.getcwdu
@@ -230,7 +291,10 @@ class StructWrapper(ABC):
 if sys.version_info.major > 2:
 
     def to_char_p(s):
-        return s.encode("utf-8")
+        encoded = string_cache.interned.get(s)
+        if encoded is None:
+            encoded = string_cache._miss(s)
+        return encoded
 
     def from_char_p(b):
         return b.decode()
@@ -251,6 +315,12 @@ else:
         exec("raise exception, None, traceback")
 
 
+# The library is loaded with `ctypes.CDLL`, which releases the GIL for the
+# duration of every call into Nuklear. Nuklear itself keeps no global state, so
+# independent contexts may be driven from different threads concurrently, as
+# long as every context is only used by one thread at a time (see
+# `nuklear.context.Context.lock`). Function prototypes are configured once at
+# import time and are never modified afterwards.
 nuklear: Optional[ctypes.CDLL] = None
 if os.environ.get("NUKLEAR_PY_LIBRARY", ""):
     try:
@@ -0,0 +1,477 @@
+"""
+Software rasterizer for rendering without a GPU.
+
+`Rasterizer` draws the triangles produced by `nk_convert` (see `Converter`) into
+an RGBA NumPy array. Scissor rects are honored, text is drawn from the baked
+font atlas and images from any texture registered with `set_texture`; draw
+commands whose texture is unknown are drawn untextured.
+
+Textured axis aligned rectangles, which make up every glyph and image, are
+drawn as whole blocks; every other triangle is drawn with edge functions over
+its bounding box. Either way each primitive costs a handful of vectorized
+operations. With `threads` greater than one, the surface is split into bands of
+`tile_size` rows that are drawn concurrently, as NumPy releases the GIL while
+it works on the pixels.
+"""
+
+from __future__ import annotations
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from nuklear.context import Context
+from nuklear.drawing import Converter
+from nuklear.drawing import DrawData
+from nuklear.font import FontAtlas
+from nuklear.headless import ATLAS_TEXTURE_ID
+from nuklear.headless import Renderer
+from nuklear.types import Rect
+
+# An axis aligned pixel box as (x0, y0, x1, y1) with exclusive maximum.
+Box = Tuple[int, int, int, int]
+
+Color = Tuple[float, float, float, float]
+
+
+def _pixel(v: float) -> int:
+    # Index of the first pixel whose center lies at or after `v`.
+    return math.ceil(v - 0.5)
+
+
+def _intersect(a: Box, b: Box) -> Optional[Box]:
+    box = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None
+    return box
+
+
+def _blend(dst: np.ndarray, rgb, alpha) -> None:
+    # Source-over blending of straight `rgb` into premultiplied RGBA floats.
+    if np.ndim(alpha) == 0:
+        if alpha <= 0.0:
+            return
+        if alpha >= 1.0 and np.ndim(rgb) == 1:
+            dst[..., :3] = rgb
+            dst[..., 3] = 1.0
+            return
+    else:
+        alpha = alpha[..., None]
+    dst *= 1.0 - alpha
+    dst[..., :3] += rgb * alpha
+    dst[..., 3:] += alpha
+
+
+def _sample(texture: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # Nearest neighbour lookup; `u` and `v` broadcast against each other.
+    height, width = texture.shape[:2]
+    tx = np.clip(np.floor(u * width).astype(np.intp), 0, width - 1)
+    ty = np.clip(np.floor(v * height).astype(np.intp), 0, height - 1)
+    return texture[ty, tx]
+
+
+class _Quad:
+    """An axis aligned rectangle with one color and linearly mapped uvs."""
+
+    __slots__ = ("box", "rect", "uv", "color", "texture")
+
+    def __init__(self, box, rect, uv, color, texture):
+        self.box = box
+        self.rect = rect
+        self.uv = uv
+        self.color = color
+        self.texture = texture
+
+    def draw(self, canvas: np.ndarray, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        dst = canvas[y0:y1, x0:x1]
+        if self.texture is None:
+            _blend(dst, self.color[:3], self.color[3])
+            return
+        rx0, ry0, rx1, ry1 = self.rect
+        u0, v0, u1, v1 = self.uv
+        px = np.arange(x0, x1) + 0.5
+        py = np.arange(y0, y1) + 0.5
+        u = u0 + (px - rx0) * ((u1 - u0) / (rx1 - rx0))
+        v = v0 + (py - ry0) * ((v1 - v0) / (ry1 - ry0))
+        src = _sample(self.texture, u[None, :], v[:, None]) * self.color
+        _blend(dst, src[..., :3], src[..., 3])
+
+
+class _Triangle:
+    """A triangle with interpolated colors and uvs."""
+
+    __slots__ = ("box", "edges", "area", "colors", "uvs", "texture")
+
+    def __init__(self, box, points, colors, uvs, texture):
+        self.box = box
+        (ax, ay), (bx, by), (cx, cy) = points
+        area = (cx - bx) * (ay - by) - (cy - by) * (ax - bx)
+        sign = 1.0 if area > 0 else -1.0
+        # The edge opposite of every vertex as w = a * x + b * y + c, oriented so
+        # the inside is positive. Pixels exactly on an edge belong to the
+        # triangle only for "top-left" edges, so shared edges are drawn once.
+        edges = []
+        for (x0, y0), (x1, y1) in (((bx, by), (cx, cy)), ((cx, cy), (ax, ay))):
+            a = -(y1 - y0) * sign
+            b = (x1 - x0) * sign
+            edges.append((a, b, -a * x0 - b * y0, a > 0 or (a == 0 and b > 0)))
+        a = -(by - ay) * sign
+        b = (bx - ax) * sign
+        edges.append((a, b, -a * ax - b * ay, a > 0 or (a == 0 and b > 0)))
+        self.edges = edges
+        self.area = abs(area)
+        self.colors = colors
+        self.uvs = uvs
+        self.texture = texture
+
+    def draw(self, canvas: np.ndarray, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        px = np.arange(x0, x1) + 0.5
+        py = (np.arange(y0, y1) + 0.5)[:, None]
+        weights = []
+        inside = None
+        for a, b, c, top_left in self.edges:
+            w = a * px + (b * py + c)
+            edge = w >= 0 if top_left else w > 0
+            inside = edge if inside is None else inside & edge
+            weights.append(w)
+        if not inside.any():
+            return
+
+        colors = self.colors
+        dst = canvas[y0:y1, x0:x1]
+        if (colors[0] == colors[1]).all() and (colors[0] == colors[2]).all():
+            src = colors[0]
+            if self.texture is None and src[3] >= 1.0:
+                # Opaque and flat, as are the insides of most widgets.
+                np.copyto(dst[..., :3], src[:3], where=inside[..., None])
+                np.copyto(dst[..., 3], 1.0, where=inside)
+                return
+        else:
+            l0, l1, l2 = (w / self.area for w in weights)
+            src = l0[..., None] * colors[0] + l1[..., None] * colors[1]
+            src += l2[..., None] * colors[2]
+        if self.texture is not None:
+            uvs = self.uvs
+            if (uvs[0] == uvs[1]).all() and (uvs[0] == uvs[2]).all():
+                texel = _sample(self.texture, uvs[0][0], uvs[0][1])
+            else:
+                l0, l1, l2 = (w / self.area for w in weights)
+                u = l0 * uvs[0][0] + l1 * uvs[1][0] + l2 * uvs[2][0]
+                v = l0 * uvs[0][1] + l1 * uvs[1][1] + l2 * uvs[2][1]
+                texel = _sample(self.texture, u, v)
+            src = src * texel
+        _blend(dst, src[..., :3], src[..., 3] * inside)
+
+
+class Rasterizer:
+    """
+    Draws `DrawData` into a `height` x `width` RGBA surface.
+
+    The surface is kept between frames in `canvas`, as premultiplied float
+    RGBA, so a frame can be drawn into a few dirty regions only (see
+    `nuklear.damage.DamageTracker`). `pixels` returns it as RGBA8 rows.
+    Textures are looked up by the value of the draw command's `nk_handle`, i.e.
+    its id or pointer.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        threads: int = 1,
+        tile_size: int = 64,
+        converter: Optional[Converter] = None,
+    ):
+        self.width = width
+        self.height = height
+        self.threads = max(1, threads)
+        self.tile_size = max(1, tile_size)
+        self.converter = converter or Converter()
+        self.textures: Dict[int, np.ndarray] = {}
+        self.canvas = np.zeros((height, width, 4), np.float32)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.threads > 1:
+            self._executor = ThreadPoolExecutor(self.threads)
+
+    def __enter__(self) -> Rasterizer:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def set_texture(
+        self,
+        handle: int,
+        pixels: Union[bytes, np.ndarray],
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> None:
+        """
+        Registers an RGBA8 texture, either as a `height` x `width` x 4 array or
+        as tightly packed rows with the given size.
+        """
+        array = np.asarray(pixels if width is None else memoryview(pixels), np.uint8)
+        if width is not None:
+            array = array.reshape(height, width, 4)
+        self.textures[handle] = array.astype(np.float32) / 255.0
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """The surface as a `height` x `width` x 4 array of RGBA8 values."""
+        return self.read_pixels()
+
+    def read_pixels(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Writes the surface as RGBA8 values into `out`, a `height` x `width` x 4
+        array such as a frame of `nuklear.export.MappedFrameWriter`, or into a
+        new array, and returns it.
+        """
+        # The canvas is premultiplied, so blending onto transparent pixels
+        # composites correctly; the result has straight alpha like the input.
+        alpha = self.canvas[..., 3:]
+        rgb = np.divide(
+            self.canvas[..., :3],
+            alpha,
+            out=np.zeros((self.height, self.width, 3), np.float32),
+            where=alpha > 0,
+        )
+        if out is None:
+            out = np.empty((self.height, self.width, 4), np.uint8)
+        out[..., :3] = np.minimum(rgb, 1.0) * 255.0 + 0.5
+        out[..., 3:] = alpha * 255.0 + 0.5
+        return out
+
+    def _primitives(self, data: DrawData) -> List:
+        if not data.element_count:
+            return []
+        vertices = data.vertices
+        positions = vertices["position"].astype(np.float64)
+        uvs = vertices["uv"].astype(np.float64)
+        colors = vertices["color"].astype(np.float32) / 255.0
+        elements = data.elements.astype(np.intp)
+        surface = (0, 0, self.width, self.height)
+
+        primitives: List = []
+        offset = 0
+        for command in data.commands:
+            count = int(command["elem_count"])
+            triangles = elements[offset : offset + count].reshape(-1, 3)
+            offset += count
+            x, y, w, h = (float(v) for v in command["clip_rect"])
+            clip = _intersect(
+                (_pixel(x), _pixel(y), _pixel(x + w), _pixel(y + h)), surface
+            )
+            if clip is None or not len(triangles):
+                continue
+            texture = self.textures.get(int(command["texture"]))
+            quads = self._quads(triangles, positions, uvs, colors)
+            i = 0
+            while i < len(triangles):
+                if quads[i]:
+                    primitive = self._quad(
+                        triangles[i][0], positions, uvs, colors, clip, texture
+                    )
+                    i += 2
+                else:
+                    primitive = self._triangle(
+                        triangles[i], positions, uvs, colors, clip, texture
+                    )
+                    i += 1
+                if primitive is not None:
+                    primitives.append(primitive)
+        return primitives
+
+    @staticmethod
+    def _quads(triangles, positions, uvs, colors) -> np.ndarray:
+        # Marks every triangle that starts a `nk_draw_list_push_rect_uv` quad:
+        # indices (v, v+1, v+2), (v, v+2, v+3) over an axis aligned rectangle
+        # with one color and uvs that follow the axes.
+        quads = np.zeros(len(triangles), bool)
+        if len(triangles) < 2:
+            return quads
+        first, second = triangles[:-1], triangles[1:]
+        v = first[:, 0]
+        candidates = np.nonzero(
+            (first[:, 1] == v + 1)
+            & (first[:, 2] == v + 2)
+            & (second[:, 0] == v)
+            & (second[:, 1] == v + 2)
+            & (second[:, 2] == v + 3)
+        )[0]
+        if not len(candidates):
+            return quads
+        v = v[candidates]
+        p = [positions[v + k] for k in range(4)]
+        t = [uvs[v + k] for k in range(4)]
+        c = [colors[v + k] for k in range(4)]
+        aligned = (
+            (p[0][:, 1] == p[1][:, 1])
+            & (p[1][:, 0] == p[2][:, 0])
+            & (p[2][:, 1] == p[3][:, 1])
+            & (p[3][:, 0] == p[0][:, 0])
+            & (t[0][:, 1] == t[1][:, 1])
+            & (t[1][:, 0] == t[2][:, 0])
+            & (t[2][:, 1] == t[3][:, 1])
+            & (t[3][:, 0] == t[0][:, 0])
+            & (c[0] == c[1]).all(axis=1)
+            & (c[0] == c[2]).all(axis=1)
+            & (c[0] == c[3]).all(axis=1)
+        )
+        quads[candidates[aligned]] = True
+        return quads
+
+    @staticmethod
+    def _quad(v, positions, uvs, colors, clip, texture) -> Optional[_Quad]:
+        (x0, y0), (x1, y1) = positions[v], positions[v + 2]
+        (u0, v0), (u1, v1) = uvs[v], uvs[v + 2]
+        if x0 > x1:
+            x0, x1, u0, u1 = x1, x0, u1, u0
+        if y0 > y1:
+            y0, y1, v0, v1 = y1, y0, v1, v0
+        box = _intersect((_pixel(x0), _pixel(y0), _pixel(x1), _pixel(y1)), clip)
+        if box is None:
+            return None
+        color = colors[v]
+        if texture is not None and u0 == u1 and v0 == v1:
+            # A single texel, such as the white pixel of the null texture.
+            color = color * _sample(texture, u0, v0)
+            texture = None
+        if color[3] <= 0:
+            return None
+        return _Quad(box, (x0, y0, x1, y1), (u0, v0, u1, v1), color, texture)
+
+    @staticmethod
+    def _triangle(index, positions, uvs, colors, clip, texture) -> Optional[_Triangle]:
+        color = colors[index]
+        if not color[:, 3].any():
+            return None
+        points = positions[index]
+        box = (
+            _pixel(points[:, 0].min()),
+            _pixel(points[:, 1].min()),
+            math.floor(points[:, 0].max() - 0.5) + 1,
+            math.floor(points[:, 1].max() - 0.5) + 1,
+        )
+        box = _intersect(box, clip)
+        if box is None:
+            return None
+        triangle = _Triangle(box, points, color, uvs[index], texture)
+        return triangle if triangle.area > 0 else None
+
+    def _regions(self, regions: Optional[Sequence[Rect]]) -> List[Box]:
+        surface = (0, 0, self.width, self.height)
+        if regions is None:
+            return [surface]
+        boxes = []
+        for rect in regions:
+            box = (
+                math.floor(rect.x),
+                math.floor(rect.y),
+                math.ceil(rect.x + rect.w),
+                math.ceil(rect.y + rect.h),
+            )
+            box = _intersect(box, surface)
+            if box is not None:
+                boxes.append(box)
+        return boxes
+
+    def _draw_band(self, primitives, boxes, regions, background) -> None:
+        canvas = self.canvas
+        for region in regions:
+            x0, y0, x1, y1 = region
+            canvas[y0:y1, x0:x1] = background
+            if not primitives:
+                continue
+            hits = np.nonzero(
+                (boxes[:, 0] < x1)
+                & (boxes[:, 2] > x0)
+                & (boxes[:, 1] < y1)
+                & (boxes[:, 3] > y0)
+            )[0]
+            for index in hits:
+                primitive = primitives[index]
+                primitive.draw(canvas, _intersect(primitive.box, region))
+
+    def draw(
+        self,
+        data: DrawData,
+        regions: Optional[Sequence[Rect]] = None,
+        background: Color = (0.0, 0.0, 0.0, 0.0),
+    ) -> None:
+        """
+        Clears `regions`, or the whole surface, to `background` and draws the
+        part of `data` that falls into them. Everything outside of `regions`
+        keeps what was drawn before.
+        """
+        primitives = self._primitives(data)
+        boxes = np.array([p.box for p in primitives], np.intp).reshape(-1, 4)
+        background = np.asarray(background, np.float32)
+        background[:3] *= background[3]
+        regions = self._regions(regions)
+
+        if self._executor is None:
+            self._draw_band(primitives, boxes, regions, background)
+            return
+        bands = []
+        for y in range(0, self.height, self.tile_size):
+            band = (0, y, self.width, y + self.tile_size)
+            parts = [b for b in (_intersect(r, band) for r in regions) if b]
+            if parts:
+                bands.append(parts)
+        futures = [
+            self._executor.submit(self._draw_band, primitives, boxes, parts, background)
+            for parts in bands
+        ]
+        for future in futures:
+            future.result()
+
+    def render(
+        self,
+        ctx: Context,
+        regions: Optional[Sequence[Rect]] = None,
+        background: Color = (0.0, 0.0, 0.0, 0.0),
+    ) -> np.ndarray:
+        """Converts and draws the current frame of `ctx` and returns `pixels`."""
+        self.draw(self.converter.convert(ctx), regions, background)
+        return self.pixels
+
+
+class SoftwareRenderer(Renderer):
+    """
+    `Renderer` for `nuklear.headless.SnapshotService` that rasterizes every
+    snapshot on the CPU with `Rasterizer`.
+    """
+
+    def __init__(self, threads: int = 1, background: Color = (0.0, 0.0, 0.0, 0.0)):
+        self.threads = threads
+        self.background = background
+        self._atlas: Optional[Tuple[bytes, int, int]] = None
+        self._rasterizer: Optional[Rasterizer] = None
+
+    def __getstate__(self):
+        return {"threads": self.threads, "background": self.background}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def setup(self, atlas: FontAtlas, pixels: bytes, width: int, height: int) -> None:
+        self._atlas = pixels, width, height
+
+    def render(self, ctx: Context, width: int, height: int) -> bytes:
+        raster = self._rasterizer
+        if raster is None or (raster.width, raster.height) != (width, height):
+            if raster is not None:
+                raster.close()
+            raster = self._rasterizer = Rasterizer(width, height, self.threads)
+            if self._atlas is not None:
+                raster.set_texture(ATLAS_TEXTURE_ID, *self._atlas)
+        return raster.render(ctx, background=self.background).tobytes()
@@ -0,0 +1,290 @@
+"""
+Deterministic input recording and replay.
+
+`InputRecorder` writes the input of every frame, exactly as it is handed to
+`input_events`, into a compact binary log. `replay` feeds such a log back into
+a context as fast as possible, with a fixed `delta_time_seconds`, and returns a
+per-frame timing and allocation report. Replaying the same log against two
+versions of a screen gives directly comparable frame times.
+
+Log format, all values little-endian:
+
+    b"NKPYINP1"
+    for every frame:
+        uint32 event count
+        for every event:
+            uint8 type, followed by
+                motion:  int32 x, int32 y
+                key:     uint8 key, uint8 down
+                button:  uint8 button, uint8 down, int32 x, int32 y
+                scroll:  float32 x, float32 y
+                unicode: uint32 rune
+"""
+
+from __future__ import annotations
+
+import csv
+import gc
+import os
+import struct
+import sys
+import time
+from dataclasses import astuple
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from typing import IO, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from nuklear.context import Context
+from nuklear.context import clear
+from nuklear.context import set_delta_time_seconds
+from nuklear.input import InputQueue
+from nuklear.input import input_events
+from nuklear.types import AllocationStats
+from nuklear.types import InputType
+
+MAGIC = b"NKPYINP1"
+
+_FRAME = struct.Struct("<I")
+_TYPE = struct.Struct("<B")
+_PAYLOAD = {
+    InputType.INPUT_MOTION: struct.Struct("<ii"),
+    InputType.INPUT_KEY: struct.Struct("<BB"),
+    InputType.INPUT_BUTTON: struct.Struct("<BBii"),
+    InputType.INPUT_SCROLL: struct.Struct("<ff"),
+    InputType.INPUT_UNICODE: struct.Struct("<I"),
+}
+
+
+def _encode(events: InputQueue) -> bytes:
+    chunks = [_FRAME.pack(len(events))]
+    for kind, code, down, x, y, sx, sy in events:
+        chunks.append(_TYPE.pack(kind))
+        if kind == InputType.INPUT_MOTION:
+            chunks.append(_PAYLOAD[kind].pack(x, y))
+        elif kind == InputType.INPUT_KEY:
+            chunks.append(_PAYLOAD[kind].pack(code, down))
+        elif kind == InputType.INPUT_BUTTON:
+            chunks.append(_PAYLOAD[kind].pack(code, down, x, y))
+        elif kind == InputType.INPUT_SCROLL:
+            chunks.append(_PAYLOAD[kind].pack(sx, sy))
+        elif kind == InputType.INPUT_UNICODE:
+            chunks.append(_PAYLOAD[kind].pack(code))
+        else:
+            raise ValueError(f"Unknown input event type: {kind}")
+    return b"".join(chunks)
+
+
+def _decode(data: bytes, offset: int, count: int) -> Tuple[InputQueue, int]:
+    events = InputQueue()
+    for _ in range(count):
+        (kind,) = _TYPE.unpack_from(data, offset)
+        offset += _TYPE.size
+        payload = _PAYLOAD.get(kind)
+        if payload is None:
+            raise ValueError(f"Corrupt input log: unknown event type {kind}")
+        values = payload.unpack_from(data, offset)
+        offset += payload.size
+        if kind == InputType.INPUT_MOTION:
+            events.motion(*values)
+        elif kind == InputType.INPUT_KEY:
+            events.key(*values)
+        elif kind == InputType.INPUT_BUTTON:
+            code, down, x, y = values
+            events.button(code, x, y, down)
+        elif kind == InputType.INPUT_SCROLL:
+            events.scroll(*values)
+        else:
+            events.unicode(*values)
+    return events, offset
+
+
+class InputRecorder:
+    """
+    Records the input of every frame into a binary log.
+
+    `file` is either a path, which is created and owned by the recorder, or a
+    binary file object that stays open after `close`. Call `record` (or
+    `input_events`, which also applies the input) exactly once per frame, even
+    for frames without input, so frame boundaries are preserved.
+    """
+
+    def __init__(self, file: Union[os.PathLike, str, IO[bytes]]):
+        if isinstance(file, (str, os.PathLike)):
+            self._file = open(file, "wb")
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+        self._file.write(MAGIC)
+        self.frames = 0
+
+    def __enter__(self) -> InputRecorder:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def record(self, events: InputQueue) -> None:
+        self._file.write(_encode(events))
+        self.frames += 1
+
+    def input_events(self, ctx: Context, events: InputQueue) -> None:
+        """Records `events` as one frame and applies them with `input_events`."""
+        self.record(events)
+        input_events(ctx, events)
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def iter_input_log(data: bytes) -> Iterator[InputQueue]:
+    """Yields the input of every frame stored in the log `data`."""
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a nuklearPy input log")
+    offset = len(MAGIC)
+    while offset < len(data):
+        try:
+            (count,) = _FRAME.unpack_from(data, offset)
+            events, offset = _decode(data, offset + _FRAME.size, count)
+        except struct.error as e:
+            raise ValueError("Corrupt input log: truncated frame") from e
+        yield events
+
+
+def read_input_log(file: Union[os.PathLike, str, IO[bytes]]) -> List[InputQueue]:
+    """Reads a log written by `InputRecorder`, returning one queue per frame."""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            data = f.read()
+    else:
+        data = file.read()
+    return list(iter_input_log(data))
+
+
+@dataclass
+class FrameReport:
+    """
+    Measurements of a single replayed frame. `seconds` covers applying the input
+    and building the frame, `nk_allocs` and `nk_alloc_bytes` are only filled in
+    when the context counts its allocations (see `init_counting`), and
+    `py_blocks` is the change in live Python memory blocks during the frame.
+    """
+
+    frame: int
+    events: int
+    seconds: float
+    input_seconds: float
+    nk_allocs: int = 0
+    nk_alloc_bytes: int = 0
+    py_blocks: int = 0
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class ReplayReport:
+    delta_time: float
+    frames: List[FrameReport] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(frame.seconds for frame in self.frames)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / len(self.frames) if self.frames else 0.0
+
+    @property
+    def max_seconds(self) -> float:
+        return max((frame.seconds for frame in self.frames), default=0.0)
+
+    def percentile(self, percent: float) -> float:
+        """Frame time below which `percent` percent of the frames fall."""
+        return _percentile([frame.seconds for frame in self.frames], percent)
+
+    @property
+    def fps(self) -> float:
+        total = self.total_seconds
+        return len(self.frames) / total if total else 0.0
+
+    @property
+    def nk_allocs(self) -> int:
+        return sum(frame.nk_allocs for frame in self.frames)
+
+    @property
+    def nk_alloc_bytes(self) -> int:
+        return sum(frame.nk_alloc_bytes for frame in self.frames)
+
+    def summary(self) -> str:
+        ms = 1000.0
+        return (
+            f"{len(self.frames)} frames, {self.fps:.1f} fps, "
+            f"mean {self.mean_seconds * ms:.3f} ms, "
+            f"p50 {self.percentile(50) * ms:.3f} ms, "
+            f"p95 {self.percentile(95) * ms:.3f} ms, "
+            f"max {self.max_seconds * ms:.3f} ms, "
+            f"{self.nk_allocs} nk allocations ({self.nk_alloc_bytes} bytes)"
+        )
+
+    def write_csv(self, file: Union[os.PathLike, str, IO[str]]) -> None:
+        """Writes one row per frame, with a header naming the `FrameReport` fields."""
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w", newline="") as f:
+                self.write_csv(f)
+            return
+        writer = csv.writer(file)
+        writer.writerow([f.name for f in fields(FrameReport)])
+        writer.writerows(astuple(frame) for frame in self.frames)
+
+
+def replay(
+    ctx: Context,
+    frames: Sequence[InputQueue],
+    build: Callable[[Context], None],
+    delta_time: float = 1 / 60,
+    stats: Optional[AllocationStats.Struct] = None,
+    warmup: int = 0,
+) -> ReplayReport:
+    """
+    Drives `ctx` through `frames` without any throttling.
+
+    Every frame sets `delta_time_seconds` to `delta_time`, applies the recorded
+    input, calls `build` to declare the widgets and clears the context. Pass the
+    counters returned by `init_counting` as `stats` to report Nuklear's own
+    allocations. The first `warmup` frames are replayed but left out of the
+    report.
+    """
+    report = ReplayReport(delta_time)
+    counter = time.perf_counter
+    gc.collect()
+    for index, events in enumerate(frames):
+        set_delta_time_seconds(ctx, delta_time)
+        allocs = stats.alloc_count if stats is not None else 0
+        alloc_bytes = stats.alloc_bytes if stats is not None else 0
+        blocks = sys.getallocatedblocks()
+
+        start = counter()
+        input_events(ctx, events)
+        applied = counter()
+        build(ctx)
+        end = counter()
+
+        frame = FrameReport(index, len(events), end - start, applied - start)
+        if stats is not None:
+            frame.nk_allocs = stats.alloc_count - allocs
+            frame.nk_alloc_bytes = stats.alloc_bytes - alloc_bytes
+        frame.py_blocks = sys.getallocatedblocks() - blocks
+        clear(ctx)
+        if index >= warmup:
+            report.frames.append(frame)
+    return report
@@ -0,0 +1,126 @@
+"""
+Text edit filters for arbitrary sets of runes, evaluated in C.
+
+A `PluginFilter` made from a Python function calls back into the interpreter
+for every rune typed into an edit widget. A `RuneFilter` describes the runes it
+accepts declaratively, as characters, rune ranges and a regular expression,
+and compiles them to a bitmap of runes. Its `filter` is a C function that only
+looks the rune up in this bitmap.
+
+Nuklear decodes UTF-8 sequences of up to three bytes, so filters only ever see
+runes of the basic multilingual plane; it passes every byte of a longer
+sequence as U+FFFD instead, which a `RuneFilter` has to accept for such runes
+to get through.
+
+`nk_plugin_filter` has no user data, so the nuklearPy shim has a fixed number
+of filter functions, `nk_py_rune_filter_count`, each reading the bitmap of its
+slot. A `RuneFilter` holds a slot until `close`, the end of its `with` block or
+until it is garbage collected; its `filter` keeps it alive. Without the shim,
+or with all slots in use, `filter` is a Python callback over the same bitmap.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import re
+import threading
+import weakref
+from typing import Iterable, Optional, Tuple, Union
+
+from nuklear.library import nuklear as nk
+from nuklear.types import PluginFilter
+
+# Runes of the basic multilingual plane.
+RUNES = 0x10000
+
+if hasattr(nk, "nk_py_rune_filter"):
+    nk.nk_py_rune_filter_count.argtypes = ()
+    nk.nk_py_rune_filter_count.restype = ctypes.c_int
+
+    nk.nk_py_rune_filter.argtypes = (ctypes.c_int, ctypes.c_void_p)
+    nk.nk_py_rune_filter.restype = PluginFilter
+
+    _free_slots = list(range(nk.nk_py_rune_filter_count()))[::-1]
+else:
+    _free_slots = []
+
+_lock = threading.Lock()
+
+
+def _release(slot: int, bitmap: ctypes.Array) -> None:
+    # Takes `bitmap` to keep it alive for C until the slot no longer reads it.
+    nk.nk_py_rune_filter(slot, None)
+    with _lock:
+        _free_slots.append(slot)
+
+
+class RuneFilter:
+    """
+    Accepts the runes in `chars`, in the inclusive (first, last) `ranges` and
+    those matching the regular expression `pattern` as a single character,
+    such as `[\\w.-]`.
+    """
+
+    def __init__(
+        self,
+        chars: str = "",
+        ranges: Iterable[Tuple[int, int]] = (),
+        pattern: Optional[Union[str, re.Pattern]] = None,
+    ):
+        mask = 0
+        for first, last in [(ord(c), ord(c)) for c in chars] + list(ranges):
+            if not 0 <= first <= last < RUNES:
+                raise ValueError(
+                    f"Rune range {first:#x}-{last:#x} is not within the basic "
+                    "multilingual plane"
+                )
+            mask |= ((1 << (last - first + 1)) - 1) << first
+        if pattern is not None:
+            match = re.compile(pattern).fullmatch
+            for rune in range(RUNES):
+                if not 0xD800 <= rune <= 0xDFFF and match(chr(rune)):
+                    mask |= 1 << rune
+        self._mask = mask
+        self.bitmap = (ctypes.c_ubyte * (RUNES // 8)).from_buffer_copy(
+            mask.to_bytes(RUNES // 8, "little")
+        )
+
+        self.slot: Optional[int] = None
+        with _lock:
+            if _free_slots:
+                self.slot = _free_slots.pop()
+        if self.slot is not None:
+            self.filter = nk.nk_py_rune_filter(self.slot, self.bitmap)
+            # Released once the filter is closed or collected, whichever first.
+            self._finalizer = weakref.finalize(self, _release, self.slot, self.bitmap)
+            self._finalizer.atexit = False
+        else:
+            self.filter = PluginFilter(lambda edit, rune: rune in self)
+        # Whoever holds on to `filter` for an edit widget keeps the slot taken.
+        self.filter.rune_filter = self
+
+    def __enter__(self) -> RuneFilter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def native(self) -> bool:
+        """Whether `filter` runs without calling back into Python."""
+        return self.slot is not None
+
+    def __contains__(self, rune: Union[int, str]) -> bool:
+        if isinstance(rune, str):
+            rune = ord(rune)
+        return rune < RUNES and bool(self._mask >> rune & 1)
+
+    def close(self) -> None:
+        """
+        Releases the slot of the filter, after which `filter` accepts every
+        rune. Edit widgets must not use it anymore.
+        """
+        if self.slot is None:
+            return
+        self._finalizer()
+        self.slot = None
@@ -0,0 +1,449 @@
+"""
+Text documents too large for a single `nk_text_edit`.
+
+`nk_text_edit` keeps its text in one contiguous `nk_str`, so every edit moves
+all the text after it, and the edit widget lays out and measures every glyph
+of its text every frame, whether it is in view or not. With a few megabytes of
+text both take longer than a frame.
+
+A `TextDocument` keeps its text in a gap buffer, where an edit only moves the
+text between the previous edit and this one, and counts lines incrementally.
+`document_edit` shows it in a list view that scrolls over all of its lines, but
+hands Nuklear only the lines in view: every frame the edit widget gets a small
+`TextEdit` with these lines, and what it changed there is applied back to the
+document as a single edit.
+
+The document keeps its own undo history, bounded by the bytes it holds rather
+than by a number of records, and `document_edit` maps the undo and redo keys to
+it. Selections, select all and clipboard operations in the widget only reach
+as far as the lines in view.
+
+Without the nuklearPy shim, `document_edit` hands Nuklear the whole document
+every frame.
+"""
+
+from __future__ import annotations
+
+import bisect
+import ctypes
+from collections import deque
+from typing import Deque, List, Optional, Tuple, Union
+
+from nuklear.context import Context
+from nuklear.layout import ListView
+from nuklear.layout import layout_row_dynamic
+from nuklear.layout import list_view_begin
+from nuklear.layout import list_view_end
+from nuklear.library import nuklear as nk
+from nuklear.textedit import TextEdit
+from nuklear.textedit import edit_buffer
+from nuklear.textedit import str_append_text_char
+from nuklear.textedit import str_clear
+from nuklear.textedit import textedit_free
+from nuklear.textedit import textedit_init_default
+from nuklear.types import TEXTEDIT_UNDOCHARCOUNT
+from nuklear.types import EditEvents
+from nuklear.types import EditFlags
+from nuklear.types import EditTypes
+from nuklear.types import Flags
+from nuklear.types import PluginFilter
+
+if hasattr(nk, "nk_py_edit_window"):
+    nk.nk_py_edit_row_height.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_float),
+    )
+    nk.nk_py_edit_row_height.restype = ctypes.c_float
+
+    nk.nk_py_edit_window.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        Flags,
+        ctypes.POINTER(TextEdit.Struct),
+        PluginFilter,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_int),
+    )
+    nk.nk_py_edit_window.restype = Flags
+
+# An edit: the byte offset, the bytes removed there and the bytes inserted.
+_Record = Tuple[int, bytes, bytes]
+
+# Typing merges into the previous undo record up to this many bytes.
+_MERGE_MAX = 256
+
+
+def _encode(text: Union[str, bytes]) -> bytes:
+    return text if isinstance(text, bytes) else text.encode("utf-8")
+
+
+def _common_affixes(a: bytes, b: bytes) -> Tuple[int, int]:
+    """Lengths of the common prefix and the common suffix not overlapping it."""
+    n = min(len(a), len(b))
+    low, high = 0, n
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+    low, high = 0, n - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return prefix, low
+
+
+class TextDocument:
+    """
+    UTF-8 text in a gap buffer with a line index and a byte-bounded undo
+    history. Offsets are in bytes.
+
+    `undo_bytes` bounds the text held by undo and redo records, 0 disables
+    undo. `cursor`, `select_start` and `select_end` are the state of the text
+    cursor in `document_edit`.
+    """
+
+    def __init__(self, text: Union[str, bytes] = "", undo_bytes: int = 1 << 20):
+        data = _encode(text)
+        self._data = bytearray(data)
+        self._gap_start = self._gap_end = len(data)
+        self._newlines = data.count(b"\n")
+        # Starts of the first lines; entries past an edit are dropped and
+        # scanned again on demand.
+        self._lines: List[int] = [0]
+
+        self.undo_bytes = undo_bytes
+        self._undo: Deque[_Record] = deque()
+        self._redo: List[_Record] = []
+        self._undo_size = 0
+
+        self.cursor = 0
+        self.select_start = self.select_end = 0
+        self._edit: Optional[TextEdit] = None
+        # The offsets, text and cursor of the lines in the edit.
+        self._slice: Tuple[int, int, bytes, Tuple[int, int, int]] = (
+            0,
+            0,
+            b"",
+            (0, 0, 0),
+        )
+
+    def __len__(self) -> int:
+        return len(self._data) - (self._gap_end - self._gap_start)
+
+    @property
+    def line_count(self) -> int:
+        return self._newlines + 1
+
+    @property
+    def selection(self) -> Tuple[int, int]:
+        """The selected bytes as a sorted (start, end) pair."""
+        start, end = self.select_start, self.select_end
+        return (start, end) if start <= end else (end, start)
+
+    # ------------------------------------------------------------- gap buffer
+
+    def _move_gap(self, pos: int) -> None:
+        start, end = self._gap_start, self._gap_end
+        if pos == start:
+            return
+        view = memoryview(self._data)
+        if pos < start:
+            n = start - pos
+            view[end - n : end] = view[pos:start]
+            self._gap_start, self._gap_end = pos, end - n
+        else:
+            n = pos - start
+            view[start:pos] = view[end : end + n]
+            self._gap_start, self._gap_end = pos, end + n
+
+    def _reserve(self, size: int) -> None:
+        if self._gap_end - self._gap_start >= size:
+            return
+        old = self._data
+        tail = len(old) - self._gap_end
+        capacity = max(2 * len(old), len(self) + size, 4096)
+        data = bytearray(capacity)
+        view, old_view = memoryview(data), memoryview(old)
+        view[: self._gap_start] = old_view[: self._gap_start]
+        view[capacity - tail :] = old_view[self._gap_end :]
+        self._data, self._gap_end = data, capacity - tail
+
+    def _find_newline(self, pos: int) -> int:
+        data, start = self._data, self._gap_start
+        if pos < start:
+            found = data.find(b"\n", pos, start)
+            if found >= 0:
+                return found
+            pos = start
+        gap = self._gap_end - start
+        found = data.find(b"\n", pos + gap)
+        return found - gap if found >= 0 else -1
+
+    def slice(self, start: int, end: int) -> bytes:
+        """The bytes from `start` to `end`."""
+        data, gap_start = memoryview(self._data), self._gap_start
+        gap = self._gap_end - gap_start
+        if end <= gap_start:
+            return bytes(data[start:end])
+        if start >= gap_start:
+            return bytes(data[start + gap : end + gap])
+        return bytes(data[start:gap_start]) + bytes(data[self._gap_end : end + gap])
+
+    def view(self) -> memoryview:
+        """
+        Returns a read-only view of the text without copying. Moves the gap to
+        the end and is only valid until the next edit.
+        """
+        size = len(self)
+        self._move_gap(size)
+        return memoryview(self._data)[:size].toreadonly()
+
+    def text(self) -> str:
+        return bytes(self.view()).decode("utf-8")
+
+    def line_start(self, line: int) -> int:
+        """Offset of the first byte of `line`, the length past the last line."""
+        if line <= 0:
+            return 0
+        if line > self._newlines:
+            return len(self)
+        lines = self._lines
+        while len(lines) <= line:
+            lines.append(self._find_newline(lines[-1]) + 1)
+        return lines[line]
+
+    def _count_newlines(self, start: int, end: int) -> int:
+        data, gap_start = self._data, self._gap_start
+        gap = self._gap_end - gap_start
+        if end <= gap_start:
+            return data.count(b"\n", start, end)
+        if start >= gap_start:
+            return data.count(b"\n", start + gap, end + gap)
+        return data.count(b"\n", start, gap_start) + data.count(
+            b"\n", self._gap_end, end + gap
+        )
+
+    def line_at(self, pos: int) -> int:
+        """Index of the line containing the byte offset `pos`."""
+        lines = self._lines
+        line = bisect.bisect_right(lines, pos) - 1
+        return line + self._count_newlines(lines[line], pos)
+
+    # ------------------------------------------------------------------ edits
+
+    def _apply(self, pos: int, end: int, text: bytes) -> bytes:
+        if not 0 <= pos <= end <= len(self):
+            raise IndexError(f"range {pos}:{end} out of document of {len(self)} bytes")
+        removed = self.slice(pos, end)
+        self._move_gap(end)
+        self._gap_start = pos
+        self._reserve(len(text))
+        self._data[pos : pos + len(text)] = text
+        self._gap_start = pos + len(text)
+
+        self._newlines += text.count(b"\n") - removed.count(b"\n")
+        lines = self._lines
+        while len(lines) > 1 and lines[-1] > pos:
+            lines.pop()
+
+        for name in ("cursor", "select_start", "select_end"):
+            offset = getattr(self, name)
+            if offset > end:
+                setattr(self, name, offset + len(text) - len(removed))
+            elif offset > pos:
+                setattr(self, name, pos + len(text))
+        return removed
+
+    def replace(
+        self, start: int, end: int, text: Union[str, bytes], merge: bool = False
+    ) -> None:
+        """
+        Replaces the bytes from `start` to `end` with `text`, as one undo step,
+        or with `merge` and text only inserted as part of the previous step if
+        that inserted text right before `start`, as typing does.
+        """
+        data = _encode(text)
+        removed = self._apply(start, end, data)
+        if not self.undo_bytes or not (removed or data):
+            return
+        self._redo.clear()
+        undo = self._undo
+        merge = merge and not removed and undo and len(undo[-1][2]) < _MERGE_MAX
+        if merge:
+            last_pos, last_removed, last_inserted = undo[-1]
+            merge = not last_removed and last_pos + len(last_inserted) == start
+        if merge:
+            undo[-1] = (last_pos, b"", last_inserted + data)
+        else:
+            undo.append((start, removed, data))
+        self._undo_size += len(removed) + len(data)
+        while self._undo_size > self.undo_bytes and undo:
+            _, old_removed, old_inserted = undo.popleft()
+            self._undo_size -= len(old_removed) + len(old_inserted)
+
+    def insert(self, pos: int, text: Union[str, bytes]) -> None:
+        self.replace(pos, pos, text)
+
+    def delete(self, start: int, end: int) -> None:
+        self.replace(start, end, b"")
+
+    def append(self, text: Union[str, bytes]) -> None:
+        self.replace(len(self), len(self), text)
+
+    def undo(self) -> bool:
+        """Reverts the last edit, returns whether there was one."""
+        if not self._undo:
+            return False
+        pos, removed, inserted = record = self._undo.pop()
+        self._undo_size -= len(removed) + len(inserted)
+        self._apply(pos, pos + len(inserted), removed)
+        self._redo.append(record)
+        self.cursor = self.select_start = self.select_end = pos + len(removed)
+        return True
+
+    def redo(self) -> bool:
+        """Repeats the last reverted edit, returns whether there was one."""
+        if not self._redo:
+            return False
+        pos, removed, inserted = record = self._redo.pop()
+        self._apply(pos, pos + len(removed), inserted)
+        self._undo.append(record)
+        self._undo_size += len(removed) + len(inserted)
+        self.cursor = self.select_start = self.select_end = pos + len(inserted)
+        return True
+
+    def clear_undo(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._undo_size = 0
+
+    def close(self) -> None:
+        """Frees the `TextEdit` of `document_edit`."""
+        if self._edit is not None:
+            textedit_free(self._edit)
+            self._edit = None
+
+
+def _runes(text: bytes, offset: int) -> int:
+    """Number of runes in the first `offset` bytes of `text`, clamped to it."""
+    offset = max(0, min(offset, len(text)))
+    return len(text[:offset].decode("utf-8", "replace"))
+
+
+def _bytes(text: bytes, runes: int) -> int:
+    return len(text.decode("utf-8", "replace")[:runes].encode("utf-8"))
+
+
+def _cursor(edit: TextEdit) -> Tuple[int, int, int]:
+    return edit.struct.cursor, edit.struct.select_start, edit.struct.select_end
+
+
+def _load(document: TextDocument, start: int, end: int) -> TextEdit:
+    edit = document._edit
+    if edit is None:
+        edit = document._edit = TextEdit(undo_records=0, undo_chars=0)
+        textedit_init_default(edit)
+    text = document.slice(start, end)
+    str_clear(edit.struct.string)
+    if text:
+        str_append_text_char(edit.struct.string, text)
+    edit.struct.undo.undo_point = edit.struct.undo.redo_point = 0
+    edit.struct.undo.undo_char_point = 0
+    edit.struct.undo.redo_char_point = TEXTEDIT_UNDOCHARCOUNT
+
+    edit.struct.cursor = _runes(text, document.cursor - start)
+    edit.struct.select_start = _runes(text, document.select_start - start)
+    edit.struct.select_end = _runes(text, document.select_end - start)
+    document._slice = (start, end, text, _cursor(edit))
+    return edit
+
+
+def _store(document: TextDocument, edit: TextEdit, typed: bool) -> bool:
+    """Applies the edits in the loaded slice, returns whether there were any."""
+    start, end, text, cursor = document._slice
+    new = bytes(edit.view())
+    changed = new != text
+    if not changed and _cursor(edit) == cursor:
+        # The document cursor may be out of the slice.
+        return False
+    if changed:
+        prefix, suffix = _common_affixes(text, new)
+        document.replace(
+            start + prefix, end - suffix, new[prefix : len(new) - suffix], typed
+        )
+    document.cursor = start + _bytes(new, edit.struct.cursor)
+    document.select_start = start + _bytes(new, edit.struct.select_start)
+    document.select_end = start + _bytes(new, edit.struct.select_end)
+    return changed
+
+
+def document_edit(
+    ctx: Context,
+    document: TextDocument,
+    flags: int = EditTypes.EDIT_BOX,
+    filter: Optional[PluginFilter] = None,
+    name: str = "document",
+) -> int:
+    """
+    Multiline edit widget over a `TextDocument` filling a row of the current
+    layout, returns the `EditEvents` flags. `name` identifies its list view in
+    the window.
+    """
+    flags |= EditFlags.EDIT_MULTILINE
+    if filter is None:
+        filter = PluginFilter()
+    if not hasattr(nk, "nk_py_edit_window"):
+        edit = _load(document, 0, len(document))
+        result = edit_buffer(ctx, flags, edit, filter)
+        if result & EditEvents.EDIT_ACTIVE:
+            _store(document, edit, True)
+        return result
+
+    frame, spacing = ctypes.c_float(), ctypes.c_float()
+    row_height = nk.nk_py_edit_row_height(ctx, frame, spacing)
+    pitch = max(1, round(row_height + spacing.value))
+    view = ListView()
+    if not list_view_begin(
+        ctx, view, name, 0, pitch - int(spacing.value), document.line_count
+    ):
+        return 0
+
+    # One more line above and below the lines in view, for the cursor to move
+    # into, which scrolls the list view.
+    first, count = view.begin, view.count
+    above = 1 if first > 0 else 0
+    edit = _load(
+        document,
+        document.line_start(first - above),
+        document.line_start(first + count + 1),
+    )
+    layout_row_dynamic(ctx, count * row_height + frame.value, 1)
+    keys = ctypes.c_int()
+    edit._filter = filter
+    result = nk.nk_py_edit_window(ctx, flags, edit, filter, above * row_height, keys)
+    list_view_end(view)
+    if not result & EditEvents.EDIT_ACTIVE:
+        return result
+
+    cursor = document.cursor
+    changed = _store(document, edit, not keys.value)
+    if keys.value & 1:
+        changed = document.undo() or changed
+    if keys.value & 2:
+        changed = document.redo() or changed
+    if changed or document.cursor != cursor:
+        line = document.line_at(document.cursor)
+        last = first + max(count - 2, 0)
+        if line < first:
+            view.scroll_pointer[0] = max(
+                0, view.scroll_pointer[0] - (first - line) * pitch
+            )
+        elif line > last:
+            view.scroll_pointer[0] += (line - last) * pitch
+    return result
@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import ctypes
+from typing import Optional, Tuple, Union
+
+from nuklear.buffer import Buffer
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.types import TEXTEDIT_UNDOCHARCOUNT
+from nuklear.types import TEXTEDIT_UNDOSTATECOUNT
+from nuklear.types import Bool
+from nuklear.types import Flags
+from nuklear.types import Handle
+from nuklear.types import PluginCopy
+from nuklear.types import PluginFilter
+from nuklear.types import PluginPaste
+from nuklear.types import Rune
+from nuklear.types import Size
+from nuklear.types import TextEdit as _TextEdit
+from nuklear.types import Vec2
+
+# ==============================================================================
+#
+#                                     STRING
+#
+# ==============================================================================
+
+
+class Str(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_str {
+            struct nk_buffer buffer;
+            int len;
+        };
+    """
+
+    _fields_ = (
+        ("buffer", Buffer.Struct),
+        ("len", ctypes.c_int),
+    )
+
+
+def _encode(text: Union[str, bytes]) -> bytes:
+    return text if isinstance(text, bytes) else to_char_p(text)
+
+
+nk.nk_str_clear.argtypes = (ctypes.POINTER(Str),)
+nk.nk_str_clear.restype = None
+
+
+def str_clear(string: Str) -> None:
+    nk.nk_str_clear(ctypes.byref(string))
+
+
+nk.nk_str_append_text_char.argtypes = (
+    ctypes.POINTER(Str),
+    ctypes.c_char_p,
+    ctypes.c_int,
+)
+nk.nk_str_append_text_char.restype = ctypes.c_int
+
+
+def str_append_text_char(string: Str, text: Union[str, bytes]) -> int:
+    """
+    Appends UTF-8 text in a single allocation. Returns the number of bytes
+    appended.
+    """
+    encoded = _encode(text)
+    return nk.nk_str_append_text_char(ctypes.byref(string), encoded, len(encoded))
+
+
+nk.nk_str_insert_at_char.argtypes = (
+    ctypes.POINTER(Str),
+    ctypes.c_int,
+    ctypes.c_char_p,
+    ctypes.c_int,
+)
+nk.nk_str_insert_at_char.restype = ctypes.c_int
+
+
+def str_insert_at_char(string: Str, pos: int, text: Union[str, bytes]) -> int:
+    """Inserts UTF-8 text at the byte offset `pos`."""
+    encoded = _encode(text)
+    return nk.nk_str_insert_at_char(ctypes.byref(string), pos, encoded, len(encoded))
+
+
+nk.nk_str_delete_chars.argtypes = (ctypes.POINTER(Str), ctypes.c_int, ctypes.c_int)
+nk.nk_str_delete_chars.restype = None
+
+
+def str_delete_chars(string: Str, pos: int, length: int) -> None:
+    """Deletes `length` bytes at the byte offset `pos`."""
+    nk.nk_str_delete_chars(ctypes.byref(string), pos, length)
+
+
+nk.nk_str_len.argtypes = (ctypes.POINTER(Str),)
+nk.nk_str_len.restype = ctypes.c_int
+
+
+def str_len(string: Str) -> int:
+    """Returns the length in runes."""
+    return nk.nk_str_len(ctypes.byref(string))
+
+
+nk.nk_str_len_char.argtypes = (ctypes.POINTER(Str),)
+nk.nk_str_len_char.restype = ctypes.c_int
+
+
+def str_len_char(string: Str) -> int:
+    """Returns the length in bytes."""
+    return nk.nk_str_len_char(ctypes.byref(string))
+
+
+# ==============================================================================
+#
+#                                   TEXT EDITOR
+#
+# ==============================================================================
+
+
+class Clipboard(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_clipboard {
+            nk_handle userdata;
+            nk_plugin_paste paste;
+            nk_plugin_copy copy;
+        };
+    """
+
+    _fields_ = (
+        ("userdata", Handle.Struct),
+        ("paste", PluginPaste),
+        ("copy", PluginCopy),
+    )
+
+
+class TextUndoRecord(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_text_undo_record {
+           int where;
+           short insert_length;
+           short delete_length;
+           short char_storage;
+        };
+    """
+
+    _fields_ = (
+        ("where", ctypes.c_int),
+        ("insert_length", ctypes.c_short),
+        ("delete_length", ctypes.c_short),
+        ("char_storage", ctypes.c_short),
+    )
+
+
+class TextUndoState(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_text_undo_state {
+           struct nk_text_undo_record undo_rec[NK_TEXTEDIT_UNDOSTATECOUNT];
+           nk_rune undo_char[NK_TEXTEDIT_UNDOCHARCOUNT];
+           short undo_point;
+           short redo_point;
+           short undo_char_point;
+           short redo_char_point;
+        };
+    """
+
+    _fields_ = (
+        ("undo_rec", TextUndoRecord * TEXTEDIT_UNDOSTATECOUNT),
+        ("undo_char", Rune * TEXTEDIT_UNDOCHARCOUNT),
+        ("undo_point", ctypes.c_short),
+        ("redo_point", ctypes.c_short),
+        ("undo_char_point", ctypes.c_short),
+        ("redo_char_point", ctypes.c_short),
+    )
+
+
+_TextEdit.Struct._fields_ = (
+    ("clip", Clipboard),
+    ("string", Str),
+    ("filter", PluginFilter),
+    ("scrollbar", Vec2.Struct),
+    ("cursor", ctypes.c_int),
+    ("select_start", ctypes.c_int),
+    ("select_end", ctypes.c_int),
+    ("mode", ctypes.c_ubyte),
+    ("cursor_at_end_of_line", ctypes.c_ubyte),
+    ("initialized", ctypes.c_ubyte),
+    ("has_preferred_x", ctypes.c_ubyte),
+    ("single_line", ctypes.c_ubyte),
+    ("active", ctypes.c_ubyte),
+    ("padding1", ctypes.c_ubyte),
+    ("preferred_x", ctypes.c_float),
+    ("undo", TextUndoState),
+)
+
+
+class TextEdit:
+    """
+    Owns a `struct nk_text_edit`, and for fixed text edits the memory of its
+    string.
+
+    Nuklear keeps up to `TEXTEDIT_UNDOSTATECOUNT` undo records of up to
+    `TEXTEDIT_UNDOCHARCOUNT` runes in total. `undo_records` and `undo_chars`
+    lower these limits, 0 disables undo; the functions of this module drop the
+    oldest records after every edit to stay below them.
+
+    Wrapper for:
+        struct nk_text_edit {
+            struct nk_clipboard clip;
+            struct nk_str string;
+            nk_plugin_filter filter;
+            struct nk_vec2 scrollbar;
+
+            int cursor;
+            int select_start;
+            int select_end;
+            unsigned char mode;
+            unsigned char cursor_at_end_of_line;
+            unsigned char initialized;
+            unsigned char has_preferred_x;
+            unsigned char single_line;
+            unsigned char active;
+            unsigned char padding1;
+            float preferred_x;
+            struct nk_text_undo_state undo;
+        };
+    """
+
+    Struct = _TextEdit.Struct
+
+    def __init__(
+        self,
+        undo_records: int = TEXTEDIT_UNDOSTATECOUNT,
+        undo_chars: int = TEXTEDIT_UNDOCHARCOUNT,
+    ):
+        self.struct = TextEdit.Struct()
+        self._as_parameter_ = ctypes.pointer(self.struct)
+        self.undo_records = undo_records
+        self.undo_chars = undo_chars
+
+        self._memory: Optional[ctypes.Array] = None
+        self._filter: Optional[PluginFilter] = None
+
+    def __len__(self) -> int:
+        """Length of the text in runes."""
+        return self.struct.string.len
+
+    @property
+    def nbytes(self) -> int:
+        """Length of the text in bytes."""
+        return self.struct.string.buffer.allocated
+
+    @property
+    def cursor(self) -> int:
+        return self.struct.cursor
+
+    @cursor.setter
+    def cursor(self, cursor: int) -> None:
+        self.struct.cursor = cursor
+        self.struct.select_start = self.struct.select_end = cursor
+
+    @property
+    def selection(self) -> Tuple[int, int]:
+        """The selected runes as a sorted (start, end) pair."""
+        start, end = self.struct.select_start, self.struct.select_end
+        return (start, end) if start <= end else (end, start)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.struct.active)
+
+    @property
+    def text(self) -> str:
+        return bytes(self.view()).decode("utf-8")
+
+    def view(self) -> memoryview:
+        """
+        Returns a read-only view of the UTF-8 text without copying. Only valid
+        until the text next grows, which may move its memory.
+        """
+        size = self.nbytes
+        if not size:
+            return memoryview(b"")
+        if self._memory is not None:
+            array = (ctypes.c_char * size).from_buffer(self._memory)
+        else:
+            address = self.struct.string.buffer.memory.ptr
+            array = (ctypes.c_char * size).from_address(address)
+        return memoryview(array).cast("B").toreadonly()
+
+    def trim_undo(self) -> None:
+        """Drops the oldest undo records beyond `undo_records` and `undo_chars`."""
+        undo = self.struct.undo
+        while undo.undo_point > self.undo_records or (
+            undo.undo_char_point > self.undo_chars
+        ):
+            if not undo.undo_point:
+                undo.undo_char_point = 0
+                break
+            # Port of nk_textedit_discard_undo.
+            records = ctypes.addressof(undo.undo_rec)
+            if undo.undo_rec[0].char_storage >= 0:
+                n = undo.undo_rec[0].insert_length
+                undo.undo_char_point -= n
+                chars = ctypes.addressof(undo.undo_char)
+                ctypes.memmove(
+                    chars,
+                    chars + n * ctypes.sizeof(Rune),
+                    undo.undo_char_point * ctypes.sizeof(Rune),
+                )
+                for i in range(undo.undo_point):
+                    if undo.undo_rec[i].char_storage >= 0:
+                        undo.undo_rec[i].char_storage -= n
+            undo.undo_point -= 1
+            ctypes.memmove(
+                records,
+                records + ctypes.sizeof(TextUndoRecord),
+                undo.undo_point * ctypes.sizeof(TextUndoRecord),
+            )
+
+    def _trim(self) -> None:
+        if (
+            self.undo_records < TEXTEDIT_UNDOSTATECOUNT
+            or self.undo_chars < TEXTEDIT_UNDOCHARCOUNT
+        ):
+            self.trim_undo()
+
+
+nk.nk_textedit_init_default.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_init_default.restype = None
+
+
+def textedit_init_default(edit: TextEdit) -> None:
+    """
+    Initializes a text edit with a growing string using the standard library
+    allocator.
+    Wrapper for:
+        void nk_textedit_init_default(struct nk_text_edit*);
+    """
+    nk.nk_textedit_init_default(edit)
+
+
+nk.nk_textedit_init_fixed.argtypes = (
+    ctypes.POINTER(TextEdit.Struct),
+    ctypes.c_void_p,
+    Size,
+)
+nk.nk_textedit_init_fixed.restype = None
+
+
+def textedit_init_fixed(edit: TextEdit, memory: ctypes.Array) -> None:
+    """
+    Initializes a text edit with a string of at most `sizeof(memory)` bytes in
+    `memory`, which is kept alive by the text edit.
+    Wrapper for:
+        void nk_textedit_init_fixed(struct nk_text_edit*, void *memory, nk_size size);
+    """
+    edit._memory = memory
+    nk.nk_textedit_init_fixed(edit, ctypes.addressof(memory), ctypes.sizeof(memory))
+
+
+nk.nk_textedit_free.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_free.restype = None
+
+
+def textedit_free(edit: TextEdit) -> None:
+    """
+    Frees the string of a growing text edit.
+    Wrapper for:
+        void nk_textedit_free(struct nk_text_edit*);
+    """
+    nk.nk_textedit_free(edit)
+    edit._memory = None
+
+
+nk.nk_textedit_text.argtypes = (
+    ctypes.POINTER(TextEdit.Struct),
+    ctypes.c_char_p,
+    ctypes.c_int,
+)
+nk.nk_textedit_text.restype = None
+
+
+def textedit_text(edit: TextEdit, text: Union[str, bytes]) -> None:
+    """
+    Types `text` at the cursor, like keyboard input: through the filter and
+    with an undo record per rune.
+    """
+    encoded = _encode(text)
+    nk.nk_textedit_text(edit, encoded, len(encoded))
+    edit._trim()
+
+
+nk.nk_textedit_delete.argtypes = (
+    ctypes.POINTER(TextEdit.Struct),
+    ctypes.c_int,
+    ctypes.c_int,
+)
+nk.nk_textedit_delete.restype = None
+
+
+def textedit_delete(edit: TextEdit, where: int, length: int) -> None:
+    """Deletes `length` runes at the rune offset `where`."""
+    nk.nk_textedit_delete(edit, where, length)
+    edit._trim()
+
+
+nk.nk_textedit_delete_selection.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_delete_selection.restype = None
+
+
+def textedit_delete_selection(edit: TextEdit) -> None:
+    nk.nk_textedit_delete_selection(edit)
+    edit._trim()
+
+
+nk.nk_textedit_select_all.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_select_all.restype = None
+
+
+def textedit_select_all(edit: TextEdit) -> None:
+    nk.nk_textedit_select_all(edit)
+
+
+nk.nk_textedit_cut.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_cut.restype = Bool
+
+
+def textedit_cut(edit: TextEdit) -> bool:
+    """Deletes the selection, returns whether there was one."""
+    result = nk.nk_textedit_cut(edit)
+    edit._trim()
+    return bool(result)
+
+
+nk.nk_textedit_paste.argtypes = (
+    ctypes.POINTER(TextEdit.Struct),
+    ctypes.c_char_p,
+    ctypes.c_int,
+)
+nk.nk_textedit_paste.restype = Bool
+
+if hasattr(nk, "nk_py_textedit_paste"):
+    nk.nk_py_textedit_paste.argtypes = nk.nk_textedit_paste.argtypes
+    nk.nk_py_textedit_paste.restype = Bool
+    _textedit_paste = nk.nk_py_textedit_paste
+else:
+    _textedit_paste = nk.nk_textedit_paste
+
+
+def textedit_paste(edit: TextEdit, text: Union[str, bytes]) -> bool:
+    """
+    Replaces the selection with `text` as a single undo record.
+
+    `nk_textedit_paste` counts runes and bytes interchangeably and only works
+    for ASCII text; with the nuklearPy shim this calls a fixed copy of it,
+    which also leaves out the runes the filter of `edit` rejects.
+    """
+    encoded = _encode(text)
+    result = _textedit_paste(edit, encoded, len(encoded))
+    edit._trim()
+    return bool(result)
+
+
+nk.nk_textedit_undo.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_undo.restype = None
+
+
+def textedit_undo(edit: TextEdit) -> None:
+    nk.nk_textedit_undo(edit)
+
+
+nk.nk_textedit_redo.argtypes = (ctypes.POINTER(TextEdit.Struct),)
+nk.nk_textedit_redo.restype = None
+
+
+def textedit_redo(edit: TextEdit) -> None:
+    nk.nk_textedit_redo(edit)
+
+
+# The filters of nuklear.h, as C function pointers that filter text input
+# without calling back into Python. See `nuklear.runefilter` for other sets of
+# runes.
+filter_default = ctypes.cast(nk.nk_filter_default, PluginFilter)
+filter_ascii = ctypes.cast(nk.nk_filter_ascii, PluginFilter)
+filter_float = ctypes.cast(nk.nk_filter_float, PluginFilter)
+filter_decimal = ctypes.cast(nk.nk_filter_decimal, PluginFilter)
+filter_hex = ctypes.cast(nk.nk_filter_hex, PluginFilter)
+filter_oct = ctypes.cast(nk.nk_filter_oct, PluginFilter)
+filter_binary = ctypes.cast(nk.nk_filter_binary, PluginFilter)
+
+
+# ==============================================================================
+#
+#                                   TEXT EDIT
+#
+# ==============================================================================
+
+nk.nk_edit_buffer.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    Flags,
+    ctypes.POINTER(TextEdit.Struct),
+    PluginFilter,
+)
+nk.nk_edit_buffer.restype = Flags
+
+
+def edit_buffer(
+    ctx: Context, flags: int, edit: TextEdit, filter: Optional[PluginFilter] = None
+) -> int:
+    """
+    Edit widget over a `TextEdit`, returns the `EditEvents` flags. `filter`,
+    `nk_filter_default` by default, is kept alive by `edit`.
+    """
+    if filter is None:
+        filter = PluginFilter()
+    edit._filter = filter
+    result = nk.nk_edit_buffer(ctx, flags, edit, filter)
+    edit._trim()
+    return result
@@ -0,0 +1,249 @@
+"""
+Cached layout of wrapped text.
+
+`nk_text_wrap` breaks its text into lines anew every frame, measuring every
+prefix of every line, which is quadratic in the line length and costs an
+interpreter round trip per measurement with a Python font. `text_wrap` here
+draws the same lines as `nuklear.text_wrap`, but breaks the text only when it
+is not in a `TextLayoutCache` yet, and draws cached lines without measuring
+anything.
+
+Layouts are keyed by the string, the font and the line width. The font is
+identified by its `nk_user_font` and the height and callbacks in it, so
+switching fonts never hits layouts of another font. A `LazyFont` or
+`GlyphTableFont` is also identified by its generation, which changes when the
+lazy font swaps in a new atlas and is never reused by a later font at the same
+address. Other fonts that change their glyphs in place need an explicit
+`TextLayoutCache.invalidate`.
+
+Without the nuklearPy shim, `text_wrap` calls `nk_text_wrap` directly.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.texts import text_wrap as _text_wrap
+from nuklear.texts import text_wrap_colored
+from nuklear.types import Color
+from nuklear.types import UserFont
+
+if hasattr(nk, "nk_py_text_wrap_layout"):
+    nk.nk_py_text_wrap_width.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.POINTER(ctypes.POINTER(UserFont.Struct)),
+    )
+    nk.nk_py_text_wrap_width.restype = ctypes.c_float
+
+    nk.nk_py_text_wrap_layout.argtypes = (
+        ctypes.POINTER(UserFont.Struct),
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int,
+    )
+    nk.nk_py_text_wrap_layout.restype = ctypes.c_int
+
+    nk.nk_py_text_wrap_lines.argtypes = (
+        ctypes.POINTER(Context.Struct),
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_float,
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int,
+        ctypes.POINTER(Color.Struct),
+    )
+    nk.nk_py_text_wrap_lines.restype = None
+
+    nk.nk_py_font_generation.argtypes = (ctypes.POINTER(UserFont.Struct),)
+    nk.nk_py_font_generation.restype = ctypes.c_uint
+
+# Bytes counted per entry on top of the text and the line arrays.
+_ENTRY_OVERHEAD = 200
+
+
+@dataclass
+class TextLayout:
+    """
+    The lines of `encoded`, the UTF-8 text, broken at `width`: the byte length
+    and the width of every line.
+    """
+
+    encoded: bytes
+    width: float
+    lengths: ctypes.Array
+    widths: ctypes.Array
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            sys.getsizeof(self.encoded)
+            + ctypes.sizeof(self.lengths)
+            + ctypes.sizeof(self.widths)
+        )
+
+    def lines(self) -> List[str]:
+        lines = []
+        start = 0
+        for length in self.lengths:
+            lines.append(self.encoded[start : start + length].decode("utf-8"))
+            start += length
+        return lines
+
+
+def layout_text(font, encoded: bytes, width: float) -> TextLayout:
+    """
+    Breaks the UTF-8 text `encoded` into the lines `nk_text_wrap` would draw at
+    the line width `width` with `font`, a pointer to a `nk_user_font`.
+    """
+    capacity = 16
+    while True:
+        lengths = (ctypes.c_int * capacity)()
+        widths = (ctypes.c_float * capacity)()
+        count = nk.nk_py_text_wrap_layout(
+            font, encoded, len(encoded), width, lengths, widths, capacity
+        )
+        if count <= capacity:
+            break
+        capacity = count
+    if count < capacity:
+        lengths = (ctypes.c_int * count).from_buffer_copy(lengths)
+        widths = (ctypes.c_float * count).from_buffer_copy(widths)
+    return TextLayout(encoded, width, lengths, widths)
+
+
+def _entry_size(string: str, layout: TextLayout) -> int:
+    return sys.getsizeof(string) + layout.nbytes + _ENTRY_OVERHEAD
+
+
+class TextLayoutCache:
+    """
+    Least recently used cache of up to `max_entries` text layouts taking up to
+    `max_bytes`, counted roughly. A cache may be shared by contexts built on
+    different threads.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Tuple, TextLayout] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def layout(self, font, string: str, width: float) -> TextLayout:
+        """
+        Returns the layout of `string` at the line width `width` with `font`, a
+        pointer to a `nk_user_font`, from the cache if possible.
+        """
+        struct = font.contents
+        key = (
+            string,
+            width,
+            ctypes.addressof(struct),
+            struct.height,
+            ctypes.cast(struct.width, ctypes.c_void_p).value,
+            struct.userdata.ptr,
+            nk.nk_py_font_generation(font),
+        )
+        with self._lock:
+            layout = self._entries.get(key)
+            if layout is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return layout
+            self.misses += 1
+
+        # Laid out without the lock, so other threads only wait for lookups.
+        layout = layout_text(font, to_char_p(string), width)
+        with self._lock:
+            # Another thread may have laid out the same text meanwhile.
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+            self._entries[key] = layout
+            self.nbytes += _entry_size(string, layout)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+            ):
+                (evicted_string, *_), evicted = self._entries.popitem(last=False)
+                self.nbytes -= _entry_size(evicted_string, evicted)
+                self.evictions += 1
+        return layout
+
+    def invalidate(self) -> None:
+        """Drops all layouts, e.g. after a font changed its glyphs in place."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+default_cache = TextLayoutCache()
+
+
+def text_wrap(
+    ctx: Context,
+    string: str,
+    cache: Optional[TextLayoutCache] = None,
+    color: Optional[Color] = None,
+) -> None:
+    """
+    Draws `string` wrapped into the next widget like `nuklear.text_wrap`, in
+    `color` instead of the style's text color if given, with the line breaks
+    from `cache`, by default `default_cache`.
+    """
+    if not hasattr(nk, "nk_py_text_wrap_layout"):
+        if color is None:
+            _text_wrap(ctx, string)
+        else:
+            text_wrap_colored(ctx, string, color)
+        return
+
+    font = ctypes.POINTER(UserFont.Struct)()
+    width = nk.nk_py_text_wrap_width(ctx, font)
+    if not font:
+        return
+    if cache is None:
+        cache = default_cache
+    layout = cache.layout(font, string, width)
+    nk.nk_py_text_wrap_lines(
+        ctx,
+        layout.encoded,
+        len(layout.encoded),
+        layout.width,
+        layout.lengths,
+        layout.widths,
+        len(layout),
+        None if color is None else ctypes.pointer(color.to_c()),
+    )
@@ -0,0 +1,69 @@
+import ctypes
+
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.types import Color
+from nuklear.types import Flags
+
+# ==============================================================================
+#
+#                                     TEXT
+#
+# ==============================================================================
+
+nk.nk_text.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_char_p,
+    ctypes.c_int,
+    Flags,
+)
+nk.nk_text.restype = None
+
+
+def text(ctx: Context, string: str, alignment: int) -> None:
+    encoded = to_char_p(string)
+    nk.nk_text(ctx, encoded, len(encoded), alignment)
+
+
+nk.nk_label.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_char_p, Flags)
+nk.nk_label.restype = None
+
+
+def label(ctx: Context, string: str, alignment: int) -> None:
+    nk.nk_label(ctx, to_char_p(string), alignment)
+
+
+nk.nk_text_wrap.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_char_p,
+    ctypes.c_int,
+)
+nk.nk_text_wrap.restype = None
+
+
+def text_wrap(ctx: Context, string: str) -> None:
+    encoded = to_char_p(string)
+    nk.nk_text_wrap(ctx, encoded, len(encoded))
+
+
+nk.nk_text_wrap_colored.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_char_p,
+    ctypes.c_int,
+    Color.Struct,
+)
+nk.nk_text_wrap_colored.restype = None
+
+
+def text_wrap_colored(ctx: Context, string: str, color: Color) -> None:
+    encoded = to_char_p(string)
+    nk.nk_text_wrap_colored(ctx, encoded, len(encoded), color.to_c())
+
+
+nk.nk_label_wrap.argtypes = (ctypes.POINTER(Context.Struct), ctypes.c_char_p)
+nk.nk_label_wrap.restype = None
+
+
+def label_wrap(ctx: Context, string: str) -> None:
+    nk.nk_label_wrap(ctx, to_char_p(string))
@@ -0,0 +1,355 @@
+"""
+Shared-memory transport of converted frames to a renderer process.
+
+`FrameProducer` runs `nk_convert` directly into a `multiprocessing.shared_memory`
+block that holds two or more slots, each with its own command, vertex and
+element buffers. `FrameConsumer`, usually in another process, attaches to the
+same block and reads the newest published frame as NumPy views, so nothing is
+serialized or copied on the way.
+
+Handoff follows the usual multiple buffering scheme: the producer converts into
+a slot that is neither the newest published one nor the one being read, then
+publishes it. The consumer always takes the newest frame, so with three slots
+neither side ever waits for the other and frames the renderer was too slow for
+are skipped. With two slots the producer waits while the consumer holds the
+other slot. Only the small slot state is guarded by a shared
+`multiprocessing.Condition`.
+
+Block layout, all values little-endian:
+
+    b"NKPYSHM1", uint32 slots, uint32 attribute count,
+    uint64 command, vertex and element capacity
+    8 x (int32 attribute, int32 format) vertex layout
+    int32 published slot, int32 reading slot, uint64 sequence
+    for every slot: uint64 frame, timestamp (ns), vertex count, element count,
+                    command offset, command count
+    the command, vertex and element buffers of every slot, 64 byte aligned
+"""
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, List, Optional
+
+import numpy as np
+
+from nuklear.context import Context
+from nuklear.drawing import DRAW_COMMAND_DTYPE
+from nuklear.drawing import Converter
+from nuklear.drawing import DrawData
+from nuklear.drawing import DrawIndex
+from nuklear.drawing import VertexLayout
+from nuklear.types import ConvertConfig
+from nuklear.types import DrawCommand
+
+MAGIC = b"NKPYSHM1"
+MAX_ATTRIBUTES = 8
+
+_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("slots", "<u4"),
+        ("attribute_count", "<u4"),
+        ("capacity", "<u8", 3),
+        ("attributes", "<i4", (MAX_ATTRIBUTES, 2)),
+        ("published", "<i4"),
+        ("reading", "<i4"),
+        ("sequence", "<u8"),
+    ]
+)
+_SLOT = np.dtype(
+    [
+        ("frame", "<u8"),
+        ("timestamp", "<u8"),
+        ("vertex_count", "<u8"),
+        ("element_count", "<u8"),
+        ("command_offset", "<u8"),
+        ("command_count", "<u8"),
+    ]
+)
+_ALIGN = 64
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class _Layout:
+    """Offsets of everything in a block with the given slots and capacities."""
+
+    def __init__(self, slots: int, capacity):
+        self.slots = slots
+        self.capacity = [_align(int(c)) for c in capacity]
+        self.slot_table = _align(_HEADER.itemsize)
+        self.first_slot = _align(self.slot_table + slots * _SLOT.itemsize)
+        self.slot_size = sum(self.capacity)
+        self.size = self.first_slot + slots * self.slot_size
+
+    def region(self, slot: int, index: int) -> int:
+        return self.first_slot + slot * self.slot_size + sum(self.capacity[:index])
+
+
+@dataclass
+class FrameHandle:
+    """
+    Everything a consumer needs to attach to a producer. It can only be passed
+    to a process when that process is started, e.g. as an argument of
+    `multiprocessing.Process`, because of the condition it carries.
+    """
+
+    name: str
+    condition: Any
+
+
+@dataclass
+class SharedFrame:
+    """
+    A frame read by `FrameConsumer.acquire`. `data` views the shared memory and
+    is only valid until the frame is released.
+    """
+
+    frame: int
+    timestamp_ns: int
+    data: DrawData
+
+
+class _SlotConverter(Converter):
+    # A converter whose buffers are fixed regions of the shared block.
+
+    def __init__(self, regions, layout, config):
+        self._regions = regions
+        super().__init__(layout, config, *(len(r) for r in regions))
+
+    def _allocate(self, index: int, capacity: int) -> ctypes.Array:
+        region = self._regions[index]
+        if capacity > len(region):
+            kind = ("command", "vertex", "element")[index]
+            raise ValueError(f"The frame does not fit into the shared {kind} buffer")
+        return region
+
+
+class FrameProducer:
+    """
+    Converts frames into a new shared memory block with `slots` slots, each
+    with buffers of the given capacities in bytes. Frames that do not fit raise
+    `ValueError`. Pass `handle` to the renderer process and call `close` when
+    done, which also removes the block.
+    """
+
+    def __init__(
+        self,
+        slots: int = 3,
+        layout: Optional[VertexLayout] = None,
+        config: Optional[ConvertConfig] = None,
+        command_capacity: int = 64 * 1024,
+        vertex_capacity: int = 1024 * 1024,
+        element_capacity: int = 256 * 1024,
+        name: Optional[str] = None,
+    ):
+        if slots < 2:
+            raise ValueError("Shared frames need at least two slots")
+        self.layout = layout or VertexLayout.default()
+        if len(self.layout.elements) > MAX_ATTRIBUTES:
+            raise ValueError(f"At most {MAX_ATTRIBUTES} vertex attributes fit")
+        offsets = _Layout(slots, (command_capacity, vertex_capacity, element_capacity))
+        self._offsets = offsets
+        self._shm = shared_memory.SharedMemory(name, create=True, size=offsets.size)
+        self._condition = multiprocessing.Condition()
+
+        self._header = np.ndarray((), _HEADER, self._shm.buf)
+        self._header["magic"] = MAGIC
+        self._header["slots"] = slots
+        self._header["attribute_count"] = len(self.layout.elements)
+        self._header["capacity"] = offsets.capacity
+        for i, element in enumerate(self.layout.elements):
+            self._header["attributes"][i] = element.attribute, element.format
+        self._header["published"] = -1
+        self._header["reading"] = -1
+        self._table = np.ndarray((slots,), _SLOT, self._shm.buf, offsets.slot_table)
+
+        self._converters: List[_SlotConverter] = []
+        for slot in range(slots):
+            regions = [
+                (ctypes.c_ubyte * capacity).from_buffer(
+                    self._shm.buf, offsets.region(slot, index)
+                )
+                for index, capacity in enumerate(offsets.capacity)
+            ]
+            self._converters.append(_SlotConverter(regions, self.layout, config))
+
+        self.frames = 0
+
+    def __enter__(self) -> FrameProducer:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def handle(self) -> FrameHandle:
+        return FrameHandle(self._shm.name, self._condition)
+
+    @property
+    def config(self) -> ConvertConfig:
+        return self._converters[0].config
+
+    @config.setter
+    def config(self, config: ConvertConfig) -> None:
+        for converter in self._converters:
+            converter.config = config
+
+    def _free_slot(self) -> Optional[int]:
+        busy = (int(self._header["published"]), int(self._header["reading"]))
+        for slot in range(len(self._converters)):
+            if slot not in busy:
+                return slot
+        return None
+
+    def publish(self, ctx: Context) -> int:
+        """
+        Converts the current frame of `ctx` into a free slot and publishes it as
+        the newest frame. Returns the frame number.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._free_slot() is not None)
+            slot = self._free_slot()
+
+        converter = self._converters[slot]
+        data = converter.convert(ctx)
+        commands = len(data.commands)
+        offset = 0
+        if commands:
+            # The commands are stored back to front, so the last one comes first.
+            offset = data.commands[::-1].ctypes.data - converter.cmds.address
+        self.frames += 1
+        self._table[slot] = (
+            self.frames,
+            time.monotonic_ns(),
+            data.vertex_count,
+            data.element_count,
+            offset,
+            commands,
+        )
+
+        with self._condition:
+            self._header["published"] = slot
+            self._header["sequence"] += 1
+            self._condition.notify_all()
+        return self.frames
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        # Every view into the block has to go before it can be closed.
+        self._converters = []
+        del self._header, self._table
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # Before 3.13 attaching registers the block with the resource tracker. The
+    # processes started by `multiprocessing` share the tracker of the producer,
+    # where the block is already registered, so this is harmless there.
+    return shared_memory.SharedMemory(name)
+
+
+class FrameConsumer:
+    """
+    Reads frames published by a `FrameProducer`, attaching to its block through
+    the producer's `handle`. Frames must be dropped before `close`, as their
+    arrays keep the block mapped.
+    """
+
+    def __init__(self, handle: FrameHandle):
+        self._shm = _attach(handle.name)
+        self._condition = handle.condition
+        self._header = np.ndarray((), _HEADER, self._shm.buf)
+        if bytes(self._header["magic"]) != MAGIC:
+            raise ValueError("Not a nuklearPy shared frame block")
+        slots = int(self._header["slots"])
+        self._offsets = _Layout(slots, self._header["capacity"])
+        self._table = np.ndarray(
+            (slots,), _SLOT, self._shm.buf, self._offsets.slot_table
+        )
+        count = int(self._header["attribute_count"])
+        self.layout = VertexLayout(
+            [tuple(int(v) for v in a) for a in self._header["attributes"][:count]]
+        )
+        self._seen = 0
+        self._slot: Optional[int] = None
+
+    def __enter__(self) -> FrameConsumer:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _frame(self, slot: int) -> SharedFrame:
+        entry = self._table[slot]
+        buf = self._shm.buf
+        vertices = np.frombuffer(
+            buf,
+            self.layout.dtype,
+            int(entry["vertex_count"]),
+            self._offsets.region(slot, 1),
+        )
+        elements = np.frombuffer(
+            buf,
+            np.dtype(DrawIndex),
+            int(entry["element_count"]),
+            self._offsets.region(slot, 2),
+        )
+        commands = np.frombuffer(
+            buf,
+            DRAW_COMMAND_DTYPE,
+            int(entry["command_count"]),
+            self._offsets.region(slot, 0) + int(entry["command_offset"]),
+        )[::-1]
+        data = DrawData(vertices, elements, commands, len(vertices), len(elements))
+        return SharedFrame(int(entry["frame"]), int(entry["timestamp"]), data)
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[SharedFrame]:
+        """
+        Waits up to `timeout` seconds for a frame newer than the last one and
+        holds its slot until `release`. Returns `None` on timeout.
+        """
+        self.release()
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: int(self._header["sequence"]) > self._seen, timeout
+            ):
+                return None
+            self._slot = int(self._header["published"])
+            self._header["reading"] = self._slot
+            self._seen = int(self._header["sequence"])
+        return self._frame(self._slot)
+
+    def release(self) -> None:
+        """Hands the slot of the acquired frame back to the producer."""
+        if self._slot is None:
+            return
+        self._slot = None
+        with self._condition:
+            self._header["reading"] = -1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self.release()
+        del self._header, self._table
+        self._shm.close()
+        self._shm = None
+
+
+# The size of `DrawCommand` must match the dtype the consumer reads.
+assert DRAW_COMMAND_DTYPE.itemsize == ctypes.sizeof(DrawCommand.Struct)
@@ -314,7 +314,7 @@ class Handle(StructWrapper):
     ptr: int = 0
     id: int = 0
 
-    class Struct(StructWrapper.Struct):
+    class Struct(ctypes.Union):
         _fields_ = (
             ("ptr", ctypes.c_void_p),
             ("id", ctypes.c_int),
@@ -329,14 +329,17 @@ class Handle(StructWrapper):
     def to_c(self) -> Handle.Struct:
         """Converts to C struct."""
         struct = Handle.Struct()
-        struct.ptr = self.ptr
-        struct.id = self.id
+        # Both members share the same storage, so only the one in use is written.
+        if self.ptr:
+            struct.ptr = self.ptr
+        else:
+            struct.id = self.id
         return struct
 
     @classmethod
     def from_c(cls, struct: Handle.Struct) -> Handle:
         """Converts from C struct."""
-        return cls(struct.ptr, struct.id)
+        return cls(struct.ptr or 0, struct.id)
 
 
 @dataclass(eq=True, order=True)
@@ -572,13 +575,14 @@ class TreeType(CEnum):
     TREE_TAB = 1
 
 
-PluginAlloc = Callable[[Handle, int, int], int]
-PluginAlloc.CFunc = ctypes.CFUNCTYPE(
-    ctypes.c_void_p, Handle.Struct, ctypes.c_void_p, Size
-)
+# The ctypes function types are the module level names and the matching Python
+# signatures are attached to them. Attributes set on a `typing.Callable` alias
+# end up on `collections.abc.Callable` and would be shared by every alias.
+PluginAlloc = ctypes.CFUNCTYPE(ctypes.c_void_p, Handle.Struct, ctypes.c_void_p, Size)
+PluginAlloc.PluginAlloc = Callable[[Handle, int, int], int]
 
-PluginFree = Callable[[Handle, int], None]
-PluginFree.CFunc = ctypes.CFUNCTYPE(None, Handle.Struct, ctypes.c_void_p)
+PluginFree = ctypes.CFUNCTYPE(None, Handle.Struct, ctypes.c_void_p)
+PluginFree.PluginFree = Callable[[Handle, int], None]
 
 
 @dataclass(eq=True, order=True)
@@ -593,35 +597,89 @@ class Allocator(StructWrapper):
     """
 
     userdata: Handle = field(default_factory=Handle)
-    alloc: Optional[PluginAlloc] = None
-    free: Optional[PluginFree] = None
+    alloc: Optional[PluginAlloc.PluginAlloc] = None
+    free: Optional[PluginFree.PluginFree] = None
 
     class Struct(StructWrapper.Struct):
         _fields_ = (
             ("userdata", Handle.Struct),
-            ("alloc", PluginAlloc.CFunc),
-            ("free", PluginFree.CFunc),
+            ("alloc", PluginAlloc),
+            ("free", PluginFree),
         )
 
-        def __init__(self):
-            super().__init__()
-            self.userdata = Handle.Struct()
-            self.alloc = None
-            self.free = None
-
     def to_c(self) -> Allocator.Struct:
-        """Converts to C struct."""
+        """
+        Converts to C struct.
+
+        Python callables are wrapped into C callbacks owned by the returned
+        struct, which must be kept alive for as long as Nuklear uses it.
+        """
         struct = Allocator.Struct()
         struct.userdata = self.userdata.to_c()
-        struct.alloc = self.alloc
-        struct.free = self.free
+        if isinstance(self.alloc, PluginAlloc):
+            struct.alloc = self.alloc
+        elif self.alloc is not None:
+            alloc = self.alloc
+
+            def _alloc(handle, old, size):
+                return alloc(Handle.from_c(handle), old or 0, size)
+
+            struct.alloc = PluginAlloc(_alloc)
+        if isinstance(self.free, PluginFree):
+            struct.free = self.free
+        elif self.free is not None:
+            free = self.free
+
+            def _free(handle, memory):
+                free(Handle.from_c(handle), memory or 0)
+
+            struct.free = PluginFree(_free)
         return struct
 
     @classmethod
     def from_c(cls, struct: Allocator.Struct) -> Allocator:
         """Converts from C struct."""
         userdata = Handle.from_c(struct.userdata)
-        return cls(userdata, struct.alloc, struct.free)
+        alloc = struct.alloc if struct.alloc else None
+        free = struct.free if struct.free else None
+        return cls(userdata, alloc, free)
+
+
+@dataclass(eq=True, order=True)
+class AllocationStats(StructWrapper):
+    """
+    Allocation counters filled in by the counting allocator of the nuklearPy
+    shim.
+
+    Wrapper for:
+        struct nk_py_alloc_stats {
+            nk_size alloc_count;
+            nk_size free_count;
+            nk_size alloc_bytes;
+        };
+    """
+
+    alloc_count: int = 0
+    free_count: int = 0
+    alloc_bytes: int = 0
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("alloc_count", Size),
+            ("free_count", Size),
+            ("alloc_bytes", Size),
+        )
+
+    def to_c(self) -> AllocationStats.Struct:
+        """Converts to C struct."""
+        return AllocationStats.Struct(
+            self.alloc_count, self.free_count, self.alloc_bytes
+        )
+
+    @classmethod
+    def from_c(cls, struct: AllocationStats.Struct) -> AllocationStats:
+        """Converts from C struct."""
+        return cls(struct.alloc_count, struct.free_count, struct.alloc_bytes)
 
 
 class SymbolType(CEnum):
@@ -647,19 +705,1334 @@ class SymbolType(CEnum):
 @dataclass(eq=True, order=True)
 class TextEdit(StructWrapper, ABC):
     """
-    Forward declaration for:
+    Declaration for:
         struct nk_text_edit;
+    The fields are defined in `nuklear.textedit`, next to `struct nk_str`.
     """
 
     class Struct(StructWrapper.Struct):
         pass
 
 
-PluginFilter = Callable[[TextEdit, int], bool]
-PluginFilter.CFunc = ctypes.CFUNCTYPE(Bool, ctypes.POINTER(TextEdit.Struct), Rune)
+PluginFilter = ctypes.CFUNCTYPE(Bool, ctypes.POINTER(TextEdit.Struct), Rune)
+PluginFilter.PluginFilter = Callable[[TextEdit, int], bool]
 
 PluginPaste = ctypes.CFUNCTYPE(None, Handle.Struct, ctypes.POINTER(TextEdit.Struct))
 PluginPaste.PluginPaste = Callable[[Handle, TextEdit], None]
 
 PluginCopy = ctypes.CFUNCTYPE(None, Handle.Struct, ctypes.c_char_p, ctypes.c_int)
 PluginCopy.PluginCopy = Callable[[Handle, int, int], None]
+
+
+# ==============================================================================
+#
+#                                      FONT
+#
+# ==============================================================================
+
+
+@dataclass(eq=True, order=True)
+class UserFontGlyph(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_user_font_glyph {
+            struct nk_vec2 uv[2];
+            struct nk_vec2 offset;
+            float width, height;
+            float xadvance;
+        };
+    """
+
+    uv: List[Vec2] = field(default_factory=lambda: [Vec2(), Vec2()])
+    offset: Vec2 = field(default_factory=Vec2)
+    width: float = 0.0
+    height: float = 0.0
+    xadvance: float = 0.0
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("uv", Vec2.Struct * 2),
+            ("offset", Vec2.Struct),
+            ("width", ctypes.c_float),
+            ("height", ctypes.c_float),
+            ("xadvance", ctypes.c_float),
+        )
+
+        def __init__(self):
+            super().__init__()
+            self.uv = (Vec2.Struct * 2)()
+            self.offset = Vec2.Struct()
+            self.width = 0.0
+            self.height = 0.0
+            self.xadvance = 0.0
+
+    def to_c(self) -> UserFontGlyph.Struct:
+        """Converts to C struct."""
+        struct = UserFontGlyph.Struct()
+        for i, uv in enumerate(self.uv):
+            struct.uv[i] = uv.to_c()
+        struct.offset = self.offset.to_c()
+        struct.width = self.width
+        struct.height = self.height
+        struct.xadvance = self.xadvance
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: UserFontGlyph.Struct) -> UserFontGlyph:
+        """Converts from C struct."""
+        uv = [Vec2.from_c(uv) for uv in struct.uv]
+        offset = Vec2.from_c(struct.offset)
+        return cls(uv, offset, struct.width, struct.height, struct.xadvance)
+
+
+TextWidthF = ctypes.CFUNCTYPE(
+    ctypes.c_float, Handle.Struct, ctypes.c_float, ctypes.POINTER(ctypes.c_char), Int
+)
+TextWidthF.TextWidthF = Callable[[Handle, float, str], float]
+
+QueryFontGlyphF = ctypes.CFUNCTYPE(
+    None,
+    Handle.Struct,
+    ctypes.c_float,
+    ctypes.POINTER(UserFontGlyph.Struct),
+    Rune,
+    Rune,
+)
+QueryFontGlyphF.QueryFontGlyphF = Callable[[Handle, float, int, int], UserFontGlyph]
+
+
+@dataclass(eq=True, order=True)
+class UserFont(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_user_font {
+            nk_handle userdata;
+            float height;
+            nk_text_width_f width;
+            nk_query_font_glyph_f query;
+            nk_handle texture;
+        };
+
+    `width` and `query` are either Python callables, which are wrapped so they
+    receive decoded arguments, or raw C function pointers of type `TextWidthF`
+    and `QueryFontGlyphF`, which are passed through untouched.
+    """
+
+    userdata: Handle = field(default_factory=Handle)
+    height: float = 0.0
+    width: Optional[TextWidthF.TextWidthF] = None
+    query: Optional[QueryFontGlyphF.QueryFontGlyphF] = None
+    texture: Handle = field(default_factory=Handle)
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("userdata", Handle.Struct),
+            ("height", ctypes.c_float),
+            ("width", TextWidthF),
+            ("query", QueryFontGlyphF),
+            ("texture", Handle.Struct),
+        )
+
+        def __init__(self):
+            super().__init__()
+            self.userdata = Handle.Struct()
+            self.height = 0.0
+            self.texture = Handle.Struct()
+
+    def to_c(self) -> UserFont.Struct:
+        """
+        Converts to C struct.
+
+        The returned struct keeps the generated callbacks alive, so it must be
+        kept alive for as long as Nuklear holds a pointer to it.
+        """
+        struct = UserFont.Struct()
+        struct.userdata = self.userdata.to_c()
+        struct.height = self.height
+        if isinstance(self.width, TextWidthF):
+            struct.width = self.width
+        elif self.width is not None:
+            width = self.width
+
+            def _width(handle, height, text, length):
+                string = ctypes.string_at(text, length).decode("utf-8", "replace")
+                return width(Handle.from_c(handle), height, string)
+
+            struct.width = TextWidthF(_width)
+        if isinstance(self.query, QueryFontGlyphF):
+            struct.query = self.query
+        elif self.query is not None:
+            query = self.query
+
+            def _query(handle, height, glyph, codepoint, next_codepoint):
+                result = query(Handle.from_c(handle), height, codepoint, next_codepoint)
+                glyph[0] = result.to_c()
+
+            struct.query = QueryFontGlyphF(_query)
+        struct.texture = self.texture.to_c()
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: UserFont.Struct) -> UserFont:
+        """Converts from C struct."""
+        userdata = Handle.from_c(struct.userdata)
+        width = struct.width if struct.width else None
+        query = struct.query if struct.query else None
+        texture = Handle.from_c(struct.texture)
+        return cls(userdata, struct.height, width, query, texture)
+
+
+class FontCoordType(CEnum):
+    COORD_UV = 0
+    COORD_PIXEL = 1
+
+
+class FontAtlasFormat(CEnum):
+    FONT_ATLAS_ALPHA8 = 0
+    FONT_ATLAS_RGBA32 = 1
+
+
+@dataclass(eq=True, order=True)
+class BakedFont(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_baked_font {
+            float height;
+            float ascent, descent;
+            nk_rune glyph_offset;
+            nk_rune glyph_count;
+            const nk_rune *ranges;
+        };
+    """
+
+    height: float = 0.0
+    ascent: float = 0.0
+    descent: float = 0.0
+    glyph_offset: int = 0
+    glyph_count: int = 0
+    ranges: int = 0
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("height", ctypes.c_float),
+            ("ascent", ctypes.c_float),
+            ("descent", ctypes.c_float),
+            ("glyph_offset", Rune),
+            ("glyph_count", Rune),
+            ("ranges", ctypes.POINTER(Rune)),
+        )
+
+    def to_c(self) -> BakedFont.Struct:
+        """Converts to C struct."""
+        struct = BakedFont.Struct()
+        struct.height = self.height
+        struct.ascent = self.ascent
+        struct.descent = self.descent
+        struct.glyph_offset = self.glyph_offset
+        struct.glyph_count = self.glyph_count
+        struct.ranges = ctypes.cast(self.ranges, ctypes.POINTER(Rune))
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: BakedFont.Struct) -> BakedFont:
+        """Converts from C struct."""
+        ranges = ctypes.cast(struct.ranges, ctypes.c_void_p).value or 0
+        return cls(
+            struct.height,
+            struct.ascent,
+            struct.descent,
+            struct.glyph_offset,
+            struct.glyph_count,
+            ranges,
+        )
+
+
+@dataclass(eq=True, order=True)
+class FontGlyph(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_font_glyph {
+            nk_rune codepoint;
+            float xadvance;
+            float x0, y0, x1, y1, w, h;
+            float u0, v0, u1, v1;
+        };
+    """
+
+    codepoint: int = 0
+    xadvance: float = 0.0
+    x0: float = 0.0
+    y0: float = 0.0
+    x1: float = 0.0
+    y1: float = 0.0
+    w: float = 0.0
+    h: float = 0.0
+    u0: float = 0.0
+    v0: float = 0.0
+    u1: float = 0.0
+    v1: float = 0.0
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("codepoint", Rune),
+            ("xadvance", ctypes.c_float),
+            ("x0", ctypes.c_float),
+            ("y0", ctypes.c_float),
+            ("x1", ctypes.c_float),
+            ("y1", ctypes.c_float),
+            ("w", ctypes.c_float),
+            ("h", ctypes.c_float),
+            ("u0", ctypes.c_float),
+            ("v0", ctypes.c_float),
+            ("u1", ctypes.c_float),
+            ("v1", ctypes.c_float),
+        )
+
+    def to_c(self) -> FontGlyph.Struct:
+        """Converts to C struct."""
+        struct = FontGlyph.Struct()
+        for name, _ in FontGlyph.Struct._fields_:
+            setattr(struct, name, getattr(self, name))
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: FontGlyph.Struct) -> FontGlyph:
+        """Converts from C struct."""
+        return cls(*(getattr(struct, name) for name, _ in FontGlyph.Struct._fields_))
+
+
+@dataclass(eq=True, order=True)
+class FontConfig(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_font_config {
+            struct nk_font_config *next;
+            void *ttf_blob;
+            nk_size ttf_size;
+            unsigned char ttf_data_owned_by_atlas;
+            unsigned char merge_mode;
+            unsigned char pixel_snap;
+            unsigned char oversample_v, oversample_h;
+            unsigned char padding[3];
+            float size;
+            enum nk_font_coord_type coord_type;
+            struct nk_vec2 spacing;
+            const nk_rune *range;
+            struct nk_baked_font *font;
+            nk_rune fallback_glyph;
+            struct nk_font_config *n;
+            struct nk_font_config *p;
+        };
+
+    `range` is a flat list of inclusive `[first, last]` rune pairs without the
+    terminating zero; `None` selects the default glyph ranges. The defaults
+    match `nk_font_config(size)`.
+    """
+
+    size: float = 0.0
+    merge_mode: bool = False
+    pixel_snap: bool = False
+    oversample_v: int = 1
+    oversample_h: int = 3
+    coord_type: int = 0  # COORD_UV
+    spacing: Vec2 = field(default_factory=Vec2)
+    range: Optional[List[int]] = None
+    fallback_glyph: int = ord("?")
+
+    class Struct(StructWrapper.Struct):
+        pass
+
+    def to_c(self) -> FontConfig.Struct:
+        """
+        Converts to C struct.
+
+        The glyph range array is owned by the returned struct, which must be kept
+        alive for as long as the font it configures.
+        """
+        struct = FontConfig.Struct()
+        struct.merge_mode = self.merge_mode
+        struct.pixel_snap = self.pixel_snap
+        struct.oversample_v = self.oversample_v
+        struct.oversample_h = self.oversample_h
+        struct.size = self.size
+        struct.coord_type = self.coord_type
+        struct.spacing = self.spacing.to_c()
+        if self.range is not None:
+            array = (Rune * (len(self.range) + 1))(*self.range, 0)
+            struct.range = ctypes.cast(array, ctypes.POINTER(Rune))
+        struct.fallback_glyph = self.fallback_glyph
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: FontConfig.Struct) -> FontConfig:
+        """Converts from C struct."""
+        ranges = None
+        if struct.range:
+            ranges = []
+            i = 0
+            while struct.range[i]:
+                ranges.append(struct.range[i])
+                i += 1
+        return cls(
+            struct.size,
+            bool(struct.merge_mode),
+            bool(struct.pixel_snap),
+            struct.oversample_v,
+            struct.oversample_h,
+            struct.coord_type,
+            Vec2.from_c(struct.spacing),
+            ranges,
+            struct.fallback_glyph,
+        )
+
+
+FontConfig.Struct._fields_ = (
+    ("next", ctypes.POINTER(FontConfig.Struct)),
+    ("ttf_blob", ctypes.c_void_p),
+    ("ttf_size", Size),
+    ("ttf_data_owned_by_atlas", ctypes.c_ubyte),
+    ("merge_mode", ctypes.c_ubyte),
+    ("pixel_snap", ctypes.c_ubyte),
+    ("oversample_v", ctypes.c_ubyte),
+    ("oversample_h", ctypes.c_ubyte),
+    ("padding", ctypes.c_ubyte * 3),
+    ("size", ctypes.c_float),
+    ("coord_type", FontCoordType),
+    ("spacing", Vec2.Struct),
+    ("range", ctypes.POINTER(Rune)),
+    ("font", ctypes.POINTER(BakedFont.Struct)),
+    ("fallback_glyph", Rune),
+    ("n", ctypes.POINTER(FontConfig.Struct)),
+    ("p", ctypes.POINTER(FontConfig.Struct)),
+)
+
+
+# ==============================================================================
+#
+#                                    DRAW LIST
+#
+# ==============================================================================
+
+
+@dataclass(eq=True, order=True)
+class DrawNullTexture(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_draw_null_texture {
+            nk_handle texture;
+            struct nk_vec2 uv;
+        };
+    """
+
+    texture: Handle = field(default_factory=Handle)
+    uv: Vec2 = field(default_factory=Vec2)
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("texture", Handle.Struct),
+            ("uv", Vec2.Struct),
+        )
+
+        def __init__(self):
+            super().__init__()
+            self.texture = Handle.Struct()
+            self.uv = Vec2.Struct()
+
+    def to_c(self) -> DrawNullTexture.Struct:
+        """Converts to C struct."""
+        struct = DrawNullTexture.Struct()
+        struct.texture = self.texture.to_c()
+        struct.uv = self.uv.to_c()
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: DrawNullTexture.Struct) -> DrawNullTexture:
+        """Converts from C struct."""
+        return cls(Handle.from_c(struct.texture), Vec2.from_c(struct.uv))
+
+
+class AntiAliasing(CEnum):
+    ANTI_ALIASING_OFF = 0
+    ANTI_ALIASING_ON = 1
+
+
+class ConvertResult(CEnum):
+    CONVERT_SUCCESS = 0
+    CONVERT_INVALID_PARAM = 1
+    CONVERT_COMMAND_BUFFER_FULL = 1 << 1
+    CONVERT_VERTEX_BUFFER_FULL = 1 << 2
+    CONVERT_ELEMENT_BUFFER_FULL = 1 << 3
+
+
+class DrawVertexLayoutAttribute(CEnum):
+    VERTEX_POSITION = 0
+    VERTEX_COLOR = 1
+    VERTEX_TEXCOORD = 2
+    VERTEX_ATTRIBUTE_COUNT = 3
+
+
+class DrawVertexLayoutFormat(CEnum):
+    FORMAT_SCHAR = 0
+    FORMAT_SSHORT = 1
+    FORMAT_SINT = 2
+    FORMAT_UCHAR = 3
+    FORMAT_USHORT = 4
+    FORMAT_UINT = 5
+    FORMAT_FLOAT = 6
+    FORMAT_DOUBLE = 7
+    FORMAT_R8G8B8 = 8
+    FORMAT_R16G15B16 = 9
+    FORMAT_R32G32B32 = 10
+    FORMAT_R8G8B8A8 = 11
+    FORMAT_B8G8R8A8 = 12
+    FORMAT_R16G15B16A16 = 13
+    FORMAT_R32G32B32A32 = 14
+    FORMAT_R32G32B32A32_FLOAT = 15
+    FORMAT_R32G32B32A32_DOUBLE = 16
+    FORMAT_RGB32 = 17
+    FORMAT_RGBA32 = 18
+    FORMAT_COUNT = 19
+
+
+@dataclass(eq=True, order=True)
+class DrawVertexLayoutElement(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_draw_vertex_layout_element {
+            enum nk_draw_vertex_layout_attribute attribute;
+            enum nk_draw_vertex_layout_format format;
+            nk_size offset;
+        };
+    """
+
+    attribute: int = DrawVertexLayoutAttribute.VERTEX_ATTRIBUTE_COUNT
+    format: int = DrawVertexLayoutFormat.FORMAT_COUNT
+    offset: int = 0
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("attribute", DrawVertexLayoutAttribute),
+            ("format", DrawVertexLayoutFormat),
+            ("offset", Size),
+        )
+
+    def to_c(self) -> DrawVertexLayoutElement.Struct:
+        """Converts to C struct."""
+        struct = DrawVertexLayoutElement.Struct()
+        struct.attribute = self.attribute
+        struct.format = self.format
+        struct.offset = self.offset
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: DrawVertexLayoutElement.Struct) -> DrawVertexLayoutElement:
+        """Converts from C struct."""
+        return cls(struct.attribute.value, struct.format.value, struct.offset)
+
+
+@dataclass(eq=True, order=True)
+class ConvertConfig(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_convert_config {
+            float global_alpha;
+            enum nk_anti_aliasing line_AA;
+            enum nk_anti_aliasing shape_AA;
+            unsigned circle_segment_count;
+            unsigned arc_segment_count;
+            unsigned curve_segment_count;
+            struct nk_draw_null_texture tex_null;
+            const struct nk_draw_vertex_layout_element *vertex_layout;
+            nk_size vertex_size;
+            nk_size vertex_alignment;
+        };
+
+    The vertex layout is not part of the dataclass, it is filled in from the
+    `VertexLayout` used for the conversion. Lower segment counts and disabled
+    anti-aliasing produce fewer vertices and make `nk_convert` cheaper.
+    """
+
+    global_alpha: float = 1.0
+    line_aa: int = AntiAliasing.ANTI_ALIASING_ON
+    shape_aa: int = AntiAliasing.ANTI_ALIASING_ON
+    circle_segment_count: int = 22
+    arc_segment_count: int = 22
+    curve_segment_count: int = 22
+    tex_null: DrawNullTexture = field(default_factory=DrawNullTexture)
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("global_alpha", ctypes.c_float),
+            ("line_AA", AntiAliasing),
+            ("shape_AA", AntiAliasing),
+            ("circle_segment_count", ctypes.c_uint),
+            ("arc_segment_count", ctypes.c_uint),
+            ("curve_segment_count", ctypes.c_uint),
+            ("tex_null", DrawNullTexture.Struct),
+            ("vertex_layout", ctypes.POINTER(DrawVertexLayoutElement.Struct)),
+            ("vertex_size", Size),
+            ("vertex_alignment", Size),
+        )
+
+    def to_c(self) -> ConvertConfig.Struct:
+        """Converts to C struct."""
+        struct = ConvertConfig.Struct()
+        struct.global_alpha = self.global_alpha
+        struct.line_AA = self.line_aa
+        struct.shape_AA = self.shape_aa
+        struct.circle_segment_count = self.circle_segment_count
+        struct.arc_segment_count = self.arc_segment_count
+        struct.curve_segment_count = self.curve_segment_count
+        struct.tex_null = self.tex_null.to_c()
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: ConvertConfig.Struct) -> ConvertConfig:
+        """Converts from C struct."""
+        return cls(
+            struct.global_alpha,
+            struct.line_AA.value,
+            struct.shape_AA.value,
+            struct.circle_segment_count,
+            struct.arc_segment_count,
+            struct.curve_segment_count,
+            DrawNullTexture.from_c(struct.tex_null),
+        )
+
+
+@dataclass(eq=True, order=True)
+class DrawCommand(StructWrapper):
+    """
+    Wrapper for:
+        struct nk_draw_command {
+            unsigned int elem_count;
+            struct nk_rect clip_rect;
+            nk_handle texture;
+        };
+    """
+
+    elem_count: int = 0
+    clip_rect: Rect = field(default_factory=Rect)
+    texture: Handle = field(default_factory=Handle)
+
+    class Struct(StructWrapper.Struct):
+        _fields_ = (
+            ("elem_count", ctypes.c_uint),
+            ("clip_rect", Rect.Struct),
+            ("texture", Handle.Struct),
+        )
+
+    def to_c(self) -> DrawCommand.Struct:
+        """Converts to C struct."""
+        struct = DrawCommand.Struct()
+        struct.elem_count = self.elem_count
+        struct.clip_rect = self.clip_rect.to_c()
+        struct.texture = self.texture.to_c()
+        return struct
+
+    @classmethod
+    def from_c(cls, struct: DrawCommand.Struct) -> DrawCommand:
+        """Converts from C struct."""
+        return cls(
+            struct.elem_count,
+            Rect.from_c(struct.clip_rect),
+            Handle.from_c(struct.texture),
+        )
+
+
+# ==============================================================================
+#
+#                                     INPUT
+#
+# ==============================================================================
+
+
+class Keys(CEnum):
+    KEY_NONE = 0
+    KEY_SHIFT = 1
+    KEY_CTRL = 2
+    KEY_DEL = 3
+    KEY_ENTER = 4
+    KEY_TAB = 5
+    KEY_BACKSPACE = 6
+    KEY_COPY = 7
+    KEY_CUT = 8
+    KEY_PASTE = 9
+    KEY_UP = 10
+    KEY_DOWN = 11
+    KEY_LEFT = 12
+    KEY_RIGHT = 13
+    KEY_TEXT_INSERT_MODE = 14
+    KEY_TEXT_REPLACE_MODE = 15
+    KEY_TEXT_RESET_MODE = 16
+    KEY_TEXT_LINE_START = 17
+    KEY_TEXT_LINE_END = 18
+    KEY_TEXT_START = 19
+    KEY_TEXT_END = 20
+    KEY_TEXT_UNDO = 21
+    KEY_TEXT_REDO = 22
+    KEY_TEXT_SELECT_ALL = 23
+    KEY_TEXT_WORD_LEFT = 24
+    KEY_TEXT_WORD_RIGHT = 25
+    KEY_SCROLL_START = 26
+    KEY_SCROLL_END = 27
+    KEY_SCROLL_DOWN = 28
+    KEY_SCROLL_UP = 29
+    KEY_MAX = 30
+
+
+class Buttons(CEnum):
+    BUTTON_LEFT = 0
+    BUTTON_MIDDLE = 1
+    BUTTON_RIGHT = 2
+    BUTTON_DOUBLE = 3
+    BUTTON_MAX = 4
+
+
+class InputType(CEnum):
+    INPUT_MOTION = 0
+    INPUT_KEY = 1
+    INPUT_BUTTON = 2
+    INPUT_SCROLL = 3
+    INPUT_UNICODE = 4
+
+
+class InputEvent(ctypes.Structure):
+    """
+    One packed input event, as consumed by the nuklearPy shim.
+    Wrapper for:
+        struct nk_py_input_event {
+            int type;
+            int code;
+            int down;
+            int x, y;
+            float sx, sy;
+        };
+    """
+
+    _fields_ = (
+        ("type", ctypes.c_int),
+        ("code", ctypes.c_int),
+        ("down", ctypes.c_int),
+        ("x", ctypes.c_int),
+        ("y", ctypes.c_int),
+        ("sx", ctypes.c_float),
+        ("sy", ctypes.c_float),
+    )
+
+
+# ==============================================================================
+#
+#                                    DRAWING
+#
+# ==============================================================================
+
+
+class CommandType(CEnum):
+    COMMAND_NOP = 0
+    COMMAND_SCISSOR = 1
+    COMMAND_LINE = 2
+    COMMAND_CURVE = 3
+    COMMAND_RECT = 4
+    COMMAND_RECT_FILLED = 5
+    COMMAND_RECT_MULTI_COLOR = 6
+    COMMAND_CIRCLE = 7
+    COMMAND_CIRCLE_FILLED = 8
+    COMMAND_ARC = 9
+    COMMAND_ARC_FILLED = 10
+    COMMAND_TRIANGLE = 11
+    COMMAND_TRIANGLE_FILLED = 12
+    COMMAND_POLYGON = 13
+    COMMAND_POLYGON_FILLED = 14
+    COMMAND_POLYLINE = 15
+    COMMAND_TEXT = 16
+    COMMAND_IMAGE = 17
+    COMMAND_CUSTOM = 18
+
+
+# The command structs below are not wrapped in dataclasses: they are only ever
+# created as views directly over the command buffer of a context (see
+# `nuklear.drawing.commands`) and are valid until the context is cleared.
+
+
+class Command(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command {
+            enum nk_command_type type;
+            nk_size next;
+        };
+    """
+
+    _fields_ = (
+        ("type", ctypes.c_int),
+        ("next", Size),
+    )
+
+
+class CommandScissor(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_scissor {
+            struct nk_command header;
+            short x, y;
+            unsigned short w, h;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+    )
+
+
+class CommandLine(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_line {
+            struct nk_command header;
+            unsigned short line_thickness;
+            struct nk_vec2i begin;
+            struct nk_vec2i end;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("line_thickness", UShort),
+        ("begin", Vec2i.Struct),
+        ("end", Vec2i.Struct),
+        ("color", Color.Struct),
+    )
+
+
+class CommandCurve(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_curve {
+            struct nk_command header;
+            unsigned short line_thickness;
+            struct nk_vec2i begin;
+            struct nk_vec2i end;
+            struct nk_vec2i ctrl[2];
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("line_thickness", UShort),
+        ("begin", Vec2i.Struct),
+        ("end", Vec2i.Struct),
+        ("ctrl", Vec2i.Struct * 2),
+        ("color", Color.Struct),
+    )
+
+
+class CommandRect(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_rect {
+            struct nk_command header;
+            unsigned short rounding;
+            unsigned short line_thickness;
+            short x, y;
+            unsigned short w, h;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("rounding", UShort),
+        ("line_thickness", UShort),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("color", Color.Struct),
+    )
+
+
+class CommandRectFilled(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_rect_filled {
+            struct nk_command header;
+            unsigned short rounding;
+            short x, y;
+            unsigned short w, h;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("rounding", UShort),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("color", Color.Struct),
+    )
+
+
+class CommandRectMultiColor(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_rect_multi_color {
+            struct nk_command header;
+            short x, y;
+            unsigned short w, h;
+            struct nk_color left;
+            struct nk_color top;
+            struct nk_color bottom;
+            struct nk_color right;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("left", Color.Struct),
+        ("top", Color.Struct),
+        ("bottom", Color.Struct),
+        ("right", Color.Struct),
+    )
+
+
+class CommandTriangle(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_triangle {
+            struct nk_command header;
+            unsigned short line_thickness;
+            struct nk_vec2i a;
+            struct nk_vec2i b;
+            struct nk_vec2i c;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("line_thickness", UShort),
+        ("a", Vec2i.Struct),
+        ("b", Vec2i.Struct),
+        ("c", Vec2i.Struct),
+        ("color", Color.Struct),
+    )
+
+
+class CommandTriangleFilled(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_triangle_filled {
+            struct nk_command header;
+            struct nk_vec2i a;
+            struct nk_vec2i b;
+            struct nk_vec2i c;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("a", Vec2i.Struct),
+        ("b", Vec2i.Struct),
+        ("c", Vec2i.Struct),
+        ("color", Color.Struct),
+    )
+
+
+class CommandCircle(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_circle {
+            struct nk_command header;
+            short x, y;
+            unsigned short line_thickness;
+            unsigned short w, h;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("line_thickness", UShort),
+        ("w", UShort),
+        ("h", UShort),
+        ("color", Color.Struct),
+    )
+
+
+class CommandCircleFilled(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_circle_filled {
+            struct nk_command header;
+            short x, y;
+            unsigned short w, h;
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("color", Color.Struct),
+    )
+
+
+class CommandArc(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_arc {
+            struct nk_command header;
+            short cx, cy;
+            unsigned short r;
+            unsigned short line_thickness;
+            float a[2];
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("cx", Short),
+        ("cy", Short),
+        ("r", UShort),
+        ("line_thickness", UShort),
+        ("a", ctypes.c_float * 2),
+        ("color", Color.Struct),
+    )
+
+
+class CommandArcFilled(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_arc_filled {
+            struct nk_command header;
+            short cx, cy;
+            unsigned short r;
+            float a[2];
+            struct nk_color color;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("cx", Short),
+        ("cy", Short),
+        ("r", UShort),
+        ("a", ctypes.c_float * 2),
+        ("color", Color.Struct),
+    )
+
+
+def _points(command) -> ctypes.Array:
+    # `points` is declared with one element and extends past the end of the
+    # struct, so the view is created at its address with the real length.
+    offset = type(command).points.offset
+    return (Vec2i.Struct * command.point_count).from_address(
+        ctypes.addressof(command) + offset
+    )
+
+
+class CommandPolygon(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_polygon {
+            struct nk_command header;
+            struct nk_color color;
+            unsigned short line_thickness;
+            unsigned short point_count;
+            struct nk_vec2i points[1];
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("color", Color.Struct),
+        ("line_thickness", UShort),
+        ("point_count", UShort),
+        ("points", Vec2i.Struct * 1),
+    )
+
+    def vertices(self) -> ctypes.Array:
+        """View of all `point_count` points."""
+        return _points(self)
+
+
+class CommandPolygonFilled(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_polygon_filled {
+            struct nk_command header;
+            struct nk_color color;
+            unsigned short point_count;
+            struct nk_vec2i points[1];
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("color", Color.Struct),
+        ("point_count", UShort),
+        ("points", Vec2i.Struct * 1),
+    )
+
+    def vertices(self) -> ctypes.Array:
+        """View of all `point_count` points."""
+        return _points(self)
+
+
+class CommandPolyline(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_polyline {
+            struct nk_command header;
+            struct nk_color color;
+            unsigned short line_thickness;
+            unsigned short point_count;
+            struct nk_vec2i points[1];
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("color", Color.Struct),
+        ("line_thickness", UShort),
+        ("point_count", UShort),
+        ("points", Vec2i.Struct * 1),
+    )
+
+    def vertices(self) -> ctypes.Array:
+        """View of all `point_count` points."""
+        return _points(self)
+
+
+class CommandImage(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_image {
+            struct nk_command header;
+            short x, y;
+            unsigned short w, h;
+            struct nk_image img;
+            struct nk_color col;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("img", Image.Struct),
+        ("col", Color.Struct),
+    )
+
+
+CommandCustomCallback = ctypes.CFUNCTYPE(
+    None, ctypes.c_void_p, Short, Short, UShort, UShort, Handle.Struct
+)
+
+
+class CommandCustom(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_custom {
+            struct nk_command header;
+            short x, y;
+            unsigned short w, h;
+            nk_handle callback_data;
+            nk_command_custom_callback callback;
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("callback_data", Handle.Struct),
+        ("callback", CommandCustomCallback),
+    )
+
+
+class CommandText(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_text {
+            struct nk_command header;
+            const struct nk_user_font *font;
+            struct nk_color background;
+            struct nk_color foreground;
+            short x, y;
+            unsigned short w, h;
+            float height;
+            int length;
+            char string[1];
+        };
+    """
+
+    _fields_ = (
+        ("header", Command),
+        ("font", ctypes.POINTER(UserFont.Struct)),
+        ("background", Color.Struct),
+        ("foreground", Color.Struct),
+        ("x", Short),
+        ("y", Short),
+        ("w", UShort),
+        ("h", UShort),
+        ("height", ctypes.c_float),
+        ("length", ctypes.c_int),
+        ("string", ctypes.c_char * 1),
+    )
+
+    @property
+    def data(self) -> bytes:
+        """The UTF-8 encoded text, `length` bytes long."""
+        return ctypes.string_at(
+            ctypes.addressof(self) + CommandText.string.offset, self.length
+        )
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8", "replace")
+
+
+class CommandBuffer(ctypes.Structure):
+    """
+    Wrapper for:
+        struct nk_command_buffer {
+            struct nk_buffer *base;
+            struct nk_rect clip;
+            int use_clipping;
+            nk_handle userdata;
+            nk_size begin, end, last;
+        };
+
+    Only ever used as a view of the canvas of a window, see
+    `nuklear.window.window_get_canvas`.
+    """
+
+    _fields_ = (
+        ("base", ctypes.c_void_p),
+        ("clip", Rect.Struct),
+        ("use_clipping", ctypes.c_int),
+        ("userdata", Handle.Struct),
+        ("begin", Size),
+        ("end", Size),
+        ("last", Size),
+    )
+
+
+# ==============================================================================
+#
+#                                    WINDOW
+#
+# ==============================================================================
+
+
+class PanelFlags(CEnum):
+    WINDOW_BORDER = 1 << 0
+    WINDOW_MOVABLE = 1 << 1
+    WINDOW_SCALABLE = 1 << 2
+    WINDOW_CLOSABLE = 1 << 3
+    WINDOW_MINIMIZABLE = 1 << 4
+    WINDOW_NO_SCROLLBAR = 1 << 5
+    WINDOW_TITLE = 1 << 6
+    WINDOW_SCROLL_AUTO_HIDE = 1 << 7
+    WINDOW_BACKGROUND = 1 << 8
+    WINDOW_SCALE_LEFT = 1 << 9
+    WINDOW_NO_INPUT = 1 << 10
+
+
+# ==============================================================================
+#
+#                                     TEXT
+#
+# ==============================================================================
+
+
+class TextAlign(CEnum):
+    TEXT_ALIGN_LEFT = 0x01
+    TEXT_ALIGN_CENTERED = 0x02
+    TEXT_ALIGN_RIGHT = 0x04
+    TEXT_ALIGN_TOP = 0x08
+    TEXT_ALIGN_MIDDLE = 0x10
+    TEXT_ALIGN_BOTTOM = 0x20
+
+
+class TextAlignment(CEnum):
+    TEXT_LEFT = 0x10 | 0x01
+    TEXT_CENTERED = 0x10 | 0x02
+    TEXT_RIGHT = 0x10 | 0x04
+
+
+# ==============================================================================
+#
+#                                   TEXT EDIT
+#
+# ==============================================================================
+
+TEXTEDIT_UNDOSTATECOUNT = 99
+TEXTEDIT_UNDOCHARCOUNT = 999
+
+
+class TextEditType(CEnum):
+    TEXT_EDIT_SINGLE_LINE = 0
+    TEXT_EDIT_MULTI_LINE = 1
+
+
+class TextEditMode(CEnum):
+    TEXT_EDIT_MODE_VIEW = 0
+    TEXT_EDIT_MODE_INSERT = 1
+    TEXT_EDIT_MODE_REPLACE = 2
+
+
+class EditFlags(CEnum):
+    EDIT_DEFAULT = 0
+    EDIT_READ_ONLY = 1 << 0
+    EDIT_AUTO_SELECT = 1 << 1
+    EDIT_SIG_ENTER = 1 << 2
+    EDIT_ALLOW_TAB = 1 << 3
+    EDIT_NO_CURSOR = 1 << 4
+    EDIT_SELECTABLE = 1 << 5
+    EDIT_CLIPBOARD = 1 << 6
+    EDIT_CTRL_ENTER_NEWLINE = 1 << 7
+    EDIT_NO_HORIZONTAL_SCROLL = 1 << 8
+    EDIT_ALWAYS_INSERT_MODE = 1 << 9
+    EDIT_MULTILINE = 1 << 10
+    EDIT_GOTO_END_ON_ACTIVATE = 1 << 11
+
+
+class EditTypes(CEnum):
+    EDIT_SIMPLE = 1 << 9
+    EDIT_FIELD = 1 << 9 | 1 << 5 | 1 << 6
+    EDIT_BOX = 1 << 9 | 1 << 5 | 1 << 10 | 1 << 3 | 1 << 6
+    EDIT_EDITOR = 1 << 5 | 1 << 10 | 1 << 3 | 1 << 6
+
+
+class EditEvents(CEnum):
+    EDIT_ACTIVE = 1 << 0
+    EDIT_INACTIVE = 1 << 1
+    EDIT_ACTIVATED = 1 << 2
+    EDIT_DEACTIVATED = 1 << 3
+    EDIT_COMMITED = 1 << 4
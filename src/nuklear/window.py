@@ -0,0 +1,79 @@
+import ctypes
+
+from nuklear.context import Context
+from nuklear.library import nuklear as nk
+from nuklear.library import to_char_p
+from nuklear.types import Bool
+from nuklear.types import CommandBuffer
+from nuklear.types import Flags
+from nuklear.types import Rect
+
+# ==============================================================================
+#
+#                                    WINDOW
+#
+# ==============================================================================
+
+nk.nk_begin.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_char_p,
+    Rect.Struct,
+    Flags,
+)
+nk.nk_begin.restype = Bool
+
+
+def begin(ctx: Context, title: str, bounds: Rect, flags: int) -> bool:
+    return nk.nk_begin(ctx, to_char_p(title), bounds.to_c(), flags)
+
+
+nk.nk_begin_titled.argtypes = (
+    ctypes.POINTER(Context.Struct),
+    ctypes.c_char_p,
+    ctypes.c_char_p,
+    Rect.Struct,
+    Flags,
+)
+nk.nk_begin_titled.restype = Bool
+
+
+def begin_titled(ctx: Context, name: str, title: str, bounds: Rect, flags: int) -> bool:
+    return nk.nk_begin_titled(
+        ctx, to_char_p(name), to_char_p(title), bounds.to_c(), flags
+    )
+
+
+nk.nk_end.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_end.restype = None
+
+
+def end(ctx: Context) -> None:
+    nk.nk_end(ctx)
+
+
+nk.nk_window_is_hovered.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_window_is_hovered.restype = Bool
+
+
+def window_is_hovered(ctx: Context) -> bool:
+    return nk.nk_window_is_hovered(ctx)
+
+
+nk.nk_window_is_any_hovered.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_window_is_any_hovered.restype = Bool
+
+
+def window_is_any_hovered(ctx: Context) -> bool:
+    return nk.nk_window_is_any_hovered(ctx)
+
+
+nk.nk_window_get_canvas.argtypes = (ctypes.POINTER(Context.Struct),)
+nk.nk_window_get_canvas.restype = ctypes.POINTER(CommandBuffer)
+
+
+def window_get_canvas(ctx: Context) -> CommandBuffer:
+    """
+    Returns the command buffer of the current window, for the drawing
+    functions in `nuklear.canvas`. Only valid between `begin` and `end`.
+    """
+    return nk.nk_window_get_canvas(ctx).contents
@@ -0,0 +1,534 @@
+"""
+Compact binary wire format for the draw commands of a frame.
+
+`WireEncoder` turns the command buffer of every frame into one message, and
+`WireDecoder` turns the messages back into the same typed command views that
+`nuklear.drawing.commands` yields, so any backend written against those views
+can draw frames received over a socket.
+
+Both sides keep the same state, so messages have to be decoded in the order
+they were encoded:
+
+- Numbers are stored as variable-length deltas against the same field of the
+  previous command of the same type, which makes rows of similar widgets cost a
+  byte or two per field. Floats (arc angles and text heights) are quantized to
+  1/`FLOAT_SCALE` first.
+- Colors are indices into a palette, and text is interned in a string table.
+  Both are filled as new values show up and cleared by every keyframe.
+- A delta frame copies runs of unchanged commands from the previous frame and
+  only encodes the others. A keyframe encodes every command and can be decoded
+  without any earlier message.
+
+Font pointers and custom draw callbacks cannot cross a process boundary, so
+decoded text and custom commands have them set to null.
+
+Message format, integers as LEB128 varints ("zigzag" for signed values):
+
+    uint8 flags (1 = keyframe), frame number, run count
+    for every run:
+        count << 1 | 1, start in the previous frame   (copied commands)
+        count << 1, count commands                     (encoded commands)
+    command:
+        uint8 command type
+        every field in declaration order:
+            numbers: zigzag delta against the previous command of the type
+            colors:  0 and 4 RGBA bytes for a new color, or palette index + 1
+        polygons: point count, then zigzag x and y deltas between points
+        text:     0, byte length and bytes for a new string, or index + 1
+
+`send_message` and `recv_message` frame messages on a stream socket with a
+uint32 length prefix.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import socket
+import struct
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from nuklear.context import Context
+from nuklear.drawing import COMMAND_VIEWS
+from nuklear.drawing import walk_commands
+from nuklear.types import Color
+from nuklear.types import Command
+from nuklear.types import CommandPolygon
+from nuklear.types import CommandPolygonFilled
+from nuklear.types import CommandPolyline
+from nuklear.types import CommandText
+from nuklear.types import Handle
+
+FLAG_KEYFRAME = 1
+FLOAT_SCALE = 4096
+
+_HEADER_SIZE = ctypes.sizeof(Command)
+_POINT = struct.Struct("=hh")
+_LENGTH = struct.Struct("<I")
+
+# Kinds of the leaf fields of a command.
+_NUMBER = 0
+_FLOAT = 1
+_COLOR_FIELD = 2
+_SKIP = 3
+
+# Fields that are implied by the variable-length tail of a command.
+_IMPLIED = ("point_count", "length")
+_INTEGERS = {
+    ctypes.c_int8: "b",
+    ctypes.c_uint8: "B",
+    ctypes.c_int16: "h",
+    ctypes.c_uint16: "H",
+    ctypes.c_int32: "i",
+    ctypes.c_uint32: "I",
+    ctypes.c_int64: "q",
+    ctypes.c_uint64: "Q",
+}
+_POINTER = "Q" if ctypes.sizeof(ctypes.c_void_p) == 8 else "I"
+
+
+def _leaves(ctype, offset: int, name: str) -> Iterable[Tuple[int, str, int]]:
+    # Yields (offset, struct format, kind) for every leaf field of `ctype`.
+    if ctype is Color.Struct:
+        yield offset, "4s", _COLOR_FIELD
+    elif ctype is Handle.Struct:
+        yield offset, _POINTER, _NUMBER
+    elif ctype is ctypes.c_float:
+        yield offset, "f", _FLOAT
+    elif issubclass(ctype, ctypes.Array):
+        size = ctypes.sizeof(ctype._type_)
+        for i in range(ctype._length_):
+            yield from _leaves(ctype._type_, offset + i * size, name)
+    elif issubclass(ctype, ctypes.Structure):
+        for field, field_type in ctype._fields_:
+            field_offset = offset + getattr(ctype, field).offset
+            yield from _leaves(field_type, field_offset, field)
+    elif ctype in _INTEGERS:
+        kind = _SKIP if name in _IMPLIED else _NUMBER
+        yield offset, _INTEGERS[ctype], kind
+    else:
+        # Pointers and callbacks only mean something in the sending process.
+        yield offset, f"{ctypes.sizeof(ctype)}x", _SKIP
+
+
+class _Plan:
+    """How the fixed part of one command type is read, encoded and rebuilt."""
+
+    def __init__(self, kind: int, view):
+        self.kind = kind
+        self.view = view
+        self.tail = None
+        if view in (CommandPolygon, CommandPolygonFilled, CommandPolyline):
+            self.tail = "points"
+        elif view is CommandText:
+            self.tail = "string"
+        self.size = (
+            getattr(view, self.tail).offset if self.tail else ctypes.sizeof(view)
+        )
+
+        fmt = ["="]
+        kinds = []
+        position = _HEADER_SIZE
+        for field, field_type in view._fields_[1:]:
+            if field == self.tail:
+                break
+            start = getattr(view, field).offset
+            for offset, code, leaf in _leaves(field_type, start, field):
+                if offset > position:
+                    fmt.append(f"{offset - position}x")
+                fmt.append(code)
+                position = offset + struct.calcsize("=" + code)
+                if not code.endswith("x"):
+                    kinds.append(leaf)
+        if self.size > position:
+            fmt.append(f"{self.size - position}x")
+        self.struct = struct.Struct("".join(fmt))
+        self.kinds = tuple(kinds)
+        # Values that are written to the wire, see `WireEncoder._encode_command`.
+        self.sent = tuple(i for i, kind in enumerate(kinds) if kind != _SKIP)
+        self.numbers = sum(1 for k in kinds if k in (_NUMBER, _FLOAT))
+
+
+_PLANS: Tuple[Optional[_Plan], ...] = tuple(
+    _Plan(kind, view) if kind else None for kind, view in enumerate(COMMAND_VIEWS)
+)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise ValueError("Truncated wire message") from None
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+class _Table:
+    # A palette or string table: values are appended until `limit` is reached.
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.values: List[Any] = []
+        self.index: Dict[Any, int] = {}
+
+    def clear(self) -> None:
+        self.values = []
+        self.index = {}
+
+    def add(self, value) -> None:
+        if len(self.values) < self.limit:
+            self.index[value] = len(self.values)
+            self.values.append(value)
+
+
+class _State:
+    # Everything both sides have to agree on between commands.
+
+    def __init__(self, max_colors: int, max_strings: int):
+        self.colors = _Table(max_colors)
+        self.strings = _Table(max_strings)
+        self.previous: Dict[int, List[int]] = {}
+
+    def reset_frame(self) -> None:
+        self.previous = {
+            plan.kind: [0] * plan.numbers for plan in _PLANS if plan is not None
+        }
+
+    def reset(self) -> None:
+        self.colors.clear()
+        self.strings.clear()
+        self.reset_frame()
+
+
+class WireEncoder:
+    """
+    Encodes the command buffer of every frame into one message.
+
+    A keyframe is written for the first frame, after `reset`, and every
+    `keyframe_interval` frames if it is not 0. The palette and string table
+    hold at most `max_colors` and `max_strings` entries; later values are
+    written out in full every time.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval: int = 0,
+        max_colors: int = 4096,
+        max_strings: int = 4096,
+    ):
+        self.keyframe_interval = keyframe_interval
+        self._state = _State(max_colors, max_strings)
+        self._keys: Optional[List[Tuple]] = None
+
+        self.frames = 0
+        self.keyframes = 0
+        self.bytes_out = 0
+
+    def reset(self) -> None:
+        """Makes the next frame a keyframe, e.g. when a new viewer connects."""
+        self._keys = None
+
+    def encode(self, ctx: Context) -> bytes:
+        """Encodes the current frame of `ctx`."""
+        return self._encode(walk_commands(ctx))
+
+    def encode_commands(self, commands: Iterable[ctypes.Structure]) -> bytes:
+        """Encodes a frame given as command views, e.g. decoded ones."""
+        return self._encode(
+            (command.header.type, ctypes.addressof(command)) for command in commands
+        )
+
+    def _encode(self, items: Iterable[Tuple[int, int]]) -> bytes:
+        frame = []
+        for kind, address in items:
+            plan = _PLANS[kind] if 0 < kind < len(_PLANS) else None
+            if plan is None:
+                continue
+            size = plan.size
+            if plan.tail == "points":
+                size += plan.view.from_address(address).point_count * _POINT.size
+            elif plan.tail == "string":
+                size += CommandText.from_address(address).length
+            data = ctypes.string_at(address + _HEADER_SIZE, size - _HEADER_SIZE)
+            values = plan.struct.unpack_from(data, 0)
+            frame.append((plan, values, data[plan.size - _HEADER_SIZE :]))
+        # Commands are compared by what is sent for them, which leaves out the
+        # padding between the fields and the pointers.
+        keys = [
+            (plan.kind, tuple(values[i] for i in plan.sent), tail)
+            for plan, values, tail in frame
+        ]
+
+        keyframe = self._keys is None or (
+            self.keyframe_interval and self.frames % self.keyframe_interval == 0
+        )
+        state = self._state
+        if keyframe:
+            state.reset()
+            runs = [("insert", 0, 0, 0, len(frame))]
+        else:
+            state.reset_frame()
+            matcher = SequenceMatcher(None, self._keys, keys, False)
+            runs = [op for op in matcher.get_opcodes() if op[0] != "delete"]
+        self._keys = keys
+
+        out = bytearray([FLAG_KEYFRAME if keyframe else 0])
+        _write_varint(out, self.frames)
+        _write_varint(out, len(runs))
+        for tag, i0, i1, j0, j1 in runs:
+            if tag == "equal":
+                _write_varint(out, (j1 - j0) << 1 | 1)
+                _write_varint(out, i0)
+                continue
+            _write_varint(out, (j1 - j0) << 1)
+            for plan, values, tail in frame[j0:j1]:
+                self._encode_command(out, plan, values, tail)
+
+        self.frames += 1
+        self.keyframes += keyframe
+        self.bytes_out += len(out)
+        return bytes(out)
+
+    def _encode_command(
+        self, out: bytearray, plan: _Plan, values: Tuple, tail: bytes
+    ) -> None:
+        state = self._state
+        out.append(plan.kind)
+        previous = state.previous[plan.kind]
+        i = 0
+        for value, kind in zip(values, plan.kinds):
+            if kind == _NUMBER or kind == _FLOAT:
+                if kind == _FLOAT:
+                    value = round(value * FLOAT_SCALE)
+                _write_varint(out, _zigzag(value - previous[i]))
+                previous[i] = value
+                i += 1
+            elif kind == _COLOR_FIELD:
+                index = state.colors.index.get(value)
+                if index is None:
+                    out.append(0)
+                    out.extend(value)
+                    state.colors.add(value)
+                else:
+                    _write_varint(out, index + 1)
+
+        if plan.tail == "points":
+            _write_varint(out, len(tail) // _POINT.size)
+            x = y = 0
+            for px, py in _POINT.iter_unpack(tail):
+                _write_varint(out, _zigzag(px - x))
+                _write_varint(out, _zigzag(py - y))
+                x, y = px, py
+        elif plan.tail == "string":
+            index = state.strings.index.get(tail)
+            if index is None:
+                out.append(0)
+                _write_varint(out, len(tail))
+                out.extend(tail)
+                state.strings.add(tail)
+            else:
+                _write_varint(out, index + 1)
+
+
+class WireDecoder:
+    """
+    Decodes messages written by a `WireEncoder` into command views.
+
+    Messages have to be passed in the order they were encoded, starting with a
+    keyframe; decoding raises `ValueError` when one is missing or corrupt. The
+    table limits must match those of the encoder.
+    """
+
+    def __init__(self, max_colors: int = 4096, max_strings: int = 4096):
+        self._state = _State(max_colors, max_strings)
+        self._frame: Optional[List[ctypes.Structure]] = None
+        self._number: Optional[int] = None
+
+        self.frames = 0
+        self.bytes_in = 0
+
+    def decode(self, message: bytes) -> List[ctypes.Structure]:
+        """
+        Returns the commands of the frame in `message`, in drawing order. Views
+        of commands that did not change are shared with the previous frame.
+        """
+        if not message:
+            raise ValueError("Empty wire message")
+        flags = message[0]
+        number, offset = _read_varint(message, 1)
+        state = self._state
+        if flags & FLAG_KEYFRAME:
+            state.reset()
+        elif self._frame is None:
+            raise ValueError("Wire stream does not start with a keyframe")
+        elif number != self._number + 1:
+            raise ValueError(f"Wire frame {self._number + 1} is missing")
+        else:
+            state.reset_frame()
+
+        previous = self._frame or []
+        frame: List[ctypes.Structure] = []
+        runs, offset = _read_varint(message, offset)
+        for _ in range(runs):
+            run, offset = _read_varint(message, offset)
+            count = run >> 1
+            if run & 1:
+                start, offset = _read_varint(message, offset)
+                if start + count > len(previous):
+                    raise ValueError("Corrupt wire message: bad copy run")
+                frame.extend(previous[start : start + count])
+                continue
+            for _ in range(count):
+                command, offset = self._decode_command(message, offset)
+                frame.append(command)
+        if offset != len(message):
+            raise ValueError("Corrupt wire message: trailing bytes")
+
+        self._frame = frame
+        self._number = number
+        self.frames += 1
+        self.bytes_in += len(message)
+        return frame
+
+    def dispatch(
+        self, message: bytes, handlers: Mapping[int, Callable[[Any], None]]
+    ) -> int:
+        """
+        Decodes `message` and calls `handlers[command_type](view)` for every
+        command, like `nuklear.drawing.dispatch_commands`. Returns the number of
+        commands.
+        """
+        frame = self.decode(message)
+        for command in frame:
+            handler = handlers.get(command.header.type)
+            if handler is not None:
+                handler(command)
+        return len(frame)
+
+    def _decode_command(
+        self, message: bytes, offset: int
+    ) -> Tuple[ctypes.Structure, int]:
+        state = self._state
+        kind = message[offset] if offset < len(message) else 0
+        plan = _PLANS[kind] if kind < len(_PLANS) else None
+        if plan is None:
+            raise ValueError(f"Corrupt wire message: unknown command type {kind}")
+        offset += 1
+
+        values = []
+        previous = state.previous[kind]
+        i = 0
+        for leaf in plan.kinds:
+            if leaf == _NUMBER or leaf == _FLOAT:
+                delta, offset = _read_varint(message, offset)
+                value = previous[i] + _unzigzag(delta)
+                previous[i] = value
+                i += 1
+                values.append(value / FLOAT_SCALE if leaf == _FLOAT else value)
+            elif leaf == _COLOR_FIELD:
+                index, offset = _read_varint(message, offset)
+                if index:
+                    values.append(_lookup(state.colors, index))
+                else:
+                    value = bytes(message[offset : offset + 4])
+                    offset += 4
+                    state.colors.add(value)
+                    values.append(value)
+            else:
+                values.append(0)
+
+        tail = b""
+        if plan.tail == "points":
+            count, offset = _read_varint(message, offset)
+            points = []
+            x = y = 0
+            for _ in range(count):
+                dx, offset = _read_varint(message, offset)
+                dy, offset = _read_varint(message, offset)
+                x += _unzigzag(dx)
+                y += _unzigzag(dy)
+                points.append(_POINT.pack(x, y))
+            tail = b"".join(points)
+        elif plan.tail == "string":
+            index, offset = _read_varint(message, offset)
+            if index:
+                tail = _lookup(state.strings, index)
+            else:
+                length, offset = _read_varint(message, offset)
+                tail = bytes(message[offset : offset + length])
+                offset += length
+                state.strings.add(tail)
+        if offset > len(message):
+            raise ValueError("Truncated wire message")
+
+        # Text keeps a terminating zero byte like the library does.
+        size = plan.size + len(tail) + (plan.tail == "string")
+        memory = bytearray(max(size, ctypes.sizeof(plan.view)))
+        plan.struct.pack_into(memory, _HEADER_SIZE, *values)
+        memory[plan.size : plan.size + len(tail)] = tail
+        command = plan.view.from_buffer(memory)
+        command.header.type = kind
+        command.header.next = len(memory)
+        if plan.tail == "points":
+            command.point_count = len(tail) // _POINT.size
+        elif plan.tail == "string":
+            command.length = len(tail)
+        return command, offset
+
+
+def _lookup(table: _Table, index: int):
+    if index > len(table.values):
+        raise ValueError("Corrupt wire message: unknown table entry")
+    return table.values[index - 1]
+
+
+def send_message(sock: socket.socket, message: bytes) -> None:
+    """Sends one message over a stream socket."""
+    sock.sendall(_LENGTH.pack(len(message)) + message)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytearray]:
+    data = bytearray(size)
+    view = memoryview(data)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            if received:
+                raise ValueError("Wire connection closed inside a message")
+            return None
+        received += n
+    return data
+
+
+def recv_message(sock: socket.socket) -> Optional[bytes]:
+    """Receives one message, or `None` when the other side closed the socket."""
+    header = _recv_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    data = _recv_exactly(sock, size) if size else bytearray()
+    if data is None:
+        raise ValueError("Wire connection closed inside a message")
+    return bytes(data)
@@ -0,0 +1,22 @@
+import nuklear as nk
+
+
+def width(handle, height, text):
+    return len(text) * height * 0.5
+
+
+def query(handle, height, codepoint, next_codepoint):
+    return nk.UserFontGlyph(width=height * 0.5, height=height, xadvance=height * 0.5)
+
+
+def font(height=13.0, **kwargs):
+    # Monospaced font at half the height per character, see `width`.
+    kwargs.setdefault("width", width)
+    return nk.UserFont(height=height, **kwargs)
+
+
+def context(user_font=None):
+    # Returns a context initialized with `user_font`, or `font()` if not given.
+    ctx = nk.Context()
+    nk.init_default(ctx, font() if user_font is None else user_font)
+    return ctx
@@ -0,0 +1,23 @@
+import ctypes
+import unittest
+
+import nuklear as nk
+
+
+class BufferModule(unittest.TestCase):
+    def test_fixed(self):
+        buffer = nk.Buffer()
+        memory = (ctypes.c_ubyte * 64)()
+        nk.buffer_init_fixed(buffer, memory)
+        self.assertEqual(buffer.address, ctypes.addressof(memory))
+        self.assertEqual(buffer.capacity, 64)
+        self.assertEqual(buffer.allocated, 0)
+        self.assertEqual(len(buffer.view()), 0)
+        nk.buffer_clear(buffer)
+        self.assertEqual(buffer.allocated, 0)
+
+    def test_dynamic(self):
+        buffer = nk.Buffer()
+        nk.buffer_init_default(buffer)
+        self.assertEqual(buffer.struct.type, nk.BUFFER_DYNAMIC)
+        nk.buffer_free(buffer)
@@ -0,0 +1,137 @@
+import unittest
+
+import numpy as np
+
+import helpers
+import nuklear as nk
+
+RED = nk.Color(255, 0, 0, 255)
+BLUE = nk.Color(0, 0, 255, 255)
+
+
+class CanvasModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def draw(self, paint):
+        # Returns the commands drawn by `paint(canvas)`, without the window.
+        nk.clear(self.ctx)
+        nk.begin(self.ctx, "Plot", nk.Rect(0, 0, 400, 400), 0)
+        canvas = nk.window_get_canvas(self.ctx)
+        before = len(list(nk.commands(self.ctx)))
+        paint(canvas)
+        after = len(list(nk.commands(self.ctx)))
+        nk.end(self.ctx)
+        return list(nk.commands(self.ctx))[before:after]
+
+    def test_shapes(self):
+        points = np.array([[10, 10], [50, 20], [30, 60]], np.float32)
+
+        def paint(canvas):
+            nk.fill_rect(canvas, nk.Rect(10, 20, 30, 40), 0, RED)
+            nk.stroke_polyline(canvas, points, 2, BLUE)
+            nk.fill_polygon(canvas, points.tolist(), RED)
+            nk.stroke_line(canvas, 0, 0, 5, 5, 1, RED)
+
+        drawn = self.draw(paint)
+        self.assertEqual(
+            [c.header.type for c in drawn],
+            [
+                nk.COMMAND_RECT_FILLED,
+                nk.COMMAND_POLYLINE,
+                nk.COMMAND_POLYGON_FILLED,
+                nk.COMMAND_LINE,
+            ],
+        )
+        self.assertEqual(
+            (drawn[0].x, drawn[0].y, drawn[0].w, drawn[0].h), (10, 20, 30, 40)
+        )
+        self.assertEqual(
+            [(p.x, p.y) for p in drawn[1].vertices()], [(10, 10), (50, 20), (30, 60)]
+        )
+        self.assertEqual(drawn[1].line_thickness, 2)
+        self.assertEqual(drawn[2].point_count, 3)
+
+    def test_fill_rects(self):
+        rects = np.array([[10 * i, 5, 8, 8] for i in range(10)], np.float32)
+        colors = np.zeros((10, 4), np.uint8)
+        colors[:, 0] = np.arange(10)
+        colors[:, 3] = 255
+
+        drawn = self.draw(lambda canvas: nk.fill_rects(canvas, rects, colors, 2))
+        self.assertEqual(len(drawn), 10)
+        self.assertEqual([c.x for c in drawn], list(range(0, 100, 10)))
+        self.assertEqual([c.color.r for c in drawn], list(range(10)))
+        self.assertEqual(drawn[0].rounding, 2)
+
+        drawn = self.draw(lambda canvas: nk.fill_rects(canvas, rects[:3], BLUE))
+        self.assertEqual([c.color.b for c in drawn], [255] * 3)
+
+        with self.assertRaises(ValueError):
+            self.draw(lambda canvas: nk.fill_rects(canvas, rects, colors[:2]))
+
+    def test_fill_rects_multi_color(self):
+        rects = [(0, 0, 10, 10), (20, 0, 10, 10)]
+        colors = [(RED, BLUE, RED, BLUE), (BLUE, RED, BLUE, RED)]
+        drawn = self.draw(
+            lambda canvas: nk.fill_rects_multi_color(canvas, rects, colors)
+        )
+        self.assertEqual(
+            [c.header.type for c in drawn], [nk.COMMAND_RECT_MULTI_COLOR] * 2
+        )
+        self.assertEqual((drawn[0].left.r, drawn[0].top.b), (255, 255))
+        self.assertEqual((drawn[1].left.b, drawn[1].right.b), (255, 255))
+
+    def test_stroke_polylines(self):
+        # Three series of 100 points each, as plot widgets draw them.
+        x = np.linspace(0, 300, 100, dtype=np.float32)
+        series = np.stack(
+            [np.stack([x, 100 + 10 * k + np.sin(x)], axis=1) for k in range(3)]
+        )
+        drawn = self.draw(
+            lambda canvas: nk.stroke_polylines(canvas, series, [RED, BLUE, RED], 1.5)
+        )
+        self.assertEqual(len(drawn), 3)
+        self.assertEqual([c.point_count for c in drawn], [100] * 3)
+        self.assertEqual([c.color.b for c in drawn], [0, 255, 0])
+        self.assertEqual(drawn[1].vertices()[0].y, 110)
+
+        # Lines of different lengths, given as a list or with counts.
+        parts = [series[0, :10], series[1, :20]]
+        drawn = self.draw(lambda canvas: nk.stroke_polylines(canvas, parts, RED))
+        self.assertEqual([c.point_count for c in drawn], [10, 20])
+        joined = np.concatenate(parts)
+        drawn = self.draw(
+            lambda canvas: nk.stroke_polylines(canvas, joined, RED, counts=[10, 20])
+        )
+        self.assertEqual([c.point_count for c in drawn], [10, 20])
+
+        drawn = self.draw(
+            lambda canvas: nk.stroke_polylines(canvas, series[:1], RED, closed=True)
+        )
+        self.assertEqual(drawn[0].header.type, nk.COMMAND_POLYGON)
+
+        with self.assertRaises(ValueError):
+            nk.stroke_polylines(None, series, RED, counts=[1, 2])
+
+    def test_fill_polygons(self):
+        triangles = np.array(
+            [[[0, 0], [10, 0], [5, 10]], [[20, 0], [30, 0], [25, 10]]], np.float32
+        )
+        drawn = self.draw(lambda canvas: nk.fill_polygons(canvas, triangles, RED))
+        self.assertEqual(
+            [c.header.type for c in drawn], [nk.COMMAND_POLYGON_FILLED] * 2
+        )
+        self.assertEqual(drawn[1].vertices()[2].x, 25)
+
+        # Nothing to draw is not an error.
+        self.assertEqual(
+            self.draw(lambda canvas: nk.fill_polygons(canvas, [], RED)), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
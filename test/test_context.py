@@ -0,0 +1,77 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import helpers
+import nuklear as nk
+
+
+def _lockable(ctx):
+    # Whether the calling thread can take the lock of `ctx`.
+    if not ctx.lock.acquire(blocking=False):
+        return False
+    ctx.lock.release()
+    return True
+
+
+class ContextModule(unittest.TestCase):
+    def setUp(self):
+        self.font = helpers.font()
+
+    def test_init_default(self):
+        ctx = nk.Context()
+        self.assertTrue(nk.init_default(ctx, self.font))
+        nk.free(ctx)
+
+    def test_init_fixed(self):
+        ctx = nk.Context()
+        memory = (nk.Byte * (1024 * 1024))()
+        self.assertTrue(nk.init_fixed(ctx, memory, self.font))
+        nk.free(ctx)
+
+    def test_scratch(self):
+        ctx = nk.Context()
+        scratch = ctx.scratch(16)
+        self.assertGreaterEqual(len(scratch), 16)
+        self.assertIs(ctx.scratch(8), scratch)
+        self.assertGreaterEqual(len(ctx.scratch(4096)), 4096)
+
+    def test_contexts_do_not_share_state(self):
+        a, b = nk.Context(), nk.Context()
+        self.assertIsNot(a.lock, b.lock)
+        self.assertIsNot(a.scratch(16), b.scratch(16))
+
+        nk.init_default(a, self.font)
+        nk.init_default(b, self.font)
+        self.assertIsNot(a._objects["font"], b._objects["font"])
+        nk.free(a)
+        nk.free(b)
+
+    def test_build_frames(self):
+        contexts = [nk.Context() for _ in range(4)]
+        for ctx in contexts:
+            nk.init_default(ctx, self.font)
+
+        def build(ctx):
+            # The context is locked against other threads while it is built.
+            with ThreadPoolExecutor(max_workers=1) as other:
+                self.assertFalse(other.submit(_lockable, ctx).result())
+            if nk.begin(ctx, "Demo", nk.Rect(0, 0, 200, 200), nk.WINDOW_BORDER):
+                nk.layout_row_dynamic(ctx, 20, 1)
+                nk.label(ctx, "Hello", nk.TEXT_LEFT)
+            nk.end(ctx)
+            nk.clear(ctx)
+            return id(ctx)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = nk.build_frames(contexts, build, executor)
+        self.assertEqual(results, [id(ctx) for ctx in contexts])
+
+        self.assertEqual(len(nk.build_frames(contexts, build)), 4)
+
+        for ctx in contexts:
+            self.assertTrue(_lockable(ctx))
+            nk.free(ctx)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import ctypes
+import unittest
+
+import helpers
+import nuklear as nk
+from nuklear.damage import DamageTracker
+from nuklear.damage import merge_boxes
+
+
+def _build(ctx, label, x=0):
+    if nk.begin(ctx, "Window", nk.Rect(x, 0, 100, 100), nk.WINDOW_BORDER):
+        nk.layout_row_dynamic(ctx, 20, 1)
+        nk.label(ctx, label, nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+class DamageModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+        self.tracker = DamageTracker()
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def frame(self, label, x=0, bounds=None):
+        _build(self.ctx, label, x)
+        rects = self.tracker.update(self.ctx, bounds)
+        nk.clear(self.ctx)
+        return rects
+
+    def test_first_frame(self):
+        rects = self.frame("Label")
+        self.assertEqual(len(rects), 1)
+        self.assertLessEqual(rects[0].x, 0)
+        self.assertGreaterEqual(rects[0].w, 100)
+
+    def test_unchanged(self):
+        self.frame("Label")
+        self.assertEqual(self.frame("Label"), [])
+
+    def test_changed_label(self):
+        self.frame("Label")
+        rects = self.frame("Other")
+        self.assertEqual(len(rects), 1)
+        # Only the label row is dirty, not the whole window.
+        self.assertLess(rects[0].h, 40)
+        self.assertLess(rects[0].w * rects[0].h, 100 * 100)
+
+    def test_moved_window(self):
+        self.frame("Label")
+        rects = self.frame("Label", x=200)
+        self.assertEqual(len(rects), 2)
+        self.assertEqual(sorted(r.x < 150 for r in rects), [False, True])
+
+    def test_stale_padding(self):
+        self.frame("Label")
+        _build(self.ctx, "Label")
+        # Fill the trailing padding of the commands with leftovers.
+        for kind, address in nk.walk_commands(self.ctx):
+            view = nk.COMMAND_VIEWS[kind]
+            name = view._fields_[-1][0]
+            if name not in ("points", "string"):
+                end = getattr(view, name).offset + getattr(view, name).size
+                ctypes.memset(address + end, 0xAB, ctypes.sizeof(view) - end)
+        self.assertEqual(self.tracker.update(self.ctx), [])
+        nk.clear(self.ctx)
+
+    def test_bounds(self):
+        rects = self.frame("Label", bounds=nk.Rect(0, 0, 50, 50))
+        self.assertEqual(rects, [nk.Rect(0, 0, 50, 50)])
+
+    def test_reset(self):
+        self.frame("Label")
+        self.tracker.reset()
+        self.assertEqual(len(self.frame("Label")), 1)
+
+
+class MergeBoxes(unittest.TestCase):
+    def test_overlapping(self):
+        boxes = merge_boxes([(0, 0, 10, 10), (5, 5, 15, 15), (100, 100, 110, 110)])
+        self.assertEqual(sorted(boxes), [(0, 0, 15, 15), (100, 100, 110, 110)])
+
+    def test_adjacent(self):
+        self.assertEqual(
+            merge_boxes([(0, 0, 10, 10), (10, 0, 20, 10)]), [(0, 0, 20, 10)]
+        )
+
+    def test_max_boxes(self):
+        boxes = [(0, 0, 10, 10), (20, 0, 30, 10), (200, 0, 210, 10)]
+        self.assertEqual(
+            sorted(merge_boxes(boxes, 2)), [(0, 0, 30, 10), (200, 0, 210, 10)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,292 @@
+import gc
+import unittest
+
+import numpy as np
+
+import helpers
+import nuklear as nk
+from nuklear import drawing
+
+
+class DrawingModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), nk.WINDOW_BORDER):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+            nk.label(self.ctx, "Label", nk.TEXT_LEFT)
+        nk.end(self.ctx)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def test_commands(self):
+        commands = list(nk.commands(self.ctx))
+        kinds = [type(command) for command in commands]
+        self.assertIn(nk.CommandScissor, kinds)
+        self.assertIn(nk.CommandRectFilled, kinds)
+
+        texts = [c for c in commands if isinstance(c, nk.CommandText)]
+        self.assertEqual([c.text for c in texts], ["Label"])
+        self.assertEqual(texts[0].header.type, nk.COMMAND_TEXT)
+
+        background = commands[kinds.index(nk.CommandRectFilled)]
+        self.assertEqual((background.w, background.h), (100, 100))
+
+    def test_dispatch(self):
+        seen = []
+        count = nk.dispatch_commands(
+            self.ctx, {nk.COMMAND_TEXT: lambda command: seen.append(command.text)}
+        )
+        self.assertEqual(count, len(list(nk.commands(self.ctx))))
+        self.assertEqual(seen, ["Label"])
+
+    def test_cleared(self):
+        nk.clear(self.ctx)
+        self.assertEqual(list(nk.commands(self.ctx)), [])
+
+
+class ConvertModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), nk.WINDOW_BORDER):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+        nk.end(self.ctx)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def test_layout(self):
+        layout = nk.VertexLayout.default()
+        self.assertEqual(layout.size, 20)
+        self.assertEqual([e.offset for e in layout.elements], [0, 8, 16])
+
+        layout = nk.VertexLayout(
+            (
+                (nk.VERTEX_COLOR, nk.FORMAT_RGBA32),
+                (nk.VERTEX_POSITION, nk.FORMAT_DOUBLE),
+            )
+        )
+        self.assertEqual((layout.size, layout.alignment), (24, 8))
+        self.assertEqual([e.offset for e in layout.elements], [0, 8])
+
+        with self.assertRaises(ValueError):
+            nk.VertexLayout(((nk.VERTEX_POSITION, nk.FORMAT_RGBA32),))
+        with self.assertRaises(ValueError):
+            nk.VertexLayout(((nk.VERTEX_COLOR, nk.FORMAT_FLOAT),))
+
+    def test_converter(self):
+        # Tiny initial buffers force the converter to grow them.
+        converter = nk.Converter(
+            command_capacity=64, vertex_capacity=64, element_capacity=64
+        )
+        data = converter.convert(self.ctx)
+        self.assertGreater(data.vertex_count, 0)
+        self.assertGreater(data.element_count, 0)
+        self.assertEqual(len(data.vertices), data.vertex_count)
+        self.assertEqual(len(data.elements), data.element_count)
+        self.assertEqual(
+            sum(int(c["elem_count"]) for c in data.commands), data.element_count
+        )
+        self.assertLess(int(max(data.elements)), data.vertex_count)
+
+        again = converter.convert(self.ctx)
+        self.assertEqual(again.vertex_count, data.vertex_count)
+
+    def test_segments(self):
+        converter = nk.Converter(
+            config=nk.ConvertConfig(
+                line_aa=nk.ANTI_ALIASING_OFF, shape_aa=nk.ANTI_ALIASING_OFF
+            )
+        )
+        plain = converter.convert(self.ctx).vertex_count
+        converter.config = nk.ConvertConfig()
+        smooth = converter.convert(self.ctx).vertex_count
+        self.assertLess(plain, smooth)
+
+    def test_outlives_converter(self):
+        data = nk.Converter().convert(self.ctx)
+        gc.collect()
+        # Reuse any memory that was freed along with the converter.
+        filler = [bytearray(b"\xff" * 16 * 1024) for _ in range(16)]  # noqa: F841
+        self.assertGreater(data.commands["elem_count"].sum(), 0)
+        self.assertEqual(data.commands["elem_count"].sum(), data.element_count)
+
+
+class FrameCacheModule(unittest.TestCase):
+    def setUp(self):
+        # Converting text queries glyphs, so the font needs a query callback.
+        self.font = helpers.font(query=helpers.query)
+        self.ctx = helpers.context(self.font)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def frame(self, label):
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), nk.WINDOW_BORDER):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+            nk.label(self.ctx, label, nk.TEXT_LEFT)
+        nk.end(self.ctx)
+
+    def test_signature(self):
+        self.frame("Label")
+        first = nk.command_signature(self.ctx)
+        nk.clear(self.ctx)
+        self.frame("Label")
+        self.assertEqual(nk.command_signature(self.ctx), first)
+        nk.clear(self.ctx)
+        self.frame("Another label")
+        self.assertNotEqual(nk.command_signature(self.ctx), first)
+        nk.clear(self.ctx)
+        # The padding of the commands now holds bytes of the previous frame.
+        self.frame("Label")
+        self.assertEqual(nk.command_signature(self.ctx), first)
+        nk.clear(self.ctx)
+
+    def test_command_bytes(self):
+        self.frame("Label")
+        first = [nk.command_bytes(*item) for item in nk.walk_commands(self.ctx)]
+        nk.clear(self.ctx)
+        self.frame("Another label")
+        nk.clear(self.ctx)
+        self.frame("Label")
+        items = list(nk.walk_commands(self.ctx))
+        self.assertEqual([nk.command_bytes(*item) for item in items], first)
+        # The string of text commands is included.
+        text = [i for i, (kind, _) in enumerate(items) if kind == nk.COMMAND_TEXT]
+        self.assertTrue(first[text[0]].endswith(b"Label"))
+        nk.clear(self.ctx)
+
+    def test_render(self):
+        cache = nk.FrameCache()
+        drawn = []
+        for label in ("A", "A", "A", "B", "B"):
+            self.frame(label)
+            cache.render(self.ctx, drawn.append)
+            nk.clear(self.ctx)
+        self.assertEqual(len(drawn), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+        self.assertAlmostEqual(cache.hit_rate, 0.6)
+        self.assertIs(cache.data, drawn[-1])
+
+        cache.converter.config = nk.ConvertConfig(circle_segment_count=8)
+        self.frame("B")
+        self.assertTrue(cache.render(self.ctx))
+        nk.clear(self.ctx)
+
+        cache.invalidate()
+        self.frame("B")
+        self.assertTrue(cache.render(self.ctx))
+        nk.clear(self.ctx)
+
+    def test_failed_draw(self):
+        cache = nk.FrameCache()
+
+        def fail(data):
+            raise RuntimeError("lost device")
+
+        self.frame("A")
+        self.assertRaises(RuntimeError, cache.render, self.ctx, fail)
+        nk.clear(self.ctx)
+        # The frame was never drawn, so it is not skipped.
+        self.frame("A")
+        self.assertTrue(cache.changed(self.ctx))
+        self.assertTrue(cache.render(self.ctx))
+        self.assertFalse(cache.changed(self.ctx))
+        nk.clear(self.ctx)
+
+
+class DrawBatcherModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context(helpers.font(query=helpers.query))
+        # Shapes use texture 2 and text texture 0, so they alternate.
+        null = nk.DrawNullTexture(texture=nk.Handle(id=2))
+        self.config = nk.ConvertConfig(tex_null=null)
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 200, 200), nk.WINDOW_BORDER):
+            nk.layout_row_dynamic(self.ctx, 20, 2)
+            for i in range(6):
+                nk.label(self.ctx, f"Label {i}", nk.TEXT_LEFT)
+                nk.label(self.ctx, "Value", nk.TEXT_RIGHT)
+        nk.end(self.ctx)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def test_batch(self):
+        data = nk.Converter(config=self.config).convert(self.ctx)
+        batcher = nk.DrawBatcher()
+        batched = nk.Converter(config=self.config, batcher=batcher).convert(self.ctx)
+        self.assertEqual(batcher.commands_in, len(data.commands))
+        self.assertEqual(batcher.commands_out, len(batched.commands))
+        self.assertLessEqual(len(batched.commands), len(data.commands))
+        self.assertEqual(sum(batched.commands["elem_count"]), data.element_count)
+
+        # Every batch keeps the texture and clip rect of its commands, and
+        # the same triangles are drawn.
+        keys = {(int(c["texture"]), *c["clip_rect"]) for c in data.commands}
+        for command in batched.commands:
+            self.assertIn((int(command["texture"]), *command["clip_rect"]), keys)
+        triangles = sorted(map(tuple, data.elements.reshape(-1, 3).tolist()))
+        self.assertEqual(
+            sorted(map(tuple, batched.elements.reshape(-1, 3).tolist())), triangles
+        )
+
+    def test_same_image(self):
+        from nuklear.raster import Rasterizer
+
+        converter = nk.Converter(config=self.config)
+        expected = Rasterizer(200, 200, converter=converter).render(self.ctx)
+        converter.batcher = nk.DrawBatcher()
+        batched = Rasterizer(200, 200, converter=converter).render(self.ctx)
+        self.assertTrue((batched == expected).all())
+
+    def test_adjacent_only(self):
+        data = nk.Converter(config=self.config).convert(self.ctx)
+        adjacent = nk.DrawBatcher(reorder=False).batch(data)
+        reordered = nk.DrawBatcher().batch(data)
+        self.assertLessEqual(len(reordered.commands), len(adjacent.commands))
+        self.assertIs(adjacent.elements, data.elements)
+
+
+def _quads(*quads):
+    """Builds `DrawData` with one draw command per `(x0, x1, texture)` quad."""
+    layout = nk.VertexLayout.default()
+    vertices = np.zeros(4 * len(quads), layout.dtype)
+    elements, commands = [], []
+    for i, (x0, x1, texture) in enumerate(quads):
+        vertices["position"][4 * i : 4 * i + 4] = [(x0, 0), (x1, 0), (x1, 10), (x0, 10)]
+        elements += [4 * i + k for k in (0, 1, 2, 0, 2, 3)]
+        commands.append((6, (0, 0, 100, 100), texture))
+    return nk.DrawData(
+        vertices,
+        np.array(elements, np.uint16),
+        np.array(commands, drawing.DRAW_COMMAND_DTYPE),
+        len(vertices),
+        len(elements),
+    )
+
+
+class DrawBatcherOrder(unittest.TestCase):
+    def test_adjacent(self):
+        data = nk.DrawBatcher().batch(_quads((0, 10, 1), (10, 20, 1), (20, 30, 2)))
+        self.assertEqual(data.commands["elem_count"].tolist(), [12, 6])
+        self.assertEqual(data.commands["texture"].tolist(), [1, 2])
+
+    def test_reorder(self):
+        batcher = nk.DrawBatcher()
+        data = batcher.batch(_quads((0, 10, 1), (20, 30, 2), (40, 50, 1)))
+        self.assertEqual(data.commands["elem_count"].tolist(), [12, 6])
+        self.assertEqual(data.commands["texture"].tolist(), [1, 2])
+        # The third quad is moved in front of the second one.
+        self.assertEqual(data.elements[6:12].tolist(), [8, 9, 10, 8, 10, 11])
+        self.assertEqual((batcher.commands_in, batcher.commands_out), (3, 2))
+        self.assertEqual(batcher.calls_saved, 1)
+
+    def test_overlap(self):
+        quads = _quads((0, 10, 1), (5, 15, 2), (10, 20, 1))
+        self.assertEqual(len(nk.DrawBatcher().batch(quads).commands), 3)
+
+    def test_window(self):
+        quads = _quads((0, 10, 1), (20, 30, 2), (40, 50, 3), (60, 70, 1))
+        self.assertEqual(len(nk.DrawBatcher(window=2).batch(quads).commands), 4)
+        self.assertEqual(len(nk.DrawBatcher(window=3).batch(quads).commands), 3)
+        self.assertEqual(len(nk.DrawBatcher(reorder=False).batch(quads).commands), 4)
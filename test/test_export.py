@@ -0,0 +1,153 @@
+import tempfile
+import threading
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from nuklear import export
+
+
+def _frame(value, width=4, height=3):
+    pixels = np.zeros((height, width, 4), np.uint8)
+    pixels[...] = (value, 2 * value % 256, 3 * value % 256, 255)
+    return pixels
+
+
+class EncodeModule(unittest.TestCase):
+    def test_png(self):
+        pixels = _frame(7)
+        data = export.encode(pixels, "png")
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        # Decode the single IDAT chunk and drop the filter byte of every row.
+        start = data.index(b"IDAT") + 4
+        length = int.from_bytes(data[start - 8 : start - 4], "big")
+        rows = zlib.decompress(data[start : start + length])
+        rows = np.frombuffer(rows, np.uint8).reshape(3, 4 * 4 + 1)
+        self.assertTrue((rows[:, 0] == 0).all())
+        np.testing.assert_array_equal(rows[:, 1:].reshape(3, 4, 4), pixels)
+
+    def test_ppm(self):
+        data = export.encode(_frame(7), "ppm")
+        self.assertTrue(data.startswith(b"P6\n4 3\n255\n"))
+        self.assertEqual(len(data), len(b"P6\n4 3\n255\n") + 4 * 3 * 3)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, export.encode, _frame(7), "gif")
+
+
+class FrameExporterModule(unittest.TestCase):
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with export.FrameExporter(directory, "rgba", workers=3) as exporter:
+                for i in range(10):
+                    self.assertTrue(exporter.submit(_frame(i)))
+            self.assertEqual(exporter.written, 10)
+            for i in range(10):
+                data = exporter.path(i).read_bytes()
+                self.assertEqual(data, _frame(i).tobytes())
+
+    def test_copy(self):
+        pixels = _frame(1)
+        with tempfile.TemporaryDirectory() as directory:
+            with export.FrameExporter(directory, "rgba") as exporter:
+                exporter.submit(pixels)
+                pixels[...] = 0
+            self.assertEqual(exporter.path(0).read_bytes(), _frame(1).tobytes())
+
+    def _blocked(self, directory, drop):
+        # Holds the only worker in `encode` until `release` is set.
+        release = threading.Event()
+        started = threading.Event()
+        original = export.encode
+
+        def encode(*args):
+            started.set()
+            release.wait()
+            return original(*args)
+
+        export.encode = encode
+        self.addCleanup(setattr, export, "encode", original)
+        exporter = export.FrameExporter(
+            directory, "rgba", workers=1, max_queue=2, drop=drop
+        )
+        exporter.submit(_frame(0))
+        started.wait()
+        return exporter, release
+
+    def test_drop_newest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            exporter, release = self._blocked(directory, export.DROP_NEWEST)
+            results = [exporter.submit(_frame(i)) for i in range(1, 5)]
+            release.set()
+            exporter.close()
+            self.assertEqual(results, [True, True, False, False])
+            self.assertEqual((exporter.written, exporter.dropped), (3, 2))
+            names = sorted(p.name for p in Path(directory).iterdir())
+            self.assertEqual(names, [f"frame{i:06d}.rgba" for i in (0, 1, 2)])
+
+    def test_drop_oldest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            exporter, release = self._blocked(directory, export.DROP_OLDEST)
+            results = [exporter.submit(_frame(i)) for i in range(1, 5)]
+            release.set()
+            exporter.close()
+            self.assertEqual(results, [True] * 4)
+            self.assertEqual((exporter.written, exporter.dropped), (3, 2))
+            names = sorted(p.name for p in Path(directory).iterdir())
+            self.assertEqual(names, [f"frame{i:06d}.rgba" for i in (0, 3, 4)])
+
+    def test_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = export.FrameExporter(directory, "rgba", workers=1)
+            exporter.directory = Path(directory) / "missing"
+            exporter.submit(_frame(1))
+            self.assertRaises(FileNotFoundError, exporter.close)
+
+    def test_arguments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertRaises(ValueError, export.FrameExporter, directory, "gif")
+            self.assertRaises(
+                ValueError, export.FrameExporter, directory, drop="sometimes"
+            )
+
+
+class MappedFrameWriterModule(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "frames.raw"
+            with export.MappedFrameWriter(path, 4, 3, capacity=3) as writer:
+                writer.write(_frame(1))
+                writer.next_frame()[...] = _frame(2)
+            frames, width, height = export.read_raw_frames(path)
+            self.assertEqual((len(frames), width, height), (2, 4, 3))
+            np.testing.assert_array_equal(frames[0], _frame(1))
+            np.testing.assert_array_equal(frames[1], _frame(2))
+            del frames
+
+    def test_frame_outlives_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "frames.raw"
+            with export.MappedFrameWriter(path, 4, 3, capacity=2) as writer:
+                frame = writer.next_frame()
+                frame[...] = _frame(1)
+            self.assertRaises(ValueError, writer.next_frame)
+            frame[...] = _frame(2)
+            del frame
+
+            frames, width, height = export.read_raw_frames(path)
+            self.assertEqual((len(frames), width, height), (1, 4, 3))
+            np.testing.assert_array_equal(frames[0], _frame(2))
+            del frames
+
+    def test_full(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "frames.raw"
+            with export.MappedFrameWriter(path, 4, 3, capacity=1) as writer:
+                writer.write(_frame(1))
+                self.assertRaises(IndexError, writer.next_frame)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import nuklear as nk
+
+
+class FontModule(unittest.TestCase):
+    def test_glyph_ranges(self):
+        ranges = nk.font_default_glyph_ranges()
+        self.assertEqual(len(ranges) % 2, 0)
+        self.assertEqual(ranges[:2], [0x0020, 0x00FF])
+
+    def test_bake_default_font(self):
+        atlas = nk.FontAtlas()
+        nk.font_atlas_init_default(atlas)
+        nk.font_atlas_begin(atlas)
+        font = nk.font_atlas_add_default(atlas, 13.0)
+        self.assertIsNotNone(font)
+
+        pixels, width, height = nk.font_atlas_bake(atlas, nk.FONT_ATLAS_RGBA32)
+        self.assertGreater(width, 0)
+        self.assertGreater(height, 0)
+        self.assertEqual(len(pixels), width * height * 4)
+
+        null = nk.font_atlas_end(atlas, nk.Handle(id=7))
+        self.assertEqual(null.texture.id, 7)
+        self.assertEqual(font.handle.texture.id, 7)
+        self.assertAlmostEqual(font.handle.height, 13.0)
+        self.assertGreater(font.info.glyph_count, 0)
+        self.assertEqual(len(font.glyphs()), font.info.glyph_count)
+        self.assertEqual(len(atlas.fonts), 1)
+
+        nk.font_atlas_cleanup(atlas)
+        nk.font_atlas_clear(atlas)
+
+    def test_font_config(self):
+        atlas = nk.FontAtlas()
+        nk.font_atlas_init_default(atlas)
+        nk.font_atlas_begin(atlas)
+        config = nk.FontConfig(range=[0x0020, 0x007E], oversample_h=1)
+        font = nk.font_atlas_add_default(atlas, 16.0, config)
+        nk.font_atlas_bake(atlas, nk.FONT_ATLAS_ALPHA8)
+        nk.font_atlas_end(atlas, nk.Handle(id=1))
+        self.assertEqual(font.info.glyph_count, 0x007E - 0x0020 + 1)
+        nk.font_atlas_clear(atlas)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import dataclasses
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import nuklear as nk
+from nuklear.fontbake import font_atlas_bake_all
+from nuklear.fontbake import font_atlas_bake_parallel
+
+
+def _atlas():
+    atlas = nk.FontAtlas()
+    nk.font_atlas_init_default(atlas)
+    nk.font_atlas_begin(atlas)
+    nk.font_atlas_add_default(atlas, 13.0)
+    merged = nk.FontConfig(range=[0x0400, 0x04FF], merge_mode=True)
+    nk.font_atlas_add_default(atlas, 13.0, merged)
+    pixel = nk.FontConfig(
+        range=nk.font_cyrillic_glyph_ranges(),
+        oversample_h=1,
+        oversample_v=2,
+        coord_type=nk.COORD_PIXEL,
+        pixel_snap=True,
+    )
+    nk.font_atlas_add_default(atlas, 20.0, pixel)
+    return atlas
+
+
+def _result(atlas):
+    # `ranges` points into each atlas.
+    fonts = [
+        (dataclasses.replace(font.info, ranges=0), font.glyphs())
+        for font in atlas.fonts
+    ]
+    custom = atlas.struct.custom
+    return fonts, (custom.x, custom.y, custom.w, custom.h)
+
+
+class FontBakeModule(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def _serial(self, fmt):
+        atlas = _atlas()
+        baked = nk.font_atlas_bake(atlas, fmt)
+        nk.font_atlas_end(atlas, nk.Handle(id=1))
+        result = _result(atlas)
+        nk.font_atlas_clear(atlas)
+        return baked, result
+
+    def test_matches_serial_bake(self):
+        for fmt in (nk.FONT_ATLAS_ALPHA8, nk.FONT_ATLAS_RGBA32):
+            serial, serial_result = self._serial(fmt)
+            for workers in (1, 3, 7):
+                atlas = _atlas()
+                baked = font_atlas_bake_parallel(atlas, fmt, workers, self.executor)
+                nk.font_atlas_end(atlas, nk.Handle(id=1))
+                self.assertEqual(baked[1:], serial[1:])
+                self.assertTrue(baked[0] == serial[0], (fmt, workers))
+                self.assertEqual(_result(atlas), serial_result)
+                nk.font_atlas_clear(atlas)
+
+    def test_bake_all(self):
+        serial, _ = self._serial(nk.FONT_ATLAS_ALPHA8)
+        atlases = [_atlas(), nk.FontAtlas(), _atlas()]
+        nk.font_atlas_init_default(atlases[1])
+        nk.font_atlas_begin(atlases[1])
+
+        results = font_atlas_bake_all(atlases, nk.FONT_ATLAS_ALPHA8, 4, self.executor)
+        self.assertTrue(results[0] == serial)
+        self.assertTrue(results[2] == serial)
+        # An empty atlas gets the default font, as with a serial bake.
+        self.assertGreater(len(results[1][0]), 0)
+        self.assertEqual(len(atlases[1].fonts), 1)
+        for atlas in atlases:
+            nk.font_atlas_end(atlas, nk.Handle(id=1))
+            nk.font_atlas_clear(atlas)
+
+
+if __name__ == "__main__":
+    unittest.main()
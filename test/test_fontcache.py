@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+import nuklear as nk
+from nuklear.fontcache import FontAtlasCache
+from nuklear.fontcache import atlas_key
+
+
+def _atlas(height=13.0, config=None):
+    atlas = nk.FontAtlas()
+    nk.font_atlas_init_default(atlas)
+    nk.font_atlas_begin(atlas)
+    nk.font_atlas_add_default(atlas, height, config)
+    return atlas
+
+
+def _bake(cache, fmt=nk.FONT_ATLAS_ALPHA8, **kwargs):
+    atlas = _atlas(**kwargs)
+    pixels, width, height = cache.bake(atlas, fmt)
+    nk.font_atlas_end(atlas, nk.Handle(id=3))
+    return atlas, bytes(pixels), width, height
+
+
+class FontAtlasCacheModule(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = FontAtlasCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_hit_matches_bake(self):
+        cold, cold_pixels, width, height = _bake(self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        warm, warm_pixels, *size = _bake(self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.assertEqual(size, [width, height])
+        self.assertEqual(warm_pixels, cold_pixels)
+        self.assertEqual(len(warm_pixels), width * height)
+        self.assertEqual(warm.struct.glyph_count, cold.struct.glyph_count)
+        self.assertEqual(
+            (warm.struct.custom.x, warm.struct.custom.y, warm.struct.custom.w),
+            (cold.struct.custom.x, cold.struct.custom.y, cold.struct.custom.w),
+        )
+
+        cold_font, warm_font = cold.fonts[0], warm.fonts[0]
+        self.assertEqual(warm_font.glyphs(), cold_font.glyphs())
+        self.assertEqual(warm_font.info.glyph_count, cold_font.info.glyph_count)
+        self.assertEqual(warm_font.info.ascent, cold_font.info.ascent)
+        self.assertEqual(warm_font.handle.texture.id, 3)
+
+        # The loaded font measures text like the baked one.
+        text = "Hello, Nuklear!".encode()
+        widths = [
+            font.handle.width(font.handle.userdata, 13.0, text, len(text))
+            for font in (cold_font, warm_font)
+        ]
+        self.assertGreater(widths[0], 0)
+        self.assertEqual(widths[0], widths[1])
+
+        for atlas in (cold, warm):
+            nk.font_atlas_clear(atlas)
+
+    def test_key(self):
+        def key(fmt=nk.FONT_ATLAS_ALPHA8, **kwargs):
+            atlas = _atlas(**kwargs)
+            try:
+                return atlas_key(atlas, fmt)
+            finally:
+                nk.font_atlas_clear(atlas)
+
+        base = key()
+        self.assertEqual(key(), base)
+        self.assertNotEqual(key(fmt=nk.FONT_ATLAS_RGBA32), base)
+        self.assertNotEqual(key(height=14.0), base)
+        self.assertNotEqual(key(config=nk.FontConfig(range=[0x20, 0x7E])), base)
+        self.assertNotEqual(key(config=nk.FontConfig(oversample_h=1)), base)
+        self.assertEqual(key(config=nk.FontConfig()), base)
+
+    def test_invalid_file_bakes(self):
+        _, pixels, *_ = _bake(self.cache)
+        (path,) = self.cache.directory.iterdir()
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 1)
+
+        atlas, again, *_ = _bake(self.cache)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+        self.assertEqual(again, pixels)
+        nk.font_atlas_clear(atlas)
+
+        # The bake replaced the broken file.
+        atlas, _, *_ = _bake(self.cache)
+        self.assertEqual(self.cache.hits, 1)
+        nk.font_atlas_clear(atlas)
+
+        self.cache.clear()
+        self.assertEqual(list(self.cache.directory.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import helpers
+import nuklear as nk
+from nuklear import glyphtable
+from nuklear.glyphtable import GlyphTableFont
+from nuklear.glyphtable import text_widths
+
+
+def _width(handle, height, text):
+    return sum(height * (0.5 if ord(c) < 0x80 else 0.75) for c in text)
+
+
+class GlyphTableFontModule(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def advance(rune):
+            self.calls.append(rune)
+            return _width(None, 13.0, chr(rune))
+
+        self.font = GlyphTableFont(13.0, advance, runes=0x80)
+
+    def test_width(self):
+        self.assertEqual(len(self.calls), 0x80)
+        self.assertEqual(self.font.width("Hello"), _width(None, 13.0, "Hello"))
+        self.assertEqual(self.font.width(""), 0)
+
+        text = "Привет, Ж"
+        self.assertAlmostEqual(self.font.width(text), _width(None, 13.0, text), 4)
+        # Runes outside of the table are measured once.
+        self.assertEqual(len(self.calls), 0x80 + len(set("ПриветЖ")))
+        self.font.width(text)
+        self.assertEqual(len(self.calls), 0x80 + len(set("ПриветЖ")))
+
+        handle = self.font.handle
+        data = b"Hello"
+        self.assertEqual(handle.width(handle.userdata, 26.0, data, 5), 65.0)
+
+    def test_from_user_font(self):
+        naive = nk.UserFont(height=13.0, width=_width)
+        font = GlyphTableFont.from_user_font(naive)
+        for text in ("Hello", "Привет", "a Ж b"):
+            self.assertAlmostEqual(font.width(text), _width(None, 13.0, text), 4)
+
+    def test_context(self):
+        ctx = helpers.context(self.font.handle)
+        for _ in range(3):
+            nk.clear(ctx)
+            if nk.begin(ctx, "Labels", nk.Rect(0, 0, 200, 200), nk.WINDOW_TITLE):
+                nk.layout_row_dynamic(ctx, 20, 1)
+                nk.label(ctx, "Hello Ж", nk.TEXT_LEFT)
+            nk.end(ctx)
+        self.assertEqual(self.calls.count(ord("Ж")), 1)
+        nk.free(ctx)
+
+    def test_text_widths(self):
+        texts = ["Hello", "", "Привет", "a Ж b"] * 10
+        expected = [self.font.width(text) for text in texts]
+        self.assertEqual(self.font.widths(texts), expected)
+        self.assertEqual(text_widths(self.font, []), [])
+
+        naive = nk.UserFont(height=13.0, width=_width)
+        widths = text_widths(naive, texts, height=26.0)
+        for text, width in zip(texts, widths):
+            self.assertAlmostEqual(width, _width(None, 26.0, text), 4)
+
+        parallel_min = glyphtable._PARALLEL_MIN
+        glyphtable._PARALLEL_MIN = 2
+        try:
+            font = GlyphTableFont(13.0, lambda rune: _width(None, 13.0, chr(rune)))
+            self.assertEqual(font.widths(texts, workers=3), expected)
+            if hasattr(nk.library.nuklear, "nk_py_text_widths"):
+                with self.assertRaises(ValueError):
+                    text_widths(naive, texts, workers=3)
+        finally:
+            glyphtable._PARALLEL_MIN = parallel_min
+
+    def test_threads(self):
+        # Threads fill the rune cache of a shared font at the same time.
+        def advance(rune):
+            return float(rune % 7 + 1)
+
+        font = GlyphTableFont(13.0, advance, runes=0)
+        texts = [
+            "".join(chr(0x4E00 + i * 5 + j) for j in range(40)) for i in range(200)
+        ]
+        expected = [sum(advance(ord(c)) for c in text) for text in texts]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(2):
+                self.assertEqual(list(executor.map(font.width, texts)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import nuklear as nk
+from nuklear import headless
+
+
+class _FillRenderer(headless.Renderer):
+    def setup(self, atlas, pixels, width, height):
+        self.atlas_size = (width, height)
+
+    def render(self, ctx, width, height):
+        return bytes((255, 0, 0, 255)) * (width * height)
+
+
+class _CommandRenderer(headless.Renderer):
+    def render(self, ctx, width, height):
+        return bytes(len(list(nk.commands(ctx))))
+
+
+def _build(ctx, width, height):
+    if nk.begin(ctx, "Snapshot", nk.Rect(0, 0, width, height), 0):
+        nk.layout_row_dynamic(ctx, 20, 1)
+        nk.label(ctx, "Report", nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+def _build_broken(ctx, width, height):
+    _build(ctx, width, height)
+    raise RuntimeError("broken")
+
+
+class HeadlessModule(unittest.TestCase):
+    def test_snapshots(self):
+        jobs = [headless.SnapshotJob(f"job{i}", _build, 32, 16) for i in range(8)]
+        with headless.SnapshotService(_FillRenderer(), max_workers=2) as service:
+            snapshots = list(service.snapshots(jobs))
+
+        self.assertEqual(sorted(s.key for s in snapshots), sorted(j.key for j in jobs))
+        for snapshot in snapshots:
+            self.assertEqual(len(snapshot.pixels), 32 * 16 * 4)
+
+    def test_failed_job(self):
+        worker = headless._Worker(_CommandRenderer(), 13.0)
+        clean = worker.run(headless.SnapshotJob("clean", _build, 32, 16))
+        with self.assertRaises(RuntimeError):
+            worker.run(headless.SnapshotJob("broken", _build_broken, 32, 16))
+        # The failed frame is cleared, so it does not leak into the next job.
+        again = worker.run(headless.SnapshotJob("again", _build, 32, 16))
+        self.assertEqual(len(again.pixels), len(clean.pixels))
+        self.assertGreater(len(clean.pixels), 0)
+
+    def test_directory_sink(self):
+        jobs = [headless.SnapshotJob(f"job{i}", _build, 8, 8) for i in range(3)]
+        with tempfile.TemporaryDirectory() as directory:
+            sink = headless.DirectorySink(directory)
+            with headless.SnapshotService(_FillRenderer(), max_workers=1) as service:
+                self.assertEqual(service.render(jobs, sink), 3)
+            files = sorted(p.name for p in Path(directory).iterdir())
+            self.assertEqual(files, ["job0.pam", "job1.pam", "job2.pam"])
+            data = (Path(directory) / "job0.pam").read_bytes()
+            self.assertTrue(data.startswith(b"P7\n"))
+            self.assertTrue(data.endswith(bytes((255, 0, 0, 255)) * 64))
+
+    def test_directory_sink_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertRaises(ValueError, headless.DirectorySink, directory, "png")
+
+
+if __name__ == "__main__":
+    unittest.main()
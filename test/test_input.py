@@ -0,0 +1,255 @@
+import unittest
+
+import helpers
+import nuklear as nk
+
+
+class InputModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+        self.frame()
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def frame(self):
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), 0):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+        nk.end(self.ctx)
+        hovered = nk.window_is_any_hovered(self.ctx)
+        nk.clear(self.ctx)
+        return hovered
+
+    def edit_frame(self, edit, *events, filter=nk.filter_default):
+        # Feeds `events` and declares a single edit box for `edit`.
+        nk.input_begin(self.ctx)
+        for event in events:
+            event()
+        nk.input_end(self.ctx)
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), 0):
+            nk.layout_row_dynamic(self.ctx, 60, 1)
+            nk.edit_buffer(self.ctx, nk.EDIT_BOX, edit, filter)
+        nk.end(self.ctx)
+        nk.clear(self.ctx)
+
+    def activate(self, edit, filter=nk.filter_default):
+        # Clicks into the edit box of `edit_frame`.
+        self.edit_frame(
+            edit,
+            lambda: nk.input_motion(self.ctx, 20, 20),
+            lambda: nk.input_button(self.ctx, nk.BUTTON_LEFT, 20, 20, True),
+            filter=filter,
+        )
+        self.edit_frame(
+            edit,
+            lambda: nk.input_button(self.ctx, nk.BUTTON_LEFT, 20, 20, False),
+            filter=filter,
+        )
+        self.assertTrue(edit.active)
+
+    def test_queue(self):
+        queue = nk.InputQueue()
+        queue.motion(10, 20)
+        queue.button(nk.BUTTON_LEFT, 10, 20, True)
+        queue.key(nk.KEY_ENTER, True)
+        queue.scroll(0.0, -1.5)
+        queue.text("hi")
+        self.assertEqual(len(queue), 6)
+
+        events = list(queue)
+        self.assertEqual(events[0], (nk.INPUT_MOTION, 0, 0, 10, 20, 0.0, 0.0))
+        self.assertEqual(events[1], (nk.INPUT_BUTTON, nk.BUTTON_LEFT, 1, 10, 20, 0, 0))
+        self.assertEqual(events[2], (nk.INPUT_KEY, nk.KEY_ENTER, 1, 0, 0, 0.0, 0.0))
+        self.assertEqual(events[3], (nk.INPUT_SCROLL, 0, 0, 0, 0, 0.0, -1.5))
+        self.assertEqual(events[4][:2], (nk.INPUT_UNICODE, ord("h")))
+
+        copy = nk.InputQueue()
+        copy.extend(events)
+        self.assertEqual(list(copy), events)
+
+        queue.clear()
+        self.assertEqual(len(queue), 0)
+
+    def test_input_events(self):
+        queue = nk.InputQueue()
+        queue.motion(500, 500)
+        queue.motion(50, 50)
+        nk.input_events(self.ctx, queue)
+        self.assertTrue(self.frame())
+
+        queue.clear()
+        queue.motion(500, 500)
+        nk.input_events(self.ctx, queue)
+        self.assertFalse(self.frame())
+
+        nk.input_events(self.ctx, nk.InputQueue())
+        self.assertFalse(self.frame())
+
+    def test_input_calls(self):
+        nk.input_begin(self.ctx)
+        nk.input_motion(self.ctx, 50, 50)
+        nk.input_scroll(self.ctx, nk.Vec2(0.0, 1.0))
+        nk.input_unicode(self.ctx, ord("a"))
+        nk.input_char(self.ctx, "b")
+        nk.input_glyph(self.ctx, "é")
+        nk.input_end(self.ctx)
+        self.assertTrue(self.frame())
+
+    def test_input_text(self):
+        edit = nk.TextEdit()
+        nk.textedit_init_default(edit)
+        self.activate(edit)
+        self.edit_frame(
+            edit,
+            lambda: nk.input_char(self.ctx, "a"),
+            lambda: nk.input_char(self.ctx, "é"),
+            lambda: nk.input_glyph(self.ctx, "ж"),
+        )
+        self.assertEqual(edit.text, "aéж")
+
+        self.assertRaises(ValueError, nk.input_char, self.ctx, "ab")
+        self.assertRaises(ValueError, nk.input_char, self.ctx, "")
+        self.assertRaises(ValueError, nk.input_glyph, self.ctx, "abcde")
+        nk.textedit_free(edit)
+
+    def test_coalesce(self):
+        queue = nk.InputQueue()
+        for i in range(10):
+            queue.motion(i, i)
+        queue.button(nk.BUTTON_LEFT, 9, 9, True)
+        queue.motion(20, 20)
+        queue.button(nk.BUTTON_LEFT, 20, 20, True)
+        queue.scroll(0.0, 1.0)
+        queue.scroll(0.5, 2.0)
+        queue.key(nk.KEY_BACKSPACE, True)
+        queue.key(nk.KEY_BACKSPACE, True)
+        queue.key(nk.KEY_BACKSPACE, True)
+        queue.key(nk.KEY_ENTER, False)
+        queue.text("ab")
+
+        coalescer = nk.InputCoalescer()
+        result = list(coalescer.coalesce(queue))
+        self.assertEqual(
+            result,
+            [
+                (nk.INPUT_BUTTON, nk.BUTTON_LEFT, 1, 9, 9, 0.0, 0.0),
+                (nk.INPUT_MOTION, 0, 0, 20, 20, 0.0, 0.0),
+                (nk.INPUT_SCROLL, 0, 0, 0, 0, 0.5, 3.0),
+                (nk.INPUT_KEY, nk.KEY_BACKSPACE, 1, 0, 0, 0.0, 0.0),
+                (nk.INPUT_UNICODE, ord("a"), 0, 0, 0, 0.0, 0.0),
+                (nk.INPUT_UNICODE, ord("b"), 0, 0, 0, 0.0, 0.0),
+            ],
+        )
+        self.assertEqual(coalescer.events_in, len(queue))
+        self.assertEqual(coalescer.events_out, len(result))
+        self.assertEqual(coalescer.calls_saved, len(queue) - len(result))
+
+    def test_coalesce_keeps_clicks(self):
+        coalescer = nk.InputCoalescer()
+
+        queue = nk.InputQueue()
+        queue.button(nk.BUTTON_LEFT, 5, 5, True)
+        queue.button(nk.BUTTON_LEFT, 5, 5, False)
+        queue.button(nk.BUTTON_DOUBLE, 5, 5, True)
+        queue.button(nk.BUTTON_LEFT, 5, 5, True)
+        self.assertEqual(list(coalescer.coalesce(queue)), list(queue))
+
+        # The button state carries over into the next frame.
+        queue.clear()
+        queue.button(nk.BUTTON_LEFT, 6, 6, True)
+        queue.button(nk.BUTTON_LEFT, 6, 6, False)
+        queue.button(nk.BUTTON_DOUBLE, 6, 6, False)
+        self.assertEqual(list(coalescer.coalesce(queue)), list(queue)[1:])
+
+        coalescer.reset_stats()
+        self.assertEqual(coalescer.calls_saved, 0)
+
+    def test_coalesce_keeps_key_taps(self):
+        coalescer = nk.InputCoalescer()
+
+        queue = nk.InputQueue()
+        queue.key(nk.KEY_ENTER, True)
+        queue.key(nk.KEY_ENTER, False)
+        queue.key(nk.KEY_ENTER, False)
+        queue.key(nk.KEY_ENTER, True)
+        queue.key(nk.KEY_TAB, True)
+        queue.key(nk.KEY_TAB, True)
+        self.assertEqual(
+            list(coalescer.coalesce(queue)),
+            [list(queue)[i] for i in (0, 1, 3, 4)],
+        )
+
+        # The key state carries over into the next frame.
+        queue.clear()
+        queue.key(nk.KEY_ENTER, True)
+        queue.key(nk.KEY_TAB, False)
+        self.assertEqual(list(coalescer.coalesce(queue)), list(queue)[1:])
+
+    def test_coalesced_key_tap(self):
+        # A key pressed and released within one frame is still pressed.
+        edit = nk.TextEdit()
+        nk.textedit_init_default(edit)
+        self.activate(edit)
+        coalescer = nk.InputCoalescer()
+        for taps in ((True, False), (True, False, True), (False,)):
+            queue = nk.InputQueue()
+            for down in taps:
+                queue.key(nk.KEY_ENTER, down)
+            self.edit_frame(edit, lambda: coalescer.input_events(self.ctx, queue))
+        self.assertEqual(edit.text, "\n\n")
+        nk.textedit_free(edit)
+
+    def test_coalesced_input_events(self):
+        queue = nk.InputQueue()
+        for i in range(100):
+            queue.motion(500 - i * 5, 500 - i * 5)
+        coalescer = nk.InputCoalescer()
+        coalescer.input_events(self.ctx, queue)
+        self.assertTrue(self.frame())
+        self.assertEqual(coalescer.calls_saved, 99)
+
+    def test_input_paste(self):
+        edit = nk.TextEdit()
+        nk.textedit_init_default(edit)
+        nk.str_append_text_char(edit.struct.string, "<>")
+
+        def frame(*events):
+            self.edit_frame(edit, *events, filter=nk.filter_ascii)
+
+        def paste_key():
+            frame(lambda: nk.input_key(self.ctx, nk.KEY_PASTE, True))
+            frame(lambda: nk.input_key(self.ctx, nk.KEY_PASTE, False))
+
+        # Nothing is active, so no widget takes the text and it is dropped.
+        frame(lambda: nk.input_paste(self.ctx, "stale"))
+        self.assertFalse(edit.active)
+        self.activate(edit, nk.filter_ascii)
+        edit.cursor = 1
+        # Neither the dropped text nor, without a clipboard, anything else is
+        # pasted by the paste key.
+        paste_key()
+        self.assertEqual(edit.text, "<>")
+
+        # Runes the filter of the widget rejects are left out.
+        text = "Grüße, 世界!\n" * 2000
+        frame(lambda: nk.input_paste(self.ctx, text))
+        ascii_text = "Gre, !\n" * 2000
+        self.assertTrue(edit.text == "<" + ascii_text + ">")
+        self.assertEqual(edit.cursor, 1 + len(ascii_text))
+        self.assertEqual(edit.struct.undo.undo_point, 1)
+
+        paste_key()
+        self.assertEqual(len(edit), len(ascii_text) + 2)
+        nk.textedit_undo(edit)
+        self.assertEqual(edit.text, "<>")
+
+        frame(lambda: nk.input_paste(self.ctx, "世界"))
+        self.assertEqual(edit.text, "<>")
+        frame(lambda: nk.input_paste(self.ctx, "世界", unfiltered=True))
+        self.assertEqual(edit.text, "<世界>")
+        self.assertEqual(edit.cursor, 3)
+        nk.textedit_free(edit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+import nuklear as nk
+from nuklear.lazyfont import LazyFont
+from nuklear.lazyfont import add_runes
+
+TEXT = "Привет"
+
+
+class LazyFontModule(unittest.TestCase):
+    def setUp(self):
+        self.uploads = []
+        self.font = LazyFont(
+            13.0,
+            lambda texture, pixels, w, h: self.uploads.append((texture.id, w, h)),
+            nk.Handle(id=5),
+            config=nk.FontConfig(range=[0x20, 0x7E]),
+            background=False,
+        )
+        self.ctx = nk.Context()
+        nk.init_default(self.ctx, self.font.handle)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+        self.font.close()
+
+    def frame(self, text):
+        nk.clear(self.ctx)
+        if nk.begin(self.ctx, "Text", nk.Rect(0, 0, 300, 200), 0):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+            nk.label(self.ctx, text, nk.TEXT_LEFT)
+        nk.end(self.ctx)
+
+    def width(self, text):
+        handle = self.font.handle
+        data = text.encode()
+        return handle.width(handle.userdata, handle.height, data, len(data))
+
+    def test_add_runes(self):
+        self.assertEqual(
+            add_runes([0x20, 0x7E], [0x41, 0x80]), [0x20, 0x7E, 0x80, 0x80]
+        )
+        self.assertEqual(
+            add_runes([0x20, 0x7E], [0x7F, 0x81]), [0x20, 0x7F, 0x81, 0x81]
+        )
+        self.assertEqual(
+            add_runes([0x20, 0x7E], [0x0411], 16), [0x20, 0x7E, 0x0410, 0x041F]
+        )
+
+    def test_records_missing_runes(self):
+        self.assertEqual(self.uploads, [(5, 512, self.uploads[0][2])])
+        ascii_count = self.font.stats.glyph_count
+        self.assertGreater(self.width("Hello"), 0)
+        self.frame("Hello")
+        self.assertFalse(self.font.update())
+
+        self.frame(TEXT)
+        self.assertTrue(self.font.update())
+        self.assertEqual(self.font.stats.bakes, 2)
+        self.assertEqual(self.font.stats.recorded, len(set(TEXT)))
+        self.assertGreater(self.font.stats.glyph_count, ascii_count)
+        self.assertEqual(len(self.uploads), 2)
+        self.assertEqual(self.uploads[-1][0], 5)
+        self.assertEqual(self.font.handle.texture.id, 5)
+        for rune in map(ord, TEXT):
+            self.assertTrue(
+                any(
+                    first <= rune <= last
+                    for first, last in zip(
+                        self.font.ranges[::2], self.font.ranges[1::2]
+                    )
+                )
+            )
+
+        # The swapped atlas has the runes, so nothing is recorded again.
+        self.frame(TEXT)
+        self.assertFalse(self.font.update())
+        self.assertEqual(self.font.stats.bakes, 2)
+
+    def test_background_rebake(self):
+        self.font.background = True
+        self.width(TEXT)
+        self.assertFalse(self.font.update())
+        self.assertTrue(self.font.rebaking)
+        self.font.wait()
+        self.assertTrue(self.font.update())
+        self.assertFalse(self.font.rebaking)
+        self.assertEqual(self.font.stats.bakes, 2)
+        self.assertGreater(self.font.stats.atlas_bytes, 0)
+        self.assertGreater(self.font.stats.bake_seconds, 0)
+
+    def test_failed_rebake(self):
+        self.font.background = True
+        # No such atlas format, so the rebake fails in the background thread.
+        self.font.fmt = 99
+        self.width(TEXT)
+        self.assertFalse(self.font.update())
+        self.font.wait()
+        self.assertRaises(KeyError, self.font.update)
+        self.assertFalse(self.font.rebaking)
+        self.assertEqual(self.font.stats.failures, 1)
+
+        # The runes are retried by the next update.
+        self.font.fmt = nk.FONT_ATLAS_RGBA32
+        self.assertFalse(self.font.update())
+        self.font.wait()
+        self.assertTrue(self.font.update())
+        self.assertEqual(self.font.stats.bakes, 2)
+        self.frame(TEXT)
+        self.assertFalse(self.font.update())
+        self.assertFalse(self.font.rebaking)
+
+        self.font.background = False
+        self.font.fmt = 99
+        self.width("Ω")
+        self.assertRaises(KeyError, self.font.update)
+        self.assertEqual(self.font.stats.failures, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import nuklear as nk
+from nuklear import library
+from nuklear.library import StringCache
+
+
+class StringCacheModule(unittest.TestCase):
+    def test_interns_repeated_strings(self):
+        cache = StringCache(max_entries=4)
+        first = cache.encode("Ünïcode")
+        self.assertEqual(first, "Ünïcode".encode("utf-8"))
+        self.assertEqual(len(cache), 0)
+        second = cache.encode("Ünïcode")
+        self.assertIs(second, first)
+        self.assertEqual(len(cache), 1)
+        self.assertIs(cache.encode("Ünïcode"), first)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.encode(""), b"")
+
+    def test_bounds(self):
+        cache = StringCache(max_entries=4, max_length=8)
+        for i in range(6):
+            cache.encode(f"label {i}")
+            cache.encode(f"label {i}")
+        self.assertLessEqual(len(cache), 4)
+        self.assertEqual(cache.evictions, 2)
+        self.assertIn("label 5", cache.interned)
+
+        # One-off strings never get interned and the nursery stays bounded.
+        for i in range(100):
+            cache.encode(f"{i:.2f}")
+        self.assertLessEqual(len(cache._nursery), 4)
+        self.assertNotIn("99.00", cache.interned)
+
+        long = "x" * 9
+        cache.encode(long)
+        cache.encode(long)
+        self.assertNotIn(long, cache.interned)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_to_char_p(self):
+        self.assertIs(library.to_char_p("Window"), library.to_char_p("Window"))
+        self.assertIn("Window", library.string_cache.interned)
+
+        ctx = nk.Context()
+        nk.init_default(ctx, nk.UserFont(height=13.0, width=lambda h, s, t: 0.0))
+        for _ in range(2):
+            nk.clear(ctx)
+            if nk.begin(ctx, "Interned", nk.Rect(0, 0, 100, 100), 0):
+                nk.layout_row_dynamic(ctx, 20, 1)
+                nk.label(ctx, "Interned label", nk.TEXT_LEFT)
+            nk.end(ctx)
+        self.assertIn("Interned label", library.string_cache.interned)
+        nk.free(ctx)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+
+import numpy as np
+
+import helpers
+import nuklear as nk
+from nuklear import drawing
+from nuklear import headless
+from nuklear.raster import Rasterizer
+from nuklear.raster import SoftwareRenderer
+
+RED = (255, 0, 0, 255)
+BLUE = (0, 0, 255, 255)
+
+# Golden images: one character per pixel.
+PALETTE = {
+    ".": (0, 0, 0, 0),
+    "R": RED,
+    "B": BLUE,
+    "r": (255, 0, 0, 128),
+}
+
+
+def _golden(*rows):
+    return np.array([[PALETTE[c] for c in row] for row in rows], np.uint8)
+
+
+def _rect(x0, y0, x1, y1, color, uv0=(0, 0), uv1=(1, 1)):
+    # Vertices and indices as written by `nk_draw_list_push_rect_uv`.
+    positions = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    uvs = [uv0, (uv1[0], uv0[1]), uv1, (uv0[0], uv1[1])]
+    return [(p, uv, color) for p, uv in zip(positions, uvs)], [0, 1, 2, 0, 2, 3]
+
+
+def _draw_data(*shapes):
+    """Builds `DrawData` from `(vertices, indices, clip, texture)` shapes."""
+    layout = nk.VertexLayout.default()
+    vertices, elements, commands = [], [], []
+    for shape_vertices, indices, clip, texture in shapes:
+        elements.extend(len(vertices) + i for i in indices)
+        vertices.extend(shape_vertices)
+        commands.append((len(indices), clip, texture))
+    array = np.zeros(len(vertices), layout.dtype)
+    array["position"] = [v[0] for v in vertices]
+    array["uv"] = [v[1] for v in vertices]
+    array["color"] = [v[2] for v in vertices]
+    return nk.DrawData(
+        array,
+        np.array(elements, np.uint16),
+        np.array(commands, drawing.DRAW_COMMAND_DTYPE),
+        len(vertices),
+        len(elements),
+    )
+
+
+FULL = (0, 0, 100, 100)
+
+
+class GoldenImages(unittest.TestCase):
+    def render(self, data, width=6, height=4, **kwargs):
+        raster = Rasterizer(width, height, **kwargs)
+        raster.set_texture(7, _golden("RB", "BR"))
+        raster.draw(data)
+        raster.close()
+        return raster.pixels
+
+    def assertImage(self, pixels, *rows):
+        np.testing.assert_array_equal(pixels, _golden(*rows))
+
+    def test_rect(self):
+        pixels = self.render(_draw_data((*_rect(1, 1, 4, 3, RED), FULL, 0)))
+        self.assertImage(pixels, "......", ".RRR..", ".RRR..", "......")
+
+    def test_scissor(self):
+        pixels = self.render(_draw_data((*_rect(0, 0, 6, 4, RED), (2, 1, 3, 2), 0)))
+        self.assertImage(pixels, "......", "..RRR.", "..RRR.", "......")
+
+    def test_texture(self):
+        pixels = self.render(_draw_data((*_rect(0, 0, 4, 4, (255,) * 4), FULL, 7)))
+        self.assertImage(pixels, "RRBB..", "RRBB..", "BBRR..", "BBRR..")
+
+    def test_triangles(self):
+        # A square split along its diagonal, with indices that are not a quad.
+        # Pixels on the shared edge must be blended only once.
+        color = (255, 0, 0, 128)
+        vertices = [((0, 0), (0, 0), color), ((4, 0), (0, 0), color)]
+        vertices += [((4, 4), (0, 0), color), ((0, 4), (0, 0), color)]
+        pixels = self.render(_draw_data((vertices, [0, 1, 2, 2, 3, 0], FULL, 0)))
+        self.assertImage(pixels, "rrrr..", "rrrr..", "rrrr..", "rrrr..")
+
+    def test_order(self):
+        data = _draw_data(
+            (*_rect(0, 0, 4, 4, RED), FULL, 0), (*_rect(2, 1, 6, 3, BLUE), FULL, 0)
+        )
+        expected = ("RRRR..", "RRBBBB", "RRBBBB", "RRRR..")
+        self.assertImage(self.render(data), *expected)
+        self.assertImage(self.render(data, threads=2, tile_size=1), *expected)
+
+
+class RasterModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context(helpers.font(query=helpers.query))
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def build(self, label):
+        bounds = nk.Rect(10, 10, 200, 150)
+        if nk.begin(self.ctx, "Window", bounds, nk.WINDOW_BORDER | nk.WINDOW_TITLE):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+            nk.label(self.ctx, label, nk.TEXT_LEFT)
+        nk.end(self.ctx)
+
+    def test_render(self):
+        self.build("Label")
+        with Rasterizer(240, 180) as raster:
+            pixels = raster.render(self.ctx)
+        self.assertEqual(pixels.shape, (180, 240, 4))
+        self.assertEqual(tuple(pixels[0, 0]), (0, 0, 0, 0))
+        self.assertEqual(tuple(pixels[170, 100]), (0, 0, 0, 0))
+        # Default window background.
+        self.assertEqual(tuple(pixels[100, 100]), (45, 45, 45, 255))
+
+        out = np.zeros((180, 240, 4), np.uint8)
+        self.assertIs(raster.read_pixels(out), out)
+        np.testing.assert_array_equal(out, pixels)
+
+    def test_threads(self):
+        self.build("Label")
+        with Rasterizer(240, 180) as serial:
+            expected = serial.render(self.ctx)
+        with Rasterizer(240, 180, threads=4, tile_size=16) as parallel:
+            np.testing.assert_array_equal(parallel.render(self.ctx), expected)
+
+    def test_regions(self):
+        self.build("Label")
+        with Rasterizer(240, 180) as raster:
+            raster.render(self.ctx)
+            nk.clear(self.ctx)
+            self.build("Other")
+            full = Rasterizer(240, 180)
+            expected = full.render(self.ctx)
+            regions = [nk.Rect(10, 30, 200, 30)]
+            np.testing.assert_array_equal(raster.render(self.ctx, regions), expected)
+
+
+def _snapshot(ctx, width, height):
+    if nk.begin(ctx, "Snapshot", nk.Rect(0, 0, width, height), 0):
+        nk.layout_row_dynamic(ctx, 20, 1)
+        nk.label(ctx, "Report", nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+class SoftwareRendererModule(unittest.TestCase):
+    def test_snapshots(self):
+        jobs = [headless.SnapshotJob(f"job{i}", _snapshot, 64, 32) for i in range(2)]
+        with headless.SnapshotService(SoftwareRenderer(), max_workers=1) as service:
+            snapshots = list(service.snapshots(jobs))
+        for snapshot in snapshots:
+            pixels = np.frombuffer(snapshot.pixels, np.uint8).reshape(32, 64, 4)
+            self.assertTrue((pixels[..., 3] == 255).all())
+            # The label is drawn from the atlas in the default text color.
+            self.assertTrue((pixels[:20, :40] == (175, 175, 175, 255)).all(-1).any())
+        self.assertEqual(snapshots[0].pixels, snapshots[1].pixels)
+
+
+if __name__ == "__main__":
+    unittest.main()
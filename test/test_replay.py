@@ -0,0 +1,89 @@
+import ctypes
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+import helpers
+import nuklear as nk
+from nuklear import replay
+
+
+def _build(ctx):
+    if nk.begin(ctx, "Window", nk.Rect(0, 0, 100, 100), 0):
+        nk.layout_row_dynamic(ctx, 20, 1)
+        nk.label(ctx, "Label", nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+def _frames():
+    frames = []
+    for i in range(5):
+        queue = nk.InputQueue()
+        queue.motion(10 * i, 20 * i)
+        frames.append(queue)
+    queue = nk.InputQueue()
+    queue.button(nk.BUTTON_LEFT, 40, 80, True)
+    queue.key(nk.KEY_ENTER, False)
+    queue.scroll(0.5, -1.5)
+    queue.text("hé")
+    frames.append(queue)
+    frames.append(nk.InputQueue())
+    return frames
+
+
+class ReplayModule(unittest.TestCase):
+    def test_log_roundtrip(self):
+        frames = _frames()
+        file = io.BytesIO()
+        with replay.InputRecorder(file) as recorder:
+            for queue in frames:
+                recorder.record(queue)
+        self.assertEqual(recorder.frames, len(frames))
+
+        file.seek(0)
+        loaded = replay.read_input_log(file)
+        self.assertEqual([list(q) for q in loaded], [list(q) for q in frames])
+
+        # The log stores far less than the packed in-memory events.
+        events = sum(len(q) for q in frames)
+        self.assertLess(len(file.getvalue()), events * ctypes.sizeof(nk.InputEvent))
+
+    def test_log_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "input.log"
+            with replay.InputRecorder(path) as recorder:
+                recorder.record(_frames()[0])
+            self.assertEqual(len(replay.read_input_log(path)), 1)
+
+    def test_invalid_log(self):
+        with self.assertRaises(ValueError):
+            list(replay.iter_input_log(b"garbage"))
+        with self.assertRaises(ValueError):
+            list(replay.iter_input_log(replay.MAGIC + b"\x05\x00"))
+
+    def test_replay(self):
+        ctx = nk.Context()
+        stats = nk.init_counting(ctx, helpers.font())
+        try:
+            frames = _frames()
+            # The first frame creates the window, which allocates its pages.
+            allocs = stats.alloc_count
+            report = replay.replay(ctx, frames, _build, stats=stats)
+            self.assertGreater(report.nk_allocs, 0)
+            self.assertLessEqual(report.nk_allocs, stats.alloc_count - allocs)
+            self.assertGreater(report.frames[0].nk_allocs, 0)
+
+            report = replay.replay(ctx, frames, _build, delta_time=0.25, warmup=1)
+            self.assertEqual(len(report.frames), len(frames) - 1)
+            self.assertEqual(report.frames[0].frame, 1)
+            self.assertEqual(report.frames[-2].events, 5)
+            self.assertGreater(report.fps, 0.0)
+            self.assertLessEqual(report.percentile(50), report.max_seconds)
+            self.assertAlmostEqual(nk.get_delta_time_seconds(ctx), 0.25)
+
+            csv = io.StringIO()
+            report.write_csv(csv)
+            self.assertEqual(len(csv.getvalue().splitlines()), len(report.frames) + 1)
+        finally:
+            nk.free(ctx)
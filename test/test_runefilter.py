@@ -0,0 +1,80 @@
+import gc
+import unittest
+
+import nuklear as nk
+from nuklear import runefilter
+from nuklear.runefilter import RuneFilter
+
+
+def _typed(filter, text):
+    edit = nk.TextEdit()
+    nk.textedit_init_default(edit)
+    edit.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+    edit.struct.filter = filter
+    nk.textedit_text(edit, text)
+    typed = edit.text
+    nk.textedit_free(edit)
+    return typed
+
+
+class RuneFilterModule(unittest.TestCase):
+    def test_builtin_filters(self):
+        self.assertEqual(_typed(nk.filter_decimal, "-12.5e3"), "-1253")
+        self.assertEqual(_typed(nk.filter_hex, "0xBEEFy"), "0BEEF")
+        self.assertEqual(_typed(nk.filter_ascii, "naïve"), "nave")
+        self.assertTrue(nk.filter_binary(None, ord("1")))
+        self.assertFalse(nk.filter_oct(None, ord("8")))
+
+    def test_rune_filter(self):
+        rune_filter = RuneFilter(
+            chars="_\ufffd", ranges=[(ord("a"), ord("f"))], pattern=r"\d"
+        )
+        try:
+            for rune in "_abf09٣":
+                self.assertIn(rune, rune_filter)
+            for rune in "g-A \U0001f600":
+                self.assertNotIn(rune, rune_filter)
+            # Nuklear passes the bytes of runes beyond U+FFFF as U+FFFD.
+            typed = _typed(rune_filter.filter, "cafe_babe 42!\U0001f600")
+            self.assertEqual(typed, "cafe_babe42\U0001f600")
+        finally:
+            rune_filter.close()
+
+        with self.assertRaises(ValueError):
+            RuneFilter(ranges=[(10, 5)])
+        with self.assertRaises(ValueError):
+            RuneFilter(ranges=[(0x1F600, 0x1F64F)])
+
+    @unittest.skipUnless(
+        hasattr(nk.library.nuklear, "nk_py_rune_filter"), "needs the shim"
+    )
+    def test_slots(self):
+        count = len(runefilter._free_slots)
+        filters = [RuneFilter(chars=str(i % 4)) for i in range(count + 1)]
+        self.assertTrue(all(f.native for f in filters[:-1]))
+        self.assertFalse(filters[-1].native)
+        self.assertEqual(_typed(filters[3].filter, "0123"), "3")
+        self.assertEqual(_typed(filters[-1].filter, "0123"), str(count % 4))
+
+        for rune_filter in filters:
+            rune_filter.close()
+        self.assertEqual(len(runefilter._free_slots), count)
+
+        with RuneFilter("x") as rune_filter:
+            self.assertTrue(rune_filter.native)
+            self.assertEqual(len(runefilter._free_slots), count - 1)
+        self.assertEqual(len(runefilter._free_slots), count)
+
+        # Filters that are dropped without close give their slot back, but not
+        # while their `filter` is still held.
+        rune_filter = RuneFilter("x").filter
+        gc.collect()
+        self.assertEqual(len(runefilter._free_slots), count - 1)
+        self.assertEqual(_typed(rune_filter, "xyz"), "x")
+        del rune_filter
+        gc.collect()
+        self.assertEqual(len(runefilter._free_slots), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
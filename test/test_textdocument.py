@@ -0,0 +1,147 @@
+import random
+import unittest
+
+import helpers
+import nuklear as nk
+from nuklear.library import nuklear as lib
+from nuklear.textdocument import TextDocument
+from nuklear.textdocument import document_edit
+
+
+class TextDocumentModule(unittest.TestCase):
+    def test_edits(self):
+        rng = random.Random(0)
+        expected = bytearray("".join(f"Zeile {i} ✓\n" for i in range(50)).encode())
+        doc = TextDocument(bytes(expected))
+        for _ in range(500):
+            start = rng.randint(0, len(expected))
+            end = min(len(expected), start + rng.choice((0, 1, 7, 40)))
+            text = rng.choice((b"", b"x", b"\n", b"ab\ncd\n", b"\xc3\xa9" * 3000))
+            doc.replace(start, end, text)
+            expected[start:end] = text
+            self.assertEqual(len(doc), len(expected))
+
+            self.assertEqual(doc.line_count, expected.count(b"\n") + 1)
+            line = rng.randrange(doc.line_count)
+            start = doc.line_start(line)
+            self.assertEqual(expected.count(b"\n", 0, start), line)
+            self.assertTrue(start == 0 or expected[start - 1] == ord("\n"))
+            self.assertEqual(doc.line_at(start), line)
+            self.assertEqual(doc.slice(start, start + 20), expected[start : start + 20])
+        self.assertEqual(doc.line_start(doc.line_count), len(doc))
+
+        view = doc.view()
+        self.assertTrue(view.readonly)
+        self.assertEqual(view, expected)
+
+    def test_undo(self):
+        doc = TextDocument("hello world", undo_bytes=16)
+        doc.delete(0, 6)
+        for c in "big ":
+            doc.replace(len(doc) - 5, len(doc) - 5, c, merge=True)
+        self.assertEqual(doc.text(), "big world")
+        self.assertEqual(len(doc._undo), 2)
+
+        self.assertTrue(doc.undo())
+        self.assertEqual(doc.text(), "world")
+        self.assertEqual(doc.cursor, 0)
+        self.assertTrue(doc.undo())
+        self.assertEqual(doc.text(), "hello world")
+        self.assertFalse(doc.undo())
+        self.assertTrue(doc.redo())
+        self.assertEqual(doc.text(), "world")
+
+        # A new edit drops the redo records, the oldest records go beyond
+        # `undo_bytes`.
+        doc.append(" and more")
+        self.assertFalse(doc.redo())
+        doc.append("!" * 10)
+        self.assertLessEqual(doc._undo_size, 16)
+        while doc.undo():
+            pass
+        self.assertEqual(doc.text(), "world and more")
+
+        doc = TextDocument("abc", undo_bytes=0)
+        doc.insert(1, "x")
+        self.assertFalse(doc.undo())
+        with self.assertRaises(IndexError):
+            doc.delete(2, 10)
+
+
+@unittest.skipUnless(hasattr(lib, "nk_py_edit_window"), "needs the shim")
+class DocumentEditModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+        self.doc = TextDocument("".join(f"line {i}\n" for i in range(1000)))
+
+    def tearDown(self):
+        self.doc.close()
+        nk.free(self.ctx)
+
+    def frame(self, *events):
+        ctx = self.ctx
+        nk.input_begin(ctx)
+        for event in events:
+            event()
+        nk.input_end(ctx)
+        nk.clear(ctx)
+        if nk.begin(ctx, "Document", nk.Rect(0, 0, 300, 300), 0):
+            nk.layout_row_dynamic(ctx, 260, 1)
+            document_edit(ctx, self.doc)
+        nk.end(ctx)
+        return [c.text for c in nk.commands(ctx) if isinstance(c, nk.CommandText)]
+
+    def key(self, key):
+        self.frame(lambda: nk.input_key(self.ctx, key, True))
+        self.frame(lambda: nk.input_key(self.ctx, key, False))
+
+    def test_draws_lines_in_view(self):
+        texts = self.frame()
+        self.assertEqual(texts[0], "line 0")
+        self.assertLess(len(texts), 20)
+
+        self.frame(
+            lambda: nk.input_motion(self.ctx, 100, 100),
+            lambda: nk.input_scroll(self.ctx, nk.Vec2(0, -20)),
+        )
+        texts = self.frame()
+        first = int(texts[0].split()[1])
+        self.assertGreater(first, 0)
+        self.assertEqual(texts, [f"line {i}" for i in range(first, first + len(texts))])
+        self.assertEqual(self.doc.cursor, 0)
+
+    def test_typing_and_undo(self):
+        ctx = self.ctx
+        self.frame(
+            lambda: nk.input_motion(ctx, 50, 60),
+            lambda: nk.input_button(ctx, nk.BUTTON_LEFT, 50, 60, True),
+        )
+        self.frame(lambda: nk.input_button(ctx, nk.BUTTON_LEFT, 50, 60, False))
+        line = self.doc.line_at(self.doc.cursor)
+        self.assertGreater(line, 0)
+
+        self.frame(lambda: nk.input_char(ctx, "X"))
+        self.frame(lambda: nk.input_char(ctx, "Y"))
+        start = self.doc.line_start(line)
+        self.assertIn(b"XY", self.doc.slice(start, self.doc.line_start(line + 1)))
+        self.assertEqual(len(self.doc._undo), 1)
+        self.assertEqual(
+            len(self.doc), len("".join(f"line {i}\n" for i in range(1000))) + 2
+        )
+
+        # Moving the cursor past the lines in view scrolls them.
+        for _ in range(30):
+            self.key(nk.KEY_DOWN)
+        texts = self.frame()
+        self.assertEqual(self.doc.line_at(self.doc.cursor), line + 30)
+        self.assertIn(f"line {line + 30}", texts)
+        self.assertNotIn("line 0", texts)
+
+        self.key(nk.KEY_TEXT_UNDO)
+        self.assertNotIn(b"XY", self.doc.slice(0, self.doc.line_start(40)))
+        self.key(nk.KEY_TEXT_REDO)
+        self.assertIn(b"XY", self.doc.slice(0, self.doc.line_start(40)))
+
+
+if __name__ == "__main__":
+    unittest.main()
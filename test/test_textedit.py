@@ -0,0 +1,139 @@
+import ctypes
+import unittest
+
+import helpers
+import nuklear as nk
+from nuklear.library import nuklear as lib
+
+
+class TextEditModule(unittest.TestCase):
+    def setUp(self):
+        self.edit = nk.TextEdit()
+        nk.textedit_init_default(self.edit)
+        self.edit.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+
+    def tearDown(self):
+        nk.textedit_free(self.edit)
+
+    @unittest.skipUnless(hasattr(lib, "nk_py_sizeof_text_edit"), "needs the shim")
+    def test_struct_size(self):
+        lib.nk_py_sizeof_text_edit.restype = ctypes.c_size_t
+        self.assertEqual(
+            ctypes.sizeof(nk.TextEdit.Struct), lib.nk_py_sizeof_text_edit()
+        )
+
+    @unittest.skipUnless(hasattr(lib, "nk_py_textedit_paste"), "needs the shim")
+    def test_text_undo_redo(self):
+        nk.textedit_text(self.edit, "Grüße")
+        self.assertEqual(self.edit.text, "Grüße")
+        self.assertEqual((len(self.edit), self.edit.nbytes), (5, 7))
+        self.assertEqual(self.edit.cursor, 5)
+
+        self.edit.cursor = 0
+        nk.textedit_paste(self.edit, "» ")
+        self.assertEqual(self.edit.text, "» Grüße")
+        nk.textedit_undo(self.edit)
+        self.assertEqual(self.edit.text, "Grüße")
+        nk.textedit_redo(self.edit)
+        self.assertEqual(self.edit.text, "» Grüße")
+
+        nk.textedit_select_all(self.edit)
+        self.assertEqual(self.edit.selection, (0, 7))
+        self.assertTrue(nk.textedit_cut(self.edit))
+        self.assertEqual(self.edit.text, "")
+
+    @unittest.skipUnless(hasattr(lib, "nk_py_textedit_paste"), "needs the shim")
+    def test_paste_filter(self):
+        self.edit.struct.filter = nk.filter_decimal
+        self.assertTrue(nk.textedit_paste(self.edit, "x1,5 mm-2"))
+        self.assertEqual(self.edit.text, "15-2")
+        self.assertEqual(self.edit.cursor, 4)
+        self.assertFalse(nk.textedit_paste(self.edit, "mm"))
+        nk.textedit_undo(self.edit)
+        self.assertEqual(self.edit.text, "")
+
+    def test_undo_limits(self):
+        edit = nk.TextEdit(undo_records=2, undo_chars=3)
+        nk.textedit_init_default(edit)
+        edit.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+        for word in ("one ", "two ", "three"):
+            nk.textedit_paste(edit, word)
+        self.assertEqual(edit.struct.undo.undo_point, 2)
+        while edit.struct.undo.undo_point:
+            nk.textedit_undo(edit)
+        self.assertEqual(edit.text, "one ")
+
+        # Deleting keeps the deleted runes, more than `undo_chars` here.
+        nk.textedit_select_all(edit)
+        nk.textedit_delete_selection(edit)
+        self.assertLessEqual(edit.struct.undo.undo_char_point, 3)
+        nk.textedit_undo(edit)
+        self.assertEqual(edit.text, "")
+        nk.textedit_free(edit)
+
+    def test_view_and_fixed_memory(self):
+        nk.textedit_text(self.edit, "abc")
+        view = self.edit.view()
+        self.assertTrue(view.readonly)
+        self.assertEqual(bytes(view), b"abc")
+        # Deleting moves the text in place, which the view sees.
+        nk.str_delete_chars(self.edit.struct.string, 0, 1)
+        self.assertEqual(bytes(view[:2]), b"bc")
+
+        memory = ctypes.create_string_buffer(4)
+        fixed = nk.TextEdit()
+        nk.textedit_init_fixed(fixed, memory)
+        fixed.struct.mode = nk.TEXT_EDIT_MODE_INSERT
+        nk.textedit_text(fixed, "abcdef")
+        # Nuklear keeps the last byte free.
+        self.assertEqual(fixed.text, "abc")
+        self.assertEqual(memory.raw[:3], b"abc")
+
+    def test_str(self):
+        string = self.edit.struct.string
+        nk.str_append_text_char(string, "héllo")
+        nk.str_insert_at_char(string, 0, b">")
+        nk.str_delete_chars(string, 1, 1)
+        self.assertEqual((nk.str_len(string), nk.str_len_char(string)), (5, 6))
+        self.assertEqual(self.edit.text, ">éllo")
+        nk.str_clear(string)
+        self.assertEqual(self.edit.text, "")
+
+    def test_edit_buffer(self):
+        ctx = helpers.context()
+        self.edit.struct.single_line = 0
+        nk.textedit_text(self.edit, "first\nsecond")
+
+        def frame(events=()):
+            nk.input_begin(ctx)
+            for event in events:
+                event()
+            nk.input_end(ctx)
+            nk.clear(ctx)
+            result = 0
+            if nk.begin(ctx, "Edit", nk.Rect(0, 0, 200, 200), 0):
+                nk.layout_row_dynamic(ctx, 100, 1)
+                result = nk.edit_buffer(ctx, nk.EDIT_BOX, self.edit)
+            nk.end(ctx)
+            texts = [c.text for c in nk.commands(ctx) if isinstance(c, nk.CommandText)]
+            return result, texts
+
+        result, texts = frame()
+        self.assertTrue(result & nk.EDIT_INACTIVE)
+        self.assertEqual(texts, ["first", "second"])
+
+        frame(
+            (
+                lambda: nk.input_motion(ctx, 20, 40),
+                lambda: nk.input_button(ctx, nk.BUTTON_LEFT, 20, 40, True),
+            )
+        )
+        frame((lambda: nk.input_button(ctx, nk.BUTTON_LEFT, 20, 40, False),))
+        result, _ = frame((lambda: nk.input_char(ctx, "!"),))
+        self.assertTrue(result & nk.EDIT_ACTIVE)
+        self.assertEqual(self.edit.text.count("!"), 1)
+        nk.free(ctx)
+
+
+if __name__ == "__main__":
+    unittest.main()
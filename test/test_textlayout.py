@@ -0,0 +1,156 @@
+import ctypes
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import helpers
+import nuklear as nk
+from nuklear import textlayout
+from nuklear.glyphtable import GlyphTableFont
+from nuklear.lazyfont import LazyFont
+from nuklear.textlayout import TextLayoutCache
+
+TEXT = (
+    "The quick brown fox jumps over the lazy dog.\n"
+    "Pack my box with five dozen liquor jugs. Sphinx of black quartz, judge my vow."
+)
+
+
+class TextLayoutModule(unittest.TestCase):
+    def setUp(self):
+        self.font = helpers.font()
+        self.ctx = helpers.context(self.font)
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def frame(self, draw, width=200, height=200, rows=1):
+        nk.clear(self.ctx)
+        if nk.begin(self.ctx, "Text", nk.Rect(0, 0, width, height), 0):
+            nk.layout_row_dynamic(self.ctx, 120, 1)
+            for _ in range(rows):
+                draw(self.ctx)
+        nk.end(self.ctx)
+        return [
+            (c.text, c.x, c.y, c.w, c.h, c.foreground.r)
+            for c in nk.commands(self.ctx)
+            if isinstance(c, nk.CommandText)
+        ]
+
+    def test_draws_like_text_wrap(self):
+        cache = TextLayoutCache()
+        for width, height in ((200, 200), (120, 200), (200, 60)):
+            expected = self.frame(lambda ctx: nk.text_wrap(ctx, TEXT), width, height)
+            cached = self.frame(
+                lambda ctx: textlayout.text_wrap(ctx, TEXT, cache), width, height
+            )
+            self.assertGreater(len(expected), 1)
+            self.assertEqual(cached, expected)
+
+        red = nk.Color(255, 0, 0, 255)
+        expected = self.frame(lambda ctx: nk.text_wrap_colored(ctx, TEXT, red))
+        cached = self.frame(lambda ctx: textlayout.text_wrap(ctx, TEXT, cache, red))
+        self.assertEqual(cached, expected)
+        self.assertEqual({line[-1] for line in cached}, {255})
+
+    @unittest.skipUnless(
+        hasattr(nk.library.nuklear, "nk_py_text_wrap_layout"), "needs the shim"
+    )
+    def test_hits_and_invalidation(self):
+        cache = TextLayoutCache()
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, TEXT, cache), rows=3)
+        self.assertEqual((cache.misses, cache.hits), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+        layout = next(iter(cache._entries.values()))
+        self.assertEqual("".join(layout.lines()), TEXT)
+        self.assertEqual(layout.lines()[0], "The quick brown fox jumps ")
+        self.assertEqual(layout.widths[0], 26 * 6.5)
+
+        # Another width and another font are laid out anew.
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, TEXT, cache), width=150)
+        nk.free(self.ctx)
+        self.ctx = helpers.context(helpers.font(height=19.5))
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, TEXT, cache))
+        self.assertEqual((cache.misses, cache.hits, len(cache)), (3, 2, 3))
+
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+        cache.reset_stats()
+        self.assertEqual(cache.hit_rate, 0.0)
+
+    @unittest.skipUnless(
+        hasattr(nk.library.nuklear, "nk_py_text_wrap_layout"), "needs the shim"
+    )
+    def test_font_generation(self):
+        font = LazyFont(
+            13.0,
+            lambda texture, pixels, w, h: None,
+            nk.Handle(id=1),
+            config=nk.FontConfig(range=[0x20, 0x7E]),
+            background=False,
+        )
+        nk.free(self.ctx)
+        self.ctx = helpers.context(font.handle)
+        cache = TextLayoutCache()
+        text = "Привет, " + TEXT
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, text, cache), rows=2)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        # The swapped atlas measures the text differently.
+        self.assertTrue(font.update())
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, text, cache))
+        self.assertEqual((cache.misses, cache.hits), (2, 1))
+        nk.free(self.ctx)
+        self.ctx = helpers.context()
+        font.close()
+
+        # A font at the address of a freed one is told apart as well.
+        tables = [GlyphTableFont(13.0, lambda rune: 6.5) for _ in range(2)]
+        generations = {
+            nk.library.nuklear.nk_py_font_generation(ctypes.pointer(table.handle))
+            for table in tables
+        }
+        self.assertEqual(len(generations), 2)
+
+    @unittest.skipUnless(
+        hasattr(nk.library.nuklear, "nk_py_text_wrap_layout"), "needs the shim"
+    )
+    def test_shared_between_threads(self):
+        cache = TextLayoutCache(max_entries=40)
+        font = self.font.to_c()
+        strings = [f"{TEXT} {i}" for i in range(50)]
+
+        def lay_out(i):
+            return cache.layout(ctypes.pointer(font), strings[i % 50], 100.0)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            layouts = list(executor.map(lay_out, range(1000)))
+        for i, layout in enumerate(layouts):
+            self.assertEqual("".join(layout.lines()), strings[i % 50])
+
+        # The counted size matches the entries, however the threads interleaved.
+        self.assertEqual(len(cache), 40)
+        self.assertEqual(
+            cache.nbytes,
+            sum(
+                textlayout._entry_size(key[0], layout)
+                for key, layout in cache._entries.items()
+            ),
+        )
+
+    @unittest.skipUnless(
+        hasattr(nk.library.nuklear, "nk_py_text_wrap_layout"), "needs the shim"
+    )
+    def test_eviction(self):
+        cache = TextLayoutCache(max_entries=2)
+        for text in ("one", "two", "three", "two"):
+            self.frame(lambda ctx: textlayout.text_wrap(ctx, text, cache))
+        self.assertEqual((len(cache), cache.evictions, cache.hits), (2, 1, 1))
+        self.assertEqual([key[0] for key in cache._entries], ["three", "two"])
+
+        cache = TextLayoutCache(max_bytes=1)
+        self.frame(lambda ctx: textlayout.text_wrap(ctx, TEXT, cache))
+        self.assertEqual((len(cache), cache.nbytes, cache.evictions), (0, 0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import multiprocessing
+import unittest
+
+import numpy as np
+
+import helpers
+import nuklear as nk
+from nuklear.transport import FrameConsumer
+from nuklear.transport import FrameProducer
+
+
+def _render(handle, results):
+    # Runs in a separate process.
+    with FrameConsumer(handle) as consumer:
+        frame = consumer.acquire(timeout=30)
+        commands = frame.data.commands
+        results.send(
+            (
+                frame.frame,
+                frame.data.vertices.tobytes(),
+                frame.data.elements.tobytes(),
+                commands["elem_count"].tolist(),
+            )
+        )
+        del frame, commands
+
+
+class TransportModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context(helpers.font(query=helpers.query))
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def build(self, label):
+        nk.clear(self.ctx)
+        if nk.begin(self.ctx, "Window", nk.Rect(0, 0, 100, 100), nk.WINDOW_BORDER):
+            nk.layout_row_dynamic(self.ctx, 20, 1)
+            nk.label(self.ctx, label, nk.TEXT_LEFT)
+        nk.end(self.ctx)
+
+    def test_same_process(self):
+        self.build("Label")
+        expected = nk.Converter().convert(self.ctx)
+        with FrameProducer() as producer:
+            consumer = FrameConsumer(producer.handle)
+            self.assertIsNone(consumer.acquire(timeout=0))
+            self.assertEqual(producer.publish(self.ctx), 1)
+            frame = consumer.acquire(timeout=0)
+            self.assertEqual(frame.frame, 1)
+            data = frame.data
+            np.testing.assert_array_equal(data.vertices, expected.vertices)
+            np.testing.assert_array_equal(data.elements, expected.elements)
+            np.testing.assert_array_equal(data.commands, expected.commands)
+            del frame, data
+            consumer.close()
+
+    def test_newest(self):
+        with FrameProducer(slots=3) as producer:
+            consumer = FrameConsumer(producer.handle)
+            self.build("A")
+            producer.publish(self.ctx)
+            held = consumer.acquire(timeout=0)
+            vertices = held.data.vertices.copy()
+            # Both other slots are free, so the producer never waits and the
+            # held frame is left alone.
+            for label in ("B", "C", "D"):
+                self.build(label)
+                producer.publish(self.ctx)
+            np.testing.assert_array_equal(held.data.vertices, vertices)
+            del held
+            frame = consumer.acquire(timeout=0)
+            self.assertEqual(frame.frame, 4)
+            del frame
+            self.assertIsNone(consumer.acquire(timeout=0))
+            consumer.close()
+
+    def test_too_small(self):
+        self.build("Label")
+        with FrameProducer(vertex_capacity=64) as producer:
+            self.assertRaises(ValueError, producer.publish, self.ctx)
+        self.assertRaises(ValueError, FrameProducer, slots=1)
+
+    def test_process(self):
+        self.build("Label")
+        expected = nk.Converter().convert(self.ctx)
+        with FrameProducer() as producer:
+            receive, send = multiprocessing.Pipe(False)
+            process = multiprocessing.Process(
+                target=_render, args=(producer.handle, send)
+            )
+            process.start()
+            producer.publish(self.ctx)
+            frame, vertices, elements, counts = receive.recv()
+            process.join()
+        self.assertEqual(frame, 1)
+        self.assertEqual(vertices, expected.vertices.tobytes())
+        self.assertEqual(elements, expected.elements.tobytes())
+        self.assertEqual(counts, expected.commands["elem_count"].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import ctypes
+import math
+import socket
+import unittest
+
+import helpers
+import nuklear as nk
+from nuklear import drawing
+from nuklear import wire
+
+
+def _build(ctx, labels):
+    nk.clear(ctx)
+    if nk.begin(ctx, "Window", nk.Rect(0, 0, 200, 200), nk.WINDOW_BORDER):
+        nk.layout_row_dynamic(ctx, 20, 1)
+        for label in labels:
+            nk.label(ctx, label, nk.TEXT_LEFT)
+    nk.end(ctx)
+
+
+def _normalize(command):
+    # The bytes of a command after its header, without the font pointer, which
+    # does not cross the wire.
+    kind = command.header.type
+    address = ctypes.addressof(command)
+    if kind == nk.COMMAND_TEXT:
+        command.font = None
+    size = drawing.command_size(kind, address) - ctypes.sizeof(nk.Command)
+    return kind, ctypes.string_at(address + ctypes.sizeof(nk.Command), size)
+
+
+def _snapshot(commands):
+    result = []
+    for command in commands:
+        copy = (ctypes.c_ubyte * 1024)()
+        size = drawing.command_size(command.header.type, ctypes.addressof(command))
+        ctypes.memmove(copy, ctypes.addressof(command), size)
+        result.append(_normalize(type(command).from_buffer(copy)))
+    return result
+
+
+class WireModule(unittest.TestCase):
+    def setUp(self):
+        self.ctx = helpers.context()
+
+    def tearDown(self):
+        nk.free(self.ctx)
+
+    def test_roundtrip(self):
+        encoder = wire.WireEncoder()
+        decoder = wire.WireDecoder()
+        frames = [
+            ["Alpha", "Beta", "Gamma"],
+            ["Alpha", "Beta", "Gamma"],
+            ["Alpha", "Delta", "Gamma", "Epsilon"],
+            ["Alpha"],
+        ]
+        sizes = []
+        for labels in frames:
+            _build(self.ctx, labels)
+            expected = _snapshot(drawing.commands(self.ctx))
+            message = encoder.encode(self.ctx)
+            sizes.append(len(message))
+            self.assertEqual(_snapshot(decoder.decode(message)), expected)
+        self.assertEqual(encoder.keyframes, 1)
+        self.assertEqual(decoder.frames, len(frames))
+        # An unchanged frame is a single copy run.
+        self.assertLess(sizes[1], 8)
+        self.assertLess(sizes[2], sizes[0])
+
+    def test_stale_padding(self):
+        encoder = wire.WireEncoder()
+        _build(self.ctx, ["Alpha", "Beta"])
+        encoder.encode(self.ctx)
+        _build(self.ctx, ["Alpha", "Beta"])
+        # Fill the trailing padding of the commands with leftovers.
+        for kind, address in drawing.walk_commands(self.ctx):
+            view = nk.COMMAND_VIEWS[kind]
+            name = view._fields_[-1][0]
+            if name not in ("points", "string"):
+                end = getattr(view, name).offset + getattr(view, name).size
+                ctypes.memset(address + end, 0xAB, ctypes.sizeof(view) - end)
+        self.assertLess(len(encoder.encode(self.ctx)), 8)
+
+    def test_compact(self):
+        _build(self.ctx, [f"Row {i}" for i in range(8)])
+        raw = sum(
+            drawing.command_size(kind, address)
+            for kind, address in drawing.walk_commands(self.ctx)
+        )
+        message = wire.WireEncoder().encode(self.ctx)
+        self.assertLess(len(message) * 2, raw)
+
+    def test_keyframes(self):
+        encoder = wire.WireEncoder(keyframe_interval=2)
+        _build(self.ctx, ["Label"])
+        messages = [encoder.encode(self.ctx) for _ in range(4)]
+        self.assertEqual([m[0] for m in messages], [1, 0, 1, 0])
+
+        # A decoder can join at any keyframe.
+        decoder = wire.WireDecoder()
+        self.assertRaises(ValueError, decoder.decode, messages[1])
+        decoder.decode(messages[2])
+        decoder.decode(messages[3])
+
+        encoder.reset()
+        self.assertEqual(encoder.encode(self.ctx)[0], wire.FLAG_KEYFRAME)
+
+    def test_missing_frame(self):
+        encoder = wire.WireEncoder()
+        decoder = wire.WireDecoder()
+        _build(self.ctx, ["A"])
+        decoder.decode(encoder.encode(self.ctx))
+        encoder.encode(self.ctx)
+        self.assertRaises(ValueError, decoder.decode, encoder.encode(self.ctx))
+        self.assertRaises(ValueError, decoder.decode, b"")
+        self.assertRaises(ValueError, wire.WireDecoder().decode, b"\x01\x00\x01\x02")
+
+    def test_synthetic(self):
+        arc = nk.CommandArcFilled()
+        arc.header.type = nk.COMMAND_ARC_FILLED
+        arc.cx, arc.cy, arc.r = -10, 20, 5
+        arc.a[0], arc.a[1] = 0.25, math.pi
+        arc.color.r, arc.color.a = 255, 128
+
+        polygon = (ctypes.c_ubyte * 64)()
+        view = nk.CommandPolygonFilled.from_buffer(polygon)
+        view.header.type = nk.COMMAND_POLYGON_FILLED
+        view.point_count = 3
+        points = (nk.Vec2i.Struct * 3).from_address(
+            ctypes.addressof(view) + nk.CommandPolygonFilled.points.offset
+        )
+        for point, (x, y) in zip(points, ((0, 0), (300, -40), (-7, 9))):
+            point.x, point.y = x, y
+
+        encoder = wire.WireEncoder()
+        decoder = wire.WireDecoder()
+        decoded = decoder.decode(encoder.encode_commands([arc, view]))
+        self.assertEqual(len(decoded), 2)
+        self.assertEqual((decoded[0].cx, decoded[0].cy, decoded[0].r), (-10, 20, 5))
+        self.assertAlmostEqual(decoded[0].a[1], math.pi, delta=1 / wire.FLOAT_SCALE)
+        self.assertEqual((decoded[0].color.r, decoded[0].color.a), (255, 128))
+        self.assertEqual(
+            [(p.x, p.y) for p in decoded[1].vertices()],
+            [(0, 0), (300, -40), (-7, 9)],
+        )
+
+        # Decoded commands can be encoded again, e.g. by a relay.
+        relay = wire.WireDecoder().decode(wire.WireEncoder().encode_commands(decoded))
+        self.assertEqual(_snapshot(relay), _snapshot(decoded))
+
+    def test_dispatch(self):
+        _build(self.ctx, ["Label"])
+        seen = []
+        count = wire.WireDecoder().dispatch(
+            wire.WireEncoder().encode(self.ctx),
+            {nk.COMMAND_TEXT: lambda c: seen.append(c.text)},
+        )
+        self.assertEqual(count, len(list(drawing.commands(self.ctx))))
+        self.assertIn("Label", seen)
+
+    def test_socket(self):
+        encoder = wire.WireEncoder()
+        decoder = wire.WireDecoder()
+        left, right = socket.socketpair()
+        with left, right:
+            for labels in (["A", "B"], ["A", "C"]):
+                _build(self.ctx, labels)
+                wire.send_message(left, encoder.encode(self.ctx))
+                decoded = decoder.decode(wire.recv_message(right))
+                self.assertEqual(
+                    _snapshot(decoded), _snapshot(drawing.commands(self.ctx))
+                )
+            wire.send_message(left, b"")
+            self.assertEqual(wire.recv_message(right), b"")
+            left.close()
+            self.assertIsNone(wire.recv_message(right))
+
+
+if __name__ == "__main__":
+    unittest.main()